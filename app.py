@@ -5,10 +5,10 @@
 # Distributed under terms of the GNU license.
 
 
+import concurrent.futures
+import hashlib
 import io
 import math
-import os
-import tempfile
 
 import pandas as pd
 import plotly.express as px
@@ -19,6 +19,34 @@ from run import export_amp, export_cq, export_melt, extract_run
 # Streamlit app layout
 st.title("lc96p qpcr Data Parser")
 
+# Results shared by all sessions, keyed by the hash of the uploaded file
+CACHE_TTL = 3600  # seconds
+CACHE_MAX_ENTRIES = 32
+
+EXPORTS = {"amp": export_amp, "melt": export_melt, "cq": export_cq}
+
+
+@st.cache_resource
+def get_executor():
+    # One pool for all sessions, the exports of a file run concurrently
+    return concurrent.futures.ThreadPoolExecutor()
+
+
+def compute_export(kind, file_bytes):
+    # Runs in the pool. Every export parses its own run, lxml trees are not
+    # safe to share between threads and parsing is cheap next to LinRegPCR
+    return EXPORTS[kind](extract_run(file_bytes))
+
+
+@st.cache_resource(
+    ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False
+)
+def cached_export(kind, file_hash, _file_bytes):
+    # Called from the script thread only. The future is shared, so a second
+    # session waits for the running export instead of starting another one.
+    # _file_bytes is not hashed by streamlit, file_hash is the cache key
+    return get_executor().submit(compute_export, kind, _file_bytes)
+
 
 def to_excel(df):
     output = io.BytesIO()
@@ -147,50 +175,31 @@ def show_melt_table(melt_table, placeholder):
 # File uploader widget
 uploaded_file = st.file_uploader("Choose a PDF file", type="lc96p")
 if uploaded_file is not None:
-    with tempfile.NamedTemporaryFile(
-        delete=False, suffix=".lc96p"
-    ) as temp_file:
-        name_base = uploaded_file.name.rsplit(".")[0]
-        temp_file.write(uploaded_file.getvalue())
-        temp_file_path = temp_file.name
+    name_base = uploaded_file.name.rsplit(".")[0]
+
+    file_bytes = uploaded_file.getvalue()
+    file_hash = hashlib.sha256(file_bytes).hexdigest()
 
     loading_placeholder = st.empty()
-    amp_placeholder = st.empty()
-    melt_placeholder = st.empty()
-    cq_placeholder = st.empty()
-    if (
-        "file_id" not in st.session_state
-        or st.session_state.file_id != uploaded_file.file_id
-    ):
-        try:
-            with loading_placeholder.container():
-                with st.spinner("Converting the file... Please wait."):
-                    run = extract_run(temp_file_path)
-            with loading_placeholder.container():
-                with st.spinner("Exporting amp table... Please wait."):
-                    amp_table = export_amp(run)
-                    show_amp_table(amp_table, amp_placeholder)
-            with loading_placeholder.container():
-                with st.spinner("Exporting melt table... Please wait."):
-                    melt_table = export_melt(run)
-                    show_melt_table(melt_table, melt_placeholder)
-            with loading_placeholder.container():
-                with st.spinner("Exporting cq table... Please wait."):
-                    result_table = export_cq(run)
-                    show_result_table(result_table, cq_placeholder)
-        except Exception as e:
-            st.error(f"An error occurred while parsing the lc96p file: {e}")
-        st.session_state.file_id = uploaded_file.file_id
-        st.session_state.amp_table = amp_table
-        st.session_state.melt_table = melt_table
-        st.session_state.result_table = result_table
-    else:
-        amp_table = st.session_state.amp_table
-        show_amp_table(amp_table, amp_placeholder)
-        melt_table = st.session_state.melt_table
-        show_melt_table(melt_table, melt_placeholder)
-        result_table = st.session_state.result_table
-        show_result_table(result_table, cq_placeholder)
-
-    # Delete the temporary files
-    os.remove(temp_file_path)
+    placeholders = {"amp": st.empty(), "melt": st.empty(), "cq": st.empty()}
+    show_table = {
+        "amp": show_amp_table,
+        "melt": show_melt_table,
+        "cq": show_result_table,
+    }
+    futures = {
+        cached_export(kind, file_hash, file_bytes): kind for kind in EXPORTS
+    }
+    with loading_placeholder.container():
+        with st.spinner("Parsing the file... Please wait."):
+            # Show each table as soon as it is ready
+            for future in concurrent.futures.as_completed(futures):
+                kind = futures[future]
+                try:
+                    table = future.result()
+                except Exception as e:
+                    placeholders[kind].error(
+                        f"An error occurred while parsing the lc96p file: {e}"
+                    )
+                else:
+                    show_table[kind](table, placeholders[kind])
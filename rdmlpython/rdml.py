@@ -1,17 +1,28 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import copy
 import csv
 import datetime
+import hashlib
 import io
 import json
+import logging
 import math
 import os
 import re
+import struct
 import sys
 import tempfile
+import threading
+import time
+import tracemalloc
+import types
 import warnings
+import weakref
 import zipfile
+import zlib
 
 import numpy as np
 import scipy.stats as scp
@@ -228,6 +239,14 @@ def _value_to_booldic(value):
     return ret
 
 
+# The id registries of the documents loaded by a live Rdml object, keyed by
+# the id of the root element. An entry holds the root element, the
+# registries per base element and the metadata lookups of the document, it
+# is dropped together with the Rdml object.
+_idRegistries = {}
+_idRegistriesMax = 16
+
+
 def _get_first_child_by_pos_or_id(base, tag, by_id, by_pos):
     """Get a child element of the base node with a given tag and position or
     id.
@@ -250,14 +269,14 @@ def _get_first_child_by_pos_or_id(base, tag, by_id, by_pos):
         raise RdmlError(
             "Only an " + tag + " id or a position can be provided."
         )
-    allChildren = _get_all_children(base, tag)
     if by_id is not None:
-        for node in allChildren:
-            if node.get("id") == by_id:
-                return node
+        node = _get_child_by_id(base, tag, by_id)
+        if node is not None:
+            return node
         raise RdmlError(
             "The " + tag + " id: " + by_id + " was not found in RDML file."
         )
+    allChildren = _get_all_children(base, tag)
     if by_pos is not None:
         if by_pos < 0 or by_pos > len(allChildren) - 1:
             raise RdmlError(
@@ -288,6 +307,90 @@ def _add_first_child_to_dic(base, dic, opt, tag):
     return dic
 
 
+def _json_chunks(obj, floatDigits=None):
+    """A generator which encodes an object as json piece by piece, so large
+    structures can be written or sent without building the whole string.
+    Lists may also be given as generators.
+
+    Args:
+        obj: The object to encode
+        floatDigits: The number of significant digits of floats, None for full precision
+
+    Returns:
+        Yields the json strings.
+    """
+
+    if isinstance(obj, dict):
+        yield "{"
+        first = True
+        for key in obj:
+            if not first:
+                yield ", "
+            first = False
+            yield json.dumps(str(key)) + ": "
+            yield from _json_chunks(obj[key], floatDigits)
+        yield "}"
+    elif isinstance(obj, (list, tuple, np.ndarray, types.GeneratorType)):
+        yield "["
+        first = True
+        for elem in obj:
+            if not first:
+                yield ", "
+            first = False
+            yield from _json_chunks(elem, floatDigits)
+        yield "]"
+    elif (
+        floatDigits is not None
+        and isinstance(obj, (float, np.floating))
+        and math.isfinite(obj)
+    ):
+        yield "{0:.{1}g}".format(float(obj), int(floatDigits))
+    else:
+        yield json.dumps(obj, cls=NpEncoder)
+
+
+def _round_number_text(text, floatDigits):
+    """Rounds a number stored as text to a number of significant digits.
+
+    Args:
+        text: The number as string
+        floatDigits: The number of significant digits, None to keep the text
+
+    Returns:
+        The rounded number as string, text which is no number is not changed.
+    """
+
+    if floatDigits is None or text == "":
+        return text
+    try:
+        value = float(text)
+    except ValueError:
+        return text
+    if not math.isfinite(value):
+        return text
+    return "{0:.{1}g}".format(value, int(floatDigits))
+
+
+def _reactjson_index(reacts):
+    """Indexes the datas of the react json by react id and target.
+
+    Args:
+        reacts: The list of reacts from getreactjson
+
+    Returns:
+        A dictionary with a list of the data dictionaries per (react id, target id).
+    """
+
+    ret = {}
+    for react in reacts:
+        for data in react["datas"]:
+            dataKey = (react["id"], data.get("tar", ""))
+            if dataKey not in ret:
+                ret[dataKey] = []
+            ret[dataKey].append(data)
+    return ret
+
+
 def _get_all_children(base, tag):
     """Get a list of all child elements with a given tag.
 
@@ -342,6 +445,314 @@ def _get_number_of_children(base, tag):
     return counter
 
 
+_dataPointPaths = {}
+
+
+def _get_data_point_texts(base, pointTag, valueTag):
+    """Get the texts of one value of all data points of a data node.
+
+    Args:
+        base: The react data node element. (lxml node)
+        pointTag: Data point tag, "adp" or "mdp". (string)
+        valueTag: Value tag inside the data point, e.g. "cyc". (string)
+
+    Returns:
+        A list with the non empty value texts in document order.
+    """
+
+    key = (pointTag, valueTag)
+    if key not in _dataPointPaths:
+        _dataPointPaths[key] = et.XPath(
+            "rdml:{0}/rdml:{1}/text() | {0}/{1}/text()".format(
+                pointTag, valueTag
+            ),
+            namespaces={"rdml": "http://www.rdml.org"},
+            smart_strings=False,
+        )
+    return _dataPointPaths[key](base)
+
+
+def _read_data_points(dataNodes, pointTag, xTag, commaConv=False):
+    """Read the raw data points of react data nodes in one bulk pass.
+
+    Args:
+        dataNodes: The list of the react data nodes. (lxml nodes)
+        pointTag: Data point tag, "adp" or "mdp". (string)
+        xTag: The x value tag, "cyc" or "tmp". (string)
+        commaConv: If true, convert comma separator to dot in the fluorescence.
+
+    Returns:
+        The numpy arrays with the node index, the x value and the
+        fluorescence of each data point.
+    """
+
+    rows = []
+    xVals = []
+    fluors = []
+    for row in range(0, len(dataNodes)):
+        rowX = _get_data_point_texts(dataNodes[row], pointTag, xTag)
+        rowFluors = _get_data_point_texts(dataNodes[row], pointTag, "fluor")
+        if len(rowX) != len(rowFluors):
+            # Empty values, read point by point
+            rowX = []
+            rowFluors = []
+            for point in _get_all_children(dataNodes[row], pointTag):
+                rowX.append(_get_first_child_text(point, xTag))
+                rowFluors.append(_get_first_child_text(point, "fluor"))
+        rows.extend([row] * len(rowX))
+        xVals.extend(rowX)
+        fluors.extend(rowFluors)
+    if commaConv and len(fluors) > 0:
+        fluors = (
+            "\0".join(fluors)
+            .translate({ord("."): None, ord(","): "."})
+            .split("\0")
+        )
+    return (
+        np.array(rows, dtype=np.int64),
+        np.fromiter(map(float, xVals), dtype=np.float64, count=len(xVals)),
+        np.fromiter(map(float, fluors), dtype=np.float64, count=len(fluors)),
+    )
+
+
+def _id_registry(base, tag):
+    """Returns the id registry of the child elements with a given tag.
+
+    The registry maps each id to its child element. For documents loaded by
+    a live Rdml object it is cached per base element and kept current by
+    _id_registry_insert, _id_registry_remove and _id_registry_rename. If the
+    number of children of the base element changed by other means, the
+    registry is rebuilt. A registry with duplicate ids is not cached.
+
+    Args:
+        base: The base node element. (lxml node)
+        tag: Child elements group tag used to select the elements. (string)
+
+    Returns:
+        A dictionary with the ids as keys and the elements as values.
+    """
+
+    key = id(base)
+    count = len(base)
+    registries = _id_registry_document(base)
+    entry = None
+    if registries is not None:
+        entry = registries.pop(key, None)
+        if entry is None or entry[0] is not base or entry[1] != count:
+            entry = [base, count, {}]
+        if len(registries) >= _idRegistriesMax:
+            del registries[next(iter(registries))]
+        registries[key] = entry
+        if tag in entry[2]:
+            return entry[2][tag]
+    ids = {}
+    unique = True
+    for node in base.iterchildren(tag, "{http://www.rdml.org}" + tag):
+        nodeId = node.get("id")
+        if nodeId in ids:
+            unique = False
+        else:
+            ids[nodeId] = node
+    if unique and entry is not None:
+        entry[2][tag] = ids
+    return ids
+
+
+def _id_registry_document(base):
+    """Returns the registries of the document of base.
+
+    Args:
+        base: The base node element. (lxml node)
+
+    Returns:
+        A dictionary with the registry entry per base element or None if
+        the document is not loaded by a live Rdml object.
+    """
+
+    root = base.getroottree().getroot()
+    doc = _idRegistries.get(id(root))
+    if doc is None or doc[0] is not root:
+        return None
+    return doc[1]
+
+
+def _id_registry_owner(rdml):
+    """Enables the id registries for the document of an Rdml object until
+    the object is garbage collected.
+
+    Args:
+        rdml: The Rdml object with the loaded document.
+
+    Returns:
+        The weakref.finalize object which drops the registries.
+    """
+
+    key = id(rdml._node)
+    _idRegistries[key] = [rdml._node, {}, None]
+    return weakref.finalize(rdml, _idRegistries.pop, key, None)
+
+
+def _id_registry_entry(base):
+    """Returns the cached registries of base if they are current.
+
+    Args:
+        base: The base node element. (lxml node)
+
+    Returns:
+        The registry entry or None.
+    """
+
+    registries = _id_registry_document(base)
+    if registries is None:
+        return None
+    entry = registries.get(id(base))
+    if entry is None or entry[0] is not base or entry[1] != len(base):
+        return None
+    return entry
+
+
+def _get_child_by_id(base, tag, id):
+    """Get the child element with a given tag and id.
+
+    Args:
+        base: The base node element. (lxml node)
+        tag: Child elements group tag used to select the elements. (string)
+        id: The unique id to search for. (string)
+
+    Returns:
+        The child node element or None.
+    """
+
+    node = _id_registry(base, tag).get(id)
+    if node is None:
+        return None
+    if node.getparent() is base and node.get("id") == id:
+        return node
+    _id_registry_clear(base)
+    return _id_registry(base, tag).get(id)
+
+
+def _id_registry_insert(base, pos, node):
+    """Inserts a child element and updates the id registry of base.
+
+    Args:
+        base: The base node element. (lxml node)
+        pos: The position to insert the element at. (int)
+        node: The element to insert. (lxml node)
+
+    Returns:
+        Nothing, the base lxml element is modified.
+    """
+
+    entry = _id_registry_entry(base)
+    isChild = node.getparent() is base
+    base.insert(pos, node)
+    _metadata_clear_tag(node)
+    if entry is None or isChild:
+        return
+    entry[1] += 1
+    tag = node.tag.replace("{http://www.rdml.org}", "")
+    if tag in entry[2]:
+        if node.get("id") in entry[2][tag]:
+            del entry[2][tag]
+        else:
+            entry[2][tag][node.get("id")] = node
+
+
+def _id_registry_remove(base, node):
+    """Removes a child element and updates the id registry of base.
+
+    Args:
+        base: The base node element. (lxml node)
+        node: The child element to remove. (lxml node)
+
+    Returns:
+        Nothing, the base lxml element is modified.
+    """
+
+    entry = _id_registry_entry(base)
+    base.remove(node)
+    _metadata_clear_tag(node)
+    if entry is None:
+        return
+    entry[1] -= 1
+    tag = node.tag.replace("{http://www.rdml.org}", "")
+    if tag in entry[2] and entry[2][tag].get(node.get("id")) is node:
+        del entry[2][tag][node.get("id")]
+
+
+def _id_registry_rename(node, oldId):
+    """Updates the id registry of the parent after an id was changed.
+
+    Args:
+        node: The element with the new id. (lxml node)
+        oldId: The previous id of the element. (string)
+
+    Returns:
+        Nothing.
+    """
+
+    _metadata_clear_tag(node)
+    entry = _id_registry_entry(node.getparent())
+    if entry is None:
+        return
+    tag = node.tag.replace("{http://www.rdml.org}", "")
+    if tag in entry[2]:
+        ids = entry[2][tag]
+        if ids.get(oldId) is node:
+            del ids[oldId]
+        if node.get("id") in ids:
+            del entry[2][tag]
+        else:
+            ids[node.get("id")] = node
+
+
+def _id_registry_clear(base):
+    """Drops the cached id registries of base after ids were changed
+    directly.
+
+    Args:
+        base: The base node element. (lxml node)
+
+    Returns:
+        Nothing.
+    """
+
+    registries = _id_registry_document(base)
+    if registries is not None:
+        registries.pop(id(base), None)
+    _metadata_clear(base)
+
+
+def _import_child_by_id(base, tag, xmlkeys, node):
+    """Adds an element to the end of its group or replaces the child with
+    the same id at its position.
+
+    Args:
+        base: The base node element. (lxml node)
+        tag: Child elements group tag used to select the elements. (string)
+        xmlkeys: The list of possible keys in the right order for xml (list strings)
+        node: The element to import. (lxml node)
+
+    Returns:
+        Nothing, the base lxml element is modified.
+    """
+
+    currId = node.get("id")
+    oldNode = _get_child_by_id(base, tag, currId)
+    if oldNode is None:
+        nextKeys = xmlkeys[xmlkeys.index(tag) + 1 :]
+        if nextKeys:
+            pos = _get_first_tag_pos(base, nextKeys[0], xmlkeys)
+        else:
+            pos = len(base)
+    while oldNode is not None:
+        pos = base.index(oldNode)
+        _id_registry_remove(base, oldNode)
+        oldNode = _get_child_by_id(base, tag, currId)
+    _id_registry_insert(base, pos, node)
+
+
 def _check_unique_id(base, tag, id):
     """Find all child elements with a given group and check if the id is
     already used.
@@ -355,11 +766,7 @@ def _check_unique_id(base, tag, id):
         False if the id is already used, True if not.
     """
 
-    for node in base:
-        if node.tag.replace("{http://www.rdml.org}", "") == tag:
-            if node.get("id") == id:
-                return False
-    return True
+    return _get_child_by_id(base, tag, id) is None
 
 
 def _create_new_element(base, tag, id):
@@ -447,7 +854,9 @@ def _change_subelement(
                 raise RdmlError(
                     "The " + groupTag + ' id "' + goodVal + '" is not unique.'
                 )
+            oldId = base.get("id")
             base.attrib["id"] = goodVal
+            _id_registry_rename(base, oldId)
         return
 
     # Check if the tag already excists
@@ -465,6 +874,72 @@ def _change_subelement(
             base.insert(place, new_node)
 
 
+def _change_subelements_bulk(bases, xmlkeys, values):
+    """Change the values of several subelements of many elements. Each base
+    element is scanned only once, the insert positions are derived from
+    that scan.
+
+    Args:
+        bases: The list of base node elements, None entries are skipped. (lxml nodes)
+        xmlkeys: The list of possible keys in the right order for xml (list strings)
+        values: A dictionary {tag: list of values} with one value per base element.
+                A value of None leaves the element untouched, "" removes it.
+
+    Returns:
+        Nothing, the base lxml elements are modified.
+    """
+
+    tagRank = {}
+    for pos in range(0, len(xmlkeys)):
+        tagRank[xmlkeys[pos]] = pos
+    tags = [tag for tag in xmlkeys if tag in values]
+    for tag in values:
+        if tag not in tagRank:
+            raise RdmlError("Unknown tag " + tag + " for bulk change.")
+
+    for row in range(0, len(bases)):
+        base = bases[row]
+        if base is None:
+            continue
+        children = []
+        ranks = []
+        found = {}
+        for node in base:
+            tag = node.tag.replace("{http://www.rdml.org}", "")
+            if tag in values and tag not in found:
+                found[tag] = node
+            children.append(node)
+            ranks.append(tagRank.get(tag, -1))
+
+        insPos = 0
+        for tag in tags:
+            goodVal = values[tag][row]
+            if goodVal is None:
+                continue
+            if tag in found:
+                node = found[tag]
+                if goodVal == "":
+                    delPos = children.index(node)
+                    base.remove(node)
+                    del children[delPos]
+                    del ranks[delPos]
+                    if delPos < insPos:
+                        insPos -= 1
+                else:
+                    node.text = goodVal
+                continue
+            if goodVal == "":
+                continue
+            while insPos < len(ranks) and ranks[insPos] < tagRank[tag]:
+                insPos += 1
+            new_node = et.Element(tag)
+            new_node.text = goodVal
+            base.insert(insPos, new_node)
+            children.insert(insPos, new_node)
+            ranks.insert(insPos, tagRank[tag])
+            insPos += 1
+
+
 def _get_or_create_subelement(base, tag, xmlkeys):
     """Get element with a given tag, if not present, create it.
 
@@ -579,2080 +1054,4316 @@ def _get_first_tag_pos(base, tag, xmlkeys):
     """
 
     listrest = xmlkeys[xmlkeys.index(tag) :]
-    counter = 0
-    for node in base:
-        if node.tag.replace("{http://www.rdml.org}", "") in listrest:
-            return counter
-        counter += 1
-    return counter
+    tags = listrest + ["{http://www.rdml.org}" + key for key in listrest]
+    for node in base.iterchildren(*tags):
+        return base.index(node)
+    return len(base)
 
 
-def _writeFileInRDML(rdmlName, fileName, data):
-    """Writes a file in the RDML zip, even if it existed before.
+def _rdmlSource(source):
+    """Returns the RDML source as file name or as seekable in-memory stream.
 
     Args:
-        rdmlName: The name of the RDML zip file
-        fileName: The name of the file to write into the zip
-        data: The data string of the file
+        source: A file name, bytes or a file-like object with a read() method
 
     Returns:
-        Nothing, modifies the RDML file.
+        The file name unchanged or an io.BytesIO with the data.
     """
 
-    needRewrite = False
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        data = source.read()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return io.BytesIO(data)
+    return source
 
-    if os.path.isfile(rdmlName):
-        try:
-            with zipfile.ZipFile(rdmlName, "r") as RDMLin:
-                for item in RDMLin.infolist():
-                    if item.filename == fileName:
-                        needRewrite = True
-        except zipfile.BadZipFile as e:
-            needRewrite = False
 
-    if needRewrite:
-        tempFolder, tempName = tempfile.mkstemp(dir=os.path.dirname(rdmlName))
-        os.close(tempFolder)
-
-        # copy everything except the filename
-        with zipfile.ZipFile(rdmlName, "r") as RDMLin:
-            with zipfile.ZipFile(
-                tempName, mode="w", compression=zipfile.ZIP_DEFLATED
-            ) as RDMLout:
-                RDMLout.comment = RDMLin.comment
-                for item in RDMLin.infolist():
-                    if item.filename != fileName:
-                        RDMLout.writestr(item, RDMLin.read(item.filename))
-                if data != "":
-                    RDMLout.writestr(fileName, data)
+def _zipRawCopySupported(zin, zout):
+    """A function which checks that the zipfile internals used by
+    _zipCopyRaw are present.
 
-        os.remove(rdmlName)
-        os.rename(tempName, rdmlName)
-    else:
-        with zipfile.ZipFile(
-            rdmlName, mode="a", compression=zipfile.ZIP_DEFLATED
-        ) as RDMLout:
-            RDMLout.writestr(fileName, data)
+    Args:
+        zin: The zipfile.ZipFile to read from
+        zout: The zipfile.ZipFile opened for writing
 
+    Returns:
+        True if members can be copied raw, False if not.
+    """
 
-def _niceQuantityType(txt):
-    if txt == "cop":
-        return "copies per microliter"
-    if txt == "fold":
-        return "fold change"
-    if txt == "dil":
-        return "dilution"
-    if txt == "nMol":
-        return "nanomol per microliter"
-    if txt == "ng":
-        return "nanogram per microliter"
-    if txt == "other":
-        return "other unit"
-    return txt
+    if not hasattr(zipfile, "sizeFileHeader") or not hasattr(zin, "fp"):
+        return False
+    for name in ["fp", "filelist", "NameToInfo", "start_dir", "_didModify"]:
+        if not hasattr(zout, name):
+            return False
+    return not getattr(zout, "_writing", False)
 
 
-def _wellRangeToList(wells, columns):
-    """Translates a range like "B2-C3" to list ["B2","B3","C2","C3"].
+def _zipCopyStream(zin, info, zout):
+    """A function which copies a member between zip files by decompressing
+    and compressing it again in chunks.
 
     Args:
-        wells: The range like "B2-C3"
-        columns: Number of colums in a plate
+        zin: The zipfile.ZipFile to read from
+        info: The zipfile.ZipInfo of the member in zin
+        zout: The zipfile.ZipFile opened for writing
 
     Returns:
-        returns a list like ["B2","B3","C2","C3"].
+        Nothing, writes to zout.
     """
 
-    res = []
-    wellList = []
-    re_found_comp = re.search(r"(\D)(\d+)-(\D)(\d+)\s*", wells)
-    if re_found_comp:
-        letter_s = ord(re_found_comp.group(1).upper())
-        letter_e = ord(re_found_comp.group(3).upper())
-        numb_s = int(re_found_comp.group(2))
-        numb_e = int(re_found_comp.group(4))
-        if letter_e < letter_s:
-            temp_num = letter_s
-            letter_s = letter_e
-            letter_e = temp_num
-        if numb_e < numb_s:
-            temp_num = numb_s
-            numb_s = numb_e
-            numb_e = temp_num
-        for letter in range(letter_s, letter_e + 1):
-            for numb in range(numb_s, numb_e + 1):
-                wellList.append(chr(letter) + str(numb))
-    else:
-        re_found_simp = re.search(r"(\D)(\d+)\s*", wells)
-        if re_found_simp:
-            wellList.append(re_found_simp.group(1) + re_found_simp.group(2))
+    newInfo = zipfile.ZipInfo(info.filename, info.date_time)
+    newInfo.compress_type = info.compress_type
+    newInfo.comment = info.comment
+    newInfo.external_attr = info.external_attr
+    forceZip64 = info.file_size >= zipfile.ZIP64_LIMIT
+    with zin.open(info) as src:
+        with zout.open(newInfo, "w", force_zip64=forceZip64) as dst:
+            chunk = src.read(1 << 20)
+            while chunk:
+                dst.write(chunk)
+                chunk = src.read(1 << 20)
+
+
+def _zipCopyRaw(zin, info, zout):
+    """A function which copies a member between zip files without
+    decompressing it. The local header and the compressed data are copied
+    verbatim, zout writes the central directory entry from the info. If the
+    zipfile internals this needs are missing, the member is copied with
+    _zipCopyStream.
+
+    Args:
+        zin: The zipfile.ZipFile to read from
+        info: The zipfile.ZipInfo of the member in zin
+        zout: The zipfile.ZipFile opened for writing
 
-    for well in wellList:
-        re_found_simp = re.search(r"(\D)(\d+)\s*", well)
-        if re_found_simp:
-            letter = ord(re_found_simp.group(1).upper()) - ord("A")
-            numb = int(re_found_simp.group(2))
-            fin_id = numb + letter * int(columns)
-            res.append(str(fin_id))
-    return res
+    Returns:
+        Nothing, writes to zout.
+    """
 
+    if not _zipRawCopySupported(zin, zout):
+        _zipCopyStream(zin, info, zout)
+        return
 
-def _sampleTypeToDics(rootEl):
-    """Translates all ele in samples to dic {sample Id}{target Id} with ele
-    value.
+    zin.fp.seek(info.header_offset)
+    header = zin.fp.read(zipfile.sizeFileHeader)
+    nameLen, extraLen = struct.unpack("<HH", header[26:30])
+    length = nameLen + extraLen + info.compress_size
+    if info.flag_bits & 0x08:
+        descLen = 12
+        if max(info.compress_size, info.file_size) > zipfile.ZIP64_LIMIT:
+            descLen = 20
+        zin.fp.seek(info.header_offset + len(header) + length)
+        if zin.fp.read(4) == b"PK\x07\x08":
+            descLen += 4
+        length += descLen
+        zin.fp.seek(info.header_offset + len(header))
+
+    newInfo = copy.copy(info)
+    newInfo.header_offset = zout.fp.tell()
+    zout.fp.write(header)
+    while length > 0:
+        chunk = zin.fp.read(min(length, 1 << 20))
+        if not chunk:
+            raise RdmlError("Zip member " + info.filename + " is truncated.")
+        zout.fp.write(chunk)
+        length -= len(chunk)
+    zout.filelist.append(newInfo)
+    zout.NameToInfo[newInfo.filename] = newInfo
+    zout.start_dir = zout.fp.tell()
+    zout._didModify = True
+
+
+def _zipReplaceFirstLine(zin, info, zout, firstLine):
+    """A function which copies a member between zip files with a new first
+    line. The rest of the member is streamed, never held in memory.
 
     Args:
-        rootEl: The root node of the rdml file
+        zin: The zipfile.ZipFile to read from
+        info: The zipfile.ZipInfo of the member in zin
+        zout: The zipfile.ZipFile opened for writing
+        firstLine: The new first line without line ending
 
     Returns:
-        returns a dictionary {sample Id}{target Id} with ele value.
+        Nothing, writes to zout.
     """
-    tar = []
-    ret = {}
 
-    # Get all targets
-    targets = _get_all_children(rootEl, "target")
-    for node in targets:
-        if "id" in node.attrib:
-            tar.append(node.attrib["id"])
+    newLine = firstLine.encode("utf-8")
+    forceZip64 = info.file_size + len(newLine) >= zipfile.ZIP64_LIMIT
+    with zin.open(info) as src:
+        oldLine = src.readline()
+        newLine += oldLine[len(oldLine.rstrip(b"\r\n")) :]
+        with zout.open(info.filename, "w", force_zip64=forceZip64) as dst:
+            dst.write(newLine)
+            chunk = src.read(1 << 20)
+            while chunk:
+                dst.write(chunk)
+                chunk = src.read(1 << 20)
 
-    samples = _get_all_children(rootEl, "sample")
-    for node in samples:
-        if "id" in node.attrib:
-            currSam = node.attrib["id"]
-            ret[currSam] = {}
-            for currTar in tar:
-                ret[currSam][currTar] = "unkn"
-            subEles = _get_all_children(node, "type")
-            for subNode in subEles:
-                if "targetId" not in subNode.attrib:
-                    for currTar in tar:
-                        ret[currSam][currTar] = subNode.text
-            for subNode in subEles:
-                if "targetId" in subNode.attrib:
-                    ret[currSam][subNode.attrib["targetId"]] = subNode.text
-    return ret
 
+def _rewriteZip(source, target, members, firstLines=None):
+    """A function which writes a copy of a zip with some members replaced.
+    Unchanged members are copied raw, only new data is compressed.
 
-def _lrp_linReg(xIn, yUse):
-    """A function which calculates the slope or the intercept by linear
-    regression.
+    Args:
+        source: The name or a seekable binary stream of the old zip
+        target: The name or a binary stream for the new zip
+        members: A dictionary with file names as keys and the new data as
+                 values, None deletes the member. New files are appended.
+        firstLines: A dictionary with file names as keys and a new first
+                    line for the member as values (optional)
+
+    Returns:
+        Nothing, writes the target.
+    """
+
+    if firstLines is None:
+        firstLines = {}
+    with zipfile.ZipFile(source, "r") as RDMLin:
+        with zipfile.ZipFile(
+            target, mode="w", compression=zipfile.ZIP_DEFLATED
+        ) as RDMLout:
+            RDMLout.comment = RDMLin.comment
+            written = set()
+            for item in RDMLin.infolist():
+                if item.filename in firstLines:
+                    _zipReplaceFirstLine(
+                        RDMLin, item, RDMLout, firstLines[item.filename]
+                    )
+                elif item.filename not in members:
+                    _zipCopyRaw(RDMLin, item, RDMLout)
+                elif members[item.filename] is not None:
+                    if item.filename not in written:
+                        RDMLout.writestr(item.filename, members[item.filename])
+                written.add(item.filename)
+            for fileName, data in members.items():
+                if fileName not in written and data is not None:
+                    RDMLout.writestr(fileName, data)
+
+
+def _rewriteRDML(rdmlName, members, firstLines=None):
+    """Rewrites the RDML zip held in a file or in a stream with some members
+    replaced, see _rewriteZip(). A file is replaced by an atomic rename.
 
     Args:
-        xIn: The numpy array of the cycles
-        yUse: The numpy array that contains the fluorescence
+        rdmlName: The name of the RDML zip file or a seekable file-like object
+        members: A dictionary with file names as keys and the new data as
+                 values, None deletes the member.
+        firstLines: A dictionary with file names as keys and a new first
+                    line for the member as values (optional)
 
     Returns:
-        An array with the slope and intercept.
+        Nothing, modifies the RDML file.
     """
 
-    counts = np.ones(yUse.shape)
-    xUse = xIn.copy()
-    xUse[np.isnan(yUse)] = 0
-    counts[np.isnan(yUse)] = 0
+    if hasattr(rdmlName, "read"):
+        newZip = io.BytesIO()
+        _rewriteZip(rdmlName, newZip, members, firstLines)
+        rdmlName.seek(0)
+        rdmlName.truncate()
+        rdmlName.write(newZip.getvalue())
+        return
 
-    cycSqared = xUse * xUse
-    cycFluor = xUse * yUse
-    sumCyc = np.nansum(xUse, axis=1)
-    sumFluor = np.nansum(yUse, axis=1)
-    sumCycSquared = np.nansum(cycSqared, axis=1)
-    sumCycFluor = np.nansum(cycFluor, axis=1)
-    n = np.nansum(counts, axis=1)
+    tempFolder, tempName = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(rdmlName))
+    )
+    os.close(tempFolder)
+    try:
+        _rewriteZip(rdmlName, tempName, members, firstLines)
+        with open(tempName, "rb+") as tempFile:
+            os.fsync(tempFile.fileno())
+        os.replace(tempName, rdmlName)
+    except BaseException:
+        if os.path.isfile(tempName):
+            os.remove(tempName)
+        raise
 
-    ssx = sumCycSquared - (sumCyc * sumCyc) / n
-    sxy = sumCycFluor - (sumCyc * sumFluor) / n
 
-    slope = sxy / ssx
-    intercept = (sumFluor / n) - slope * (sumCyc / n)
-    return [slope, intercept]
+_partitionCatalogues = {}
+_partitionCataloguesMax = 8
 
 
-def _lrp_findStopCyc(fluor, aRow):
-    """Find the stop cycle of the log lin phase in fluor.
+def _partitionCatalogueKey(rdmlName):
+    """A function which returns the cache key of an RDML zip file.
 
     Args:
-        fluor: The array with the fluorescence values
-        aRow: The row to work on
+        rdmlName: The name of the RDML zip file or a file-like object
 
     Returns:
-        An int with the stop cycle.
+        A tuple of path, size and modification time or None for streams.
     """
 
-    # Take care of nan values
-    validTwoLessCyc = 3  # Cycles so +1 to array
-    while validTwoLessCyc <= fluor.shape[1] and (
-        np.isnan(fluor[aRow, validTwoLessCyc - 1])
-        or np.isnan(fluor[aRow, validTwoLessCyc - 2])
-        or np.isnan(fluor[aRow, validTwoLessCyc - 3])
-    ):
-        validTwoLessCyc += 1
-
-    # First and Second Derivative values calculation
-    fluorShift = np.roll(
-        fluor[aRow], 1, axis=0
-    )  # Shift to right - real position is -0.5
-    fluorShift[0] = np.nan
-    firstDerivative = fluor[aRow] - fluorShift
-    if np.isfinite(firstDerivative).any():
-        FDMaxCyc = (
-            np.nanargmax(firstDerivative, axis=0) + 1
-        )  # Cycles so +1 to array
-    else:
-        return fluor.shape[1]
+    if not isinstance(rdmlName, str):
+        return None
+    fileStat = os.stat(rdmlName)
+    return (os.path.abspath(rdmlName), fileStat.st_size, fileStat.st_mtime_ns)
 
-    firstDerivativeShift = np.roll(
-        firstDerivative, -1, axis=0
-    )  # Shift to left
-    firstDerivativeShift[-1] = np.nan
-    secondDerivative = firstDerivativeShift - firstDerivative
 
-    if FDMaxCyc + 2 <= fluor.shape[1]:
-        # Only add two cycles if there is an increase without nan
-        if (
-            not np.isnan(fluor[aRow, FDMaxCyc - 1])
-            and not np.isnan(fluor[aRow, FDMaxCyc])
-            and not np.isnan(fluor[aRow, FDMaxCyc + 1])
-            and fluor[aRow, FDMaxCyc + 1]
-            > fluor[aRow, FDMaxCyc]
-            > fluor[aRow, FDMaxCyc - 1]
-        ):
-            FDMaxCyc += 2
-    else:
-        FDMaxCyc = fluor.shape[1]
+def _partitionCatalogue(rdmlName):
+    """A function which returns the header columns of all partition tables
+    in an RDML zip. Only the first line of each table is decompressed, the
+    catalogue of a file is cached until the file changes.
 
-    maxMeanSD = 0.0
-    stopCyc = fluor.shape[1]
+    Args:
+        rdmlName: The name of the RDML zip file or a seekable file-like object
 
-    for cycInRange in range(validTwoLessCyc, FDMaxCyc):
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", category=RuntimeWarning)
-            tempMeanSD = np.mean(
-                secondDerivative[cycInRange - 2 : cycInRange + 1], axis=0
-            )
-        # The > 0.000000000001 is to avoid float differences to the pascal version
-        if (
-            not np.isnan(tempMeanSD)
-            and (tempMeanSD - maxMeanSD) > 0.000000000001
-        ):
-            maxMeanSD = tempMeanSD
-            stopCyc = cycInRange
-    if stopCyc + 2 >= fluor.shape[1]:
-        stopCyc = fluor.shape[1]
+    Returns:
+        A dictionary with the table file names as keys and the list of
+        header cells as values.
+    """
 
-    return stopCyc
+    key = _partitionCatalogueKey(rdmlName)
+    if key in _partitionCatalogues:
+        return _partitionCatalogues[key]
+    catalogue = {}
+    with zipfile.ZipFile(rdmlName, "r") as RDMLin:
+        for item in RDMLin.infolist():
+            if re.search("^partitions/", item.filename):
+                with RDMLin.open(item) as tabFile:
+                    header = tabFile.readline().decode("utf-8")
+                catalogue[item.filename] = header.rstrip("\r\n").split("\t")
+    _partitionCatalogueStore(key, catalogue)
+    return catalogue
 
 
-def _lrp_findStartCyc(fluor, aRow, stopCyc):
-    """A function which finds the start cycle of the log lin phase in fluor.
+def _partitionCatalogueStore(key, catalogue):
+    """A function which caches the partition catalogue of an RDML zip file.
 
     Args:
-        fluor: The array with the fluorescence values
-        aRow: The row to work on
-        stopCyc: The stop cycle
+        key: The key from _partitionCatalogueKey(), None is not cached
+        catalogue: The catalogue as returned by _partitionCatalogue()
 
     Returns:
-        An array [int, int] with the start cycle and the fixed start cycle.
+        Nothing.
     """
 
-    startCyc = stopCyc - 1
+    if key is None:
+        return
+    if len(_partitionCatalogues) >= _partitionCataloguesMax:
+        del _partitionCatalogues[next(iter(_partitionCatalogues))]
+    _partitionCatalogues[key] = catalogue
 
-    # startCyc might be NaN, so shift it to the first value
-    firstNotNaN = 1  # Cycles so +1 to array
-    while np.isnan(fluor[aRow, firstNotNaN - 1]) and firstNotNaN < startCyc:
-        firstNotNaN += 1
-    while startCyc > firstNotNaN and np.isnan(fluor[aRow, startCyc - 1]):
-        startCyc -= 1
 
-    # As long as there are no NaN and new values are increasing
-    while (
-        startCyc > firstNotNaN
-        and stopCyc - startCyc < 11
-        and not np.isnan(fluor[aRow, startCyc - 2])
-        and fluor[aRow, startCyc - 2] <= fluor[aRow, startCyc - 1]
-    ):
-        startCyc -= 1
+def _writeFileInRDMLStream(rdmlStream, fileName, data):
+    """Writes a file in a RDML zip held in a stream, even if it existed before.
+    A readable and seekable stream with a zip is rewritten in place, all other
+    streams get a new zip. A stream only needs a write() method.
 
-    startCycFix = startCyc
-    if (
-        not np.isnan(fluor[aRow, startCyc])
-        and not np.isnan(fluor[aRow, startCyc - 1])
-        and not np.isnan(fluor[aRow, stopCyc - 1])
-        and not np.isnan(fluor[aRow, stopCyc - 2])
-    ):
-        startStep = np.log10(fluor[aRow, startCyc]) - np.log10(
-            fluor[aRow, startCyc - 1]
-        )
-        stopStep = np.log10(fluor[aRow, stopCyc - 1]) - np.log10(
-            fluor[aRow, stopCyc - 2]
-        )
-        if startStep > 1.1 * stopStep:
-            startCycFix += 1
+    Args:
+        rdmlStream: The file-like object with the RDML zip
+        fileName: The name of the file to write into the zip
+        data: The data string of the file
 
-    return [startCyc, startCycFix]
+    Returns:
+        Nothing, modifies the stream.
+    """
 
+    seekable = getattr(rdmlStream, "seekable", None)
+    seekable = seekable is not None and seekable()
+    readable = getattr(rdmlStream, "readable", None)
+    readable = readable is not None and readable()
+    if seekable and readable:
+        rdmlStream.seek(0)
+        if zipfile.is_zipfile(rdmlStream):
+            if data == "":
+                data = None
+            _rewriteRDML(rdmlStream, {fileName: data})
+            return
 
-def _lrp_testSlopes(fluor, aRow, stopCyc, startCycFix):
-    """Splits the values and calculates a slope for the upper and the lower
-    half.
+    newZip = io.BytesIO()
+    with zipfile.ZipFile(
+        newZip, mode="w", compression=zipfile.ZIP_DEFLATED
+    ) as RDMLout:
+        if data != "":
+            RDMLout.writestr(fileName, data)
+
+    if seekable:
+        rdmlStream.seek(0)
+        rdmlStream.truncate()
+    rdmlStream.write(newZip.getvalue())
+
+
+def _writeFileInRDML(rdmlName, fileName, data):
+    """Writes a file in the RDML zip, even if it existed before.
 
     Args:
-        fluor: The array with the fluorescence values
-        aRow: The row to work on
-        stopCyc: The stop cycle
-        startCycFix: The start cycle
+        rdmlName: The name of the RDML zip file or a file-like object
+        fileName: The name of the file to write into the zip
+        data: The data string of the file
 
     Returns:
-        An array with [slopelow, slopehigh].
+        Nothing, modifies the RDML file.
     """
 
-    # Both start with full range
-    loopStart = [startCycFix[aRow], stopCyc[aRow]]
-    loopStop = [startCycFix[aRow], stopCyc[aRow]]
+    if hasattr(rdmlName, "write"):
+        _writeFileInRDMLStream(rdmlName, fileName, data)
+        return
 
-    # Now find the center ignoring nan
-    while True:
-        loopStart[1] -= 1
-        loopStop[0] += 1
-        while (loopStart[1] - loopStop[0]) > 1 and np.isnan(
-            fluor[aRow, loopStart[1] - 1]
-        ):
-            loopStart[1] -= 1
-        while (loopStart[1] - loopStop[0]) > 1 and np.isnan(
-            fluor[aRow, loopStop[1] - 1]
-        ):
-            loopStop[0] += 1
-        if (loopStart[1] - loopStop[0]) <= 1:
-            break
+    needRewrite = False
 
-    # basic regression per group
-    ssx = [0, 0]
-    sxy = [0, 0]
-    slope = [0, 0]
-    for j in range(0, 2):
-        sumx = 0.0
-        sumy = 0.0
-        sumx2 = 0.0
-        sumxy = 0.0
-        nincl = 0.0
-        for i in range(loopStart[j], loopStop[j] + 1):
-            if not np.isnan(fluor[aRow, i - 1]):
-                sumx += i
-                sumy += np.log10(fluor[aRow, i - 1])
-                sumx2 += i * i
-                sumxy += i * np.log10(fluor[aRow, i - 1])
-                nincl += 1
-        if nincl != 0.0:
-            ssx[j] = sumx2 - sumx * sumx / nincl
-            sxy[j] = sumxy - sumx * sumy / nincl
-            slope[j] = sxy[j] / ssx[j]
-        else:
-            slope[j] = -999.9
+    if os.path.isfile(rdmlName):
+        try:
+            with zipfile.ZipFile(rdmlName, "r") as RDMLin:
+                for item in RDMLin.infolist():
+                    if item.filename == fileName:
+                        needRewrite = True
+        except zipfile.BadZipFile as e:
+            needRewrite = False
 
-    return [slope[0], slope[1]]
+    if needRewrite:
+        if data == "":
+            data = None
+        _rewriteRDML(rdmlName, {fileName: data})
+    else:
+        with zipfile.ZipFile(
+            rdmlName, mode="a", compression=zipfile.ZIP_DEFLATED
+        ) as RDMLout:
+            RDMLout.writestr(fileName, data)
 
 
-def _lrp_lastCycMeanMax(fluor, vecSkipSample, vecNoPlateau):
-    """A function which calculates the mean of the max fluor in the last ten
-    cycles.
+_journalMaxRecords = 64
+_journalMaxRatio = 0.5
+
+
+def _journal_scan(node, path, oldSnap, newSnap, changed):
+    """A function which records the checksums of the journaled elements and
+    collects the elements changed since the old snapshot.
+
+    Experiments and runs are scanned child by child, all other elements
+    are compared as a whole. If the attributes of a scanned element changed
+    or its children were added, removed or reordered, the whole element
+    counts as changed.
 
     Args:
-        fluor: The array with the fluorescence values
-        vecSkipSample: Skip the sample
-        vecNoPlateau: Sample has no plateau
+        node: The element to scan. (lxml node)
+        path: The path of the element as tuple of (tag, id, count) keys.
+        oldSnap: The snapshot of the last save.
+        newSnap: The snapshot to fill.
+        changed: The list to append (path, element) tuples to or None.
 
     Returns:
-        An float with the max mean.
+        Nothing, fills newSnap and changed.
     """
 
-    # Ignore all nan slices, to fix them below
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", category=RuntimeWarning)
-        maxFlour = np.nanmax(fluor[:, -11:], axis=1)
-        maxFlour[vecSkipSample] = np.nan
-        maxFlour[vecNoPlateau] = np.nan
-        maxMean = np.nanmean(maxFlour)
-    if np.isnan(maxMean):
-        maxMean = np.nanmax(maxFlour)
-
-    return maxMean
+    keys = []
+    children = []
+    counts = {}
+    for child in node.iterchildren(tag=et.Element):
+        tag = child.tag.replace("{http://www.rdml.org}", "")
+        countKey = (tag, child.get("id"))
+        counts[countKey] = counts.get(countKey, 0) + 1
+        key = (tag, child.get("id"), counts[countKey])
+        keys.append(key)
+        children.append((key, child))
+    keys = (tuple(sorted(node.attrib.items())), tuple(keys))
+    newSnap[path] = keys
+    if oldSnap.get(path) != keys:
+        if changed is not None:
+            changed.append((path, node))
+        changed = None
+    for key, child in children:
+        childPath = path + (key,)
+        if (len(path) == 0 and key[0] == "experiment") or (
+            len(path) == 1 and key[0] == "run"
+        ):
+            _journal_scan(child, childPath, oldSnap, newSnap, changed)
+            continue
+        digest = hashlib.sha1(et.tostring(child, with_tail=False)).digest()
+        newSnap[childPath] = digest
+        if changed is not None and oldSnap.get(childPath) != digest:
+            changed.append((childPath, child))
 
 
-def _lrp_meanPcrEff(
-    tarGroup, vecTarget, pcrEff, vecSkipSample, vecNoPlateau, vecShortLogLin
-):
-    """A function which calculates the mean efficiency of the selected target
-    group excluding bad ones.
+def _journal_find(root, path):
+    """A function which finds the element with the given journal path.
 
     Args:
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        pcrEff: The array with the PCR efficiencies
-        vecSkipSample: Skip the sample
-        vecNoPlateau: True if there is no plateau
-        vecShortLogLin: True indicates a short log lin phase
+        root: The root node element. (lxml node)
+        path: The path as list of (tag, id, count) keys.
 
     Returns:
-        An array with [meanPcrEff, pcrEffVar].
+        The element or None.
     """
 
-    cnt = 0
-    sumEff = 0.0
-    sumEff2 = 0.0
-    for j in range(0, len(pcrEff)):
-        if tarGroup is None or tarGroup == vecTarget[j]:
-            if (
-                not (vecSkipSample[j] or vecNoPlateau[j] or vecShortLogLin[j])
-            ) and pcrEff[j] > 1.0:
-                cnt += 1
-                sumEff += pcrEff[j]
-                sumEff2 += pcrEff[j] * pcrEff[j]
-
-    if cnt > 1:
-        meanPcrEff = sumEff / cnt
-        pcrEffVar = (sumEff2 - (sumEff * sumEff) / cnt) / (cnt - 1)
-    else:
-        meanPcrEff = 1.0
-        pcrEffVar = 100
+    node = root
+    for tag, nodeId, count in path:
+        found = None
+        for child in node.iterchildren(tag=et.Element):
+            if child.tag.replace("{http://www.rdml.org}", "") != tag:
+                continue
+            if child.get("id") != nodeId:
+                continue
+            count -= 1
+            if count == 0:
+                found = child
+                break
+        if found is None:
+            return None
+        node = found
+    return node
 
-    return [meanPcrEff, pcrEffVar]
 
+def _journal_read(journalName, baseCrc):
+    """A function which reads the valid records of a save journal.
 
-def _lrp_startStopInWindow(fluor, aRow, upWin, lowWin):
-    """Find the start and the stop of the part of the curve which is inside the
-    window.
+    Records written for another rdml_data.xml are stale and ignored, a
+    record cut by a crash ends the journal.
 
     Args:
-        fluor: The array with the fluorescence values
-        aRow: The row to work on
-        upWin: The upper limit of the window
-        lowWin: The lower limit of the window
+        journalName: The file name of the journal.
+        baseCrc: The CRC of the rdml_data.xml in the RDML zip.
 
     Returns:
-        The int startWinCyc, stopWinCyc and the bool notInWindow.
+        A tuple with the list of records, each a list of [path, xml] changes,
+        and the byte length of the valid journal.
     """
 
-    startWinCyc = 0
-    stopWinCyc = 0
-    # Find the stopCyc and the startCyc cycle of the log lin phase
-    stopCyc = _lrp_findStopCyc(fluor, aRow)
-    [startCyc, startCycFix] = _lrp_findStartCyc(fluor, aRow, stopCyc)
+    if not os.path.isfile(journalName):
+        return [], 0
+    with open(journalName, "rb") as journalFile:
+        data = journalFile.read()
+    records = []
+    pos = 0
+    while pos + 12 <= len(data):
+        magic, length, crc = struct.unpack(">4sII", data[pos : pos + 12])
+        payload = data[pos + 12 : pos + 12 + length]
+        if magic != b"RDJ1" or len(payload) != length:
+            break
+        if zlib.crc32(payload) != crc:
+            break
+        record = json.loads(zlib.decompress(payload).decode("utf-8"))
+        if record["base"] != baseCrc:
+            return [], 0
+        records.append(record["changes"])
+        pos += 12 + length
+    return records, pos
 
-    if np.isfinite(fluor[aRow, startCycFix - 1 :]).any():
-        stopMaxCyc = np.nanargmax(fluor[aRow, startCycFix - 1 :]) + startCycFix
-    else:
-        return startCyc, startCyc, True
 
-    # If is true if outside the window
-    if (
-        fluor[aRow, startCyc - 1] > upWin
-        or fluor[aRow, stopMaxCyc - 1] < lowWin
-    ):
-        notInWindow = True
-        if fluor[aRow, startCyc - 1] > upWin:
-            startWinCyc = startCyc
-            stopWinCyc = startCyc
-        if fluor[aRow, stopMaxCyc - 1] < lowWin:
-            startWinCyc = stopMaxCyc
-            stopWinCyc = stopMaxCyc
-    else:
-        notInWindow = False
-        # look for stopWinCyc
-        if fluor[aRow, stopMaxCyc - 1] < upWin:
-            stopWinCyc = stopMaxCyc
-        else:
-            for i in range(stopMaxCyc, startCyc, -1):
-                if fluor[aRow, i - 1] > upWin > fluor[aRow, i - 2]:
-                    stopWinCyc = i - 1
-        # look for startWinCyc
-        if fluor[aRow, startCycFix - 1] > lowWin:
-            startWinCyc = startCycFix
-        else:
-            for i in range(stopMaxCyc, startCyc, -1):
-                if fluor[aRow, i - 1] > lowWin > fluor[aRow, i - 2]:
-                    startWinCyc = i
-    return startWinCyc, stopWinCyc, notInWindow
+def _journal_apply(root, records):
+    """A function which applies the journal records to a freshly loaded
+    RDML tree.
 
+    Args:
+        root: The root node element. (lxml node)
+        records: The records as returned by _journal_read().
 
-def _lrp_paramInWindow(fluor, aRow, upWin, lowWin):
-    """Calculates slope, nNull, PCR efficiency and mean x/y for the curve part
-    in the window.
+    Returns:
+        Nothing, the root lxml element is modified.
+    """
+
+    for changes in records:
+        for path, xml in changes:
+            oldNode = _journal_find(root, path)
+            if oldNode is None or oldNode is root:
+                raise RdmlError(
+                    "The save journal does not match the RDML file."
+                )
+            # Copy the content into the old element, a moved element would
+            # get the rdml: prefix instead of the default namespace
+            newNode = et.fromstring(xml.encode("utf-8"))
+            tail = oldNode.tail
+            oldNode.clear()
+            oldNode.tail = tail
+            oldNode.text = newNode.text
+            for attName, attValue in newNode.attrib.items():
+                oldNode.set(attName, attValue)
+            for child in list(newNode):
+                oldNode.append(child)
+
+
+def _journal_append(journalName, validLength, baseCrc, changes):
+    """A function which appends one record to the save journal.
 
     Args:
-        fluor: The array with the fluorescence values
-        aRow: The row to work on
-        upWin: The upper limit of the window
-        lowWin: The lower limit of the window
+        journalName: The file name of the journal.
+        validLength: The byte length of the valid journal, a cut record
+                     behind it is overwritten.
+        baseCrc: The CRC of the rdml_data.xml in the RDML zip.
+        changes: A list of [path, xml] changes.
 
     Returns:
-        The calculated values: indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl.
+        The new byte length of the journal.
     """
 
-    startWinCyc, stopWinCyc, notInWindow = _lrp_startStopInWindow(
-        fluor, aRow, upWin, lowWin
+    payload = zlib.compress(
+        json.dumps({"base": baseCrc, "changes": changes}).encode("utf-8")
     )
+    with open(journalName, "ab") as journalFile:
+        journalFile.truncate(validLength)
+        journalFile.write(
+            struct.pack(">4sII", b"RDJ1", len(payload), zlib.crc32(payload))
+        )
+        journalFile.write(payload)
+        journalFile.flush()
+        os.fsync(journalFile.fileno())
+    return validLength + 12 + len(payload)
 
-    sumx = 0.0
-    sumy = 0.0
-    sumx2 = 0.0
-    sumy2 = 0.0
-    sumxy = 0.0
-    nincl = 0.0
-    ssx = 0.0
-    ssy = 0.0
-    sxy = 0.0
-    for i in range(startWinCyc, stopWinCyc + 1):
-        fluorSamp = fluor[aRow, i - 1]
-        if not np.isnan(fluorSamp):
-            logFluorSamp = np.log10(fluorSamp)
-            sumx += i
-            sumy += logFluorSamp
-            sumx2 += i * i
-            sumy2 += logFluorSamp * logFluorSamp
-            sumxy += i * logFluorSamp
-            nincl += 1
 
-    if nincl > 1:
-        ssx = sumx2 - sumx * sumx / nincl
-        ssy = sumy2 - sumy * sumy / nincl
-        sxy = sumxy - sumx * sumy / nincl
+def _rdml_data_crc(rdmlName):
+    """A function which returns the CRC of rdml_data.xml in a RDML zip.
 
-    if ssx > 0.0 and ssy > 0.0 and nincl > 0.0:
-        cslope = sxy / ssx
-        cinterc = sumy / nincl - cslope * sumx / nincl
-        correl = sxy / np.sqrt(ssx * ssy)
-        indMeanX = sumx / nincl
-        indMeanY = sumy / nincl
-        pcrEff = np.power(10, cslope)
-        nnulls = np.power(10, cinterc)
-    else:
-        correl = np.nan
-        indMeanX = np.nan
-        indMeanY = np.nan
-        pcrEff = np.nan
-        nnulls = np.nan
+    Args:
+        rdmlName: The name of the RDML zip file
 
-    if notInWindow:
-        ninclu = 0
-    else:
-        ninclu = stopWinCyc - startWinCyc + 1
+    Returns:
+        The CRC or None if the file is no RDML zip.
+    """
 
-    return indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl
+    if not os.path.isfile(rdmlName) or not zipfile.is_zipfile(rdmlName):
+        return None
+    with zipfile.ZipFile(rdmlName, "r") as RDMLin:
+        try:
+            return RDMLin.getinfo("rdml_data.xml").CRC
+        except KeyError:
+            return None
 
 
-def _lrp_allParamInWindow(
-    fluor,
-    tarGroup,
-    vecTarget,
-    indMeanX,
-    indMeanY,
-    pcrEff,
-    nnulls,
-    ninclu,
-    correl,
-    upWin,
-    lowWin,
-    vecNoAmplification,
-    vecBaselineError,
-):
-    """A function which calculates the mean of the max fluor in the last ten
-    cycles.
+def _niceQuantityType(txt):
+    if txt == "cop":
+        return "copies per microliter"
+    if txt == "fold":
+        return "fold change"
+    if txt == "dil":
+        return "dilution"
+    if txt == "nMol":
+        return "nanomol per microliter"
+    if txt == "ng":
+        return "nanogram per microliter"
+    if txt == "other":
+        return "other unit"
+    return txt
+
+
+def _sampleTypeToDics(rootEl):
+    """Translates all ele in samples to dic {sample Id}{target Id} with ele
+    value.
 
     Args:
-        fluor: The array with the fluorescence values
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        indMeanX: The vector with the x mean position
-        indMeanY: The vector with the y mean position
-        pcrEff: The array with the PCR efficiencies
-        nnulls: The array with the calculated nnulls
-        ninclu: The array with the calculated ninclu
-        correl: The array with the calculated correl
-        upWin: The upper limit of the window
-        lowWin: The lower limit of the window
-        vecNoAmplification: True if there is a amplification error
-        vecBaselineError: True if there is a baseline error
+        rootEl: The root node of the rdml file
 
     Returns:
-        An array with [indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl].
+        returns a dictionary {sample Id}{target Id} with ele value.
     """
+    tar = []
+    ret = {}
 
-    for row in range(0, fluor.shape[0]):
-        if tarGroup is None or tarGroup == vecTarget[row]:
-            if not (vecNoAmplification[row] or vecBaselineError[row]):
-                if tarGroup is None:
-                    (
-                        indMeanX[row],
-                        indMeanY[row],
-                        pcrEff[row],
-                        nnulls[row],
-                        ninclu[row],
-                        correl[row],
-                    ) = _lrp_paramInWindow(fluor, row, upWin[0], lowWin[0])
-                else:
-                    (
-                        indMeanX[row],
-                        indMeanY[row],
-                        pcrEff[row],
-                        nnulls[row],
-                        ninclu[row],
-                        correl[row],
-                    ) = _lrp_paramInWindow(
-                        fluor, row, upWin[tarGroup], lowWin[tarGroup]
-                    )
-            else:
-                correl[row] = np.nan
-                indMeanX[row] = np.nan
-                indMeanY[row] = np.nan
-                pcrEff[row] = np.nan
-                nnulls[row] = np.nan
-                ninclu[row] = 0
+    # Get all targets
+    targets = _get_all_children(rootEl, "target")
+    for node in targets:
+        if "id" in node.attrib:
+            tar.append(node.attrib["id"])
 
-    return indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl
+    samples = _get_all_children(rootEl, "sample")
+    for node in samples:
+        if "id" in node.attrib:
+            currSam = node.attrib["id"]
+            ret[currSam] = {}
+            for currTar in tar:
+                ret[currSam][currTar] = "unkn"
+            subEles = _get_all_children(node, "type")
+            for subNode in subEles:
+                if "targetId" not in subNode.attrib:
+                    for currTar in tar:
+                        ret[currSam][currTar] = subNode.text
+            for subNode in subEles:
+                if "targetId" in subNode.attrib:
+                    ret[currSam][subNode.attrib["targetId"]] = subNode.text
+    return ret
 
 
-def _lrp_meanStopFluor(
-    fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
-):
-    """Return the mean of the stop fluor or the max fluor if all rows have no
-    plateau.
+def _metadata_clear(node):
+    """Drops the cached metadata lookups of the document of node.
 
     Args:
-        fluor: The array with the fluorescence values
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        stopCyc: The vector with the stop cycle of the log lin phase
-        vecSkipSample: Skip the sample
-        vecNoPlateau: True if there is no plateau
+        node: Any element of the document. (lxml node)
 
     Returns:
-        The meanMax fluorescence.
+        Nothing.
     """
 
-    meanMax = 0.0
-    maxFluor = 0.0000001
-    cnt = 0
-    if tarGroup is None:
-        for aRow in range(0, fluor.shape[0]):
-            if not vecSkipSample[aRow]:
-                if not vecNoPlateau[aRow]:
-                    cnt += 1
-                    meanMax += fluor[aRow, stopCyc[aRow] - 1]
-                else:
-                    for i in range(0, fluor.shape[1]):
-                        if fluor[aRow, i] > maxFluor:
-                            maxFluor = fluor[aRow, i]
-    else:
-        for aRow in range(0, fluor.shape[0]):
-            if tarGroup == vecTarget[aRow] and not vecSkipSample[aRow]:
-                if not vecNoPlateau[aRow]:
-                    cnt += 1
-                    meanMax += fluor[aRow, stopCyc[aRow] - 1]
-                else:
-                    for i in range(0, fluor.shape[1]):
-                        if fluor[aRow, i] > maxFluor:
-                            maxFluor = fluor[aRow, i]
-
-    if cnt > 0:
-        meanMax = meanMax / cnt
-    else:
-        meanMax = maxFluor
-    return meanMax
+    root = node.getroottree().getroot()
+    doc = _idRegistries.get(id(root))
+    if doc is not None and doc[0] is root:
+        doc[2] = None
 
 
-def _lrp_maxStartFluor(fluor, tarGroup, vecTarget, startCyc, vecSkipSample):
-    """Return the maximum of the start fluorescence.
+def _metadata_clear_tag(node):
+    """Drops the cached metadata lookups if node is a dye, sample or target
+    element.
 
     Args:
-        fluor: The array with the fluorescence values
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        startCyc: The vector with the start cycle of the log lin phase
-        vecSkipSample: Skip the sample
+        node: The element which was added, removed or renamed. (lxml node)
 
     Returns:
-        The maxStart fluorescence.
+        Nothing.
     """
-    maxStart = -10.0
-    if tarGroup is None:
-        for aRow in range(0, fluor.shape[0]):
-            if not vecSkipSample[aRow]:
-                if fluor[aRow, startCyc[aRow] - 1] > maxStart:
-                    maxStart = fluor[aRow, startCyc[aRow] - 1]
-    else:
-        for aRow in range(0, fluor.shape[0]):
-            if tarGroup == vecTarget[aRow] and not vecSkipSample[aRow]:
-                if fluor[aRow, startCyc[aRow] - 1] > maxStart:
-                    maxStart = fluor[aRow, startCyc[aRow] - 1]
 
-    return 0.999 * maxStart
+    if node.tag.replace("{http://www.rdml.org}", "") in [
+        "dye",
+        "sample",
+        "target",
+    ]:
+        _metadata_clear(node)
 
 
-def _lrp_setLogWin(
-    tarGroup, newUpWin, foldWidth, upWin, lowWin, maxFluorTotal, minFluorTotal
-):
-    """Sets a new window and ensures its within the total fluorescence values.
+def _metadataToDics(rootEl):
+    """Builds the sample, target and dye lookup dictionaries of a document.
+
+    For documents loaded by a live Rdml object the lookups are cached with
+    the id registries and dropped by the dye, sample and target methods that
+    change them. The returned dictionaries are read-only views.
+
+    A target whose dye is missing or has no chemistry maps to the
+    non-saturating DNA binding dye chemistry.
 
     Args:
-        tarGroup: The target number
-        newUpWin: The new upper window
-        foldWidth: The foldWith to the lower window
-        upWin: The upper window fluorescence
-        lowWin: The lower window fluorescence
-        maxFluorTotal: The maximum fluorescence over all rows
-        minFluorTotal: The minimum fluorescence over all rows
+        rootEl: The root node of the rdml file
 
     Returns:
-        An array with [indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl].
+        A dictionary with the lookup dictionaries:
+        sampleType: {sample Id}{target Id} with the sample type
+        sampleNucleotide: {sample Id} with the template nucleotide
+        dyeChemistry: {dye Id} with the dye chemistry
+        targetChemistry: {target Id} with the dye chemistry
+        targetMeltTemp: {target Id} with the expected melting temperature
+        targetType: {target Id} with the target type
+        targetDye: {target Id} with the dye Id
     """
-    # No rounding needed, only present for exact identical output with Pascal version
-    tempUpWin = np.power(10, np.round(1000 * newUpWin) / 1000)
-    tempLowWin = np.power(10, np.round(1000 * (newUpWin - foldWidth)) / 1000)
 
-    tempUpWin = np.minimum(tempUpWin, maxFluorTotal)
-    tempUpWin = np.maximum(tempUpWin, minFluorTotal)
-    tempLowWin = np.minimum(tempLowWin, maxFluorTotal)
-    tempLowWin = np.maximum(tempLowWin, minFluorTotal)
+    doc = _idRegistries.get(id(rootEl))
+    if doc is None or doc[0] is not rootEl:
+        doc = None
+    elif doc[2] is not None:
+        return doc[2]
+
+    ret = {
+        "sampleType": _sampleTypeToDics(rootEl),
+        "sampleNucleotide": {},
+        "dyeChemistry": {},
+        "targetChemistry": {},
+        "targetMeltTemp": {},
+        "targetType": {},
+        "targetDye": {},
+    }
+
+    luDyes = _get_all_children(rootEl, "dye")
+    for lu_dye in luDyes:
+        lu_chemistry = _get_first_child_text(lu_dye, "dyeChemistry")
+        if lu_chemistry == "":
+            lu_chemistry = "non-saturating DNA binding dye"
+        if lu_dye.attrib["id"] != "":
+            ret["dyeChemistry"][lu_dye.attrib["id"]] = lu_chemistry
+
+    luTargets = _get_all_children(rootEl, "target")
+    for lu_target in luTargets:
+        tarId = lu_target.attrib["id"]
+        if tarId == "":
+            continue
+        forType = _get_first_child_text(lu_target, "type")
+        if forType != "":
+            ret["targetType"][tarId] = forType
+        lu_dyeId = ""
+        forId = _get_first_child(lu_target, "dyeId")
+        if forId is not None:
+            if forId.attrib["id"] != "":
+                lu_dyeId = forId.attrib["id"]
+                ret["targetDye"][tarId] = lu_dyeId
+        if lu_dyeId in ret["dyeChemistry"]:
+            ret["targetChemistry"][tarId] = ret["dyeChemistry"][lu_dyeId]
+        else:
+            ret["targetChemistry"][tarId] = "non-saturating DNA binding dye"
+        ret["targetMeltTemp"][tarId] = _get_first_child_text(
+            lu_target, "meltingTemperature"
+        )
 
-    if tarGroup is None:
-        upWin[0] = tempUpWin
-        lowWin[0] = tempLowWin
-    else:
-        upWin[tarGroup] = tempUpWin
-        lowWin[tarGroup] = tempLowWin
+    luSamples = _get_all_children(rootEl, "sample")
+    for lu_sample in luSamples:
+        lu_Nucl = ""
+        forUnit = _get_first_child(lu_sample, "templateQuantity")
+        if forUnit is not None:
+            lu_Nucl = _get_first_child_text(forUnit, "nucleotide")
+        if lu_Nucl == "":
+            lu_Nucl = "cDNA"
+        if lu_sample.attrib["id"] != "":
+            ret["sampleNucleotide"][lu_sample.attrib["id"]] = lu_Nucl
+
+    for samId in ret["sampleType"]:
+        ret["sampleType"][samId] = types.MappingProxyType(
+            ret["sampleType"][samId]
+        )
+    for key in ret:
+        ret[key] = types.MappingProxyType(ret[key])
+    ret = types.MappingProxyType(ret)
+    if doc is not None:
+        doc[2] = ret
+    return ret
 
-    return upWin, lowWin
 
+def _lrp_workArray(shape, fill, workDtype="float64", workDir=None):
+    """A function which allocates a working array for linRegPCR.
 
-def _lrp_logStepStop(
-    fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
-):
-    """Calculates the log of the fluorescence increase at the stop cycle.
+    With a workDir the array is backed by an anonymous temporary file in
+    that directory, which is removed as soon as the array is released.
 
     Args:
-        fluor: The array with the fluorescence values
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        stopCyc: The vector with the stop cycle of the log lin phase
-        vecSkipSample: True if row should be skipped
-        vecNoPlateau: True if there is no plateau
+        shape: The shape of the array.
+        fill: The initial value of all elements.
+        workDtype: "float64" or "float32".
+        workDir: A directory for memory mapped storage or None for RAM.
 
     Returns:
-        An array with [indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl].
+        The numpy array.
     """
-    cnt = 0
-    step = 0.0
-    for aRow in range(0, fluor.shape[0]):
-        if (tarGroup is None or tarGroup == vecTarget[aRow]) and not (
-            vecSkipSample[aRow] or vecNoPlateau[aRow]
-        ):
-            cnt += 1
-            step += np.log10(fluor[aRow, stopCyc[aRow] - 1]) - np.log10(
-                fluor[aRow, stopCyc[aRow] - 2]
-            )
-    if cnt > 0:
-        step = step / cnt
-    else:
-        step = np.log10(1.8)
-    return step
 
+    if workDtype not in ["float64", "float32"]:
+        raise RdmlError('Unknown working dtype "' + str(workDtype) + '".')
+    if workDir is None or shape[0] * shape[1] == 0:
+        return np.full(shape, fill, dtype=workDtype)
+    tmpFile = tempfile.TemporaryFile(dir=workDir)
+    try:
+        ret = np.memmap(tmpFile, dtype=workDtype, mode="w+", shape=shape)
+    finally:
+        tmpFile.close()
+    ret[:] = fill
+    return ret
 
-def _lrp_setWoL(
-    fluor,
-    tarGroup,
-    vecTarget,
-    pointsInWoL,
-    indMeanX,
-    indMeanY,
-    pcrEff,
-    nNulls,
-    nInclu,
-    correl,
-    upWin,
-    lowWin,
-    maxFluorTotal,
-    minFluorTotal,
-    stopCyc,
-    startCyc,
-    threshold,
-    vecNoAmplification,
-    vecBaselineError,
-    vecSkipSample,
-    vecNoPlateau,
-    vecShortLogLin,
-    vecIsUsedInWoL,
-):
-    """Find the window with the lowest variation in PCR efficiency and
-    calculate its values.
+
+def _lrp_linReg(xIn, yUse):
+    """A function which calculates the slope or the intercept by linear
+    regression.
+
+    The sums are accumulated in yUse itself, which is overwritten, so no
+    temporary array of its size is allocated.
+
+    Args:
+        xIn: The numpy array of the cycles, a single row is broadcast
+        yUse: The numpy array that contains the fluorescence, overwritten
+
+    Returns:
+        An array with the slope and intercept.
+    """
+
+    nanFluor = np.isnan(yUse)
+    countNan = np.count_nonzero(nanFluor, axis=1)
+    n = (yUse.shape[1] - countNan).astype(np.float64)
+
+    sumCyc = np.zeros(yUse.shape[0], dtype=xIn.dtype)
+    sumCycSquared = np.zeros(yUse.shape[0], dtype=xIn.dtype)
+    for col in range(0, yUse.shape[1]):
+        validCol = ~nanFluor[:, col]
+        sumCyc[validCol] += xIn[col]
+        sumCycSquared[validCol] += xIn[col] * xIn[col]
+
+    yUse[nanFluor] = 0.0
+    del nanFluor
+    sumFluor = np.sum(yUse, axis=1)
+    np.multiply(yUse, xIn.astype(yUse.dtype), out=yUse)
+    sumCycFluor = np.sum(yUse, axis=1)
+
+    ssx = sumCycSquared - (sumCyc * sumCyc) / n
+    sxy = sumCycFluor - (sumCyc * sumFluor) / n
+
+    slope = sxy / ssx
+    intercept = (sumFluor / n) - slope * (sumCyc / n)
+    return [slope, intercept]
+
+
+def _lrp_findStopCyc(fluor, aRow):
+    """Find the stop cycle of the log lin phase in fluor.
 
     Args:
         fluor: The array with the fluorescence values
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        pointsInWoL: The number of points in the window
-        indMeanX: The vector with the x mean position
-        indMeanY: The vector with the y mean position
-        pcrEff: The array with the PCR efficiencies
-        nNulls: The array with the calculated nNulls
-        nInclu: The array with the calculated nInclu
-        correl: The array with the calculated correl
-        upWin: The upper limit of the window
-        lowWin: The lower limit of the window
-        maxFluorTotal: The maximum fluorescence over all rows
-        minFluorTotal: The minimum fluorescence over all rows
-        stopCyc: The vector with the stop cycle of the log lin phase
-        startCyc: The vector with the start cycle of the log lin phase
-        threshold: The threshold fluorescence
-        vecNoAmplification: True if there is a amplification error
-        vecBaselineError: True if there is a baseline error
-        vecSkipSample: Skip the sample
-        vecNoPlateau: True if there is no plateau
-        vecShortLogLin: True indicates a short log lin phase
-        vecIsUsedInWoL: True if used in the WoL
+        aRow: The row to work on
 
     Returns:
-        The values indMeanX, indMeanY, pcrEff, nNulls, nInclu, correl, upWin, lowWin, threshold, vecIsUsedInWoL.
+        An int with the stop cycle.
     """
-    skipGroup = False
-    stepSize = 0.2  # was 0.5, smaller steps help in finding WoL
-    # Keep 60 calculated results
-    memVarEff = np.zeros(60, dtype=np.float64)
-    memUpWin = np.zeros(60, dtype=np.float64)
-    memFoldWidth = np.zeros(60, dtype=np.float64)
 
-    maxFluorWin = _lrp_meanStopFluor(
-        fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
-    )
-    if maxFluorWin > 0.0:
-        maxFluorWin = np.log10(maxFluorWin)
+    # Take care of nan values
+    validTwoLessCyc = 3  # Cycles so +1 to array
+    while validTwoLessCyc <= fluor.shape[1] and (
+        np.isnan(fluor[aRow, validTwoLessCyc - 1])
+        or np.isnan(fluor[aRow, validTwoLessCyc - 2])
+        or np.isnan(fluor[aRow, validTwoLessCyc - 3])
+    ):
+        validTwoLessCyc += 1
+
+    # First and Second Derivative values calculation
+    fluorShift = np.roll(
+        fluor[aRow], 1, axis=0
+    )  # Shift to right - real position is -0.5
+    fluorShift[0] = np.nan
+    firstDerivative = fluor[aRow] - fluorShift
+    if np.isfinite(firstDerivative).any():
+        FDMaxCyc = (
+            np.nanargmax(firstDerivative, axis=0) + 1
+        )  # Cycles so +1 to array
     else:
-        skipGroup = True
-    minFluorLim = _lrp_maxStartFluor(
-        fluor, tarGroup, vecTarget, startCyc, vecSkipSample
-    )
-    if minFluorLim > 0.0:
-        minFluorLim = np.log10(minFluorLim)
+        return fluor.shape[1]
+
+    firstDerivativeShift = np.roll(
+        firstDerivative, -1, axis=0
+    )  # Shift to left
+    firstDerivativeShift[-1] = np.nan
+    secondDerivative = firstDerivativeShift - firstDerivative
+
+    if FDMaxCyc + 2 <= fluor.shape[1]:
+        # Only add two cycles if there is an increase without nan
+        if (
+            not np.isnan(fluor[aRow, FDMaxCyc - 1])
+            and not np.isnan(fluor[aRow, FDMaxCyc])
+            and not np.isnan(fluor[aRow, FDMaxCyc + 1])
+            and fluor[aRow, FDMaxCyc + 1]
+            > fluor[aRow, FDMaxCyc]
+            > fluor[aRow, FDMaxCyc - 1]
+        ):
+            FDMaxCyc += 2
     else:
-        skipGroup = True
+        FDMaxCyc = fluor.shape[1]
 
-    checkMeanEff = 1.0
-    if not skipGroup:
-        foldWidth = pointsInWoL * _lrp_logStepStop(
-            fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
-        )
-        upWin, lowWin = _lrp_setLogWin(
-            tarGroup,
-            maxFluorWin,
-            foldWidth,
-            upWin,
-            lowWin,
-            maxFluorTotal,
-            minFluorTotal,
-        )
+    maxMeanSD = 0.0
+    stopCyc = fluor.shape[1]
 
-        (
-            _unused,
-            _unused2,
-            checkPcrEff,
-            _unused3,
-            _unused4,
-            _unused5,
-        ) = _lrp_allParamInWindow(
-            fluor,
-            tarGroup,
-            vecTarget,
-            indMeanX,
-            indMeanY,
-            pcrEff,
-            nNulls,
-            nInclu,
-            correl,
-            upWin,
-            lowWin,
-            vecNoAmplification,
-            vecBaselineError,
+    for cycInRange in range(validTwoLessCyc, FDMaxCyc):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            tempMeanSD = np.mean(
+                secondDerivative[cycInRange - 2 : cycInRange + 1], axis=0
+            )
+        # The > 0.000000000001 is to avoid float differences to the pascal version
+        if (
+            not np.isnan(tempMeanSD)
+            and (tempMeanSD - maxMeanSD) > 0.000000000001
+        ):
+            maxMeanSD = tempMeanSD
+            stopCyc = cycInRange
+    if stopCyc + 2 >= fluor.shape[1]:
+        stopCyc = fluor.shape[1]
+
+    return stopCyc
+
+
+def _lrp_findStartCyc(fluor, aRow, stopCyc):
+    """A function which finds the start cycle of the log lin phase in fluor.
+
+    Args:
+        fluor: The array with the fluorescence values
+        aRow: The row to work on
+        stopCyc: The stop cycle
+
+    Returns:
+        An array [int, int] with the start cycle and the fixed start cycle.
+    """
+
+    startCyc = stopCyc - 1
+
+    # startCyc might be NaN, so shift it to the first value
+    firstNotNaN = 1  # Cycles so +1 to array
+    while np.isnan(fluor[aRow, firstNotNaN - 1]) and firstNotNaN < startCyc:
+        firstNotNaN += 1
+    while startCyc > firstNotNaN and np.isnan(fluor[aRow, startCyc - 1]):
+        startCyc -= 1
+
+    # As long as there are no NaN and new values are increasing
+    while (
+        startCyc > firstNotNaN
+        and stopCyc - startCyc < 11
+        and not np.isnan(fluor[aRow, startCyc - 2])
+        and fluor[aRow, startCyc - 2] <= fluor[aRow, startCyc - 1]
+    ):
+        startCyc -= 1
+
+    startCycFix = startCyc
+    if (
+        not np.isnan(fluor[aRow, startCyc])
+        and not np.isnan(fluor[aRow, startCyc - 1])
+        and not np.isnan(fluor[aRow, stopCyc - 1])
+        and not np.isnan(fluor[aRow, stopCyc - 2])
+    ):
+        startStep = np.log10(fluor[aRow, startCyc]) - np.log10(
+            fluor[aRow, startCyc - 1]
         )
-        [checkMeanEff, _unused] = _lrp_meanPcrEff(
-            tarGroup,
-            vecTarget,
-            checkPcrEff,
-            vecSkipSample,
-            vecNoPlateau,
-            vecShortLogLin,
+        stopStep = np.log10(fluor[aRow, stopCyc - 1]) - np.log10(
+            fluor[aRow, stopCyc - 2]
         )
-        if checkMeanEff < 1.001:
-            skipGroup = True
+        if startStep > 1.1 * stopStep:
+            startCycFix += 1
 
-    if skipGroup:
-        if tarGroup is None:
-            threshold[0] = 0.5 * np.round(1000 * upWin[0]) / 1000
+    return [startCyc, startCycFix]
+
+
+def _lrp_testSlopes(fluor, aRow, stopCyc, startCycFix):
+    """Splits the values and calculates a slope for the upper and the lower
+    half.
+
+    Args:
+        fluor: The array with the fluorescence values
+        aRow: The row to work on
+        stopCyc: The stop cycle
+        startCycFix: The start cycle
+
+    Returns:
+        An array with [slopelow, slopehigh].
+    """
+
+    # Both start with full range
+    loopStart = [startCycFix[aRow], stopCyc[aRow]]
+    loopStop = [startCycFix[aRow], stopCyc[aRow]]
+
+    # Now find the center ignoring nan
+    while True:
+        loopStart[1] -= 1
+        loopStop[0] += 1
+        while (loopStart[1] - loopStop[0]) > 1 and np.isnan(
+            fluor[aRow, loopStart[1] - 1]
+        ):
+            loopStart[1] -= 1
+        while (loopStart[1] - loopStop[0]) > 1 and np.isnan(
+            fluor[aRow, loopStop[1] - 1]
+        ):
+            loopStop[0] += 1
+        if (loopStart[1] - loopStop[0]) <= 1:
+            break
+
+    # basic regression per group
+    ssx = [0, 0]
+    sxy = [0, 0]
+    slope = [0, 0]
+    for j in range(0, 2):
+        sumx = 0.0
+        sumy = 0.0
+        sumx2 = 0.0
+        sumxy = 0.0
+        nincl = 0.0
+        for i in range(loopStart[j], loopStop[j] + 1):
+            if not np.isnan(fluor[aRow, i - 1]):
+                sumx += i
+                sumy += np.log10(fluor[aRow, i - 1])
+                sumx2 += i * i
+                sumxy += i * np.log10(fluor[aRow, i - 1])
+                nincl += 1
+        if nincl != 0.0:
+            ssx[j] = sumx2 - sumx * sumx / nincl
+            sxy[j] = sumxy - sumx * sumy / nincl
+            slope[j] = sxy[j] / ssx[j]
         else:
-            threshold[tarGroup] = 0.5 * np.round(1000 * upWin[tarGroup]) / 1000
+            slope[j] = -999.9
 
-    if not skipGroup:
-        foldWidth = np.log10(np.power(checkMeanEff, pointsInWoL))
-        counter = -1
-        maxVarEff = 0.0
-        maxVarEffStep = -1
-        lastUpWin = 2 + maxFluorWin
-        while True:
-            counter += 1
-            step = np.log10(checkMeanEff)
-            newUpWin = maxFluorWin - counter * stepSize * step
-            if newUpWin < lastUpWin:
-                upWin, lowWin = _lrp_setLogWin(
-                    tarGroup,
-                    newUpWin,
-                    foldWidth,
-                    upWin,
-                    lowWin,
-                    maxFluorTotal,
-                    minFluorTotal,
-                )
-                (
-                    _unused,
-                    _unused2,
-                    checkPcrEff,
-                    _unused3,
-                    _unused4,
-                    _unused5,
-                ) = _lrp_allParamInWindow(
-                    fluor,
-                    tarGroup,
-                    vecTarget,
-                    indMeanX,
-                    indMeanY,
-                    pcrEff,
-                    nNulls,
-                    nInclu,
-                    correl,
-                    upWin,
-                    lowWin,
-                    vecNoAmplification,
-                    vecBaselineError,
-                )
-                [checkMeanEff, _unused] = _lrp_meanPcrEff(
-                    tarGroup,
-                    vecTarget,
-                    checkPcrEff,
-                    vecSkipSample,
-                    vecNoPlateau,
-                    vecShortLogLin,
-                )
-                foldWidth = np.log10(np.power(checkMeanEff, pointsInWoL))
-                if foldWidth < 0.5:
-                    foldWidth = 0.5  # to avoid width = 0 above stopCyc
-                upWin, lowWin = _lrp_setLogWin(
-                    tarGroup,
-                    newUpWin,
-                    foldWidth,
-                    upWin,
-                    lowWin,
-                    maxFluorTotal,
-                    minFluorTotal,
-                )
-                (
-                    _unused,
-                    _unused2,
-                    checkPcrEff,
-                    _unused3,
-                    _unused4,
-                    _unused5,
-                ) = _lrp_allParamInWindow(
-                    fluor,
-                    tarGroup,
-                    vecTarget,
-                    indMeanX,
-                    indMeanY,
-                    pcrEff,
-                    nNulls,
-                    nInclu,
-                    correl,
-                    upWin,
-                    lowWin,
-                    vecNoAmplification,
-                    vecBaselineError,
-                )
-                [checkMeanEff, checkVarEff] = _lrp_meanPcrEff(
-                    tarGroup,
-                    vecTarget,
-                    checkPcrEff,
-                    vecSkipSample,
-                    vecNoPlateau,
-                    vecShortLogLin,
-                )
-                if checkVarEff > 0.0:
-                    memVarEff[counter] = np.sqrt(checkVarEff) / checkMeanEff
-                else:
-                    memVarEff[counter] = 0.0
-                if checkVarEff > maxVarEff:
-                    maxVarEff = checkVarEff
-                    maxVarEffStep = counter
-                memUpWin[counter] = newUpWin
-                memFoldWidth[counter] = foldWidth
-                lastUpWin = newUpWin
+    return [slope[0], slope[1]]
+
+
+def _lrp_lastCycMeanMax(fluor, vecSkipSample, vecNoPlateau):
+    """A function which calculates the mean of the max fluor in the last ten
+    cycles.
+
+    Args:
+        fluor: The array with the fluorescence values
+        vecSkipSample: Skip the sample
+        vecNoPlateau: Sample has no plateau
+
+    Returns:
+        An float with the max mean.
+    """
+
+    # Ignore all nan slices, to fix them below
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        maxFlour = np.nanmax(fluor[:, -11:], axis=1)
+        maxFlour[vecSkipSample] = np.nan
+        maxFlour[vecNoPlateau] = np.nan
+        maxMean = np.nanmean(maxFlour)
+    if np.isnan(maxMean):
+        maxMean = np.nanmax(maxFlour)
+
+    return maxMean
+
+
+def _lrp_meanPcrEff(
+    tarGroup, vecTarget, pcrEff, vecSkipSample, vecNoPlateau, vecShortLogLin
+):
+    """A function which calculates the mean efficiency of the selected target
+    group excluding bad ones.
+
+    Args:
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        pcrEff: The array with the PCR efficiencies
+        vecSkipSample: Skip the sample
+        vecNoPlateau: True if there is no plateau
+        vecShortLogLin: True indicates a short log lin phase
+
+    Returns:
+        An array with [meanPcrEff, pcrEffVar].
+    """
+
+    cnt = 0
+    sumEff = 0.0
+    sumEff2 = 0.0
+    for j in range(0, len(pcrEff)):
+        if tarGroup is None or tarGroup == vecTarget[j]:
+            if (
+                not (vecSkipSample[j] or vecNoPlateau[j] or vecShortLogLin[j])
+            ) and pcrEff[j] > 1.0:
+                cnt += 1
+                sumEff += pcrEff[j]
+                sumEff2 += pcrEff[j] * pcrEff[j]
+
+    if cnt > 1:
+        meanPcrEff = sumEff / cnt
+        pcrEffVar = (sumEff2 - (sumEff * sumEff) / cnt) / (cnt - 1)
+    else:
+        meanPcrEff = 1.0
+        pcrEffVar = 100
+
+    return [meanPcrEff, pcrEffVar]
+
+
+def _lrp_startStopInWindow(fluor, aRow, upWin, lowWin):
+    """Find the start and the stop of the part of the curve which is inside the
+    window.
+
+    Args:
+        fluor: The array with the fluorescence values
+        aRow: The row to work on
+        upWin: The upper limit of the window
+        lowWin: The lower limit of the window
+
+    Returns:
+        The int startWinCyc, stopWinCyc and the bool notInWindow.
+    """
+
+    startWinCyc = 0
+    stopWinCyc = 0
+    # Find the stopCyc and the startCyc cycle of the log lin phase
+    stopCyc = _lrp_findStopCyc(fluor, aRow)
+    [startCyc, startCycFix] = _lrp_findStartCyc(fluor, aRow, stopCyc)
+
+    if np.isfinite(fluor[aRow, startCycFix - 1 :]).any():
+        stopMaxCyc = np.nanargmax(fluor[aRow, startCycFix - 1 :]) + startCycFix
+    else:
+        return startCyc, startCyc, True
+
+    # If is true if outside the window
+    if (
+        fluor[aRow, startCyc - 1] > upWin
+        or fluor[aRow, stopMaxCyc - 1] < lowWin
+    ):
+        notInWindow = True
+        if fluor[aRow, startCyc - 1] > upWin:
+            startWinCyc = startCyc
+            stopWinCyc = startCyc
+        if fluor[aRow, stopMaxCyc - 1] < lowWin:
+            startWinCyc = stopMaxCyc
+            stopWinCyc = stopMaxCyc
+    else:
+        notInWindow = False
+        # look for stopWinCyc
+        if fluor[aRow, stopMaxCyc - 1] < upWin:
+            stopWinCyc = stopMaxCyc
+        else:
+            for i in range(stopMaxCyc, startCyc, -1):
+                if fluor[aRow, i - 1] > upWin > fluor[aRow, i - 2]:
+                    stopWinCyc = i - 1
+        # look for startWinCyc
+        if fluor[aRow, startCycFix - 1] > lowWin:
+            startWinCyc = startCycFix
+        else:
+            for i in range(stopMaxCyc, startCyc, -1):
+                if fluor[aRow, i - 1] > lowWin > fluor[aRow, i - 2]:
+                    startWinCyc = i
+    return startWinCyc, stopWinCyc, notInWindow
+
+
+def _lrp_paramInWindow(fluor, aRow, upWin, lowWin):
+    """Calculates slope, nNull, PCR efficiency and mean x/y for the curve part
+    in the window.
+
+    Args:
+        fluor: The array with the fluorescence values
+        aRow: The row to work on
+        upWin: The upper limit of the window
+        lowWin: The lower limit of the window
+
+    Returns:
+        The calculated values: indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl.
+    """
+
+    startWinCyc, stopWinCyc, notInWindow = _lrp_startStopInWindow(
+        fluor, aRow, upWin, lowWin
+    )
+
+    sumx = 0.0
+    sumy = 0.0
+    sumx2 = 0.0
+    sumy2 = 0.0
+    sumxy = 0.0
+    nincl = 0.0
+    ssx = 0.0
+    ssy = 0.0
+    sxy = 0.0
+    for i in range(startWinCyc, stopWinCyc + 1):
+        fluorSamp = fluor[aRow, i - 1]
+        if not np.isnan(fluorSamp):
+            logFluorSamp = np.log10(fluorSamp)
+            sumx += i
+            sumy += logFluorSamp
+            sumx2 += i * i
+            sumy2 += logFluorSamp * logFluorSamp
+            sumxy += i * logFluorSamp
+            nincl += 1
+
+    if nincl > 1:
+        ssx = sumx2 - sumx * sumx / nincl
+        ssy = sumy2 - sumy * sumy / nincl
+        sxy = sumxy - sumx * sumy / nincl
+
+    if ssx > 0.0 and ssy > 0.0 and nincl > 0.0:
+        cslope = sxy / ssx
+        cinterc = sumy / nincl - cslope * sumx / nincl
+        correl = sxy / np.sqrt(ssx * ssy)
+        indMeanX = sumx / nincl
+        indMeanY = sumy / nincl
+        pcrEff = np.power(10, cslope)
+        nnulls = np.power(10, cinterc)
+    else:
+        correl = np.nan
+        indMeanX = np.nan
+        indMeanY = np.nan
+        pcrEff = np.nan
+        nnulls = np.nan
+
+    if notInWindow:
+        ninclu = 0
+    else:
+        ninclu = stopWinCyc - startWinCyc + 1
+
+    return indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl
+
+
+def _lrp_allParamInWindow(
+    fluor,
+    tarGroup,
+    vecTarget,
+    indMeanX,
+    indMeanY,
+    pcrEff,
+    nnulls,
+    ninclu,
+    correl,
+    upWin,
+    lowWin,
+    vecNoAmplification,
+    vecBaselineError,
+):
+    """A function which calculates the mean of the max fluor in the last ten
+    cycles.
+
+    Args:
+        fluor: The array with the fluorescence values
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        indMeanX: The vector with the x mean position
+        indMeanY: The vector with the y mean position
+        pcrEff: The array with the PCR efficiencies
+        nnulls: The array with the calculated nnulls
+        ninclu: The array with the calculated ninclu
+        correl: The array with the calculated correl
+        upWin: The upper limit of the window
+        lowWin: The lower limit of the window
+        vecNoAmplification: True if there is a amplification error
+        vecBaselineError: True if there is a baseline error
+
+    Returns:
+        An array with [indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl].
+    """
+
+    for row in range(0, fluor.shape[0]):
+        if tarGroup is None or tarGroup == vecTarget[row]:
+            if not (vecNoAmplification[row] or vecBaselineError[row]):
+                if tarGroup is None:
+                    (
+                        indMeanX[row],
+                        indMeanY[row],
+                        pcrEff[row],
+                        nnulls[row],
+                        ninclu[row],
+                        correl[row],
+                    ) = _lrp_paramInWindow(fluor, row, upWin[0], lowWin[0])
+                else:
+                    (
+                        indMeanX[row],
+                        indMeanY[row],
+                        pcrEff[row],
+                        nnulls[row],
+                        ninclu[row],
+                        correl[row],
+                    ) = _lrp_paramInWindow(
+                        fluor, row, upWin[tarGroup], lowWin[tarGroup]
+                    )
+            else:
+                correl[row] = np.nan
+                indMeanX[row] = np.nan
+                indMeanY[row] = np.nan
+                pcrEff[row] = np.nan
+                nnulls[row] = np.nan
+                ninclu[row] = 0
+
+    return indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl
+
+
+def _lrp_meanStopFluor(
+    fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
+):
+    """Return the mean of the stop fluor or the max fluor if all rows have no
+    plateau.
+
+    Args:
+        fluor: The array with the fluorescence values
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        stopCyc: The vector with the stop cycle of the log lin phase
+        vecSkipSample: Skip the sample
+        vecNoPlateau: True if there is no plateau
+
+    Returns:
+        The meanMax fluorescence.
+    """
+
+    meanMax = 0.0
+    maxFluor = 0.0000001
+    cnt = 0
+    if tarGroup is None:
+        for aRow in range(0, fluor.shape[0]):
+            if not vecSkipSample[aRow]:
+                if not vecNoPlateau[aRow]:
+                    cnt += 1
+                    meanMax += fluor[aRow, stopCyc[aRow] - 1]
+                else:
+                    for i in range(0, fluor.shape[1]):
+                        if fluor[aRow, i] > maxFluor:
+                            maxFluor = fluor[aRow, i]
+    else:
+        for aRow in range(0, fluor.shape[0]):
+            if tarGroup == vecTarget[aRow] and not vecSkipSample[aRow]:
+                if not vecNoPlateau[aRow]:
+                    cnt += 1
+                    meanMax += fluor[aRow, stopCyc[aRow] - 1]
+                else:
+                    for i in range(0, fluor.shape[1]):
+                        if fluor[aRow, i] > maxFluor:
+                            maxFluor = fluor[aRow, i]
+
+    if cnt > 0:
+        meanMax = meanMax / cnt
+    else:
+        meanMax = maxFluor
+    return meanMax
+
+
+def _lrp_maxStartFluor(fluor, tarGroup, vecTarget, startCyc, vecSkipSample):
+    """Return the maximum of the start fluorescence.
+
+    Args:
+        fluor: The array with the fluorescence values
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        startCyc: The vector with the start cycle of the log lin phase
+        vecSkipSample: Skip the sample
+
+    Returns:
+        The maxStart fluorescence.
+    """
+    maxStart = -10.0
+    if tarGroup is None:
+        for aRow in range(0, fluor.shape[0]):
+            if not vecSkipSample[aRow]:
+                if fluor[aRow, startCyc[aRow] - 1] > maxStart:
+                    maxStart = fluor[aRow, startCyc[aRow] - 1]
+    else:
+        for aRow in range(0, fluor.shape[0]):
+            if tarGroup == vecTarget[aRow] and not vecSkipSample[aRow]:
+                if fluor[aRow, startCyc[aRow] - 1] > maxStart:
+                    maxStart = fluor[aRow, startCyc[aRow] - 1]
+
+    return 0.999 * maxStart
+
+
+def _lrp_setLogWin(
+    tarGroup, newUpWin, foldWidth, upWin, lowWin, maxFluorTotal, minFluorTotal
+):
+    """Sets a new window and ensures its within the total fluorescence values.
+
+    Args:
+        tarGroup: The target number
+        newUpWin: The new upper window
+        foldWidth: The foldWith to the lower window
+        upWin: The upper window fluorescence
+        lowWin: The lower window fluorescence
+        maxFluorTotal: The maximum fluorescence over all rows
+        minFluorTotal: The minimum fluorescence over all rows
+
+    Returns:
+        An array with [indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl].
+    """
+    # No rounding needed, only present for exact identical output with Pascal version
+    tempUpWin = np.power(10, np.round(1000 * newUpWin) / 1000)
+    tempLowWin = np.power(10, np.round(1000 * (newUpWin - foldWidth)) / 1000)
+
+    tempUpWin = np.minimum(tempUpWin, maxFluorTotal)
+    tempUpWin = np.maximum(tempUpWin, minFluorTotal)
+    tempLowWin = np.minimum(tempLowWin, maxFluorTotal)
+    tempLowWin = np.maximum(tempLowWin, minFluorTotal)
+
+    if tarGroup is None:
+        upWin[0] = tempUpWin
+        lowWin[0] = tempLowWin
+    else:
+        upWin[tarGroup] = tempUpWin
+        lowWin[tarGroup] = tempLowWin
+
+    return upWin, lowWin
+
+
+def _lrp_logStepStop(
+    fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
+):
+    """Calculates the log of the fluorescence increase at the stop cycle.
+
+    Args:
+        fluor: The array with the fluorescence values
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        stopCyc: The vector with the stop cycle of the log lin phase
+        vecSkipSample: True if row should be skipped
+        vecNoPlateau: True if there is no plateau
+
+    Returns:
+        An array with [indMeanX, indMeanY, pcrEff, nnulls, ninclu, correl].
+    """
+    cnt = 0
+    step = 0.0
+    for aRow in range(0, fluor.shape[0]):
+        if (tarGroup is None or tarGroup == vecTarget[aRow]) and not (
+            vecSkipSample[aRow] or vecNoPlateau[aRow]
+        ):
+            cnt += 1
+            step += np.log10(fluor[aRow, stopCyc[aRow] - 1]) - np.log10(
+                fluor[aRow, stopCyc[aRow] - 2]
+            )
+    if cnt > 0:
+        step = step / cnt
+    else:
+        step = np.log10(1.8)
+    return step
+
+
+def _lrp_setWoL(
+    fluor,
+    tarGroup,
+    vecTarget,
+    pointsInWoL,
+    indMeanX,
+    indMeanY,
+    pcrEff,
+    nNulls,
+    nInclu,
+    correl,
+    upWin,
+    lowWin,
+    maxFluorTotal,
+    minFluorTotal,
+    stopCyc,
+    startCyc,
+    threshold,
+    vecNoAmplification,
+    vecBaselineError,
+    vecSkipSample,
+    vecNoPlateau,
+    vecShortLogLin,
+    vecIsUsedInWoL,
+):
+    """Find the window with the lowest variation in PCR efficiency and
+    calculate its values.
+
+    Args:
+        fluor: The array with the fluorescence values
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        pointsInWoL: The number of points in the window
+        indMeanX: The vector with the x mean position
+        indMeanY: The vector with the y mean position
+        pcrEff: The array with the PCR efficiencies
+        nNulls: The array with the calculated nNulls
+        nInclu: The array with the calculated nInclu
+        correl: The array with the calculated correl
+        upWin: The upper limit of the window
+        lowWin: The lower limit of the window
+        maxFluorTotal: The maximum fluorescence over all rows
+        minFluorTotal: The minimum fluorescence over all rows
+        stopCyc: The vector with the stop cycle of the log lin phase
+        startCyc: The vector with the start cycle of the log lin phase
+        threshold: The threshold fluorescence
+        vecNoAmplification: True if there is a amplification error
+        vecBaselineError: True if there is a baseline error
+        vecSkipSample: Skip the sample
+        vecNoPlateau: True if there is no plateau
+        vecShortLogLin: True indicates a short log lin phase
+        vecIsUsedInWoL: True if used in the WoL
+
+    Returns:
+        The values indMeanX, indMeanY, pcrEff, nNulls, nInclu, correl, upWin, lowWin, threshold, vecIsUsedInWoL.
+    """
+    skipGroup = False
+    stepSize = 0.2  # was 0.5, smaller steps help in finding WoL
+    # Keep 60 calculated results
+    memVarEff = np.zeros(60, dtype=np.float64)
+    memUpWin = np.zeros(60, dtype=np.float64)
+    memFoldWidth = np.zeros(60, dtype=np.float64)
+
+    maxFluorWin = _lrp_meanStopFluor(
+        fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
+    )
+    if maxFluorWin > 0.0:
+        maxFluorWin = np.log10(maxFluorWin)
+    else:
+        skipGroup = True
+    minFluorLim = _lrp_maxStartFluor(
+        fluor, tarGroup, vecTarget, startCyc, vecSkipSample
+    )
+    if minFluorLim > 0.0:
+        minFluorLim = np.log10(minFluorLim)
+    else:
+        skipGroup = True
+
+    checkMeanEff = 1.0
+    if not skipGroup:
+        foldWidth = pointsInWoL * _lrp_logStepStop(
+            fluor, tarGroup, vecTarget, stopCyc, vecSkipSample, vecNoPlateau
+        )
+        upWin, lowWin = _lrp_setLogWin(
+            tarGroup,
+            maxFluorWin,
+            foldWidth,
+            upWin,
+            lowWin,
+            maxFluorTotal,
+            minFluorTotal,
+        )
+
+        (
+            _unused,
+            _unused2,
+            checkPcrEff,
+            _unused3,
+            _unused4,
+            _unused5,
+        ) = _lrp_allParamInWindow(
+            fluor,
+            tarGroup,
+            vecTarget,
+            indMeanX,
+            indMeanY,
+            pcrEff,
+            nNulls,
+            nInclu,
+            correl,
+            upWin,
+            lowWin,
+            vecNoAmplification,
+            vecBaselineError,
+        )
+        [checkMeanEff, _unused] = _lrp_meanPcrEff(
+            tarGroup,
+            vecTarget,
+            checkPcrEff,
+            vecSkipSample,
+            vecNoPlateau,
+            vecShortLogLin,
+        )
+        if checkMeanEff < 1.001:
+            skipGroup = True
+
+    if skipGroup:
+        if tarGroup is None:
+            threshold[0] = 0.5 * np.round(1000 * upWin[0]) / 1000
+        else:
+            threshold[tarGroup] = 0.5 * np.round(1000 * upWin[tarGroup]) / 1000
+
+    if not skipGroup:
+        foldWidth = np.log10(np.power(checkMeanEff, pointsInWoL))
+        counter = -1
+        maxVarEff = 0.0
+        maxVarEffStep = -1
+        lastUpWin = 2 + maxFluorWin
+        while True:
+            counter += 1
+            step = np.log10(checkMeanEff)
+            newUpWin = maxFluorWin - counter * stepSize * step
+            if newUpWin < lastUpWin:
+                upWin, lowWin = _lrp_setLogWin(
+                    tarGroup,
+                    newUpWin,
+                    foldWidth,
+                    upWin,
+                    lowWin,
+                    maxFluorTotal,
+                    minFluorTotal,
+                )
+                (
+                    _unused,
+                    _unused2,
+                    checkPcrEff,
+                    _unused3,
+                    _unused4,
+                    _unused5,
+                ) = _lrp_allParamInWindow(
+                    fluor,
+                    tarGroup,
+                    vecTarget,
+                    indMeanX,
+                    indMeanY,
+                    pcrEff,
+                    nNulls,
+                    nInclu,
+                    correl,
+                    upWin,
+                    lowWin,
+                    vecNoAmplification,
+                    vecBaselineError,
+                )
+                [checkMeanEff, _unused] = _lrp_meanPcrEff(
+                    tarGroup,
+                    vecTarget,
+                    checkPcrEff,
+                    vecSkipSample,
+                    vecNoPlateau,
+                    vecShortLogLin,
+                )
+                foldWidth = np.log10(np.power(checkMeanEff, pointsInWoL))
+                if foldWidth < 0.5:
+                    foldWidth = 0.5  # to avoid width = 0 above stopCyc
+                upWin, lowWin = _lrp_setLogWin(
+                    tarGroup,
+                    newUpWin,
+                    foldWidth,
+                    upWin,
+                    lowWin,
+                    maxFluorTotal,
+                    minFluorTotal,
+                )
+                (
+                    _unused,
+                    _unused2,
+                    checkPcrEff,
+                    _unused3,
+                    _unused4,
+                    _unused5,
+                ) = _lrp_allParamInWindow(
+                    fluor,
+                    tarGroup,
+                    vecTarget,
+                    indMeanX,
+                    indMeanY,
+                    pcrEff,
+                    nNulls,
+                    nInclu,
+                    correl,
+                    upWin,
+                    lowWin,
+                    vecNoAmplification,
+                    vecBaselineError,
+                )
+                [checkMeanEff, checkVarEff] = _lrp_meanPcrEff(
+                    tarGroup,
+                    vecTarget,
+                    checkPcrEff,
+                    vecSkipSample,
+                    vecNoPlateau,
+                    vecShortLogLin,
+                )
+                if checkVarEff > 0.0:
+                    memVarEff[counter] = np.sqrt(checkVarEff) / checkMeanEff
+                else:
+                    memVarEff[counter] = 0.0
+                if checkVarEff > maxVarEff:
+                    maxVarEff = checkVarEff
+                    maxVarEffStep = counter
+                memUpWin[counter] = newUpWin
+                memFoldWidth[counter] = foldWidth
+                lastUpWin = newUpWin
+            else:
+                checkVarEff = 0.0
+
+            if (
+                counter >= 60
+                or newUpWin - foldWidth / (pointsInWoL / 2.0) < minFluorLim
+                or checkVarEff < 0.00000000001
+            ):
+                break
+
+        # corrections: start
+        if checkVarEff < 0.00000000001:
+            counter -= 1  # remove window with vareff was 0.0
+
+        validSteps = -1
+        while True:
+            validSteps += 1
+            if memVarEff[validSteps] < 0.000001:
+                break
+        validSteps -= 1  # i = number of valid steps
+
+        minSmooth = memVarEff[0]
+        minStep = 0  # default top window
+
+        # next 3 if conditions on i: added to correct smoothing
+        if validSteps == 0:
+            minStep = 0
+
+        if 0 < validSteps < 4:
+            n = -1
+            while True:
+                n += 1
+                if memVarEff[n] < minSmooth:
+                    minSmooth = memVarEff[n]
+                    minStep = n
+                if n == validSteps:
+                    break
+        if validSteps >= 4:
+            n = 0
+            while True:
+                n += 1
+                smoothVar = 0.0
+                for m in range(n - 1, n + 2):
+                    smoothVar = smoothVar + memVarEff[m]
+                smoothVar = smoothVar / 3.0
+                if smoothVar < minSmooth:
+                    minSmooth = smoothVar
+                    minStep = n
+
+                if n >= validSteps - 1 or n > maxVarEffStep:
+                    break
+        # corrections: stop
+
+        # Calculate the final values again
+        upWin, lowWin = _lrp_setLogWin(
+            tarGroup,
+            memUpWin[minStep],
+            memFoldWidth[minStep],
+            upWin,
+            lowWin,
+            maxFluorTotal,
+            minFluorTotal,
+        )
+        if tarGroup is None:
+            threshold[0] = 0.5 * np.round(1000 * upWin[0]) / 1000
+        else:
+            threshold[tarGroup] = 0.5 * np.round(1000 * upWin[tarGroup]) / 1000
+
+        (
+            indMeanX,
+            indMeanY,
+            pcrEff,
+            nNulls,
+            nInclu,
+            correl,
+        ) = _lrp_allParamInWindow(
+            fluor,
+            tarGroup,
+            vecTarget,
+            indMeanX,
+            indMeanY,
+            pcrEff,
+            nNulls,
+            nInclu,
+            correl,
+            upWin,
+            lowWin,
+            vecNoAmplification,
+            vecBaselineError,
+        )
+        for aRow in range(0, len(pcrEff)):
+            if tarGroup is None or tarGroup == vecTarget[aRow]:
+                if (
+                    not (
+                        vecSkipSample[aRow]
+                        or vecNoPlateau[aRow]
+                        or vecShortLogLin[aRow]
+                    )
+                ) and pcrEff[aRow] > 1.0:
+                    vecIsUsedInWoL[aRow] = True
+                else:
+                    vecIsUsedInWoL[aRow] = False
+
+    return (
+        indMeanX,
+        indMeanY,
+        pcrEff,
+        nNulls,
+        nInclu,
+        correl,
+        upWin,
+        lowWin,
+        threshold,
+        vecIsUsedInWoL,
+    )
+
+
+def _lrp_assignNoPlateau(
+    fluor,
+    tarGroup,
+    vecTarget,
+    pointsInWoL,
+    indMeanX,
+    indMeanY,
+    pcrEff,
+    nNulls,
+    nInclu,
+    correl,
+    upWin,
+    lowWin,
+    maxFluorTotal,
+    minFluorTotal,
+    stopCyc,
+    startCyc,
+    threshold,
+    vecNoAmplification,
+    vecBaselineError,
+    vecSkipSample,
+    vecNoPlateau,
+    vecShortLogLin,
+    vecIsUsedInWoL,
+):
+    """Assign no plateau again and possibly recalculate WoL if new no plateau
+    was found.
+
+    Args:
+        fluor: The array with the fluorescence values
+        tarGroup: The target number
+        vecTarget: The vector with the targets numbers
+        pointsInWoL: The number of points in the window
+        indMeanX: The vector with the x mean position
+        indMeanY: The vector with the y mean position
+        pcrEff: The array with the PCR efficiencies
+        nNulls: The array with the calculated nNulls
+        nInclu: The array with the calculated nInclu
+        correl: The array with the calculated correl
+        upWin: The upper limit of the window
+        lowWin: The lower limit of the window
+        maxFluorTotal: The maximum fluorescence over all rows
+        minFluorTotal: The minimum fluorescence over all rows
+        stopCyc: The vector with the stop cycle of the log lin phase
+        startCyc: The vector with the start cycle of the log lin phase
+        threshold: The threshold fluorescence
+        vecNoAmplification: True if there is a amplification error
+        vecBaselineError: True if there is a baseline error
+        vecSkipSample: Skip the sample
+        vecNoPlateau: True if there is no plateau
+        vecShortLogLin: True indicates a short log lin phase
+        vecIsUsedInWoL: True if used in the WoL
+
+    Returns:
+        The values indMeanX, indMeanY, pcrEff, nNulls, nInclu, correl, upWin, lowWin, threshold, vecIsUsedInWoL, vecNoPlateau.
+    """
+    newNoPlateau = False
+    for aRow in range(0, fluor.shape[0]):
+        if (tarGroup is None or tarGroup == vecTarget[aRow]) and not (
+            vecNoAmplification[aRow]
+            or vecBaselineError[aRow]
+            or vecNoPlateau[aRow]
+        ):
+            expectedFluor = nNulls[aRow] * np.power(
+                pcrEff[aRow], fluor.shape[1]
+            )
+            if expectedFluor / fluor[aRow, fluor.shape[1] - 1] < 5:
+                newNoPlateau = True
+                vecNoPlateau[aRow] = True
+
+    if newNoPlateau:
+        (
+            indMeanX,
+            indMeanY,
+            pcrEff,
+            nNulls,
+            nInclu,
+            correl,
+            upWin,
+            lowWin,
+            threshold,
+            vecIsUsedInWoL,
+        ) = _lrp_setWoL(
+            fluor,
+            tarGroup,
+            vecTarget,
+            pointsInWoL,
+            indMeanX,
+            indMeanY,
+            pcrEff,
+            nNulls,
+            nInclu,
+            correl,
+            upWin,
+            lowWin,
+            maxFluorTotal,
+            minFluorTotal,
+            stopCyc,
+            startCyc,
+            threshold,
+            vecNoAmplification,
+            vecBaselineError,
+            vecSkipSample,
+            vecNoPlateau,
+            vecShortLogLin,
+            vecIsUsedInWoL,
+        )
+
+    return (
+        indMeanX,
+        indMeanY,
+        pcrEff,
+        nNulls,
+        nInclu,
+        correl,
+        upWin,
+        lowWin,
+        threshold,
+        vecIsUsedInWoL,
+        vecNoPlateau,
+    )
+
+
+def _lrp_removeOutlier(data, vecNoPlateau, alpha=0.05):
+    """A function which calculates the skewness and Grubbs test to identify
+    outliers ignoring nan.
+
+    Args:
+        data: The numpy array with the data
+        vecNoPlateau: The vector of samples without plateau.
+        alpha: The the significance level (default 0.05)
+
+    Returns:
+        The a bool array with the removed outliers set true.
+    """
+
+    oData = np.copy(data)
+    oLogic = np.zeros(data.shape, dtype=np.bool_)
+    loopOn = True
+
+    while loopOn:
+        count = np.count_nonzero(~np.isnan(oData))
+        if count < 3:
+            loopOn = False
+        else:
+            mean = np.nanmean(oData)
+            std = np.nanstd(oData, ddof=1)
+            skewness = scp.skew(oData, bias=False, nan_policy="omit")
+            skewness_SE = np.sqrt(
+                (6 * count * (count - 1))
+                / ((count - 2) * (count + 1) * (count + 3))
+            )
+            skewness_t = np.abs(skewness) / skewness_SE
+            skewness_P = scp.t.sf(skewness_t, df=np.power(10, 10)) * 2
+
+            if skewness_P < alpha / 2.0:
+                # It's skewed!
+                grubbs_t = scp.t.ppf(1 - (alpha / count) / 2, (count - 2))
+                grubbs_Gcrit = ((count - 1) / np.sqrt(count)) * np.sqrt(
+                    np.power(grubbs_t, 2)
+                    / ((count - 2) + np.power(grubbs_t, 2))
+                )
+                if skewness > 0.0:
+                    data_max = np.nanmax(oData)
+                    grubbs_res = (data_max - mean) / std
+                    max_pos = np.nanargmax(oData)
+                    if grubbs_res > grubbs_Gcrit:
+                        # It's a true outlier
+                        oData[max_pos] = np.nan
+                        oLogic[max_pos] = True
+                    else:
+                        if vecNoPlateau[max_pos]:
+                            # It has no plateau
+                            oData[max_pos] = np.nan
+                            oLogic[max_pos] = True
+                        else:
+                            loopOn = False
+                else:
+                    data_min = np.nanmin(oData)
+                    grubbs_res = (mean - data_min) / std
+                    min_pos = np.nanargmin(oData)
+                    if grubbs_res > grubbs_Gcrit:
+                        # It's a true outlier
+                        oData[min_pos] = np.nan
+                        oLogic[min_pos] = True
+                    else:
+                        if vecNoPlateau[min_pos]:
+                            # It has no plateau
+                            oData[min_pos] = np.nan
+                            oLogic[min_pos] = True
+                        else:
+                            loopOn = False
+            else:
+                loopOn = False
+    return oLogic
+
+
+def _mca_smooth(tempList, rawFluor):
+    """A function to smooth the melt curve date based on Friedmans
+    supersmoother.
+
+       # https://www.slac.stanford.edu/pubs/slacpubs/3250/slac-pub-3477.pdf
+
+    Args:
+        tempList:
+        rawFluor: The numpy array with the raw data
+
+    Returns:
+        The numpy array with the smoothed data.
+    """
+
+    span_s = 0.05
+    span_m = 0.2
+    span_l = 0.5
+
+    smoothFluor = np.zeros(rawFluor.shape, dtype=np.float64)
+
+    padTemp = np.append(0.0, tempList)
+
+    zeroPad = np.zeros((rawFluor.shape[0], 1), dtype=np.float64)
+    padFluor = np.append(zeroPad, rawFluor, axis=1)
+    n = len(padTemp) - 1
+
+    # Find the increase in x from 0.25 to 0.75 over the total range
+    firstQuarter = int(0.5 + n / 4)
+    thirdQuarter = 3 * firstQuarter
+    scale = -1.0
+    while scale <= 0.0:
+        if thirdQuarter < n:
+            thirdQuarter += 1
+        if firstQuarter > 1:
+            firstQuarter -= 1
+        scale = padTemp[thirdQuarter] - padTemp[firstQuarter]
+    vsmlsq = 0.0001 * scale * 0.0001 * scale
+
+    countUp = 0
+    for fluor in padFluor:
+        [res_s_a, res_s_t] = _mca_sub_smooth(
+            padTemp, fluor, span_s, vsmlsq, True
+        )
+        [res_s_b, _unused] = _mca_sub_smooth(
+            padTemp, res_s_t, span_m, vsmlsq, False
+        )
+        [res_s_c, res_s_t] = _mca_sub_smooth(
+            padTemp, fluor, span_m, vsmlsq, True
+        )
+        [res_s_d, _unused] = _mca_sub_smooth(
+            padTemp, res_s_t, span_m, vsmlsq, False
+        )
+        [res_s_e, res_s_t] = _mca_sub_smooth(
+            padTemp, fluor, span_l, vsmlsq, True
+        )
+        [res_s_f, _unused] = _mca_sub_smooth(
+            padTemp, res_s_t, span_m, vsmlsq, False
+        )
+
+        res_s_fin = np.zeros(res_s_a.shape, dtype=np.float64)
+        for thirdQuarter in range(1, n + 1):
+            resmin = 1.0e20
+            if res_s_b[thirdQuarter] < resmin:
+                resmin = res_s_b[thirdQuarter]
+                res_s_fin[thirdQuarter] = span_s
+            if res_s_d[thirdQuarter] < resmin:
+                resmin = res_s_d[thirdQuarter]
+                res_s_fin[thirdQuarter] = span_m
+            if res_s_f[thirdQuarter] < resmin:
+                res_s_fin[thirdQuarter] = span_l
+
+        [res_s_bb, _unused] = _mca_sub_smooth(
+            padTemp, res_s_fin, span_m, vsmlsq, False
+        )
+
+        res_s_cc = np.zeros(res_s_a.shape, dtype=np.float64)
+        for thirdQuarter in range(1, n + 1):
+            # compare res_s_bb with spans[] and make sure the no res_s_bb[] is below span_s or above span_l
+            if res_s_bb[thirdQuarter] <= span_s:
+                res_s_bb[thirdQuarter] = span_s
+            if res_s_bb[thirdQuarter] >= span_l:
+                res_s_bb[thirdQuarter] = span_l
+            f = res_s_bb[thirdQuarter] - span_m
+            if f >= 0.0:
+                # in case res_s_bb[] is higher than span_m: calculate res_s_cc[] from res_s_c and res_s_e
+                # using linear interpolation between span_l and span_m
+                f = f / (span_l - span_m)
+                res_s_cc[thirdQuarter] = (1.0 - f) * res_s_c[
+                    thirdQuarter
+                ] + f * res_s_e[thirdQuarter]
+            else:
+                # in case res_s_bb[] is less than span_m: calculate res_s_cc[] from res_s_c and res_s_a
+                # using linear interpolation between span_s and span_m
+                f = -f / (span_m - span_s)
+                res_s_cc[thirdQuarter] = (1.0 - f) * res_s_c[
+                    thirdQuarter
+                ] + f * res_s_a[thirdQuarter]
+
+        # final smoothing of combined optimally smoothed values in res_s_cc[] into smo[]
+        [res_s_t, _unused] = _mca_sub_smooth(
+            padTemp, res_s_cc, span_s, vsmlsq, False
+        )
+        smoothFluor[countUp] = res_s_t[1:]
+        countUp += 1
+
+    return smoothFluor
+
+
+def _mca_sub_smooth(temperature, fluor, span, vsmlsq, saveVarianceData):
+    """A function to smooth the melt curve date based on Friedmans
+    supersmoother.
+
+       # https://www.slac.stanford.edu/pubs/slacpubs/3250/slac-pub-3477.pdf
+
+    Args:
+        temperature:
+        fluor: The numpy array with the raw data
+        span: The selected span
+        vsmlsq: The width
+        saveVarianceData: Sava variance data
+
+    Returns:
+        [smoothData[], varianceData[]]  where smoothData[] contains smoothed data,
+        varianceData[] contains residuals scaled to variance.
+    """
+
+    n = len(temperature) - 1
+    smoothData = np.zeros(len(temperature), dtype=np.float64)
+    varianceData = np.zeros(len(temperature), dtype=np.float64)
+
+    windowSize = int(0.5 * span * n + 0.6)
+    if windowSize < 2:
+        windowSize = 2
+    windowStop = 2 * windowSize + 1  # range of smoothing window
+
+    xm = temperature[1]
+    ym = fluor[1]
+    tempVar = 0.0
+    fluorVar = 0.0
+
+    for i in range(2, windowStop + 1):
+        xm = ((i - 1) * xm + temperature[i]) / i
+        ym = ((i - 1) * ym + fluor[i]) / i
+        tmp = i * (temperature[i] - xm) / (i - 1)
+        tempVar += tmp * (temperature[i] - xm)
+        fluorVar += tmp * (fluor[i] - ym)
+
+    fbw = windowStop
+    for j in range(1, n + 1):  # Loop through all
+        windowStart = j - windowSize - 1
+        windowEnd = j + windowSize
+        if not (windowStart < 1 or windowEnd > n):
+            tempStart = temperature[windowStart]
+            tempEnd = temperature[windowEnd]
+            fbo = fbw
+            fbw = fbw - 1.0
+            tmp = 0.0
+            if fbw > 0.0:
+                xm = (fbo * xm - tempStart) / fbw
+            if fbw > 0.0:
+                ym = (fbo * ym - fluor[windowStart]) / fbw
+            if fbw > 0.0:
+                tmp = fbo * (tempStart - xm) / fbw
+            tempVar = tempVar - tmp * (tempStart - xm)
+            fluorVar = fluorVar - tmp * (fluor[windowStart] - ym)
+
+            fbo = fbw
+            fbw = fbw + 1.0
+            tmp = 0.0
+            if fbw > 0.0:
+                xm = (fbo * xm + tempEnd) / fbw
+            if fbw > 0.0:
+                ym = (fbo * ym + fluor[windowEnd]) / fbw
+            if fbo > 0.0:
+                tmp = fbw * (tempEnd - xm) / fbo
+            tempVar = tempVar + tmp * (tempEnd - xm)
+            fluorVar = fluorVar + tmp * (fluor[windowEnd] - ym)
+
+        if tempVar > vsmlsq:
+            smoothData[j] = (
+                temperature[j] - xm
+            ) * fluorVar / tempVar + ym  # contains smoothed data
+        else:
+            smoothData[j] = ym  # contains smoothed data
+
+        if saveVarianceData:
+            h = 0.0
+            if fbw > 0.0:
+                h = 1.0 / fbw
+            if tempVar > vsmlsq:
+                h = h + (temperature[j] - xm) * (temperature[j] - xm) / tempVar
+
+            if 1.0 - h > 0.0:
+                varianceData[j] = abs(fluor[j] - smoothData[j]) / (
+                    1.0 - h
+                )  # contains residuals scaled to variance
+            else:
+                if j > 1:
+                    varianceData[j] = varianceData[
+                        j - 1
+                    ]  # contains residuals scaled to variance
+                else:
+                    varianceData[j] = 0.0
+
+    return [smoothData, varianceData]
+
+
+def _mca_linReg(xIn, yUse, start, stop):
+    """A function which calculates the slope or the intercept by linear
+    regression.
+
+    Args:
+        xIn: The numpy array of the temperatures, one row or one per reaction
+        yUse: The numpy array that contains the fluorescence
+
+    Returns:
+        An array with the slope and intercept.
+    """
+
+    valid = ~np.isnan(yUse)
+    xUse = np.where(valid, xIn, 0.0)
+    myStop = stop + 1
+
+    tempSqared = xUse * xUse
+    tempFluor = xUse * yUse
+
+    sumCyc = np.nansum(xUse[:, start:myStop], axis=1)
+    sumFluor = np.nansum(yUse[:, start:myStop], axis=1)
+    sumCycSquared = np.nansum(tempSqared[:, start:myStop], axis=1)
+    sumCycFluor = np.nansum(tempFluor[:, start:myStop], axis=1)
+    n = np.sum(valid[:, start:myStop], axis=1, dtype=np.float64)
+
+    ssx = sumCycSquared - (sumCyc * sumCyc) / n
+    sxy = sumCycFluor - (sumCyc * sumFluor) / n
+
+    slope = sxy / ssx
+    intercept = (sumFluor / n) - slope * (sumCyc / n)
+    return [slope, intercept]
+
+
+def _mca_linRegWindows(tempList, yUse, starts, stops):
+    """A function which calculates the slopes and intercepts of many
+    temperature windows at once by linear regression on cumulative sums.
+
+    Args:
+        tempList: The numpy array of the temperatures
+        yUse: The numpy array that contains the fluorescence
+        starts: The numpy array with the first index of each window
+        stops: The numpy array with the last index of each window
+
+    Returns:
+        An array with the slopes and intercepts, one column per window.
+    """
+
+    valid = ~np.isnan(yUse)
+    xUse = np.where(valid, tempList, 0.0)
+    yZero = np.where(valid, yUse, 0.0)
+
+    # Position 0 holds the empty sum, window [a, b] is cum[b + 1] - cum[a]
+    cumSums = np.zeros((5, yUse.shape[0], yUse.shape[1] + 1), dtype=np.float64)
+    np.cumsum(xUse, axis=1, out=cumSums[0, :, 1:])
+    np.cumsum(yZero, axis=1, out=cumSums[1, :, 1:])
+    np.cumsum(xUse * xUse, axis=1, out=cumSums[2, :, 1:])
+    np.cumsum(xUse * yZero, axis=1, out=cumSums[3, :, 1:])
+    np.cumsum(valid, axis=1, out=cumSums[4, :, 1:])
+
+    # Same windows as the slice [start:stop + 1]
+    starts = np.asarray(starts)
+    lowPos = np.where(starts < 0, starts + yUse.shape[1], starts)
+    lowPos = np.clip(lowPos, 0, yUse.shape[1])
+    highPos = np.clip(np.asarray(stops) + 1, 0, yUse.shape[1])
+    highPos = np.maximum(highPos, lowPos)
+    winSums = cumSums[:, :, highPos] - cumSums[:, :, lowPos]
+    [sumCyc, sumFluor, sumCycSquared, sumCycFluor, n] = winSums
+
+    ssx = sumCycSquared - (sumCyc * sumCyc) / n
+    sxy = sumCycFluor - (sumCyc * sumFluor) / n
+
+    slope = sxy / ssx
+    intercept = (sumFluor / n) - slope * (sumCyc / n)
+    return [slope, intercept]
+
+
+def _mca_findPeaks(
+    firstDerTemp,
+    firstDer,
+    secondDerTemp,
+    secondDer,
+    fluor,
+    peakLowTemp,
+    peakHighTemp,
+    peakMaxWidth,
+):
+    """A function which finds the melting peaks of all reactions at once.
+    Peaks are local maxima of the first derivative, their borders are the
+    maximum and minimum of the second derivative next to the peak.
+
+    Args:
+        firstDerTemp: The numpy array of the first derivative temperatures
+        firstDer: The numpy array with the smoothed first derivative
+        secondDerTemp: The numpy array of the second derivative temperatures
+        secondDer: The numpy array with the smoothed second derivative
+        fluor: The numpy array with the fluorescence used for the drop
+        peakLowTemp: peaks below this temperature are ignored
+        peakHighTemp: peaks above this temperature are ignored
+        peakMaxWidth: peaks broader than this temperature width are ignored
+
+    Returns:
+        A dictionary with one numpy array per peak parameter, ordered by
+        reaction and temperature: "row", "temp", "width", "height",
+        "deltaH" and "fluorDrop".
+    """
+
+    nFD = firstDer.shape[1]
+    nSD = secondDer.shape[1]
+
+    # Local maxima of the first derivative
+    isPeak = (firstDer[:, 0 : nFD - 3] <= firstDer[:, 1 : nFD - 2]) & (
+        firstDer[:, 1 : nFD - 2] > firstDer[:, 2 : nFD - 1]
+    )
+    [rows, fdPos] = np.nonzero(isPeak)
+    fdPos = fdPos + 1
+
+    # Walking up the second derivative stops at the first position which
+    # is not lower than its left (sdPosMax) or higher than its right
+    # neighbour (sdPosMin), the lookup tables hold the next stop position
+    sdIdx = np.arange(0, nSD)
+    stopLeft = np.ones(secondDer.shape, dtype=np.bool_)
+    stopLeft[:, 1:] = ~(secondDer[:, 1:] < secondDer[:, :-1])
+    nextLeft = np.maximum.accumulate(np.where(stopLeft, sdIdx, 0), axis=1)
+    stopRight = np.ones(secondDer.shape, dtype=np.bool_)
+    stopRight[:, : nSD - 2] = ~(
+        secondDer[:, : nSD - 2] > secondDer[:, 1 : nSD - 1]
+    )
+    nextRight = np.minimum.accumulate(
+        np.where(stopRight, sdIdx, nSD)[:, ::-1], axis=1
+    )[:, ::-1]
+    sdPosMax = nextLeft[rows, fdPos - 1]
+    sdPosMin = nextRight[rows, fdPos]
+
+    # All peaks have to go up first!
+    goesUp = sdPosMax > 0
+    rows = rows[goesUp]
+    fdPos = fdPos[goesUp]
+    sdPosMax = sdPosMax[goesUp]
+    sdPosMin = sdPosMin[goesUp]
+
+    peakTemp = firstDerTemp[fdPos]
+    lowPeakTemp = secondDerTemp[sdPosMax]
+    # sdPosMax + 4 is the precise same temp in the fluorescence
+    lowFinFluor = fluor[rows, sdPosMax + 4]
+    peakHeight = firstDer[rows, fdPos]
+    # sdPosMax position is on FD between sdPosMax and sdPosMax + 1
+    lowHeight = firstDer[rows, sdPosMax]
+    highHeight = firstDer[rows, sdPosMin + 1]
+
+    # assume symmetry when down side is missing
+    symmetric = sdPosMin > (nSD - 4)
+    peakWidth = np.where(
+        symmetric,
+        2 * (peakTemp - lowPeakTemp),
+        secondDerTemp[sdPosMin] - lowPeakTemp,
+    )
+    # The symmetric peak is between +3 and +4
+    fluorDrop = np.where(
+        symmetric,
+        2 * (lowFinFluor - fluor[rows, fdPos + 3]),
+        lowFinFluor - fluor[rows, sdPosMin + 4],
+    )
+    deltaH = np.where(
+        symmetric | (firstDer[rows, sdPosMin] < 0.0),
+        peakHeight - lowHeight,
+        peakHeight - (lowHeight + highHeight) / 2,
+    )
+    invalidSD = (
+        (peakHeight < lowHeight) | (peakHeight < 0.0) | (lowHeight < 0.0)
+    )
+    invalidSD |= ~symmetric & (peakHeight < highHeight)
+
+    keep = (
+        (fluorDrop > 0.0)
+        & (peakWidth < peakMaxWidth)
+        & (peakLowTemp < peakTemp)
+        & (peakTemp < peakHighTemp)
+        & ~invalidSD
+    )
+    return {
+        "row": rows[keep],
+        "temp": peakTemp[keep],
+        "width": peakWidth[keep],
+        "height": peakHeight[keep],
+        "deltaH": deltaH[keep],
+        "fluorDrop": fluorDrop[keep],
+    }
+
+
+def _mca_readMeltData(dataNodes, lookUpTemp, tempCount):
+    """A function which reads the melting curve raw data of reactions.
+
+    Args:
+        dataNodes: The list of the react data lxml nodes
+        lookUpTemp: A dictionary with the column of each temperature string
+        tempCount: The number of temperatures
+
+    Returns:
+        The numpy array with the raw fluorescence, missing values are NaN.
+    """
+
+    rawFluor = np.full((len(dataNodes), tempCount), np.nan, dtype=np.float64)
+    for row in range(0, len(dataNodes)):
+        temps = _get_data_point_texts(dataNodes[row], "mdp", "tmp")
+        fluors = _get_data_point_texts(dataNodes[row], "mdp", "fluor")
+        if len(temps) == len(fluors):
+            cols = [lookUpTemp.get(cTemp, -1) for cTemp in temps]
+            if -1 not in cols:
+                rawFluor[row, cols] = np.fromiter(
+                    map(float, fluors), dtype=np.float64, count=len(fluors)
+                )
+                continue
+        # Empty or unknown values, read point by point
+        mdps = _get_all_children(dataNodes[row], "mdp")
+        for mdp in mdps:
+            cTemp = _get_first_child_text(mdp, "tmp")
+            cFluor = _get_first_child_text(mdp, "fluor")
+            if cTemp != "" and cFluor != "" and cTemp in lookUpTemp:
+                rawFluor[row, lookUpTemp[cTemp]] = float(cFluor)
+    return rawFluor
+
+
+def _mca_expoNormalise(tempList, smoothFluor, expoLowTemp, expoHighTemp):
+    """A function which removes the exponential background from the smoothed
+    melting curves and scales them from 0.0 to 1.0.
+
+    Args:
+        tempList: The numpy array of the temperatures
+        smoothFluor: The numpy array with the smoothed fluorescence
+        expoLowTemp: the low temperature for the exponential normalisation
+        expoHighTemp: the high temperature for the exponential normalisation
+
+    Returns:
+        The numpy array with the normalised fluorescence.
+    """
+
+    posLowT = 0
+    while posLowT < len(tempList) - 1 and tempList[posLowT] < expoLowTemp:
+        posLowT += 1
+    posHighT = len(tempList) - 1
+    while posHighT > 0 and tempList[posHighT] > expoHighTemp:
+        posHighT -= 1
+
+    # calculate FDLow and FDHigh from mc[] for all reactions at once
+    FDLow = -1 * (smoothFluor[:, posLowT] - smoothFluor[:, posLowT - 1])
+    FDHigh = -1 * (smoothFluor[:, posHighT] - smoothFluor[:, posHighT - 1])
+
+    # Rarely happens, protects the log from negative values
+    FDLow[FDLow <= 0.0] = 0.00001
+    FDHigh[FDHigh <= 0.0] = 0.000001  # not same as FDLow = 0.00001
+
+    # determine Aexp and Cexp
+    Aexp = (np.log(FDHigh) - np.log(FDLow)) / (expoHighTemp - expoLowTemp)
+    Cexp = -1 * FDLow / Aexp
+
+    # apply exponential base trend correction
+    normalMelting = smoothFluor - Cexp[:, np.newaxis] * np.exp(
+        Aexp[:, np.newaxis] * (tempList - expoLowTemp)
+    )
+    MaxMCCorr = np.fmax.reduce(normalMelting, axis=1, initial=0.0)
+    MinMCCorr = np.fmin.reduce(normalMelting, axis=1, initial=10000.0)
+    return (normalMelting - MinMCCorr[:, np.newaxis]) / (
+        MaxMCCorr - MinMCCorr
+    )[:, np.newaxis]
+
+
+def _mca_bilinLowRangeSums(
+    tempList,
+    bilinBase,
+    vecTarget,
+    targetsCount,
+    startindex,
+    NtempsInRange,
+    starthighT,
+    stophighT,
+):
+    """A function which sums up the slopes of the bilinear normalised
+    melting curves for all candidate low temperature ranges. The sums of
+    several blocks of reactions can be added up.
+
+    Args:
+        tempList: The numpy array of the temperatures
+        bilinBase: The numpy array with the fluorescence to normalise
+        vecTarget: The numpy array with the target number of each reaction
+        targetsCount: The number of targets + 1
+        startindex: The index of the low start temperature
+        NtempsInRange: The number of temperatures in a range
+        starthighT: The index of the high start temperature
+        stophighT: The index of the high stop temperature
+
+    Returns:
+        An array with the sums of the slopes, the sums of the squared slopes
+        and the counts, each with one row per target and one column per range.
+    """
+
+    # Candidate low ranges start at k - 1 for every tested k
+    lowStarts = np.arange(startindex - 1, startindex + 3 * NtempsInRange)
+    SumSlopes = np.zeros((targetsCount, len(lowStarts)), dtype=np.float64)
+    SumSlopes2 = np.zeros((targetsCount, len(lowStarts)), dtype=np.float64)
+    cntSlopes = np.zeros((targetsCount, len(lowStarts)), dtype=np.int64)
+
+    [slopeLowAll, interceptLowAll] = _mca_linRegWindows(
+        tempList, bilinBase, lowStarts, lowStarts + NtempsInRange
+    )
+    [slopehigh, intercepthigh] = _mca_linReg(
+        tempList, bilinBase, starthighT, stophighT
+    )
+    HighTline = (
+        intercepthigh[:, np.newaxis] + slopehigh[:, np.newaxis] * tempList
+    )
+    for IndexR in range(0, len(lowStarts)):
+        startlowT = lowStarts[IndexR]
+        LowTline = (
+            interceptLowAll[:, IndexR, np.newaxis]
+            + slopeLowAll[:, IndexR, np.newaxis] * tempList
+        )
+        bilinNormal = (bilinBase - HighTline) / (LowTline - HighTline)
+        nmcStart = startlowT + NtempsInRange
+        nmcStop = startlowT + 2 * NtempsInRange + 1
+        [slopeNMC, interceptNMC] = _mca_linReg(
+            tempList[nmcStart:nmcStop],
+            bilinNormal[:, nmcStart:nmcStop],
+            0,
+            nmcStop - nmcStart - 1,
+        )
+
+        # Sweeps cross 1.0 with a big step between two temperatures
+        leftVal = bilinNormal[:, :-1]
+        rightVal = bilinNormal[:, 1:]
+        sweeps = (np.abs(leftVal - rightVal) > 0.1) & (
+            ((leftVal > 1.0) & (1.0 > rightVal))
+            | ((leftVal < 1.0) & (1.0 < rightVal))
+        )
+        nonSweep = ~np.any(sweeps, axis=1)
+        SumSlopes[:, IndexR] = np.bincount(
+            vecTarget[nonSweep],
+            weights=slopeNMC[nonSweep],
+            minlength=targetsCount,
+        )
+        SumSlopes2[:, IndexR] = np.bincount(
+            vecTarget[nonSweep],
+            weights=slopeNMC[nonSweep] * slopeNMC[nonSweep],
+            minlength=targetsCount,
+        )
+        cntSlopes[:, IndexR] = np.bincount(
+            vecTarget[nonSweep], minlength=targetsCount
+        )
+    return [SumSlopes, SumSlopes2, cntSlopes]
+
+
+def _mca_bilinHighRangeSums(
+    tempList, tarBase, startlowT, stoplowT, startindex, NtempsInRange
+):
+    """A function which sums up the mean values of the bilinear normalised
+    melting curves of one target for all candidate high temperature ranges.
+    The sums of several blocks of reactions can be added up.
+
+    Args:
+        tempList: The numpy array of the temperatures
+        tarBase: The numpy array with the fluorescence of the target reactions
+        startlowT: The index of the low start temperature
+        stoplowT: The index of the low stop temperature
+        startindex: The index of the first high start temperature
+        NtempsInRange: The number of temperatures in a range
+
+    Returns:
+        An array with the sums of the means, the sums of the squared means
+        and the counts, each with one value per range.
+    """
+
+    # Candidate high ranges start at k - 1 for every tested k
+    highStarts = np.arange(startindex - 1, startindex + 5 * NtempsInRange)
+    SumVal = np.zeros(len(highStarts), dtype=np.float64)
+    SumVal2 = np.zeros(len(highStarts), dtype=np.float64)
+    cntVal = np.zeros(len(highStarts), dtype=np.int64)
+
+    [slopelow, interceptlow] = _mca_linReg(
+        tempList, tarBase, startlowT, stoplowT
+    )
+    LowTline = interceptlow[:, np.newaxis] + slopelow[:, np.newaxis] * tempList
+    [slopeHighAll, interceptHighAll] = _mca_linRegWindows(
+        tempList, tarBase, highStarts, highStarts + NtempsInRange
+    )
+    for IndexR in range(0, len(highStarts)):
+        k = startindex + IndexR
+        HighTline = (
+            interceptHighAll[:, IndexR, np.newaxis]
+            + slopeHighAll[:, IndexR, np.newaxis] * tempList
+        )
+        bilinNormal = (tarBase - HighTline) / (LowTline - HighTline)
+
+        # Sweeps cross 0.0 with a big step between two temperatures
+        sweepPos = np.arange(k - 2 * NtempsInRange, k + 1)
+        leftVal = bilinNormal[:, sweepPos]
+        rightVal = bilinNormal[:, sweepPos + 1]
+        sweeps = (np.abs(leftVal - rightVal) > 0.1) & (
+            ((leftVal > 0.0) & (0.0 > rightVal))
+            | ((leftVal < 0.0) & (0.0 < rightVal))
+        )
+        nonSweep = ~np.any(sweeps, axis=1)
+        MeanValIn = np.mean(
+            bilinNormal[nonSweep][:, np.arange(k - NtempsInRange, k + 1)],
+            axis=1,
+        )
+        SumVal[IndexR] = np.sum(MeanValIn)
+        SumVal2[IndexR] = np.sum(MeanValIn * MeanValIn)
+        cntVal[IndexR] = len(MeanValIn)
+    return [SumVal, SumVal2, cntVal]
+
+
+def _mca_bilinNormalise(
+    tempList,
+    bilinBase,
+    vecTarget,
+    targetsCount,
+    bilinLowStart,
+    bilinLowStop,
+    bilinHighStart,
+    bilinHighStop,
+):
+    """A function which normalises the melting curves between the low and
+    the high temperature lines of each target.
+
+    Args:
+        tempList: The numpy array of the temperatures
+        bilinBase: The numpy array with the fluorescence to normalise
+        vecTarget: The numpy array with the target number of each reaction
+        targetsCount: The number of targets + 1
+        bilinLowStart: The low start temperature of each target
+        bilinLowStop: The low stop temperature of each target
+        bilinHighStart: The high start temperature of each target
+        bilinHighStop: The high stop temperature of each target
+
+    Returns:
+        The numpy array with the normalised fluorescence.
+    """
+
+    normalMelting = bilinBase.copy()
+    for curTarNr in range(1, targetsCount):
+        # determine index of low start temperature
+        startlowT = 0
+        while (
+            tempList[startlowT] < bilinLowStart[curTarNr]
+            and startlowT < len(tempList) - 1
+        ):
+            startlowT += 1
+        # determine index of low stop temperature
+        stoplowT = len(tempList) - 1
+        while tempList[stoplowT] > bilinLowStop[curTarNr] and stoplowT > 0:
+            stoplowT -= 1
+        # determine indices of high start and stop temperature
+        starthighT = 1
+        while (
+            tempList[starthighT] < bilinHighStart[curTarNr]
+            and starthighT < len(tempList) - 1
+        ):
+            starthighT += 1
+        # determine indices of high start and stop temperature
+        stophighT = len(tempList) - 1
+        while tempList[stophighT] > bilinHighStop[curTarNr] and stophighT > 0:
+            stophighT -= 1
+
+        [slopelow, interceptlow] = _mca_linReg(
+            tempList, bilinBase, startlowT, stoplowT
+        )
+        [slopehigh, intercepthigh] = _mca_linReg(
+            tempList, bilinBase, starthighT, stophighT
+        )
+
+        LowTline = (
+            interceptlow[:, np.newaxis] + slopelow[:, np.newaxis] * tempList
+        )
+        HighTline = (
+            intercepthigh[:, np.newaxis] + slopehigh[:, np.newaxis] * tempList
+        )
+
+        for j in np.nonzero(vecTarget == curTarNr)[0]:
+            normalMelting[j] = (bilinBase[j] - HighTline[j]) / (
+                LowTline[j] - HighTline[j]
+            )
+            # avoid sweeps because LowTline and HighTline are about to cross
+            for i in range(stophighT + 1, len(tempList)):
+                if (
+                    abs(normalMelting[j][i] - normalMelting[j][i - 1])
+                    > 1.01 * normalMelting[j][i - 1]
+                ):
+                    normalMelting[j][i] = normalMelting[j][i - 1]
+    return normalMelting
+
+
+def _mca_derivatives(tempList, normalMelting):
+    """A function which calculates the smoothed first and second derivative
+    of the normalised melting curves.
+
+    Args:
+        tempList: The numpy array of the temperatures
+        normalMelting: The numpy array with the normalised fluorescence
+
+    Returns:
+        An array with the first derivative temperatures, the smoothed first
+        derivative, the second derivative temperatures and the smoothed
+        second derivative.
+    """
+
+    # Derivate normalMelting
+    tmp = (tempList + np.roll(tempList, 1)) / 2  # Shift to right
+    rawFirstDerivativeTemp = tmp[1:]
+    tmp = np.roll(normalMelting, 1, axis=1) - normalMelting  # Shift to right
+    rawFirstDerivative = tmp[:, 1:]
+
+    # Delete the first three columns
+    rawFirstDerivativeTemp = rawFirstDerivativeTemp[3:]
+    rawFirstDerivative = rawFirstDerivative[:, 3:]
+
+    # Smooth of raw data
+    smoothFirstDerivative = _mca_smooth(
+        rawFirstDerivativeTemp, rawFirstDerivative
+    )
+
+    # Derivate smoothFirstDerivative
+    rawSecondDerivativeTemp = tempList[4:-2]
+    tmp = smoothFirstDerivative - np.roll(
+        smoothFirstDerivative, 1, axis=1
+    )  # Shift to right
+    rawSecondDerivative = tmp[:, 1:-1]
+
+    # Smooth of raw data
+    smoothSecondDerivative = _mca_smooth(
+        rawSecondDerivativeTemp, rawSecondDerivative
+    )
+    return [
+        rawFirstDerivativeTemp,
+        smoothFirstDerivative,
+        rawSecondDerivativeTemp,
+        smoothSecondDerivative,
+    ]
+
+
+def _pco_fixPlateMatix(mat, row, col):
+    """A function which calculates the missing values for the given position.
+
+    Args:
+        mat: The matrix to correct
+        row: The row position of the value to correct
+        col: The column position of the value to correct
+
+    Returns:
+        None, changes the values in the matrix.
+    """
+
+    matSize = len(mat)
+
+    # Return if there are useful no values
+    maxVal = -10
+    for curr in range(0, matSize):
+        maxVal = max(maxVal, mat[row][curr])
+        maxVal = max(maxVal, mat[curr][col])
+    if maxVal <= 0.0:
+        return
+
+    # Calc the missing values
+    finSum = 0.0
+    finNum = 0
+    for mCol in range(0, matSize):
+        if mCol == col:
+            continue
+        colSum = 0.0
+        colNum = 0
+        for mRow in range(0, matSize):
+            if mRow == row:
+                continue
+            if mat[mRow][mCol] <= 0.0:
+                continue
+            if mat[mRow][col] <= 0.0:
+                continue
+            colSum += math.log(mat[mRow][mCol] / mat[mRow][col])
+            colNum += 1
+        if colNum > 0:
+            colGeo = math.exp(colSum / colNum)
+            if colGeo > 0:
+                finSum += math.log(mat[row][mCol] / colGeo)
+                finNum += 1
+    finFact = -1.0
+    if finNum > 0:
+        finFact = math.exp(finSum / finNum)
+    if finNum > 0:
+        mat[row][col] = finFact
+        mat[col][row] = 1.0 / finFact
+
+
+def _exp_longTable(n0Data, transSamTar):
+    """A function which flattens the N0 values into one long-format table.
+
+    Args:
+        n0Data: The N0 dictionary per sample and target from getExperimentData
+        transSamTar: The sample type per sample and target
+
+    Returns:
+        A list with the (sample, target) key of each group, a numpy array with
+        the group index of each value and a numpy array with the values.
+        Negative and no template controls are skipped.
+    """
+
+    keys = []
+    groups = []
+    vals = []
+    for sample in n0Data:
+        for target in n0Data[sample]:
+            if transSamTar[sample][target] in [
+                "ntc",
+                "nac",
+                "ntp",
+                "nrt",
+                "opt",
+            ]:
+                continue
+            groups.extend([len(keys)] * len(n0Data[sample][target]))
+            vals.extend(n0Data[sample][target])
+            keys.append((sample, target))
+    return (
+        keys,
+        np.array(groups, dtype=np.int64),
+        np.array(vals, dtype=np.float64),
+    )
+
+
+def _exp_groupedMeanSd(vals, groups, groupCount):
+    """A function which calculates mean and standard deviation per group.
+
+    Args:
+        vals: The numpy array with the values
+        groups: The numpy array with the group index of each value
+        groupCount: The number of groups
+
+    Returns:
+        Numpy arrays with the number of values, the mean and the standard
+        deviation (ddof=1) per group. Groups without values have a mean of
+        0.0, groups with less than two values a standard deviation of 0.0.
+    """
+
+    count = np.bincount(groups, minlength=groupCount)
+    sums = np.bincount(groups, weights=vals, minlength=groupCount)
+    mean = np.zeros(groupCount, dtype=np.float64)
+    np.divide(sums, count, out=mean, where=count > 0)
+    dev = vals - mean[groups]
+    sqSums = np.bincount(groups, weights=dev * dev, minlength=groupCount)
+    var = np.zeros(groupCount, dtype=np.float64)
+    np.divide(sqSums, count - 1, out=var, where=count > 1)
+    return count, mean, np.sqrt(var)
+
+
+def _gen_pairLogSd(n0Geo):
+    """A function which calculates the pairwise variation of all reference genes.
+
+    The standard deviation of log2(a / b) over the conditions is derived for
+    all gene pairs at once from matrix products of the centred log2 values,
+    using only the conditions where both genes have a value.
+
+    Args:
+        n0Geo: The matrix with the N0 per condition (rows) and gene (columns)
+
+    Returns:
+        A square numpy matrix with the standard deviation (ddof=1) of the
+        log2 expression ratio for each pair of genes, NaN for pairs with less
+        than two shared conditions.
+    """
+
+    logN0 = np.log2(n0Geo)
+    valid = ~np.isnan(logN0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        logN0 = np.where(valid, logN0 - np.nanmean(logN0, axis=0), 0.0)
+    valid = valid.astype(np.float64)
+    pairNum = valid.T @ valid
+    pairSum = logN0.T @ valid
+    pairSum = pairSum - pairSum.T
+    pairSqr = (logN0 * logN0).T @ valid
+    pairSqr = pairSqr + pairSqr.T - 2.0 * (logN0.T @ logN0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pairVar = (pairSqr - pairSum * pairSum / pairNum) / (pairNum - 1)
+    pairSd = np.sqrt(np.maximum(pairVar, 0.0))
+    pairSd[pairNum < 2] = np.nan
+    return pairSd
+
+
+def _gen_vValues(sortedN0Geo):
+    """A function which calculates the pairwise variation of successive normalisation factors.
+
+    Args:
+        sortedN0Geo: The N0 matrix with the genes sorted by increasing M value
+
+    Returns:
+        A numpy array with V n/n+1 for n = 2 to the number of genes - 1.
+    """
+
+    logN0 = np.log(sortedN0Geo)
+    logNum = np.cumsum(~np.isnan(logN0), axis=1)
+    logSum = np.cumsum(np.where(np.isnan(logN0), 0.0, logN0), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        geoMean = np.exp(logSum / logNum)
+        logDiff = np.log2(geoMean[:, 1:-1] / geoMean[:, 2:])
+        return np.nanstd(logDiff, axis=0, ddof=1)
+
+
+_genormSvgCache = {}
+_genormSvgCacheMax = 64
+_genormSvgPlots = {
+    "m_values": ("m_targets", 0.8, 0.5),
+    "v_values": ("v_labels", 0.2, 0.15),
+}
+_genormSvgExecutor = []
+# The futures of the renders in progress, keyed like _genormSvgCache
+_genormSvgPending = {}
+_genormSvgLock = threading.Lock()
+
+
+def _gen_renderBarSvg(labels, values, minTop, cutLine):
+    """A function which renders a geNorm bar plot as svg.
+
+    Args:
+        labels: The bar labels
+        values: The bar heights
+        minTop: The minimal upper limit of the y axis
+        cutLine: The height of the dashed threshold line
+
+    Returns:
+        A string with the svg.
+    """
+
+    fig = plt_fig()
+    axis = fig.add_subplot(1, 1, 1)
+    axis.bar(labels, values)
+    axis.tick_params(labelsize=16)
+    axis.tick_params(axis="x", labelrotation=90)
+    xLim = axis.get_xlim()
+    yLim = axis.get_ylim()
+    if yLim[1] < minTop:
+        axis.set_ylim(0.0, minTop)
+    else:
+        axis.set_ylim(0.0, None)
+    axis.plot(xLim, [cutLine, cutLine], "k--")
+    fig.tight_layout()
+    with io.StringIO() as svgFile:
+        figSVG(fig).print_svg(svgFile)
+        return svgFile.getvalue()
+
+
+def _gen_svgPlot(key, labels, values, minTop, cutLine):
+    """A function which returns one geNorm svg plot from the cache. If the
+    plot is rendered by another thread it waits for that render, otherwise
+    it renders the plot itself.
+
+    Args:
+        key: The cache key of the plot
+        labels: The bar labels
+        values: The bar heights
+        minTop: The minimal upper limit of the y axis
+        cutLine: The height of the dashed threshold line
+
+    Returns:
+        A string with the svg.
+    """
+
+    with _genormSvgLock:
+        if key in _genormSvgCache:
+            return _genormSvgCache[key]
+        future = _genormSvgPending.get(key)
+        if future is None:
+            future = concurrent.futures.Future()
+            _genormSvgPending[key] = future
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return future.result()
+
+    try:
+        svg = _gen_renderBarSvg(labels, values, minTop, cutLine)
+    except BaseException as err:
+        with _genormSvgLock:
+            _genormSvgPending.pop(key, None)
+        future.set_exception(err)
+        raise
+    with _genormSvgLock:
+        if len(_genormSvgCache) >= _genormSvgCacheMax:
+            _genormSvgCache.pop(next(iter(_genormSvgCache)), None)
+        _genormSvgCache[key] = svg
+        _genormSvgPending.pop(key, None)
+    future.set_result(svg)
+    return svg
+
+
+def genormSvg(genormRes):
+    """Renders the svg plots of a geNorm result.
+
+    The rendered plots are cached by a hash of the plotted labels and values,
+    so repeated requests for the same result do not render again. A request
+    for a plot which is rendered in the background waits for that render.
+
+    Args:
+        genormRes: The dictionary returned by Experiment.genorm
+
+    Returns:
+        A dictionary with the "m_values" and, if present, the "v_values" svg.
+    """
+
+    ret = {}
+    for plot in _genormSvgPlots:
+        labelKey, minTop, cutLine = _genormSvgPlots[plot]
+        if plot not in genormRes or labelKey not in genormRes:
+            continue
+        key = hashlib.sha1(
+            json.dumps(
+                [plot, genormRes[labelKey], genormRes[plot]], cls=NpEncoder
+            ).encode()
+        ).hexdigest()
+        ret[plot] = _gen_svgPlot(
+            key, genormRes[labelKey], genormRes[plot], minTop, cutLine
+        )
+    return ret
+
+
+def genormSvgAsync(genormRes):
+    """Renders the svg plots of a geNorm result in a background thread.
+
+    Args:
+        genormRes: The dictionary returned by Experiment.genorm
+
+    Returns:
+        A concurrent.futures.Future with the result of genormSvg. Until it is
+        done, genormSvg waits for it instead of rendering the plots again.
+    """
+
+    if len(_genormSvgExecutor) == 0:
+        _genormSvgExecutor.append(
+            concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        )
+    return _genormSvgExecutor[0].submit(genormSvg, genormRes)
+
+
+def _cleanErrorString(inStr, cleanStyle):
+    outStr = ";"
+    inStr += ";"
+    if cleanStyle == "melt":
+        outStr = inStr.replace(
+            "several products with different melting temperatures detected", ""
+        )
+        outStr = outStr.replace(
+            "product with different melting temperatures detected", ""
+        )
+        outStr = outStr.replace(
+            "no product with expected melting temperature", ""
+        )
+        outStr = outStr.replace("product detected in negative control", "")
+    else:
+        strList = inStr.split(";")
+        knownWarn = [
+            "amplification in negative control",
+            "plateau in negative control",
+            "no amplification in positive control",
+            "baseline error in positive control",
+            "instable baseline",
+            "instable baseline in positive control",
+            "no plateau in positive control",
+            "noisy sample in positive control",
+            "Cq < 10, N0 unreliable",
+            "Cq > 34",
+            "no indiv PCR eff can be calculated",
+            "PCR efficiency outlier",
+            "no amplification",
+            "baseline error",
+            "no plateau",
+            "noisy sample",
+            "Cq too high",
+            "N0 unreliable",
+        ]
+        for ele in strList:
+            if ele in knownWarn:
+                continue
+            if re.search(r"^only \d+ values in log phase", ele):
+                continue
+            if re.search(r"^indiv PCR eff is .+", ele):
+                continue
+            outStr += ele + ";"
+
+    #   if inStr.find('several products with different melting temperatures detected') >= 0:
+    #       outStr += ';several products with different melting temperatures detected;'
+    #   if inStr.find('product with different melting temperatures detected') >= 0:
+    #       outStr += ';product with different melting temperatures detected;'
+    #   if inStr.find('no product with expected melting temperature') >= 0:
+    #       outStr += ';no product with expected melting temperature;'
+
+    outStr = re.sub(r";+", ";", outStr)
+    return outStr
+
+
+def _numpyTwoAxisSave(var, fileName):
+    with np.printoptions(precision=3, suppress=True):
+        np.savetxt(fileName, var, fmt="%.6f", delimiter="\t", newline="\n")
+
+
+def _getXMLDataType():
+    return [
+        "tar",
+        "cq",
+        "N0",
+        "ampEffMet",
+        "ampEff",
+        "ampEffSE",
+        "corrF",
+        "corrP",
+        "corrCq",
+        "meltTemp",
+        "excl",
+        "note",
+        "adp",
+        "mdp",
+        "endPt",
+        "bgFluor",
+        "quantFluor",
+    ]
+
+
+def _getXMLPartitionDataType():
+    return ["tar", "excluded", "note", "pos", "neg", "undef", "excl", "conc"]
+
+
+class ResultsTable:
+    """RDML-Python library.
+
+    A columnar result table with one typed numpy array per column.
+
+    Attributes:
+        _header: The list of column names.
+        _formats: The list of column formats, "text", "num", "yesno", "%d" or a printf format like "%0.6f".
+        _columns: The list of numpy arrays holding the column values.
+    """
+
+    __slots__ = ("_header", "_formats", "_columns")
+
+    def __init__(self, header, formats, rows):
+        """Inits an empty result table.
+
+        Args:
+            self: The class self parameter.
+            header: The list of column names.
+            formats: The list of column formats, "text", "num", "yesno", "%d" or a float printf format.
+            rows: The number of rows.
+
+        Returns:
+            No return value. Function may raise RdmlError if required.
+        """
+
+        if len(header) != len(formats):
+            raise RdmlError("Results table header and formats must match.")
+        self._header = list(header)
+        self._formats = list(formats)
+        self._columns = []
+        for fmt in self._formats:
+            if fmt == "text":
+                col = np.empty(rows, dtype=object)
+                col[:] = ""
+            elif fmt == "yesno":
+                col = np.zeros(rows, dtype=np.bool_)
+            elif fmt == "%d":
+                col = np.zeros(rows, dtype=np.int64)
             else:
-                checkVarEff = 0.0
+                col = np.full(rows, np.nan, dtype=np.float64)
+            self._columns.append(col)
 
-            if (
-                counter >= 60
-                or newUpWin - foldWidth / (pointsInWoL / 2.0) < minFluorLim
-                or checkVarEff < 0.00000000001
-            ):
-                break
+    def __len__(self):
+        """Returns the number of rows.
 
-        # corrections: start
-        if checkVarEff < 0.00000000001:
-            counter -= 1  # remove window with vareff was 0.0
+        Args:
+            self: The class self parameter.
 
-        validSteps = -1
-        while True:
-            validSteps += 1
-            if memVarEff[validSteps] < 0.000001:
-                break
-        validSteps -= 1  # i = number of valid steps
+        Returns:
+            The int number of rows.
+        """
 
-        minSmooth = memVarEff[0]
-        minStep = 0  # default top window
+        if len(self._columns) == 0:
+            return 0
+        return len(self._columns[0])
 
-        # next 3 if conditions on i: added to correct smoothing
-        if validSteps == 0:
-            minStep = 0
+    def __getitem__(self, key):
+        """Returns the column array for a column name or position.
 
-        if 0 < validSteps < 4:
-            n = -1
-            while True:
-                n += 1
-                if memVarEff[n] < minSmooth:
-                    minSmooth = memVarEff[n]
-                    minStep = n
-                if n == validSteps:
-                    break
-        if validSteps >= 4:
-            n = 0
-            while True:
-                n += 1
-                smoothVar = 0.0
-                for m in range(n - 1, n + 2):
-                    smoothVar = smoothVar + memVarEff[m]
-                smoothVar = smoothVar / 3.0
-                if smoothVar < minSmooth:
-                    minSmooth = smoothVar
-                    minStep = n
+        Args:
+            self: The class self parameter.
+            key: The column name (string) or position (int)
 
-                if n >= validSteps - 1 or n > maxVarEffStep:
-                    break
-        # corrections: stop
+        Returns:
+            The numpy array of the column.
+        """
 
-        # Calculate the final values again
-        upWin, lowWin = _lrp_setLogWin(
-            tarGroup,
-            memUpWin[minStep],
-            memFoldWidth[minStep],
-            upWin,
-            lowWin,
-            maxFluorTotal,
-            minFluorTotal,
+        return self._columns[self._column_pos(key)]
+
+    def __setitem__(self, key, value):
+        """Sets all values of a column, the values are converted to the column type.
+
+        Args:
+            self: The class self parameter.
+            key: The column name (string) or position (int)
+            value: The list or array with the new values
+
+        Returns:
+            No return value, changes self.
+        """
+
+        pos = self._column_pos(key)
+        self._columns[pos][:] = value
+
+    def _column_pos(self, key):
+        if isinstance(key, (int, np.integer)):
+            return int(key)
+        try:
+            return self._header.index(key)
+        except ValueError:
+            raise KeyError(key)
+
+    def header(self):
+        """Returns the list of column names.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            A list of the column name strings.
+        """
+
+        return list(self._header)
+
+    def _format_column(self, pos, start, stop):
+        fmt = self._formats[pos]
+        values = self._columns[pos][start:stop]
+        if fmt == "yesno":
+            return np.where(values, "Yes", "No").tolist()
+        if fmt in ["text", "num"]:
+            return [str(val) for val in values.tolist()]
+        return [fmt % val for val in values.tolist()]
+
+    def to_tsv(self, fileObj=None, blockSize=4096):
+        """Writes the table as tab separated text. The values are formatted
+        column by column and written in blocks of rows.
+
+        Args:
+            self: The class self parameter.
+            fileObj: A file like object with a write method, if None a string is returned.
+            blockSize: The number of rows formatted and written in one step.
+
+        Returns:
+            The table string if fileObj is None, otherwise nothing.
+        """
+
+        retStr = fileObj is None
+        if retStr:
+            fileObj = io.StringIO()
+        fileObj.write("\t".join(self._header) + "\n")
+        rowCount = len(self)
+        for start in range(0, rowCount, blockSize):
+            stop = min(start + blockSize, rowCount)
+            cols = [
+                self._format_column(pos, start, stop)
+                for pos in range(0, len(self._columns))
+            ]
+            fileObj.write("".join("\t".join(row) + "\n" for row in zip(*cols)))
+        if retStr:
+            return fileObj.getvalue()
+
+    def to_list(self):
+        """Returns the table as 2d list including the header row.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            A 2d list with the header as first row.
+        """
+
+        ret = [list(self._header)]
+        for row in zip(*[col.tolist() for col in self._columns]):
+            ret.append(list(row))
+        return ret
+
+    def to_records(self):
+        """Returns the table as numpy record array with the column names as fields.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            A numpy record array.
+        """
+
+        return np.rec.fromarrays(self._columns, names=self._header)
+
+    def to_dataframe(self):
+        """Returns the table as pandas DataFrame. Requires pandas.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            A pandas DataFrame.
+        """
+
+        try:
+            import pandas as pd
+        except ImportError:
+            raise RdmlError("The pandas package is required for a DataFrame.")
+        return pd.DataFrame(
+            {
+                self._header[pos]: self._columns[pos]
+                for pos in range(0, len(self._columns))
+            },
+            columns=self._header,
         )
-        if tarGroup is None:
-            threshold[0] = 0.5 * np.round(1000 * upWin[0]) / 1000
-        else:
-            threshold[tarGroup] = 0.5 * np.round(1000 * upWin[tarGroup]) / 1000
 
-        (
-            indMeanX,
-            indMeanY,
-            pcrEff,
-            nNulls,
-            nInclu,
-            correl,
-        ) = _lrp_allParamInWindow(
-            fluor,
-            tarGroup,
-            vecTarget,
-            indMeanX,
-            indMeanY,
-            pcrEff,
-            nNulls,
-            nInclu,
-            correl,
-            upWin,
-            lowWin,
-            vecNoAmplification,
-            vecBaselineError,
+
+_statCriticValues = {}
+_statCriticValuesMax = 256
+
+
+def _stat_tCritical(df):
+    """A function which returns the two-sided 5% critical t value.
+
+    Args:
+        df: The degrees of freedom
+
+    Returns:
+        The critical value, cached per degrees of freedom.
+    """
+
+    key = ("t", df)
+    if key not in _statCriticValues:
+        if len(_statCriticValues) >= _statCriticValuesMax:
+            del _statCriticValues[next(iter(_statCriticValues))]
+        _statCriticValues[key] = scp.t.ppf(1 - 0.05 / 2.0, df)
+    return _statCriticValues[key]
+
+
+def _stat_snkCriticQ(dfWithin, groupCount):
+    """A function which returns the Student-Newman-Keuls critical Q values.
+
+    Args:
+        dfWithin: The degrees of freedom within the groups
+        groupCount: The number of groups
+
+    Returns:
+        A numpy array with the approximated studentized range critical value
+        indexed by the group range, NaN for ranges of 1 or above dfWithin.
+        The array is cached per degrees of freedom and group count.
+    """
+
+    key = ("q", dfWithin, groupCount)
+    if key in _statCriticValues:
+        return _statCriticValues[key]
+    tCrit = _stat_tCritical(dfWithin)
+    criticQ = np.full(groupCount + 1, np.nan)
+    for grpRange in range(2, min(groupCount, dfWithin) + 1):
+        criticQ[grpRange] = tCrit * (
+            np.log(grpRange - 1)
+            * (
+                0.8843
+                - 0.2368 * tCrit
+                - 1.214 / dfWithin
+                + 1.208 * tCrit / dfWithin
+            )
+            + np.sqrt(2)
         )
-        for aRow in range(0, len(pcrEff)):
-            if tarGroup is None or tarGroup == vecTarget[aRow]:
-                if (
-                    not (
-                        vecSkipSample[aRow]
-                        or vecNoPlateau[aRow]
-                        or vecShortLogLin[aRow]
-                    )
-                ) and pcrEff[aRow] > 1.0:
-                    vecIsUsedInWoL[aRow] = True
-                else:
-                    vecIsUsedInWoL[aRow] = False
+    if len(_statCriticValues) >= _statCriticValuesMax:
+        del _statCriticValues[next(iter(_statCriticValues))]
+    _statCriticValues[key] = criticQ
+    return criticQ
 
-    return (
-        indMeanX,
-        indMeanY,
-        pcrEff,
-        nNulls,
-        nInclu,
-        correl,
-        upWin,
-        lowWin,
-        threshold,
-        vecIsUsedInWoL,
-    )
 
+def _stat_multiComp(labels, centers, centerName, obsDiff, criticDiff):
+    """A function which creates the multiple comparison table.
 
-def _lrp_assignNoPlateau(
-    fluor,
-    tarGroup,
-    vecTarget,
-    pointsInWoL,
-    indMeanX,
-    indMeanY,
-    pcrEff,
-    nNulls,
-    nInclu,
-    correl,
-    upWin,
-    lowWin,
-    maxFluorTotal,
-    minFluorTotal,
-    stopCyc,
-    startCyc,
-    threshold,
-    vecNoAmplification,
-    vecBaselineError,
-    vecSkipSample,
-    vecNoPlateau,
-    vecShortLogLin,
-    vecIsUsedInWoL,
-):
-    """Assign no plateau again and possibly recalculate WoL if new no plateau
-    was found.
+    Args:
+        labels: The group names in table order
+        centers: The numpy array with the group centers in table order
+        centerName: The name of the center, "mean" or "median"
+        obsDiff: The numpy grid with the observed differences
+        criticDiff: The numpy grid with the critical differences, NaN if not tested
+
+    Returns:
+        A list of lists with the group header rows and one row per group.
+    """
+
+    marks = np.where(obsDiff > criticDiff, "*", "ns")
+    marks[np.isnan(criticDiff)] = "-"
+    centerVals = centers.tolist()
+    grpGridMultiComp = [
+        ["group", ""] + labels,
+        ["", centerName] + centerVals,
+    ]
+    for row in range(0, len(labels)):
+        grpGridMultiComp.append(
+            [labels[row], centerVals[row]] + marks[row].tolist()
+        )
+    return grpGridMultiComp
+
+
+def _stat_snk(tab, tar, translateGrp):
+    """A function which runs the Student-Newman-Keuls multiple comparison.
 
     Args:
-        fluor: The array with the fluorescence values
-        tarGroup: The target number
-        vecTarget: The vector with the targets numbers
-        pointsInWoL: The number of points in the window
-        indMeanX: The vector with the x mean position
-        indMeanY: The vector with the y mean position
-        pcrEff: The array with the PCR efficiencies
-        nNulls: The array with the calculated nNulls
-        nInclu: The array with the calculated nInclu
-        correl: The array with the calculated correl
-        upWin: The upper limit of the window
-        lowWin: The lower limit of the window
-        maxFluorTotal: The maximum fluorescence over all rows
-        minFluorTotal: The minimum fluorescence over all rows
-        stopCyc: The vector with the stop cycle of the log lin phase
-        startCyc: The vector with the start cycle of the log lin phase
-        threshold: The threshold fluorescence
-        vecNoAmplification: True if there is a amplification error
-        vecBaselineError: True if there is a baseline error
-        vecSkipSample: Skip the sample
-        vecNoPlateau: True if there is no plateau
-        vecShortLogLin: True indicates a short log lin phase
-        vecIsUsedInWoL: True if used in the WoL
+        tab: The dictionary with the long table arrays from runStatisticsBatch
+        tar: The target index in the table
+        translateGrp: The group names of the target
+
+    Returns:
+        The multiple comparison table with the groups sorted by increasing mean.
+    """
+
+    first = tab["grpStart"][tar]
+    last = tab["grpStart"][tar + 1]
+    grpN = tab["grpN"][first:last]
+    grpSum = tab["grpSum"][first:last]
+    grpCount = last - first
+    totalN = int(tab["tarN"][tar])
+
+    # Same summation order as the textbook sum of squares
+    statQuant1 = 0.0
+    statQuant2 = 0.0
+    statQuant3 = 0.0
+    for row in range(0, grpCount):
+        statQuant1 += grpSum[row]
+        statQuant2 += tab["grpSum2"][first + row]
+        statQuant3 += grpSum[row] * grpSum[row] / grpN[row]
+    statQuant4 = statQuant1 * statQuant1 / totalN
+    statSSwithin = (statQuant2 - statQuant4) - (statQuant3 - statQuant4)
+    dfWithin = totalN - grpCount
+    statMSwithin = statSSwithin / dfWithin
+
+    order = np.argsort(tab["grpMean"][first:last], kind="stable")
+    sortMean = tab["grpMean"][first:last][order]
+    sortN = grpN[order].astype(np.float64)
+    pos = np.arange(grpCount)
+    grpGridObsDiff = np.abs(sortMean[:, None] - sortMean[None, :])
+    grpGridGrpRange = np.abs(pos[:, None] - pos[None, :]) + 1
+    grpGridCriticQ = _stat_snkCriticQ(dfWithin, grpCount)[grpGridGrpRange]
+    with np.errstate(invalid="ignore"):
+        grpGridCriticDiff = (
+            grpGridCriticQ
+            * np.sqrt(statMSwithin)
+            * np.sqrt(
+                (sortN[:, None] + sortN[None, :])
+                / (2.0 * sortN[:, None] * sortN[None, :])
+            )
+        )
+    labels = [translateGrp[grp] for grp in order.tolist()]
+    return _stat_multiComp(
+        labels, sortMean, "mean", grpGridObsDiff, grpGridCriticDiff
+    )
+
+
+def _stat_kruskalPostHoc(tab, tar, translateGrp):
+    """A function which runs the multiple comparison of mean ranks.
+
+    Args:
+        tab: The dictionary with the long table arrays from runStatisticsBatch
+        tar: The target index in the table
+        translateGrp: The group names of the target
 
     Returns:
-        The values indMeanX, indMeanY, pcrEff, nNulls, nInclu, correl, upWin, lowWin, threshold, vecIsUsedInWoL, vecNoPlateau.
+        The multiple comparison table with the groups in input order.
     """
-    newNoPlateau = False
-    for aRow in range(0, fluor.shape[0]):
-        if (tarGroup is None or tarGroup == vecTarget[aRow]) and not (
-            vecNoAmplification[aRow]
-            or vecBaselineError[aRow]
-            or vecNoPlateau[aRow]
-        ):
-            expectedFluor = nNulls[aRow] * np.power(
-                pcrEff[aRow], fluor.shape[1]
-            )
-            if expectedFluor / fluor[aRow, fluor.shape[1] - 1] < 5:
-                newNoPlateau = True
-                vecNoPlateau[aRow] = True
 
-    if newNoPlateau:
-        (
-            indMeanX,
-            indMeanY,
-            pcrEff,
-            nNulls,
-            nInclu,
-            correl,
-            upWin,
-            lowWin,
-            threshold,
-            vecIsUsedInWoL,
-        ) = _lrp_setWoL(
-            fluor,
-            tarGroup,
-            vecTarget,
-            pointsInWoL,
-            indMeanX,
-            indMeanY,
-            pcrEff,
-            nNulls,
-            nInclu,
-            correl,
-            upWin,
-            lowWin,
-            maxFluorTotal,
-            minFluorTotal,
-            stopCyc,
-            startCyc,
-            threshold,
-            vecNoAmplification,
-            vecBaselineError,
-            vecSkipSample,
-            vecNoPlateau,
-            vecShortLogLin,
-            vecIsUsedInWoL,
-        )
+    first = tab["grpStart"][tar]
+    last = tab["grpStart"][tar + 1]
+    grpN = tab["grpN"][first:last].astype(np.float64)
+    grpRankSum = tab["grpRankSum"][first:last]
+    grpCount = last - first
+    totalN = int(tab["tarN"][tar])
+
+    statresS1 = 0.0
+    for row in range(0, grpCount):
+        statresS1 += grpRankSum[row] * grpRankSum[row] / grpN[row]
+    statresN3 = totalN * (totalN + 1) * (totalN + 1) / 4
+    statresS2 = (1 / (totalN - 1)) * (tab["tarRankSqrSum"][tar] - statresN3)
+    statresTT = (1 / statresS2) * (statresS1 - statresN3)
+    statresSD = _stat_tCritical(totalN - grpCount) * np.sqrt(
+        statresS2 * ((totalN - 1 - statresTT) / (totalN - grpCount))
+    )
 
-    return (
-        indMeanX,
-        indMeanY,
-        pcrEff,
-        nNulls,
-        nInclu,
-        correl,
-        upWin,
-        lowWin,
-        threshold,
-        vecIsUsedInWoL,
-        vecNoPlateau,
+    meanRank = grpRankSum / grpN
+    grpGridRanksum = np.abs(meanRank[:, None] - meanRank[None, :])
+    with np.errstate(invalid="ignore"):
+        grpGridCriticDiff = statresSD * np.sqrt(
+            1 / grpN[:, None] + 1 / grpN[None, :]
+        )
+    grpGridCriticDiff[grpGridRanksum <= 0.0] = np.nan
+    labels = [translateGrp[grp] for grp in range(0, grpCount)]
+    return _stat_multiComp(
+        labels,
+        tab["grpMedian"][first:last],
+        "median",
+        grpGridRanksum,
+        grpGridCriticDiff,
     )
 
 
-def _lrp_removeOutlier(data, vecNoPlateau, alpha=0.05):
-    """A function which calculates the skewness and Grubbs test to identify
-    outliers ignoring nan.
+def runStatisticsBatch(statTarGroups, parametric, translateGrps):
+    """Runs the group statistics for many targets at once.
+
+    The values of all targets are combined in one long table. The test
+    statistics of all targets are calculated with grouped array operations
+    and the p values with one call per distribution. Post-hoc comparisons
+    are run for targets with more than two groups and p <= 0.05.
 
     Args:
-        data: The numpy array with the data
-        vecNoPlateau: The vector of samples without plateau.
-        alpha: The the significance level (default 0.05)
+        statTarGroups: A dictionary with the list of group value lists per target
+        parametric: True uses parametric tests, False non-parametric tests
+        translateGrps: A dictionary with the group names per target
 
     Returns:
-        The a bool array with the removed outliers set true.
+        A dictionary with the statistics result per target.
     """
 
-    oData = np.copy(data)
-    oLogic = np.zeros(data.shape, dtype=np.bool_)
-    loopOn = True
+    parametric = _string_to_bool(parametric, triple=False)
+    allRes = {}
+    tarKeys = []
+    grpTar = []
+    valGrp = []
+    vals = []
+    for target in statTarGroups:
+        allRes[target] = {}
+        allRes[target]["multi comparison"] = ""
+        groups = statTarGroups[target]
+        if len(groups) < 2:
+            allRes[target]["test name"] = "no test possible"
+            allRes[target]["stat name"] = "only 1 group"
+            allRes[target]["stat val"] = -1.0
+            allRes[target]["p val"] = -1.0
+            continue
+        if parametric and len(groups) == 2:
+            allRes[target]["test name"] = "T-test"
+            allRes[target]["stat name"] = "t-statistic"
+        elif parametric:
+            allRes[target]["test name"] = "One-way ANOVA"
+            allRes[target]["stat name"] = "F statistic"
+        elif len(groups) == 2:
+            allRes[target]["test name"] = "Mann-Whitney U rank test"
+            allRes[target]["stat name"] = "U statistic"
+        else:
+            allRes[target]["test name"] = "Kruskal-Wallis H-test"
+            allRes[target]["stat name"] = "H statistic"
+        if min([len(group) for group in groups]) == 0:
+            allRes[target]["stat val"] = float("nan")
+            allRes[target]["p val"] = float("nan")
+            continue
+        for group in groups:
+            valGrp.extend([len(grpTar)] * len(group))
+            vals.extend(group)
+            grpTar.append(len(tarKeys))
+        tarKeys.append(target)
+    if len(tarKeys) == 0:
+        return allRes
+
+    # The long table, values are contiguous per group and per target
+    tarCount = len(tarKeys)
+    tab = {}
+    grpTar = np.array(grpTar, dtype=np.int64)
+    valGrp = np.array(valGrp, dtype=np.int64)
+    vals = np.array(vals, dtype=np.float64)
+    valTar = grpTar[valGrp]
+    grpCount = len(grpTar)
+    tarGrpN = np.bincount(grpTar, minlength=tarCount)
+    tab["grpStart"] = np.concatenate(([0], np.cumsum(tarGrpN)))
+    tab["grpN"] = np.bincount(valGrp, minlength=grpCount)
+    tab["tarN"] = np.bincount(valTar, minlength=tarCount)
+    valStart = np.concatenate(([0], np.cumsum(tab["tarN"])))
+    tarN = tab["tarN"].astype(np.float64)
+    n1 = tab["grpN"][tab["grpStart"][:-1]].astype(np.float64)
+    n2 = tab["grpN"][tab["grpStart"][:-1] + 1].astype(np.float64)
+    twoGrp = tarGrpN == 2
+    tarConst = np.minimum.reduceat(vals, valStart[:-1]) == np.maximum.reduceat(
+        vals, valStart[:-1]
+    )
 
-    while loopOn:
-        count = np.count_nonzero(~np.isnan(oData))
-        if count < 3:
-            loopOn = False
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if parametric:
+            tab["grpSum"] = np.bincount(
+                valGrp, weights=vals, minlength=grpCount
+            )
+            tab["grpSum2"] = np.bincount(
+                valGrp, weights=vals * vals, minlength=grpCount
+            )
+            tab["grpMean"] = tab["grpSum"] / tab["grpN"]
+            dev = vals - tab["grpMean"][valGrp]
+            grpSS = np.bincount(valGrp, weights=dev * dev, minlength=grpCount)
+            tarMean = (
+                np.bincount(valTar, weights=vals, minlength=tarCount) / tarN
+            )
+            grpDev = tab["grpMean"] - tarMean[grpTar]
+            ssGroups = np.bincount(
+                grpTar,
+                weights=tab["grpN"] * grpDev * grpDev,
+                minlength=tarCount,
+            )
+            ssWithin = np.bincount(grpTar, weights=grpSS, minlength=tarCount)
+            dfGroups = tarGrpN - 1.0
+            dfWithin = tarN - tarGrpN
+            statF = (ssGroups / dfGroups) / (ssWithin / dfWithin)
+            meanDiff = (
+                tab["grpMean"][tab["grpStart"][:-1]]
+                - tab["grpMean"][tab["grpStart"][:-1] + 1]
+            )
+            statT = meanDiff / np.sqrt(
+                ssWithin / dfWithin * (1.0 / n1 + 1.0 / n2)
+            )
+            statVal = np.where(twoGrp, statT, statF)
+            pVal = np.where(
+                twoGrp,
+                2.0 * scp.t.sf(np.abs(statT), dfWithin),
+                scp.f.sf(statF, dfGroups, dfWithin),
+            )
         else:
-            mean = np.nanmean(oData)
-            std = np.nanstd(oData, ddof=1)
-            skewness = scp.skew(oData, bias=False, nan_policy="omit")
-            skewness_SE = np.sqrt(
-                (6 * count * (count - 1))
-                / ((count - 2) * (count + 1) * (count + 3))
+            # Average ranks within each target, ties share their mean rank
+            order = np.lexsort((vals, valTar))
+            sortVals = vals[order]
+            sortTar = valTar[order]
+            newRun = np.ones(len(vals), dtype=bool)
+            newRun[1:] = (sortVals[1:] != sortVals[:-1]) | (
+                sortTar[1:] != sortTar[:-1]
             )
-            skewness_t = np.abs(skewness) / skewness_SE
-            skewness_P = scp.t.sf(skewness_t, df=np.power(10, 10)) * 2
-
-            if skewness_P < alpha / 2.0:
-                # It's skewed!
-                grubbs_t = scp.t.ppf(1 - (alpha / count) / 2, (count - 2))
-                grubbs_Gcrit = ((count - 1) / np.sqrt(count)) * np.sqrt(
-                    np.power(grubbs_t, 2)
-                    / ((count - 2) + np.power(grubbs_t, 2))
+            runStart = np.flatnonzero(newRun)
+            runLen = np.diff(np.append(runStart, len(vals)))
+            runTar = sortTar[runStart]
+            runRank = (2 * (runStart - valStart[runTar]) + runLen + 1) / 2.0
+            ranks = np.empty(len(vals), dtype=np.float64)
+            ranks[order] = np.repeat(runRank, runLen)
+            tieSum = np.bincount(
+                runTar, weights=runLen**3.0 - runLen, minlength=tarCount
+            )
+            tab["grpRankSum"] = np.bincount(
+                valGrp, weights=ranks, minlength=grpCount
+            )
+            tab["tarRankSqrSum"] = np.bincount(
+                valTar, weights=ranks * ranks, minlength=tarCount
+            )
+            statH = (
+                12.0
+                / (tarN * (tarN + 1.0))
+                * np.bincount(
+                    grpTar,
+                    weights=tab["grpRankSum"] ** 2 / tab["grpN"],
+                    minlength=tarCount,
                 )
-                if skewness > 0.0:
-                    data_max = np.nanmax(oData)
-                    grubbs_res = (data_max - mean) / std
-                    max_pos = np.nanargmax(oData)
-                    if grubbs_res > grubbs_Gcrit:
-                        # It's a true outlier
-                        oData[max_pos] = np.nan
-                        oLogic[max_pos] = True
-                    else:
-                        if vecNoPlateau[max_pos]:
-                            # It has no plateau
-                            oData[max_pos] = np.nan
-                            oLogic[max_pos] = True
-                        else:
-                            loopOn = False
-                else:
-                    data_min = np.nanmin(oData)
-                    grubbs_res = (mean - data_min) / std
-                    min_pos = np.nanargmin(oData)
-                    if grubbs_res > grubbs_Gcrit:
-                        # It's a true outlier
-                        oData[min_pos] = np.nan
-                        oLogic[min_pos] = True
-                    else:
-                        if vecNoPlateau[min_pos]:
-                            # It has no plateau
-                            oData[min_pos] = np.nan
-                            oLogic[min_pos] = True
-                        else:
-                            loopOn = False
-            else:
-                loopOn = False
-    return oLogic
+                - 3.0 * (tarN + 1.0)
+            ) / (1.0 - tieSum / (tarN**3 - tarN))
+            statU = (
+                tab["grpRankSum"][tab["grpStart"][:-1]] - n1 * (n1 + 1.0) / 2.0
+            )
+            sdU = np.sqrt(
+                n1
+                * n2
+                / 12.0
+                * ((tarN + 1.0) - tieSum / (tarN * (tarN - 1.0)))
+            )
+            zU = (np.maximum(statU, n1 * n2 - statU) - n1 * n2 / 2.0) / sdU
+            statVal = np.where(twoGrp, statU, statH)
+            pVal = np.where(
+                twoGrp,
+                np.minimum(2.0 * scp.norm.sf(zU), 1.0),
+                scp.chi2.sf(statH, tarGrpN - 1.0),
+            )
+            # Medians from the values sorted within each group
+            grpOrder = np.lexsort((vals, valGrp))
+            grpFirst = np.concatenate(([0], np.cumsum(tab["grpN"])))[:-1]
+            tab["grpMedian"] = (
+                vals[grpOrder[grpFirst + (tab["grpN"] - 1) // 2]]
+                + vals[grpOrder[grpFirst + tab["grpN"] // 2]]
+            ) / 2.0
+
+    # All values identical gives no statistic, except for the U statistic
+    if parametric:
+        statVal[tarConst] = np.nan
+    else:
+        statVal[tarConst & ~twoGrp] = np.nan
+    pVal[tarConst] = np.nan
+    statVal = statVal.tolist()
+    pVal = pVal.tolist()
+    for tar in range(0, tarCount):
+        target = tarKeys[tar]
+        allRes[target]["stat val"] = statVal[tar]
+        allRes[target]["p val"] = pVal[tar]
+        if twoGrp[tar] or not pVal[tar] <= 0.05:
+            continue
+        if parametric:
+            allRes[target]["multi comparison"] = _stat_snk(
+                tab, tar, translateGrps[target]
+            )
+        else:
+            allRes[target]["multi comparison"] = _stat_kruskalPostHoc(
+                tab, tar, translateGrps[target]
+            )
+    return allRes
 
 
-def _mca_smooth(tempList, rawFluor):
-    """A function to smooth the melt curve date based on Friedmans
-    supersmoother.
+def runStatistics(statTarGroup, parametric, translateGrp):
+    return runStatisticsBatch(
+        {0: statTarGroup}, parametric, {0: translateGrp}
+    )[0]
 
-       # https://www.slac.stanford.edu/pubs/slacpubs/3250/slac-pub-3477.pdf
 
-    Args:
-        tempList:
-        rawFluor: The numpy array with the raw data
+def webAppRunStatistics(
+    data, parametric=False, seperator="\t", replaceComma=True
+):
+    replaceComma = _string_to_bool(replaceComma, triple=False)
+    goodData = []
+    foundGrp = {}
+    translateGrp = {}
+    posGrp = 0
 
-    Returns:
-        The numpy array with the smoothed data.
+    dff = io.StringIO(data)
+    rawData = list(csv.reader(dff, delimiter=seperator))
+    for row in range(0, len(rawData)):
+        if len(rawData[row]) < 2:
+            continue
+        if rawData[row][0] not in foundGrp:
+            foundGrp[rawData[row][0]] = posGrp
+            translateGrp[posGrp] = rawData[row][0]
+            goodData.append([])
+            posGrp += 1
+        for col in range(1, len(rawData[row])):
+            cell = rawData[row][col]
+            if replaceComma:
+                cell = re.sub(r"\.", "", cell)
+                cell = re.sub(r",", "\.", cell)
+            goodData[foundGrp[rawData[row][0]]].append(float(cell))
+
+    return runStatistics(goodData, parametric, translateGrp)
+
+
+class MeltDerivativeFiles:
+    """RDML-Python library.
+
+    Writes the derivative data of the melt curve analysis block by block
+    to tab separated files, use it as derivativeCallback. Used in a with
+    statement, the files are closed even if the analysis raises.
+
+    Attributes:
+        _baseName: The base name of the files.
+        _files: A dictionary with the open file of each data name.
     """
 
-    span_s = 0.05
-    span_m = 0.2
-    span_l = 0.5
+    def __init__(self, baseName):
+        """Inits the writer, the files are created on the first data.
 
-    smoothFluor = np.zeros(rawFluor.shape, dtype=np.float64)
+        Args:
+            self: The class self parameter.
+            baseName: The base name, the data name and .tsv are appended.
 
-    padTemp = np.append(0.0, tempList)
+        Returns:
+            No return value.
+        """
 
-    zeroPad = np.zeros((rawFluor.shape[0], 1), dtype=np.float64)
-    padFluor = np.append(zeroPad, rawFluor, axis=1)
-    n = len(padTemp) - 1
+        self._baseName = baseName
+        self._files = {}
 
-    # Find the increase in x from 0.25 to 0.75 over the total range
-    firstQuarter = int(0.5 + n / 4)
-    thirdQuarter = 3 * firstQuarter
-    scale = -1.0
-    while scale <= 0.0:
-        if thirdQuarter < n:
-            thirdQuarter += 1
-        if firstQuarter > 1:
-            firstQuarter -= 1
-        scale = padTemp[thirdQuarter] - padTemp[firstQuarter]
-    vsmlsq = 0.0001 * scale * 0.0001 * scale
+    def __call__(self, dataName, dataRows):
+        """Appends the rows to the file of the data name.
 
-    countUp = 0
-    for fluor in padFluor:
-        [res_s_a, res_s_t] = _mca_sub_smooth(
-            padTemp, fluor, span_s, vsmlsq, True
-        )
-        [res_s_b, _unused] = _mca_sub_smooth(
-            padTemp, res_s_t, span_m, vsmlsq, False
-        )
-        [res_s_c, res_s_t] = _mca_sub_smooth(
-            padTemp, fluor, span_m, vsmlsq, True
-        )
-        [res_s_d, _unused] = _mca_sub_smooth(
-            padTemp, res_s_t, span_m, vsmlsq, False
-        )
-        [res_s_e, res_s_t] = _mca_sub_smooth(
-            padTemp, fluor, span_l, vsmlsq, True
-        )
-        [res_s_f, _unused] = _mca_sub_smooth(
-            padTemp, res_s_t, span_m, vsmlsq, False
-        )
+        Args:
+            self: The class self parameter.
+            dataName: The name of the data, like "smoothed" or "firstDerivative".
+            dataRows: The list of rows to write.
+
+        Returns:
+            No return value.
+        """
+
+        if dataName not in self._files:
+            self._files[dataName] = open(
+                self._baseName + "_" + dataName + ".tsv", "w"
+            )
+        floatFormat = "{0:0.8f}"
+        if dataName in ["firstDerivative", "secondDerivative"]:
+            floatFormat = "{0:0.8e}"
+        lines = []
+        for row in dataRows:
+            cols = []
+            for col in row:
+                if type(col) is float:
+                    cols.append(floatFormat.format(col))
+                else:
+                    cols.append(str(col))
+            lines.append("\t".join(cols) + "\n")
+        self._files[dataName].write("".join(lines))
+
+    def close(self):
+        """Closes all written files.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            No return value.
+        """
 
-        res_s_fin = np.zeros(res_s_a.shape, dtype=np.float64)
-        for thirdQuarter in range(1, n + 1):
-            resmin = 1.0e20
-            if res_s_b[thirdQuarter] < resmin:
-                resmin = res_s_b[thirdQuarter]
-                res_s_fin[thirdQuarter] = span_s
-            if res_s_d[thirdQuarter] < resmin:
-                resmin = res_s_d[thirdQuarter]
-                res_s_fin[thirdQuarter] = span_m
-            if res_s_f[thirdQuarter] < resmin:
-                res_s_fin[thirdQuarter] = span_l
+        for dataFile in self._files.values():
+            dataFile.close()
+        self._files = {}
 
-        [res_s_bb, _unused] = _mca_sub_smooth(
-            padTemp, res_s_fin, span_m, vsmlsq, False
-        )
+    def __enter__(self):
+        """Returns the writer for use in a with statement.
 
-        res_s_cc = np.zeros(res_s_a.shape, dtype=np.float64)
-        for thirdQuarter in range(1, n + 1):
-            # compare res_s_bb with spans[] and make sure the no res_s_bb[] is below span_s or above span_l
-            if res_s_bb[thirdQuarter] <= span_s:
-                res_s_bb[thirdQuarter] = span_s
-            if res_s_bb[thirdQuarter] >= span_l:
-                res_s_bb[thirdQuarter] = span_l
-            f = res_s_bb[thirdQuarter] - span_m
-            if f >= 0.0:
-                # in case res_s_bb[] is higher than span_m: calculate res_s_cc[] from res_s_c and res_s_e
-                # using linear interpolation between span_l and span_m
-                f = f / (span_l - span_m)
-                res_s_cc[thirdQuarter] = (1.0 - f) * res_s_c[
-                    thirdQuarter
-                ] + f * res_s_e[thirdQuarter]
-            else:
-                # in case res_s_bb[] is less than span_m: calculate res_s_cc[] from res_s_c and res_s_a
-                # using linear interpolation between span_s and span_m
-                f = -f / (span_m - span_s)
-                res_s_cc[thirdQuarter] = (1.0 - f) * res_s_c[
-                    thirdQuarter
-                ] + f * res_s_a[thirdQuarter]
+        Args:
+            self: The class self parameter.
 
-        # final smoothing of combined optimally smoothed values in res_s_cc[] into smo[]
-        [res_s_t, _unused] = _mca_sub_smooth(
-            padTemp, res_s_cc, span_s, vsmlsq, False
-        )
-        smoothFluor[countUp] = res_s_t[1:]
-        countUp += 1
+        Returns:
+            The MeltDerivativeFiles object.
+        """
 
-    return smoothFluor
+        return self
 
+    def __exit__(self, excType, excValue, traceback):
+        """Closes all written files at the end of a with statement.
 
-def _mca_sub_smooth(temperature, fluor, span, vsmlsq, saveVarianceData):
-    """A function to smooth the melt curve date based on Friedmans
-    supersmoother.
+        Args:
+            self: The class self parameter.
+            excType: The type of the raised exception or None.
+            excValue: The raised exception or None.
+            traceback: The traceback of the raised exception or None.
+
+        Returns:
+            False, exceptions are not suppressed.
+        """
+
+        self.close()
+        return False
+
+
+# The weak references to the active stage profilers and a flag set while
+# the profilers started tracemalloc
+_stageProfilers = []
+_stageProfilerTrace = []
 
-       # https://www.slac.stanford.edu/pubs/slacpubs/3250/slac-pub-3477.pdf
+
+def _stageProfilerUpdate(release=None):
+    """A function which hands the peak of tracemalloc to all active stage
+    profilers and resets it if the profilers started the tracing. Profilers
+    which are finished or were dropped by an exception are removed,
+    tracemalloc is stopped with the last one.
 
     Args:
-        temperature:
-        fluor: The numpy array with the raw data
-        span: The selected span
-        vsmlsq: The width
-        saveVarianceData: Sava variance data
+        release: The profiler to remove from the active ones or None
 
     Returns:
-        [smoothData[], varianceData[]]  where smoothData[] contains smoothed data,
-        varianceData[] contains residuals scaled to variance.
+        No return value.
     """
 
-    n = len(temperature) - 1
-    smoothData = np.zeros(len(temperature), dtype=np.float64)
-    varianceData = np.zeros(len(temperature), dtype=np.float64)
+    if tracemalloc.is_tracing():
+        peak = tracemalloc.get_traced_memory()[1]
+        for ref in _stageProfilers:
+            prof = ref()
+            if prof is not None and prof._peak < peak:
+                prof._peak = peak
+        if len(_stageProfilerTrace) > 0:
+            tracemalloc.reset_peak()
+    alive = []
+    for ref in _stageProfilers:
+        prof = ref()
+        if prof is not None and prof is not release:
+            alive.append(ref)
+    _stageProfilers[:] = alive
+    if len(alive) == 0 and len(_stageProfilerTrace) > 0:
+        del _stageProfilerTrace[:]
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class StageProfiler:
+    """RDML-Python library.
 
-    windowSize = int(0.5 * span * n + 0.6)
-    if windowSize < 2:
-        windowSize = 2
-    windowStop = 2 * windowSize + 1  # range of smoothing window
+    Measures the wall time, the CPU time and the peak memory allocation of
+    the named stages of an analysis. A stage ends with the start of the next
+    one, a stage entered several times is summed up. The allocations are
+    traced with tracemalloc while a profiler is active, which makes
+    linRegPCR about ten times slower. With profile="time" only the times
+    are measured.
 
-    xm = temperature[1]
-    ym = fluor[1]
-    tempVar = 0.0
-    fluorVar = 0.0
+    If tracemalloc was already started by the caller, its peak is not
+    reset. A stage which stays below the earlier peak of the caller then
+    reports the memory it still holds at its end as peakAlloc.
 
-    for i in range(2, windowStop + 1):
-        xm = ((i - 1) * xm + temperature[i]) / i
-        ym = ((i - 1) * ym + fluor[i]) / i
-        tmp = i * (temperature[i] - xm) / (i - 1)
-        tempVar += tmp * (temperature[i] - xm)
-        fluorVar += tmp * (fluor[i] - ym)
+    Attributes:
+        _function: The name of the profiled function.
+        _id: The id of the profiled element, like the run id.
+        _report: None, a callable or a logging.Logger to report the stages to.
+        _active: False if profiling is switched off.
+        _memory: True if the allocations are traced.
+        _records: A dictionary with the record of each stage.
+        _stage: The name of the running stage or None.
+        _start: The wall time, CPU time, traced memory and traced peak at the
+            stage start.
+        _peak: The highest traced memory of the running stage so far.
+    """
 
-    fbw = windowStop
-    for j in range(1, n + 1):  # Loop through all
-        windowStart = j - windowSize - 1
-        windowEnd = j + windowSize
-        if not (windowStart < 1 or windowEnd > n):
-            tempStart = temperature[windowStart]
-            tempEnd = temperature[windowEnd]
-            fbo = fbw
-            fbw = fbw - 1.0
-            tmp = 0.0
-            if fbw > 0.0:
-                xm = (fbo * xm - tempStart) / fbw
-            if fbw > 0.0:
-                ym = (fbo * ym - fluor[windowStart]) / fbw
-            if fbw > 0.0:
-                tmp = fbo * (tempStart - xm) / fbw
-            tempVar = tempVar - tmp * (tempStart - xm)
-            fluorVar = fluorVar - tmp * (fluor[windowStart] - ym)
+    def __init__(self, function, profile, elemId=""):
+        """Inits the profiler, nothing is measured if profile is false.
 
-            fbo = fbw
-            fbw = fbw + 1.0
-            tmp = 0.0
-            if fbw > 0.0:
-                xm = (fbo * xm + tempEnd) / fbw
-            if fbw > 0.0:
-                ym = (fbo * ym + fluor[windowEnd]) / fbw
-            if fbo > 0.0:
-                tmp = fbw * (tempEnd - xm) / fbo
-            tempVar = tempVar + tmp * (tempEnd - xm)
-            fluorVar = fluorVar + tmp * (fluor[windowEnd] - ym)
+        Args:
+            self: The class self parameter.
+            function: The name of the profiled function.
+            profile: True, "time" for the times only, a callable called with each stage record or a logging.Logger.
+            elemId: The id of the profiled element (optional)
 
-        if tempVar > vsmlsq:
-            smoothData[j] = (
-                temperature[j] - xm
-            ) * fluorVar / tempVar + ym  # contains smoothed data
-        else:
-            smoothData[j] = ym  # contains smoothed data
+        Returns:
+            No return value.
+        """
 
-        if saveVarianceData:
-            h = 0.0
-            if fbw > 0.0:
-                h = 1.0 / fbw
-            if tempVar > vsmlsq:
-                h = h + (temperature[j] - xm) * (temperature[j] - xm) / tempVar
+        self._function = function
+        self._id = elemId
+        self._report = None
+        self._active = bool(profile)
+        self._memory = profile != "time"
+        self._records = {}
+        self._stage = None
+        self._start = None
+        self._peak = 0
+        if profile is not True and profile != "time":
+            self._report = profile
+        if not self._active or not self._memory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _stageProfilerTrace.append(True)
+        _stageProfilers.append(weakref.ref(self))
 
-            if 1.0 - h > 0.0:
-                varianceData[j] = abs(fluor[j] - smoothData[j]) / (
-                    1.0 - h
-                )  # contains residuals scaled to variance
-            else:
-                if j > 1:
-                    varianceData[j] = varianceData[
-                        j - 1
-                    ]  # contains residuals scaled to variance
-                else:
-                    varianceData[j] = 0.0
+    def stage(self, name):
+        """Ends the running stage and starts the given one.
 
-    return [smoothData, varianceData]
+        Args:
+            self: The class self parameter.
+            name: The name of the stage, like "parse" or "baseline".
 
+        Returns:
+            No return value.
+        """
 
-def _mca_linReg(xIn, yUse, start, stop):
-    """A function which calculates the slope or the intercept by linear
-    regression.
+        if not self._active:
+            return
+        self._close()
+        traced = (0, 0)
+        if self._memory:
+            _stageProfilerUpdate()
+            traced = tracemalloc.get_traced_memory()
+        self._stage = name
+        self._peak = 0
+        self._start = (
+            time.perf_counter(),
+            time.process_time(),
+            traced[0],
+            traced[1],
+        )
 
-    Args:
-        xIn: The numpy array of the temperatures
-        yUse: The numpy array that contains the fluorescence
+    def _close(self):
+        """Adds the running stage to the records.
 
-    Returns:
-        An array with the slope and intercept.
-    """
+        Args:
+            self: The class self parameter.
 
-    counts = np.ones(yUse.shape)
-    xUse = xIn.copy()
-    xUse[np.isnan(yUse)] = 0
-    counts[np.isnan(yUse)] = 0
-    myStop = stop + 1
+        Returns:
+            No return value.
+        """
 
-    tempSqared = xUse * xUse
-    tempFluor = xUse * yUse
+        if self._stage is None:
+            return
+        wall = time.perf_counter() - self._start[0]
+        cpu = time.process_time() - self._start[1]
+        peakAlloc = None
+        if self._memory:
+            peakAlloc = 0
+        if self._memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(self._peak, peak)
+            if peak <= self._start[3]:
+                # The stage stayed below a peak which was not reset
+                peak = current
+            peakAlloc = max(0, peak - self._start[2])
+        if self._stage not in self._records:
+            self._records[self._stage] = {
+                "function": self._function,
+                "id": self._id,
+                "stage": self._stage,
+                "wall": 0.0,
+                "cpu": 0.0,
+                "peakAlloc": peakAlloc,
+            }
+        rec = self._records[self._stage]
+        rec["wall"] += wall
+        rec["cpu"] += cpu
+        if peakAlloc is not None:
+            rec["peakAlloc"] = max(rec["peakAlloc"], peakAlloc)
+        self._stage = None
 
-    sumCyc = np.nansum(xUse[:, start:myStop], axis=1)
-    sumFluor = np.nansum(yUse[:, start:myStop], axis=1)
-    sumCycSquared = np.nansum(tempSqared[:, start:myStop], axis=1)
-    sumCycFluor = np.nansum(tempFluor[:, start:myStop], axis=1)
-    n = np.nansum(counts[:, start:myStop], axis=1)
+    def finish(self):
+        """Ends the running stage and reports all stages.
 
-    ssx = sumCycSquared - (sumCyc * sumCyc) / n
-    sxy = sumCycFluor - (sumCyc * sumFluor) / n
+        Args:
+            self: The class self parameter.
 
-    slope = sxy / ssx
-    intercept = (sumFluor / n) - slope * (sumCyc / n)
-    return [slope, intercept]
+        Returns:
+            A list with a dictionary per stage with the keys "function", "id",
+            "stage", "wall" and "cpu" in seconds and "peakAlloc" in bytes or
+            None for profile="time".
+        """
+
+        if not self._active:
+            return []
+        self._close()
+        self._active = False
+        if self._memory:
+            _stageProfilerUpdate(self)
+        ret = list(self._records.values())
+        for rec in ret:
+            if isinstance(self._report, logging.Logger):
+                self._report.info(
+                    "%s %s %s: wall %.6f s, cpu %.6f s, peak %d bytes",
+                    rec["function"],
+                    rec["id"],
+                    rec["stage"],
+                    rec["wall"],
+                    rec["cpu"],
+                    rec["peakAlloc"],
+                )
+            elif self._report is not None:
+                self._report(rec)
+        return ret
 
 
-def _pco_fixPlateMatix(mat, row, col):
-    """A function which calculates the missing values for the given position.
+# The plate formats already created, keyed by rows and columns
+_plateFormats = {}
+
+
+def _plateRowLabel(row):
+    """Translates a row index to the row letters like "A", "Z" or "AF".
 
     Args:
-        mat: The matrix to correct
-        row: The row position of the value to correct
-        col: The column position of the value to correct
+        row: The row index starting with 0
 
     Returns:
-        None, changes the values in the matrix.
+        returns the string with the row letters.
     """
 
-    matSize = len(mat)
+    ret = chr(ord("A") + row % 26)
+    row = row // 26
+    while row > 0:
+        row -= 1
+        ret = chr(ord("A") + row % 26) + ret
+        row = row // 26
+    return ret
 
-    # Return if there are useful no values
-    maxVal = -10
-    for curr in range(0, matSize):
-        maxVal = max(maxVal, mat[row][curr])
-        maxVal = max(maxVal, mat[curr][col])
-    if maxVal <= 0.0:
-        return
 
-    # Calc the missing values
-    finSum = 0.0
-    finNum = 0
-    for mCol in range(0, matSize):
-        if mCol == col:
-            continue
-        colSum = 0.0
-        colNum = 0
-        for mRow in range(0, matSize):
-            if mRow == row:
-                continue
-            if mat[mRow][mCol] <= 0.0:
-                continue
-            if mat[mRow][col] <= 0.0:
-                continue
-            colSum += math.log(mat[mRow][mCol] / mat[mRow][col])
-            colNum += 1
-        if colNum > 0:
-            colGeo = math.exp(colSum / colNum)
-            if colGeo > 0:
-                finSum += math.log(mat[row][mCol] / colGeo)
-                finNum += 1
-    finFact = -1.0
-    if finNum > 0:
-        finFact = math.exp(finSum / finNum)
-    if finNum > 0:
-        mat[row][col] = finFact
-        mat[col][row] = 1.0 / finFact
+class PlateFormat:
+    """RDML-Python library.
+
+    The well layout of a plate, translates react ids to well labels like
+    "B3" or "AF48" and back. Rows after "Z" continue with "AA", "AB"...
+
+    Attributes:
+        rows: The number of rows.
+        columns: The number of columns.
+        _labels: The numpy array with the well label of each react id - 1.
+        _labelList: The list with the well label of each react id - 1.
+        _ids: A dictionary with the react id of each upper case well label.
+    """
+
+    __slots__ = ("rows", "columns", "_labels", "_labelList", "_ids")
+
+    def __init__(self, rows, columns):
+        """Inits the plate format and precomputes all well labels.
+
+        Args:
+            self: The class self parameter.
+            rows: The number of rows.
+            columns: The number of columns.
+
+        Returns:
+            No return value. Function may raise RdmlError if required.
+        """
+
+        self.rows = int(rows)
+        self.columns = int(columns)
+        if self.rows < 1 or self.columns < 1:
+            raise RdmlError("Plate format requires rows and columns > 0.")
+        rowLabels = np.array(
+            [_plateRowLabel(row) for row in range(0, self.rows)]
+        )
+        colLabels = np.arange(1, self.columns + 1).astype(str)
+        self._labels = np.char.add(
+            np.repeat(rowLabels, self.columns),
+            np.tile(colLabels, self.rows),
+        )
+        self._labelList = self._labels.tolist()
+        self._ids = {}
+        for pos in range(0, len(self._labelList)):
+            self._ids[self._labelList[pos]] = pos + 1
+
+    def label(self, reactId):
+        """Returns the well label of a react id.
+
+        Args:
+            self: The class self parameter.
+            reactId: The react id as int or string.
+
+        Returns:
+            The well label string.
+        """
+
+        pos = int(reactId) - 1
+        if 0 <= pos < len(self._labelList):
+            return self._labelList[pos]
+        return _plateRowLabel(pos // self.columns) + str(
+            pos % self.columns + 1
+        )
 
+    def labels(self, reactIds):
+        """Returns the well labels of many react ids at once.
 
-def _cleanErrorString(inStr, cleanStyle):
-    outStr = ";"
-    inStr += ";"
-    if cleanStyle == "melt":
-        outStr = inStr.replace(
-            "several products with different melting temperatures detected", ""
+        Args:
+            self: The class self parameter.
+            reactIds: A list or numpy array of react ids as int or string.
+
+        Returns:
+            The numpy array with the well label strings.
+        """
+
+        pos = np.asarray(reactIds).astype(np.int64) - 1
+        if pos.size == 0 or (
+            np.min(pos) >= 0 and np.max(pos) < len(self._labelList)
+        ):
+            return self._labels[pos]
+        return np.array(
+            [self.label(reactPos + 1) for reactPos in pos.tolist()]
         )
-        outStr = outStr.replace(
-            "product with different melting temperatures detected", ""
+
+    def react_id(self, label):
+        """Returns the react id of a well label like "B3".
+
+        Args:
+            self: The class self parameter.
+            label: The well label string.
+
+        Returns:
+            The react id as int or None if label is not a well label.
+        """
+
+        wellLabel = str(label).strip().upper()
+        if wellLabel in self._ids:
+            return self._ids[wellLabel]
+        reFound = re.match(r"^([A-Z]+)(\d+)$", wellLabel)
+        if not reFound:
+            return None
+        row = 0
+        for letter in reFound.group(1):
+            row = row * 26 + ord(letter) - ord("A") + 1
+        return (row - 1) * self.columns + int(reFound.group(2))
+
+    def well_range(self, wells):
+        """Translates a range like "B2-C3" to the react ids of all wells in it.
+
+        Args:
+            self: The class self parameter.
+            wells: The range like "B2-C3" or a single well like "B2"
+
+        Returns:
+            A list of react id strings like ["14","15","26","27"].
+        """
+
+        reFound = re.search(
+            r"([A-Za-z]+)(\d+)\s*-\s*([A-Za-z]+)(\d+)", str(wells)
         )
-        outStr = outStr.replace(
-            "no product with expected melting temperature", ""
+        if not reFound:
+            reFound = re.search(r"([A-Za-z]+)(\d+)", str(wells))
+            if not reFound:
+                return []
+            return [str(self.react_id(reFound.group(1) + reFound.group(2)))]
+        rowStart = self.react_id(reFound.group(1) + "1") - 1
+        rowEnd = self.react_id(reFound.group(3) + "1") - 1
+        colStart = int(reFound.group(2))
+        colEnd = int(reFound.group(4))
+        if rowEnd < rowStart:
+            temp_num = rowStart
+            rowStart = rowEnd
+            rowEnd = temp_num
+        if colEnd < colStart:
+            temp_num = colStart
+            colStart = colEnd
+            colEnd = temp_num
+        rowOffsets = np.arange(rowStart, rowEnd + 1, self.columns)
+        colIds = np.arange(colStart, colEnd + 1)
+        return (
+            (rowOffsets[:, np.newaxis] + colIds).ravel().astype(str).tolist()
         )
-        outStr = outStr.replace("product detected in negative control", "")
-    else:
-        strList = inStr.split(";")
-        knownWarn = [
-            "amplification in negative control",
-            "plateau in negative control",
-            "no amplification in positive control",
-            "baseline error in positive control",
-            "instable baseline",
-            "instable baseline in positive control",
-            "no plateau in positive control",
-            "noisy sample in positive control",
-            "Cq < 10, N0 unreliable",
-            "Cq > 34",
-            "no indiv PCR eff can be calculated",
-            "PCR efficiency outlier",
-            "no amplification",
-            "baseline error",
-            "no plateau",
-            "noisy sample",
-            "Cq too high",
-            "N0 unreliable",
-        ]
-        for ele in strList:
-            if ele in knownWarn:
-                continue
-            if re.search(r"^only \d+ values in log phase", ele):
-                continue
-            if re.search(r"^indiv PCR eff is .+", ele):
-                continue
-            outStr += ele + ";"
 
-    #   if inStr.find('several products with different melting temperatures detected') >= 0:
-    #       outStr += ';several products with different melting temperatures detected;'
-    #   if inStr.find('product with different melting temperatures detected') >= 0:
-    #       outStr += ';product with different melting temperatures detected;'
-    #   if inStr.find('no product with expected melting temperature') >= 0:
-    #       outStr += ';no product with expected melting temperature;'
 
-    outStr = re.sub(r";+", ";", outStr)
-    return outStr
+_plateArraysVersion = "1"
 
 
-def _numpyTwoAxisSave(var, fileName):
-    with np.printoptions(precision=3, suppress=True):
-        np.savetxt(fileName, var, fmt="%.6f", delimiter="\t", newline="\n")
+def _plateArraysKey(filename, experiment, run, digest=""):
+    """Returns the cache key of the plate arrays of a file.
 
+    Args:
+        filename: The name of the RDML or lc96p file
+        experiment: The experiment id or None for the first experiment
+        run: The run id or None for the first run
+        digest: The SHA-1 hex digest of the file or "" to skip it
 
-def _getXMLDataType():
+    Returns:
+        A list of strings with library version, size, mtime, digest and
+        the selected experiment and run.
+    """
+
+    stat = os.stat(filename)
     return [
-        "tar",
-        "cq",
-        "N0",
-        "ampEffMet",
-        "ampEff",
-        "ampEffSE",
-        "corrF",
-        "corrP",
-        "corrCq",
-        "meltTemp",
-        "excl",
-        "note",
-        "adp",
-        "mdp",
-        "endPt",
-        "bgFluor",
-        "quantFluor",
+        _plateArraysVersion + "/" + get_rdml_lib_version(),
+        str(stat.st_size),
+        str(stat.st_mtime_ns),
+        digest,
+        "" if experiment is None else experiment,
+        "" if run is None else run,
     ]
 
 
-def _getXMLPartitionDataType():
-    return ["tar", "excluded", "note", "pos", "neg", "undef", "excl", "conc"]
+def _plateArraysDigest(filename):
+    """Returns the SHA-1 hex digest of a file.
 
+    Args:
+        filename: The name of the file
 
-def runStatistics(statTarGroup, parametric, translateGrp):
-    ret = {}
-    ret["multi comparison"] = ""
-    if len(statTarGroup) < 2:
-        ret["test name"] = "no test possible"
-        ret["stat name"] = "only 1 group"
-        ret["stat val"] = -1.0
-        ret["p val"] = -1.0
-        return ret
+    Returns:
+        The hex digest string.
+    """
 
-    if _string_to_bool(parametric, triple=False):
-        if len(statTarGroup) == 2:
-            ret["test name"] = "T-test"
-            ret["stat name"] = "t-statistic"
-            ret["stat val"], ret["p val"] = scp.ttest_ind(
-                statTarGroup[0], statTarGroup[1]
-            )
-        else:
-            ret["test name"] = "One-way ANOVA"
-            ret["stat name"] = "F statistic"
-            ret["stat val"], ret["p val"] = scp.f_oneway(*statTarGroup)
-
-            if ret["p val"] > 0.05:
-                return ret
-            gridGroup = []
-            gridValue = []
-            grid_Y2 = []
-            gridGroup = []
-            groupRes = []
-            groupIncreasMean = []
-            grpGridRanksum = []
-            statres_total_n = 0
-            grpGridObsDiff = []
-            grpGridGrpRange = []
-            grpGridCriticQ = []
-            grpGridCriticDiff = []
-            grpGridMultiComp = []
-            # Prepare Data
-            for row in range(0, len(statTarGroup)):
-                groupRes.append({})
-                groupRes[row]["n"] = 0
-                groupRes[row]["median"] = np.median(statTarGroup[row])
-                groupRes[row]["sumY"] = 0.0
-                groupRes[row]["sumY2"] = 0.0
-                groupRes[row]["mean"] = 0.0
-                groupRes[row]["usedMean"] = False
-                groupRes[row]["var"] = 0.0
-                groupRes[row]["SD"] = 0.0
-                for col in range(0, len(statTarGroup[row])):
-                    gridGroup.append(row)
-                    gridValue.append(statTarGroup[row][col])
-                    grid_Y2.append(
-                        statTarGroup[row][col] * statTarGroup[row][col]
-                    )
-                    groupRes[row]["n"] += 1
-                    groupRes[row]["sumY"] += statTarGroup[row][col]
-                    groupRes[row]["sumY2"] += (
-                        statTarGroup[row][col] * statTarGroup[row][col]
-                    )
-            statres_total_n = len(gridValue)
-            # Calculate the group results
-            stat_quant1 = 0.0
-            stat_quant2 = 0.0
-            stat_quant3 = 0.0
-            stat_quant4 = 0.0
-            for row in range(0, len(groupRes)):
-                groupRes[row]["sumY2_n"] = (
-                    groupRes[row]["sumY"]
-                    * groupRes[row]["sumY"]
-                    / groupRes[row]["n"]
-                )
-                stat_quant1 += groupRes[row]["sumY"]
-                stat_quant2 += groupRes[row]["sumY2"]
-                stat_quant3 += groupRes[row]["sumY2_n"]
-                groupRes[row]["mean"] = (
-                    groupRes[row]["sumY"] / groupRes[row]["n"]
-                )
-                groupRes[row]["var"] = (
-                    groupRes[row]["sumY2"] - groupRes[row]["sumY2_n"]
-                ) / (groupRes[row]["n"] - 1)
-                groupRes[row]["SD"] = np.sqrt(groupRes[row]["var"])
-                groupRes[row]["SEM"] = np.sqrt(groupRes[row]["var"]) / np.sqrt(
-                    groupRes[row]["n"]
-                )
-            stat_quant4 = stat_quant1 * stat_quant1 / statres_total_n
-            stat_SStotal = stat_quant2 - stat_quant4
-            stat_SSgroups = stat_quant3 - stat_quant4
-            stat_SSwithin = stat_SStotal - stat_SSgroups
-
-            stat_df_total = statres_total_n - 1
-            stat_df_groups = len(statTarGroup) - 1
-            stat_df_within = statres_total_n - len(statTarGroup)
-
-            stat_ms_groups = stat_SSgroups / stat_df_groups
-            stat_ms_within = stat_SSwithin / stat_df_within
-
-            stat_F = stat_ms_groups / stat_ms_within
-            stat_P = 1 - scp.f.cdf(stat_F, stat_df_groups, stat_df_within)
-            stat_grp_range = scp.t.ppf(1 - 0.05 / 2.0, stat_df_within)
-
-            # Student-Newman-Keuls multiple comparison of groups
-            # Sort by increasing mean
-            sortCurrNr = -1
-            sortMinVal = 999999999999999
-            sortOn = True
-            while sortOn:
-                for row in range(0, len(groupRes)):
-                    if not groupRes[row]["usedMean"]:
-                        if groupRes[row]["mean"] < sortMinVal:
-                            sortCurrNr = row
-                            sortMinVal = groupRes[row]["mean"]
-                if sortMinVal != 999999999999999:
-                    groupIncreasMean.append(sortCurrNr)
-                    groupRes[sortCurrNr]["usedMean"] = True
-                    sortMinVal = 999999999999999
-                else:
-                    sortOn = False
-            # Calculate observed difference
-            for row in range(0, len(groupIncreasMean)):
-                grpGridObsDiff.append([])
-                grpGridGrpRange.append([])
-                for col in range(0, len(groupIncreasMean)):
-                    grpGridObsDiff[row].append(
-                        np.abs(
-                            groupRes[groupIncreasMean[row]]["mean"]
-                            - groupRes[groupIncreasMean[col]]["mean"]
-                        )
-                    )
-                    grpGridGrpRange[row].append(np.abs(row - col) + 1)
-            # Calculate critical Q from studentized range distribution
-            for row in range(0, len(groupIncreasMean)):
-                grpGridCriticQ.append([])
-                for col in range(0, len(groupIncreasMean)):
-                    if grpGridGrpRange[row][col] == 1:
-                        grpGridCriticQ[row].append("")
-                    elif grpGridGrpRange[row][col] > stat_df_within:
-                        grpGridCriticQ[row].append("")
-                    else:
-                        grpGridCriticQ[row].append(
-                            (
-                                stat_grp_range
-                                * (
-                                    np.log(grpGridGrpRange[row][col] - 1)
-                                    * (
-                                        0.8843
-                                        - 0.2368 * stat_grp_range
-                                        - 1.214 / stat_df_within
-                                        + 1.208
-                                        * stat_grp_range
-                                        / stat_df_within
-                                    )
-                                    + np.sqrt(2)
-                                )
-                            )
-                        )
-            # Calculate critical difference
-            for row in range(0, len(statTarGroup)):
-                grpGridCriticDiff.append([])
-                for col in range(0, len(statTarGroup)):
-                    if grpGridCriticQ[row][col] == "":
-                        grpGridCriticDiff[row].append("")
-                    else:
-                        grpGridCriticDiff[row].append(
-                            grpGridCriticQ[row][col]
-                            * np.sqrt(stat_ms_within)
-                            * np.sqrt(
-                                (
-                                    groupRes[groupIncreasMean[row]]["n"]
-                                    + groupRes[groupIncreasMean[col]]["n"]
-                                )
-                                / (
-                                    2.0
-                                    * groupRes[groupIncreasMean[row]]["n"]
-                                    * groupRes[groupIncreasMean[col]]["n"]
-                                )
-                            )
-                        )
-            # Calculate multiple comparison result
-            grpGridMultiComp.append(["group", ""])
-            for row in range(0, len(statTarGroup)):
-                grpGridMultiComp[0].append(translateGrp[groupIncreasMean[row]])
-            grpGridMultiComp.append(["", "mean"])
-            for row in range(0, len(statTarGroup)):
-                grpGridMultiComp[1].append(
-                    groupRes[groupIncreasMean[row]]["mean"]
-                )
-            for row in range(0, len(statTarGroup)):
-                grpGridMultiComp.append(
-                    [
-                        translateGrp[groupIncreasMean[row]],
-                        groupRes[groupIncreasMean[row]]["mean"],
-                    ]
-                )
-                for col in range(0, len(statTarGroup)):
-                    if grpGridCriticDiff[row][col] == "":
-                        grpGridMultiComp[row + 2].append("-")
-                    elif (
-                        grpGridObsDiff[row][col] > grpGridCriticDiff[row][col]
-                    ):
-                        grpGridMultiComp[row + 2].append("*")
-                    else:
-                        grpGridMultiComp[row + 2].append("ns")
-            ret["multi comparison"] = grpGridMultiComp
+    digest = hashlib.sha1()
+    with open(filename, "rb") as fileIn:
+        for chunk in iter(lambda: fileIn.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def loadPlateArrays(filename, experiment=None, run=None, cache=True):
+    """Loads the plate layout and fluorescence data of a run as numpy arrays.
+
+    With cache the arrays are kept in a sidecar file filename + ".npz". It is
+    used as long as the size and mtime of the file match, or its SHA-1 if
+    the file was touched or copied, and rebuilt from the XML otherwise.
+
+    Args:
+        filename: The name of the RDML or lc96p file
+        experiment: The experiment id or None for the first experiment
+        run: The run id or None for the first run
+        cache: Read and write the sidecar file
+
+    Returns:
+        The dictionary of Run.plate_arrays().
+    """
+
+    sidecar = filename + ".npz"
+    if cache and os.path.isfile(sidecar):
+        try:
+            with np.load(sidecar, allow_pickle=False) as npz:
+                stored = npz["cache_key"].tolist()
+                key = _plateArraysKey(filename, experiment, run)
+                fresh = stored[:3] == key[:3] and stored[4:] == key[4:]
+                if not fresh and stored[4:] == key[4:]:
+                    fresh = stored[3] == _plateArraysDigest(filename)
+                if fresh:
+                    return {
+                        name: npz[name]
+                        for name in npz.files
+                        if name != "cache_key"
+                    }
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            pass
+
+    rdml = Rdml(filename)
+    if experiment is None:
+        exp = rdml.get_experiment(byposition=0)
     else:
-        if len(statTarGroup) == 2:
-            ret["test name"] = "Mann-Whitney U rank test"
-            ret["stat name"] = "U statistic"
-            ret["stat val"], ret["p val"] = scp.mannwhitneyu(
-                statTarGroup[0],
-                statTarGroup[1],
-                alternative="two-sided",
-                use_continuity=False,
-                method="asymptotic",
-            )
-        else:
-            ret["test name"] = "Kruskal-Wallis H-test"
-            ret["stat name"] = "H statistic"
-            ret["stat val"], ret["p val"] = scp.kruskal(*statTarGroup)
-
-            if ret["p val"] > 0.05:
-                return ret
-            gridGroup = []
-            gridValue = []
-            scoreGrid = []
-            scoreRank = []
-            groupRes = []
-            grpGridRanksum = []
-            grpGridCriticDiff = []
-            grpGridMultiComp = []
-            statres_total_n = 0
-            statres_s1 = 0.0
-            statres_sqrsum = 0.0
-            # Prepare Data
-            for row in range(0, len(statTarGroup)):
-                groupRes.append({})
-                groupRes[row]["n"] = 0
-                groupRes[row]["median"] = np.median(statTarGroup[row])
-                groupRes[row]["rsum"] = 0.0
-                groupRes[row]["rsum2_n"] = 0.0
-                for col in range(0, len(statTarGroup[row])):
-                    gridGroup.append(row)
-                    gridValue.append(statTarGroup[row][col])
-            statres_total_n = len(gridValue)
-            # Create the score grid filled
-            for row in range(0, len(gridValue)):
-                scoreGrid.append([])
-                for col in range(0, len(gridValue)):
-                    if gridValue[row] == gridValue[col]:
-                        scoreGrid[row].append(0.5)
-                    elif gridValue[row] < gridValue[col]:
-                        scoreGrid[row].append(0.0)
-                    elif gridValue[row] > gridValue[col]:
-                        scoreGrid[row].append(1.0)
-            # Calculate the sums
-            for row in range(0, len(scoreGrid)):
-                sumUp = 0.5
-                for col in range(0, len(scoreGrid[row])):
-                    sumUp += scoreGrid[row][col]
-                scoreRank.append(sumUp)
-                groupRes[gridGroup[row]]["n"] += 1
-                groupRes[gridGroup[row]]["rsum"] += sumUp
-                statres_sqrsum += sumUp * sumUp
-            # Calculate the group results
-            for row in range(0, len(groupRes)):
-                groupRes[row]["rsum2_n"] = (
-                    groupRes[row]["rsum"]
-                    * groupRes[row]["rsum"]
-                    / groupRes[row]["n"]
-                )
-                statres_s1 += groupRes[row]["rsum2_n"]
-            # Final calculations
-            statres_n3 = (
-                statres_total_n
-                * (statres_total_n + 1)
-                * (statres_total_n + 1)
-                / 4
-            )
-            statres_s2 = (1 / (statres_total_n - 1)) * (
-                statres_sqrsum - statres_n3
-            )
-            statres_tt = (1 / statres_s2) * (statres_s1 - statres_n3)
-            statres_df = len(statTarGroup) - 1
-            statres_prob = 1 - scp.chi2.cdf(statres_tt, df=statres_df)
-            statres_t = scp.t.ppf(
-                1 - 0.05 / 2.0, statres_total_n - len(statTarGroup)
-            )
-            statres_SD = statres_t * np.sqrt(
-                (
-                    statres_s2
-                    * (
-                        (statres_total_n - 1 - statres_tt)
-                        / (statres_total_n - len(statTarGroup))
-                    )
-                )
+        exp = rdml.get_experiment(byid=experiment)
+    if run is None:
+        selRun = exp.get_run(byposition=0)
+    else:
+        selRun = exp.get_run(byid=run)
+    ret = selRun.plate_arrays()
+    if cache:
+        key = _plateArraysKey(
+            filename, experiment, run, _plateArraysDigest(filename)
+        )
+        try:
+            fd, tmpName = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(sidecar)),
+                suffix=".npz",
             )
-            # Calculate mean ranksum difference
-            for row in range(0, len(statTarGroup)):
-                grpGridRanksum.append([])
-                for col in range(0, len(statTarGroup)):
-                    grpGridRanksum[row].append(
-                        np.abs(
-                            groupRes[row]["rsum"] / groupRes[row]["n"]
-                            - groupRes[col]["rsum"] / groupRes[col]["n"]
-                        )
-                    )
-            # Calculate critical difference
-            for row in range(0, len(statTarGroup)):
-                grpGridCriticDiff.append([])
-                for col in range(0, len(statTarGroup)):
-                    if grpGridRanksum[row][col] <= 0.0:
-                        grpGridCriticDiff[row].append("")
-                    else:
-                        grpGridCriticDiff[row].append(
-                            statres_SD
-                            * np.sqrt(
-                                1 / groupRes[row]["n"] + 1 / groupRes[col]["n"]
-                            )
-                        )
-            # Calculate multiple comparison result
-            grpGridMultiComp.append(["group", ""])
-            for row in range(0, len(statTarGroup)):
-                grpGridMultiComp[0].append(translateGrp[row])
-            grpGridMultiComp.append(["", "median"])
-            for row in range(0, len(statTarGroup)):
-                grpGridMultiComp[1].append(groupRes[row]["median"])
-            for row in range(0, len(statTarGroup)):
-                grpGridMultiComp.append(
-                    [translateGrp[row], groupRes[row]["median"]]
-                )
-                for col in range(0, len(statTarGroup)):
-                    if grpGridCriticDiff[row][col] == "":
-                        grpGridMultiComp[row + 2].append("-")
-                    elif (
-                        grpGridRanksum[row][col] > grpGridCriticDiff[row][col]
-                    ):
-                        grpGridMultiComp[row + 2].append("*")
-                    else:
-                        grpGridMultiComp[row + 2].append("ns")
-            ret["multi comparison"] = grpGridMultiComp
+        except OSError:
+            return ret
+        try:
+            with os.fdopen(fd, "wb") as fileOut:
+                np.savez(fileOut, cache_key=np.array(key), **ret)
+            os.replace(tmpName, sidecar)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmpName):
+                os.remove(tmpName)
     return ret
 
 
-def webAppRunStatistics(
-    data, parametric=False, seperator="\t", replaceComma=True
-):
-    replaceComma = _string_to_bool(replaceComma, triple=False)
-    goodData = []
-    foundGrp = {}
-    translateGrp = {}
-    posGrp = 0
+def _assemble_plate_root(source):
+    """A function which loads a plate file and migrates it to RDML v1.3.
 
-    dff = io.StringIO(data)
-    rawData = list(csv.reader(dff, delimiter=seperator))
-    for row in range(0, len(rawData)):
-        if len(rawData[row]) < 2:
-            continue
-        if rawData[row][0] not in foundGrp:
-            foundGrp[rawData[row][0]] = posGrp
-            translateGrp[posGrp] = rawData[row][0]
-            goodData.append([])
-            posGrp += 1
-        for col in range(1, len(rawData[row])):
-            cell = rawData[row][col]
-            if replaceComma:
-                cell = re.sub(r"\.", "", cell)
-                cell = re.sub(r",", "\.", cell)
-            goodData[foundGrp[rawData[row][0]]].append(float(cell))
+    Args:
+        source: A file name or the file content as bytes.
 
-    return runStatistics(goodData, parametric, translateGrp)
+    Returns:
+        A tuple with the root node and a list of strings with the migration
+        modifications.
+    """
+
+    plate = Rdml(source)
+    ret = []
+    if plate.version() == "1.0":
+        ret += plate.migrate_version_1_0_to_1_1()
+    if plate.version() == "1.1":
+        ret += plate.migrate_version_1_1_to_1_2()
+    if plate.version() == "1.2":
+        ret += plate.migrate_version_1_2_to_1_3()
+    return plate._node, ret
+
+
+def _assemble_read_plate(source):
+    """A function which loads a plate file in a worker process.
+
+    Args:
+        source: A file name or the file content as bytes.
+
+    Returns:
+        A tuple with the serialised root node and a list of strings with the
+        migration modifications.
+    """
+
+    root, ret = _assemble_plate_root(source)
+    return et.tostring(root), ret
 
 
 class Rdml:
@@ -2663,6 +5374,8 @@ class Rdml:
     Attributes:
         _rdmlData: The RDML XML object from lxml.
         _node: The root node of the RDML XML object.
+        _journalState: The snapshot of the last journaled save or None.
+        _idRegistryOwner: The finalizer dropping the id registries of the document or None.
     """
 
     def __init__(self, filename=None):
@@ -2671,7 +5384,7 @@ class Rdml:
 
         Args:
             self: The class self parameter.
-            filename: The name of the RDML file to load.
+            filename: The name of the RDML file to load, its content as bytes or a file-like object.
 
         Returns:
             No return value. Function may raise RdmlError if required.
@@ -2680,6 +5393,8 @@ class Rdml:
         self._rdmlData = None
         self._rdmlFilename = None
         self._node = None
+        self._journalState = None
+        self._idRegistryOwner = None
         if filename:
             self.load(filename)
         else:
@@ -2754,40 +5469,85 @@ class Rdml:
         self.loadXMLString(data)
         return
 
-    def load(self, filename):
+    def load(self, filename, profile=None):
         """Load an RDML file with decompression of rdml_data.xml or an XML
-        file. Uses loadXMLString().
+        file. Uses loadXMLString(). The changes in a save journal next to
+        the file are applied, see save().
 
         Args:
             self: The class self parameter.
-            filename: The name of the RDML file to load.
+            filename: The name of the RDML file to load, its content as bytes or a file-like object.
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
+
+        Returns:
+            None or with profile a list with the measurements of each stage.
+            Function may raise RdmlError if required.
+        """
+
+        profId = ""
+        if isinstance(filename, str):
+            profId = filename
+        prof = StageProfiler("load", profile, profId)
+        try:
+            self._load(prof, filename)
+        finally:
+            profRes = prof.finish()
+        if profile:
+            return profRes
+        return None
+
+    def _load(self, prof, filename):
+        """Does the work of load(), see there for the arguments.
+
+        Args:
+            self: The class self parameter.
+            prof: The StageProfiler measuring the stages.
+            filename: The name of the RDML file to load, its content as bytes or a file-like object.
 
         Returns:
             No return value. Function may raise RdmlError if required.
         """
 
-        if zipfile.is_zipfile(filename):
-            self._rdmlFilename = filename
-            zf = zipfile.ZipFile(filename, "r")
+        prof.stage("read")
+        self._journalState = None
+        source = _rdmlSource(filename)
+        if zipfile.is_zipfile(source):
+            self._rdmlFilename = source
+            zf = zipfile.ZipFile(source, "r")
             try:
                 data = zf.read("rdml_data.xml").decode("utf-8")
+                baseCrc = zf.getinfo("rdml_data.xml").CRC
             except KeyError:
                 raise RdmlError(
                     "No rdml_data.xml in compressed RDML file found."
                 )
             else:
+                prof.stage("parse")
                 self.loadXMLString(data)
             finally:
                 zf.close()
+            if isinstance(source, str):
+                prof.stage("journal")
+                records = _journal_read(source + ".journal", baseCrc)[0]
+                _journal_apply(self._node, records)
         else:
-            with open(filename, "r") as txtfile:
-                data = txtfile.read()
-                if data:
-                    self.loadXMLString(data)
-                else:
+            if isinstance(source, io.BytesIO):
+                try:
+                    data = source.getvalue().decode("utf-8")
+                except UnicodeDecodeError:
                     raise RdmlError(
                         "File format error, not a valid RDML or XML file."
                     )
+            else:
+                with open(source, "r") as txtfile:
+                    data = txtfile.read()
+            if data:
+                prof.stage("parse")
+                self.loadXMLString(data)
+            else:
+                raise RdmlError(
+                    "File format error, not a valid RDML or XML file."
+                )
 
     def load_any_zip(self, filename):
         """Load an RDML file with decompression of first file. Uses
@@ -2795,15 +5555,16 @@ class Rdml:
 
         Args:
             self: The class self parameter.
-            filename: The name of the RDML file to load.
+            filename: The name of the RDML file to load, its content as bytes or a file-like object.
 
         Returns:
             No return value. Function may raise RdmlError if required.
         """
 
-        if zipfile.is_zipfile(filename):
-            self._rdmlFilename = filename
-            zf = zipfile.ZipFile(filename, "r")
+        source = _rdmlSource(filename)
+        if zipfile.is_zipfile(source):
+            self._rdmlFilename = source
+            zf = zipfile.ZipFile(source, "r")
             archiv_name = ""
             zip_list = zf.infolist()
             for curr_file in zip_list:
@@ -2833,12 +5594,45 @@ class Rdml:
                 "File format error, no compressed RDML file found."
             )
 
-    def save(self, filename):
+    def save(self, filename, journal=False, profile=None):
         """Save an RDML file with compression of rdml_data.xml.
 
+        With journal the changed elements are appended to the file
+        filename + ".journal" instead, load() applies them again. The RDML
+        file is compacted by a save without journal, or automatically once
+        the journal grows too long.
+
+        Args:
+            self: The class self parameter.
+            filename: The name of the RDML file or a writable file-like object to save to.
+            journal: Record the changes in the save journal if possible (optional)
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
+
+        Returns:
+            None or with profile a list with the measurements of each stage.
+            Function may raise RdmlError if required.
+        """
+
+        profId = ""
+        if isinstance(filename, str):
+            profId = filename
+        prof = StageProfiler("save", profile, profId)
+        try:
+            self._save(prof, filename, journal)
+        finally:
+            profRes = prof.finish()
+        if profile:
+            return profRes
+        return None
+
+    def _save(self, prof, filename, journal):
+        """Does the work of save(), see there for the arguments.
+
         Args:
             self: The class self parameter.
-            filename: The name of the RDML file to save to.
+            prof: The StageProfiler measuring the stages.
+            filename: The name of the RDML file or a writable file-like object to save to.
+            journal: Record the changes in the save journal if possible.
 
         Returns:
             No return value. Function may raise RdmlError if required.
@@ -2848,8 +5642,93 @@ class Rdml:
             self._node, "dateUpdated", self.xmlkeys()
         )
         elem.text = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+        newSnap = None
+        if journal and isinstance(filename, str):
+            prof.stage("journal")
+            newSnap = self._save_journal(filename)
+            if newSnap is None:
+                return
+        prof.stage("serialize")
         data = et.tostring(self._rdmlData, pretty_print=True)
+        prof.stage("write")
         _writeFileInRDML(filename, "rdml_data.xml", data)
+        self._journalState = None
+        if isinstance(filename, str):
+            if os.path.isfile(filename + ".journal"):
+                os.remove(filename + ".journal")
+            if newSnap is not None:
+                self._journalState = {
+                    "file": os.path.abspath(filename),
+                    "crc": _rdml_data_crc(filename),
+                    "snapshot": newSnap,
+                    "records": 0,
+                    "length": 0,
+                }
+
+    def _save_journal(self, filename):
+        """Appends the elements changed since the last save to the save
+        journal of an RDML file.
+
+        Args:
+            self: The class self parameter.
+            filename: The name of the RDML file.
+
+        Returns:
+            None if the changes were journaled, else the new snapshot to
+            keep after the RDML file was compacted.
+        """
+
+        baseCrc = _rdml_data_crc(filename)
+        journalName = filename + ".journal"
+        journalLength = 0
+        if os.path.isfile(journalName):
+            journalLength = os.path.getsize(journalName)
+        state = self._journalState
+        if (
+            state is None
+            or state["file"] != os.path.abspath(filename)
+            or state["crc"] != baseCrc
+            or state["length"] != journalLength
+        ):
+            state = None
+            if baseCrc is not None:
+                records, validLength = _journal_read(journalName, baseCrc)
+                onDisk = Rdml(filename)
+                state = {
+                    "file": os.path.abspath(filename),
+                    "crc": baseCrc,
+                    "snapshot": {},
+                    "records": len(records),
+                    "length": validLength,
+                }
+                _journal_scan(onDisk._node, (), {}, state["snapshot"], None)
+
+        newSnap = {}
+        changed = []
+        oldSnap = {}
+        if state is not None:
+            oldSnap = state["snapshot"]
+        _journal_scan(self._node, (), oldSnap, newSnap, changed)
+        if state is not None and len(changed) == 0:
+            self._journalState = state
+            return None
+        if state is None or changed[0][0] == ():
+            return newSnap
+        if state["records"] >= _journalMaxRecords:
+            return newSnap
+        if state["length"] > _journalMaxRatio * os.path.getsize(filename):
+            return newSnap
+        changes = []
+        for path, node in changed:
+            xml = et.tostring(node, with_tail=False).decode("utf-8")
+            changes.append([path, xml])
+        state["length"] = _journal_append(
+            journalName, state["length"], baseCrc, changes
+        )
+        state["records"] += 1
+        state["snapshot"] = newSnap
+        self._journalState = state
+        return None
 
     def loadXMLString(self, data):
         """Create RDML object from xml string. !ENTITY and DOCSTRINGS will be
@@ -2875,6 +5754,9 @@ class Rdml:
         except et.XMLSyntaxError:
             raise RdmlError("XML load error, not a valid RDML or XML file.")
         self._node = self._rdmlData.getroot()
+        if self._idRegistryOwner is not None:
+            self._idRegistryOwner()
+        self._idRegistryOwner = _id_registry_owner(self)
         if self._node.tag.replace("{http://www.rdml.org}", "") != "rdml":
             raise RdmlError(
                 "Root element is not 'rdml', not a valid RDML or XML file."
@@ -3017,6 +5899,8 @@ class Rdml:
             A list of strings with the modifications made.
         """
 
+        _metadata_clear(self._node)
+
         ret = []
         rdml_version = self._node.get("version")
         if rdml_version != "1.0":
@@ -3268,6 +6152,7 @@ class Rdml:
                             + old_right_letter * 96
                         )
                         node3.attrib["id"] = str(newId)
+                _id_registry_clear(node2)
         self._node.attrib["version"] = "1.1"
         return ret
 
@@ -3281,6 +6166,8 @@ class Rdml:
             A list of strings with the modifications made.
         """
 
+        _metadata_clear(self._node)
+
         ret = []
         rdml_version = self._node.get("version")
         if rdml_version != "1.1":
@@ -3329,6 +6216,8 @@ class Rdml:
             A list of strings with the modifications made.
         """
 
+        _metadata_clear(self._node)
+
         ret = []
         rdml_version = self._node.get("version")
         if rdml_version != "1.2":
@@ -3390,6 +6279,8 @@ class Rdml:
             A list of strings with the modifications made.
         """
 
+        _metadata_clear(self._node)
+
         ret = []
         rdml_version = self._node.get("version")
         if rdml_version != "1.2":
@@ -3408,6 +6299,8 @@ class Rdml:
             A list of strings with the modifications made.
         """
 
+        _metadata_clear(self._node)
+
         ret = []
         rdml_version = self._node.get("version")
         if rdml_version != "1.3":
@@ -3727,17 +6620,11 @@ class Rdml:
         # Search in Table files
         if self._rdmlFilename is not None and self._rdmlFilename != "":
             if zipfile.is_zipfile(self._rdmlFilename):
-                zf = zipfile.ZipFile(self._rdmlFilename, "r")
-                for item in zf.infolist():
-                    if re.search("^partitions/", item.filename):
-                        fileContent = zf.read(item.filename).decode("utf-8")
-                        newlineFix = fileContent.replace("\r\n", "\n")
-                        tabLines = newlineFix.split("\n")
-                        header = tabLines[0].split("\t")
-                        for cell in header:
-                            if cell != "":
-                                foundIds[cell] = 0
-                zf.close()
+                catalogue = _partitionCatalogue(self._rdmlFilename)
+                for header in catalogue.values():
+                    for cell in header:
+                        if cell != "":
+                            foundIds[cell] = 0
 
         presentIds = []
         recreateDye = False
@@ -4065,7 +6952,7 @@ class Rdml:
         place = _get_tag_pos(
             self._node, "experimenter", self.xmlkeys(), newposition
         )
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_experimenter(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -4094,18 +6981,9 @@ class Rdml:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
-        pos = _get_tag_pos(self._node, "experimenter", self.xmlkeys(), 999999)
-        currId = experimenter["id"]
-        allChildren = _get_all_children(self._node, "experimenter")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(
-                    self._node, "experimenter", self.xmlkeys(), count
-                )
-                self._node.remove(node)
-        self._node.insert(pos, experimenter._node)
+        _import_child_by_id(
+            self._node, "experimenter", self.xmlkeys(), experimenter._node
+        )
 
     def import_all_experimenters(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -4166,7 +7044,7 @@ class Rdml:
         elem = _get_first_child_by_pos_or_id(
             self._node, "experimenter", byid, byposition
         )
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def documentations(self):
         """Returns a list of all documentation elements.
@@ -4201,7 +7079,7 @@ class Rdml:
         place = _get_tag_pos(
             self._node, "documentation", self.xmlkeys(), newposition
         )
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_documentation(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -4230,18 +7108,9 @@ class Rdml:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
-        pos = _get_tag_pos(self._node, "documentation", self.xmlkeys(), 999999)
-        currId = documentation["id"]
-        allChildren = _get_all_children(self._node, "documentation")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(
-                    self._node, "documentation", self.xmlkeys(), count
-                )
-                self._node.remove(node)
-        self._node.insert(pos, documentation._node)
+        _import_child_by_id(
+            self._node, "documentation", self.xmlkeys(), documentation._node
+        )
 
     def import_all_documentations(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -4302,7 +7171,7 @@ class Rdml:
         elem = _get_first_child_by_pos_or_id(
             self._node, "documentation", byid, byposition
         )
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def dyes(self):
         """Returns a list of all dye elements.
@@ -4335,7 +7204,7 @@ class Rdml:
         new_node = _create_new_element(self._node, "dye", id)
         _add_new_subelement(new_node, "dye", "description", description, True)
         place = _get_tag_pos(self._node, "dye", self.xmlkeys(), newposition)
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_dye(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -4362,16 +7231,7 @@ class Rdml:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
-        pos = _get_tag_pos(self._node, "dye", self.xmlkeys(), 999999)
-        currId = dye["id"]
-        allChildren = _get_all_children(self._node, "dye")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(self._node, "dye", self.xmlkeys(), count)
-                self._node.remove(node)
-        self._node.insert(pos, dye._node)
+        _import_child_by_id(self._node, "dye", self.xmlkeys(), dye._node)
 
     def import_all_dyes(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -4430,7 +7290,7 @@ class Rdml:
         elem = _get_first_child_by_pos_or_id(
             self._node, "dye", byid, byposition
         )
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def samples(self):
         """Returns a list of all sample elements.
@@ -4462,7 +7322,7 @@ class Rdml:
 
         new_node = _create_new_element(self._node, "sample", id)
         place = _get_tag_pos(self._node, "sample", self.xmlkeys(), newposition)
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_sample(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -4630,16 +7490,7 @@ class Rdml:
             for docId in addExps:
                 self.import_experimenter(add_rd.get_experimenter(byid=docId))
 
-        pos = _get_tag_pos(self._node, "sample", self.xmlkeys(), 999999)
-        currId = sample["id"]
-        allChildren = _get_all_children(self._node, "sample")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(self._node, "sample", self.xmlkeys(), count)
-                self._node.remove(node)
-        self._node.insert(pos, sample._node)
+        _import_child_by_id(self._node, "sample", self.xmlkeys(), sample._node)
 
     def import_all_samples(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -4869,7 +7720,7 @@ class Rdml:
         elem = _get_first_child_by_pos_or_id(
             self._node, "sample", byid, byposition
         )
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def export_annotations(self):
         """Returns a table the samples with the annotations in a string.
@@ -5093,7 +7944,7 @@ class Rdml:
         new_node = _create_new_element(self._node, "target", id)
         _add_new_subelement(new_node, "target", "type", type, False)
         place = _get_tag_pos(self._node, "target", self.xmlkeys(), newposition)
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_target(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -5159,16 +8010,7 @@ class Rdml:
             for docId in addDyes:
                 self.import_dye(add_rd.get_dye(byid=docId))
 
-        pos = _get_tag_pos(self._node, "target", self.xmlkeys(), 999999)
-        currId = target["id"]
-        allChildren = _get_all_children(self._node, "target")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(self._node, "target", self.xmlkeys(), count)
-                self._node.remove(node)
-        self._node.insert(pos, target._node)
+        _import_child_by_id(self._node, "target", self.xmlkeys(), target._node)
 
     def import_all_targets(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -5282,7 +8124,31 @@ class Rdml:
         elem = _get_first_child_by_pos_or_id(
             self._node, "target", byid, byposition
         )
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
+
+    def metadata_lookups(self):
+        """Returns a copy of the sample, target and dye lookup dictionaries
+        used by the analysis functions. They are built once and rebuilt only
+        after a dye, sample or target was changed through this library.
+        Targets with a missing dye use the non-saturating DNA binding dye
+        chemistry.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            A dictionary with the lookup dictionaries sampleType,
+            sampleNucleotide, dyeChemistry, targetChemistry, targetMeltTemp,
+            targetType and targetDye.
+        """
+
+        lookups = _metadataToDics(self._node)
+        ret = {}
+        for key in lookups:
+            ret[key] = dict(lookups[key])
+        for samId in ret["sampleType"]:
+            ret["sampleType"][samId] = dict(ret["sampleType"][samId])
+        return ret
 
     def therm_cyc_cons(self):
         """Returns a list of all thermalCyclingConditions elements.
@@ -5321,7 +8187,7 @@ class Rdml:
         place = _get_tag_pos(
             self._node, "thermalCyclingConditions", self.xmlkeys(), newposition
         )
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_therm_cyc_cons(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -5393,23 +8259,12 @@ class Rdml:
             for docId in addExps:
                 self.import_experimenter(add_rd.get_experimenter(byid=docId))
 
-        pos = _get_tag_pos(
-            self._node, "thermalCyclingConditions", self.xmlkeys(), 999999
+        _import_child_by_id(
+            self._node,
+            "thermalCyclingConditions",
+            self.xmlkeys(),
+            thermCycCon._node,
         )
-        currId = thermCycCon["id"]
-        allChildren = _get_all_children(self._node, "thermalCyclingConditions")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(
-                    self._node,
-                    "thermalCyclingConditions",
-                    self.xmlkeys(),
-                    count,
-                )
-                self._node.remove(node)
-        self._node.insert(pos, thermCycCon._node)
 
     def import_all_therm_cyc_cons(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -5520,7 +8375,7 @@ class Rdml:
         elem = _get_first_child_by_pos_or_id(
             self._node, "thermalCyclingConditions", byid, byposition
         )
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def experiments(self):
         """Returns a list of all experiment elements.
@@ -5554,7 +8409,7 @@ class Rdml:
         place = _get_tag_pos(
             self._node, "experiment", self.xmlkeys(), newposition
         )
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_experiment(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -5851,18 +8706,9 @@ class Rdml:
                     add_rd, add_rd.get_therm_cyc_cons(byid=docId), "no-dep"
                 )
 
-        pos = _get_tag_pos(self._node, "experiment", self.xmlkeys(), 999999)
-        currId = experiment["id"]
-        allChildren = _get_all_children(self._node, "experiment")
-        count = -1
-        for node in allChildren:
-            count += 1
-            if node.get("id") == currId:
-                pos = _get_tag_pos(
-                    self._node, "experiment", self.xmlkeys(), count
-                )
-                self._node.remove(node)
-        self._node.insert(pos, experiment._node)
+        _import_child_by_id(
+            self._node, "experiment", self.xmlkeys(), experiment._node
+        )
 
     def import_all_experiments(self, add_rd, addMode):
         """Imports all elements to the end of the current list.
@@ -6168,6 +9014,142 @@ class Rdml:
                 add_rd, add_rd.get_therm_cyc_cons(byid=docId), "no-dep"
             )
 
+    def assemble_plates(self, sources, experiment=None, processes=None):
+        """Merges many RDML or lc96p plate files into this RDML object.
+
+        The files are parsed in worker processes and migrated to RDML v1.3.
+        Experimenters, documentations, dyes, samples, targets and thermal
+        cycling conditions are merged by id, the element present first is
+        kept and every dropped one is reported. The runs are collected in the experiment with the same id or
+        in the given experiment, run ids used twice get the plate name
+        added. The kept elements are copied, lxml moves subtrees between
+        documents far slower than it copies them. Only rdml_data.xml is
+        merged, the table files of digital runs are not copied.
+
+        Args:
+            self: The class self parameter.
+            sources: A list of file names, bytes or file-like objects.
+            experiment: The id of the experiment to collect all runs in (optional)
+            processes: The number of worker processes, 1 loads in this process (optional)
+
+        Returns:
+            A list of strings with the modifications made.
+        """
+
+        if self.version() != "1.3":
+            raise RdmlError("RDML version for assembling has to be v1.3.")
+        names = []
+        loadSources = []
+        for source in sources:
+            if isinstance(source, str):
+                names.append(os.path.splitext(os.path.basename(source))[0])
+                loadSources.append(source)
+            else:
+                names.append("plate " + str(len(names) + 1))
+                loadSources.append(_rdmlSource(source).getvalue())
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = min(processes, len(loadSources))
+
+        groupTags = [
+            "experimenter",
+            "documentation",
+            "dye",
+            "sample",
+            "target",
+            "thermalCyclingConditions",
+        ]
+        known = {}
+        newNodes = {"experiment": []}
+        for tag in groupTags:
+            known[tag] = set(_get_all_children_id(self._node, tag))
+            newNodes[tag] = []
+        expNodes = {}
+        runIds = {}
+        for node in _get_all_children(self._node, "experiment"):
+            expNodes[node.get("id")] = node
+            runIds[node.get("id")] = set(_get_all_children_id(node, "run"))
+
+        ret = []
+        if processes > 1:
+            executor = concurrent.futures.ProcessPoolExecutor(processes)
+            plates = executor.map(_assemble_read_plate, loadSources)
+        else:
+            executor = None
+            plates = map(_assemble_plate_root, loadSources)
+        try:
+            for plateName, (root, modifications) in zip(names, plates):
+                if executor is not None:
+                    root = et.fromstring(root)
+                for mod in modifications:
+                    ret.append(plateName + ": " + mod)
+                for node in list(root):
+                    tag = node.tag.replace("{http://www.rdml.org}", "")
+                    if tag in known:
+                        if node.get("id") not in known[tag]:
+                            known[tag].add(node.get("id"))
+                            newNodes[tag].append(copy.deepcopy(node))
+                        else:
+                            ret.append(
+                                plateName
+                                + ": "
+                                + tag
+                                + ' "'
+                                + node.get("id")
+                                + '" dropped, the id is already used.'
+                            )
+                        continue
+                    if tag != "experiment":
+                        continue
+                    expId = node.get("id")
+                    if experiment is not None:
+                        expId = experiment
+                    if expId not in expNodes:
+                        node = copy.deepcopy(node)
+                        node.attrib["id"] = expId
+                        expNodes[expId] = node
+                        runIds[expId] = set(_get_all_children_id(node, "run"))
+                        newNodes["experiment"].append(node)
+                        continue
+                    for run in _get_all_children(node, "run"):
+                        runId = run.get("id")
+                        if runId in runIds[expId]:
+                            newId = runId + " (" + plateName + ")"
+                            count = 2
+                            while newId in runIds[expId]:
+                                newId = (
+                                    runId
+                                    + " ("
+                                    + plateName
+                                    + " "
+                                    + str(count)
+                                    + ")"
+                                )
+                                count += 1
+                            run.attrib["id"] = newId
+                            ret.append(
+                                plateName
+                                + ': Run "'
+                                + runId
+                                + '" renamed to "'
+                                + newId
+                                + '".'
+                            )
+                        runIds[expId].add(run.get("id"))
+                        expNodes[expId].append(copy.deepcopy(run))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if experiment is not None and experiment not in expNodes:
+            self.new_experiment(experiment)
+        for tag in groupTags + ["experiment"]:
+            pos = _get_tag_pos(self._node, tag, self.xmlkeys(), 999999)
+            for node in newNodes[tag]:
+                self._node.insert(pos, node)
+                pos += 1
+        return ret
+
     def get_experiment(self, byid=None, byposition=None):
         """Returns an experiment element by position or id.
 
@@ -6211,7 +9193,7 @@ class Rdml:
             experiment.delete_run(byid=run["id"])
 
         # Now delete the experiment element
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def tojson(self):
         """Returns a json of the RDML object without fluorescence data.
@@ -6280,6 +9262,43 @@ class Rdml:
         }
         return data
 
+    def write_json(self, fileObj, floatDigits=None):
+        """Writes the json of tojson to a file-like object. The elements are
+        converted one after the other while writing.
+
+        Args:
+            self: The class self parameter.
+            fileObj: The file-like object with a write function for strings.
+            floatDigits: The number of significant digits of floats, None for full precision
+
+        Returns:
+            No return value.
+        """
+
+        data = {
+            "rdml": {
+                "version": self["version"],
+                "dateMade": self["dateMade"],
+                "dateUpdated": self["dateUpdated"],
+                "ids": (elem.tojson() for elem in self.rdmlids()),
+                "experimenters": (
+                    exp.tojson() for exp in self.experimenters()
+                ),
+                "documentations": (
+                    exp.tojson() for exp in self.documentations()
+                ),
+                "dyes": (exp.tojson() for exp in self.dyes()),
+                "samples": (exp.tojson() for exp in self.samples()),
+                "targets": (exp.tojson() for exp in self.targets()),
+                "therm_cyc_cons": (
+                    exp.tojson() for exp in self.therm_cyc_cons()
+                ),
+                "experiments": (exp.tojson() for exp in self.experiments()),
+            }
+        }
+        for chunk in _json_chunks(data, floatDigits):
+            fileObj.write(chunk)
+
 
 class Rdmlid:
     """RDML-Python library.
@@ -6775,6 +9794,8 @@ class Dye:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
+        _metadata_clear(self._node)
+
         if key == "dyeChemistry":
             if value not in [
                 "non-saturating DNA binding dye",
@@ -6998,6 +10019,8 @@ class Sample:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
+        _metadata_clear(self._node)
+
         if key == "id":
             self.change_id(value, merge_with_id=False)
             return
@@ -7390,6 +10413,8 @@ class Sample:
             Nothing, changes self.
         """
 
+        _metadata_clear(self._node)
+
         if type not in [
             "unkn",
             "ntc",
@@ -7428,6 +10453,8 @@ class Sample:
             Nothing, changes self.
         """
 
+        _metadata_clear(self._node)
+
         if type not in [
             "unkn",
             "ntc",
@@ -7471,6 +10498,8 @@ class Sample:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
+        _metadata_clear(self._node)
+
         pos = _get_tag_pos(self._node, "type", self.xmlkeys(), newposition)
         ele = _get_first_child_by_pos_or_id(
             self._node, "type", None, oldposition
@@ -7488,6 +10517,8 @@ class Sample:
             Nothing, changes self.
         """
 
+        _metadata_clear(self._node)
+
         par = self._node.getparent()
         ver = par.get("version")
         if ver != "1.3":
@@ -8246,6 +11277,8 @@ class Target:
             No return value, changes self. Function may raise RdmlError if required.
         """
 
+        _metadata_clear(self._node)
+
         par = self._node.getparent()
         ver = par.get("version")
         if key == "type":
@@ -8568,68 +11601,25 @@ class Target:
             # Search in Table files
             if self._rdmlFilename is not None and self._rdmlFilename != "":
                 if zipfile.is_zipfile(self._rdmlFilename):
-                    fileList = []
-                    tempName = ""
-                    flipFiles = False
-                    with zipfile.ZipFile(self._rdmlFilename, "r") as RDMLin:
-                        for item in RDMLin.infolist():
-                            if re.search("^partitions/", item.filename):
-                                fileContent = RDMLin.read(
-                                    item.filename
-                                ).decode("utf-8")
-                                newlineFix = fileContent.replace("\r\n", "\n")
-                                tabLines = newlineFix.split("\n")
-                                header = tabLines[0].split("\t")
-                                needRewrite = False
-                                for cell in header:
-                                    if cell == oldValue:
-                                        needRewrite = True
-                                if needRewrite:
-                                    fileList.append(item.filename)
-                        if len(fileList) > 0:
-                            tempFolder, tempName = tempfile.mkstemp(
-                                dir=os.path.dirname(self._rdmlFilename)
-                            )
-                            os.close(tempFolder)
-                            flipFiles = True
-                            with zipfile.ZipFile(
-                                tempName,
-                                mode="w",
-                                compression=zipfile.ZIP_DEFLATED,
-                            ) as RDMLout:
-                                RDMLout.comment = RDMLin.comment
-                                for item in RDMLin.infolist():
-                                    if item.filename not in fileList:
-                                        RDMLout.writestr(
-                                            item, RDMLin.read(item.filename)
-                                        )
-                                    else:
-                                        fileContent = RDMLin.read(
-                                            item.filename
-                                        ).decode("utf-8")
-                                        newlineFix = fileContent.replace(
-                                            "\r\n", "\n"
-                                        )
-                                        tabLines = newlineFix.split("\n")
-                                        header = tabLines[0].split("\t")
-                                        headerText = ""
-                                        for cell in header:
-                                            if cell == oldValue:
-                                                headerText += value + "\t"
-                                            else:
-                                                headerText += cell + "\t"
-                                        outFileStr = re.sub(
-                                            r"\t$", "\n", headerText
-                                        )
-                                        for tabLine in tabLines[1:]:
-                                            if tabLine != "":
-                                                outFileStr += tabLine + "\n"
-                                        RDMLout.writestr(
-                                            item.filename, outFileStr
-                                        )
-                    if flipFiles:
-                        os.remove(self._rdmlFilename)
-                        os.rename(tempName, self._rdmlFilename)
+                    catalogue = dict(_partitionCatalogue(self._rdmlFilename))
+                    newHeaders = {}
+                    for fileName, header in catalogue.items():
+                        if oldValue not in header:
+                            continue
+                        newHeader = []
+                        for cell in header:
+                            if cell == oldValue:
+                                newHeader.append(value)
+                            else:
+                                newHeader.append(cell)
+                        catalogue[fileName] = newHeader
+                        newHeaders[fileName] = "\t".join(newHeader)
+                    if len(newHeaders) > 0:
+                        _rewriteRDML(self._rdmlFilename, {}, newHeaders)
+                        _partitionCatalogueStore(
+                            _partitionCatalogueKey(self._rdmlFilename),
+                            catalogue,
+                        )
         return
 
     def keys(self):
@@ -10172,7 +13162,7 @@ class Experiment:
 
         new_node = _create_new_element(self._node, "run", id)
         place = _get_tag_pos(self._node, "run", self.xmlkeys(), newposition)
-        self._node.insert(place, new_node)
+        _id_registry_insert(self._node, place, new_node)
 
     def move_run(self, id, newposition):
         """Moves the element to the new position in the list.
@@ -10235,27 +13225,12 @@ class Experiment:
         if len(fileList) > 0:
             if self._rdmlFilename is not None and self._rdmlFilename != "":
                 if zipfile.is_zipfile(self._rdmlFilename):
-                    with zipfile.ZipFile(self._rdmlFilename, "r") as RDMLin:
-                        tempFolder, tempName = tempfile.mkstemp(
-                            dir=os.path.dirname(self._rdmlFilename)
-                        )
-                        os.close(tempFolder)
-                        with zipfile.ZipFile(
-                            tempName,
-                            mode="w",
-                            compression=zipfile.ZIP_DEFLATED,
-                        ) as RDMLout:
-                            RDMLout.comment = RDMLin.comment
-                            for item in RDMLin.infolist():
-                                if item.filename not in fileList:
-                                    RDMLout.writestr(
-                                        item, RDMLin.read(item.filename)
-                                    )
-                    os.remove(self._rdmlFilename)
-                    os.rename(tempName, self._rdmlFilename)
+                    _rewriteRDML(
+                        self._rdmlFilename, dict.fromkeys(fileList, None)
+                    )
 
         # Delete the node
-        self._node.remove(elem)
+        _id_registry_remove(self._node, elem)
 
     def tojson(self):
         """Returns a json of the RDML object without fluorescence data.
@@ -10411,6 +13386,7 @@ class Experiment:
         selAnnotation="",
         updateRDML=False,
         calcCorrection=True,
+        profile=None,
     ):
         """Corrects inter run differences. Modifies the cq values and returns a
         json with additional data.
@@ -10421,12 +13397,47 @@ class Experiment:
             selAnnotation: The annotation to use if overlapType == "annotation", else ignored.
             updateRDML: If true, update the RDML data with the calculated values.
             calcCorrection: If false, only the combined threshold and PCR efficiency is calculated
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
 
         Returns:
             A dictionary with the resulting data, presence and format depending on input.
             run: A list of the run ids
             target: A dictionary with the results per target
             plate: A dictionary with the results per plate
+            profile: A list with the measurements of each stage.
+        """
+
+        prof = StageProfiler("interRunCorr", profile, self["id"])
+        try:
+            res = self._interRunCorr(
+                prof,
+                overlapType=overlapType,
+                selAnnotation=selAnnotation,
+                updateRDML=updateRDML,
+                calcCorrection=calcCorrection,
+            )
+        finally:
+            profRes = prof.finish()
+        if profile:
+            res["profile"] = profRes
+        return res
+
+    def _interRunCorr(
+        self,
+        prof,
+        overlapType="samples",
+        selAnnotation="",
+        updateRDML=False,
+        calcCorrection=True,
+    ):
+        """Does the work of interRunCorr(), see there for the other arguments.
+
+        Args:
+            self: The class self parameter.
+            prof: The StageProfiler measuring the stages.
+
+        Returns:
+            The dictionary returned by interRunCorr() without the profile.
         """
 
         res = {}
@@ -10435,6 +13446,7 @@ class Experiment:
         if overlapType == "annotation":
             if selAnnotation == "":
                 raise RdmlError("Error: Selection of annotation required.")
+        prof.stage("parse")
         res["runs"] = []
         res["target"] = {}
         res["plate"] = {}
@@ -10454,7 +13466,7 @@ class Experiment:
 
         # Get the sample infos
         pRoot = self._node.getparent()
-        transSamTar = _sampleTypeToDics(pRoot)
+        transSamTar = _metadataToDics(pRoot)["sampleType"]
         if overlapType == "annotation":
             if selAnnotation != "":
                 samples = _get_all_children(pRoot, "sample")
@@ -10578,6 +13590,7 @@ class Experiment:
                             thres_Num += 1
 
         # Analyze the runs pair by pair
+        prof.stage("correction")
         if calcCorrection:
             for cRunA in range(0, len(allRuns)):
                 condCount = {}
@@ -10874,6 +13887,7 @@ class Experiment:
             res["error"] = err
 
         # Table creation
+        prof.stage("CSV")
         runLine = ""
         for tRun in res["runs"]:
             runLine += "\t" + tRun
@@ -10950,6 +13964,7 @@ class Experiment:
         ##############################
         # write out the rdml results #
         ##############################
+        prof.stage("write-back")
         if updateRDML is True:
             dataXMLelements = _getXMLDataType()
             for pRunA in range(0, len(allRuns)):
@@ -11078,7 +14093,7 @@ class Experiment:
         finalConc = -1.0
         n0data = self.getExperimentData()
         pRoot = self._node.getparent()
-        transSamTar = _sampleTypeToDics(pRoot)
+        transSamTar = _metadataToDics(pRoot)["sampleType"]
 
         res = {}
         tarType = {}
@@ -11858,74 +14873,50 @@ class Experiment:
                     res["tsv"]["standard"] += csvStandard
 
             # Mean the technical replicates
+            tecKeys, tecGroups, tecVals = _exp_longTable(
+                n0data["N0"], transSamTar
+            )
+            tecCount = np.bincount(tecGroups, minlength=len(tecKeys))
+            tecFact = np.ones(len(tecKeys), dtype=np.float64)
+            for pos in range(0, len(tecKeys)):
+                if tecCount[pos] > 0:
+                    tecFact[pos] = res["fluorN0Fact"][tecKeys[pos][1]]
+            tecVals = tecVals / tecFact[tecGroups]
+            tecCount, tecMean, tecSd = _exp_groupedMeanSd(
+                tecVals, tecGroups, len(tecKeys)
+            )
+            tecStart = np.concatenate(([0], np.cumsum(tecCount)))
+
             res["tec_data"] = {}
             for sample in n0data["N0"]:
                 res["tec_data"][sample] = {}
-                for target in n0data["N0"][sample]:
-                    if transSamTar[sample][target] in [
-                        "ntc",
-                        "nac",
-                        "ntp",
-                        "nrt",
-                        "opt",
-                    ]:
-                        continue
-                    res["tec_data"][sample][target] = {}
-                    res["tec_data"][sample][target]["sample_type"] = ""
-                    res["tec_data"][sample][target]["error"] = ""
-                    res["tec_data"][sample][target]["note"] = ""
-                    if sample in transSamTar:
-                        if target in transSamTar[sample]:
-                            res["tec_data"][sample][target][
-                                "sample_type"
-                            ] = transSamTar[sample][target]
-                    res["tec_data"][sample][target]["target_type"] = ""
-                    if target in tarType:
-                        res["tec_data"][sample][target][
-                            "target_type"
-                        ] = tarType[target]
-                    res["tec_data"][sample][target]["n_tec_rep"] = len(
-                        n0data["N0"][sample][target]
-                    )
-                    res["tec_data"][sample][target]["raw_vals"] = []
-                    if len(n0data["N0"][sample][target]) == 0:
-                        res["tec_data"][sample][target][
-                            "error"
-                        ] += "No N0 values;"
-                        res["tec_data"][sample][target]["cop_mean"] = -1.0
-                        res["tec_data"][sample][target]["cop_sd"] = -1.0
-                        res["tec_data"][sample][target]["cop_cv"] = -1.0
-                    else:
-                        for n0Val in n0data["N0"][sample][target]:
-                            res["tec_data"][sample][target]["raw_vals"].append(
-                                n0Val / res["fluorN0Fact"][target]
-                            )
-                        res["tec_data"][sample][target]["cop_mean"] = float(
-                            np.mean(
-                                res["tec_data"][sample][target]["raw_vals"]
-                            )
-                        )
-                        if len(n0data["N0"][sample][target]) == 1:
-                            res["tec_data"][sample][target]["cop_sd"] = 0.0
-                            res["tec_data"][sample][target]["cop_cv"] = 0.0
-                        else:
-                            res["tec_data"][sample][target]["cop_sd"] = float(
-                                np.std(
-                                    res["tec_data"][sample][target][
-                                        "raw_vals"
-                                    ],
-                                    ddof=1,
-                                )
-                            )
-                            calcCV = (
-                                res["tec_data"][sample][target]["cop_sd"]
-                                / res["tec_data"][sample][target]["cop_mean"]
-                            )
-                            res["tec_data"][sample][target]["cop_cv"] = calcCV
-                            if calcCV > 0.3:
-                                res["tec_data"][sample][target][
-                                    "note"
-                                ] += "Tec. Rep. CV > 0.3;"
+            for pos in range(0, len(tecKeys)):
+                sample, target = tecKeys[pos]
+                tecRes = {}
+                tecRes["sample_type"] = transSamTar[sample][target]
+                tecRes["error"] = ""
+                tecRes["note"] = ""
+                tecRes["target_type"] = ""
+                if target in tarType:
+                    tecRes["target_type"] = tarType[target]
+                tecRes["n_tec_rep"] = int(tecCount[pos])
+                tecRes["raw_vals"] = tecVals[
+                    tecStart[pos] : tecStart[pos + 1]
+                ].tolist()
+                if tecCount[pos] == 0:
+                    tecRes["error"] += "No N0 values;"
+                    tecRes["cop_mean"] = -1.0
+                    tecRes["cop_sd"] = -1.0
+                    tecRes["cop_cv"] = -1.0
+                else:
+                    tecRes["cop_mean"] = float(tecMean[pos])
+                    tecRes["cop_sd"] = float(tecSd[pos])
+                    tecRes["cop_cv"] = 0.0
+                    if tecCount[pos] > 1:
+                        tecRes["cop_cv"] = float(tecSd[pos] / tecMean[pos])
+                        if tecRes["cop_cv"] > 0.3:
+                            tecRes["note"] += "Tec. Rep. CV > 0.3;"
+                res["tec_data"][sample][target] = tecRes
 
             if overlapType == "annotation":
                 res["anno_data"] = {}
@@ -12139,6 +15130,7 @@ class Experiment:
         saveResultsCSV=False,
         saveResultsSVG=False,
         maxRef=-1,
+        profile=None,
     ):
         """Finds most stable reference genes. Returns a json with additional
         data.
@@ -12149,14 +15141,53 @@ class Experiment:
             selAnnotation: The annotation to use if overlapType == "annotation", else ignored.
             selAnnoValue: The value of the annotation to use if overlapType == "annotation", else ignored.
             saveResultsCSV: Save the results as tsv file
-            saveResultsSVG: Save results as svg, this sets saveResultsCSV=True
+            saveResultsSVG: Save results as svg, this sets saveResultsCSV=True. "background" returns the Future of the render in "svg_future" instead of the svg
             maxRef: Maximum number of reference genes allowed
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
 
         Returns:
             A dictionary with the resulting data, presence and format depending on input.
             run: A list of the run ids
             target: A dictionary with the results per target
             plate: A dictionary with the results per plate
+            profile: A list with the measurements of each stage.
+        """
+
+        prof = StageProfiler("genorm", profile, self["id"])
+        try:
+            res = self._genorm(
+                prof,
+                selSamples=selSamples,
+                selAnnotation=selAnnotation,
+                selAnnoValue=selAnnoValue,
+                saveResultsCSV=saveResultsCSV,
+                saveResultsSVG=saveResultsSVG,
+                maxRef=maxRef,
+            )
+        finally:
+            profRes = prof.finish()
+        if profile:
+            res["profile"] = profRes
+        return res
+
+    def _genorm(
+        self,
+        prof,
+        selSamples="samples",
+        selAnnotation="",
+        selAnnoValue="",
+        saveResultsCSV=False,
+        saveResultsSVG=False,
+        maxRef=-1,
+    ):
+        """Does the work of genorm(), see there for the other arguments.
+
+        Args:
+            self: The class self parameter.
+            prof: The StageProfiler measuring the stages.
+
+        Returns:
+            The dictionary returned by genorm() without the profile.
         """
 
         res = {}
@@ -12172,6 +15203,7 @@ class Experiment:
 
         if saveResultsSVG:
             saveResultsCSV = True
+        prof.stage("parse")
 
         res["tsv"] = {}
         err = ""
@@ -12185,7 +15217,7 @@ class Experiment:
 
         # Get the sample infos
         pRoot = self._node.getparent()
-        transSamTar = _sampleTypeToDics(pRoot)
+        transSamTar = _metadataToDics(pRoot)["sampleType"]
         if selSamples == "annotation":
             if selAnnotation != "":
                 samples = _get_all_children(pRoot, "sample")
@@ -12394,20 +15426,16 @@ class Experiment:
         if np.shape(n0_geo)[0] < 2:
             raise RdmlError("Error: geNorm requires at least two conditions.")
 
-        # Calculate M factor
-        mFactor = np.zeros(np.shape(n0_geo)[1], dtype=np.float64)
-        for col in range(0, np.shape(n0_geo)[1]):
-            logRes = np.log2(
-                n0_geo[:, col][:, None] / np.delete(n0_geo, col, axis=1)
-            )
-            stdRes = np.nanstd(logRes, axis=0, ddof=1)
-            mFactor[col] = np.nanmean(stdRes)
-        #    print(res["reference"][col])
-        #    print(stdRes)
-        #    print(mFactor[col])
+        # Calculate M factor from the pairwise variation matrix
+        prof.stage("stability")
+        geneCount = np.shape(n0_geo)[1]
+        pairSd = _gen_pairLogSd(n0_geo)
+        pairSd[np.arange(geneCount), np.arange(geneCount)] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            mFactor = np.nanmean(pairSd, axis=1)
 
         # Calculate V factor
-        vFactor = np.zeros(np.shape(n0_geo)[1] - 2, dtype=np.float64)
         mFactorInds = mFactor.argsort()
         sorted_mFactor = mFactor[mFactorInds[::1]]
         sorted_n0_geo = n0_geo[:, mFactorInds[::1]]
@@ -12438,25 +15466,7 @@ class Experiment:
             res["v_values"] = []
             for col in range(1, np.shape(n0_geo)[1] - 1):
                 res["v_labels"].append("v" + str(col + 1) + "/" + str(col + 2))
-                sum_a = np.nansum(
-                    np.log(sorted_n0_geo[:, 0 : col + 1]), axis=1
-                )
-                sum_b = np.nansum(
-                    np.log(sorted_n0_geo[:, 0 : col + 2]), axis=1
-                )
-                num_a = np.count_nonzero(
-                    ~np.isnan(np.log(sorted_n0_geo[:, 0 : col + 1])), axis=1
-                )
-                num_b = np.count_nonzero(
-                    ~np.isnan(np.log(sorted_n0_geo[:, 0 : col + 2])), axis=1
-                )
-                with np.errstate(divide="ignore", invalid="ignore"):
-                    geoDiff = np.exp(sum_a / num_a) / np.exp(sum_b / num_b)
-                    logDiff = np.log2(geoDiff)
-                    vFactor[col - 1] = np.nanstd(logDiff, axis=0, ddof=1)
-                    res["v_values"].append(
-                        float(np.nanstd(logDiff, axis=0, ddof=1))
-                    )
+            res["v_values"] = _gen_vValues(sorted_n0_geo).tolist()
 
         if saveResultsCSV:
             if np.shape(n0_geo)[1] > 2:
@@ -12472,44 +15482,11 @@ class Experiment:
                     r"\t$", "\n", res["tsv"]["v_values"]
                 )
 
-        if saveResultsSVG:
-            res["svg"] = {}
-            fig = plt_fig()
-            axis = fig.add_subplot(1, 1, 1)
-            axis.bar(res["m_targets"], res["m_values"])
-            axis.tick_params(labelsize=16)
-            axis.tick_params(axis="x", labelrotation=90)
-            xLim = axis.get_xlim()
-            yLim = axis.get_ylim()
-            if yLim[1] < 0.8:
-                axis.set_ylim(0.0, 0.8)
-            else:
-                axis.set_ylim(0.0, None)
-            axis.plot(xLim, [0.5, 0.5], "k--")
-            fig.tight_layout()
-            with io.StringIO() as mFile:
-                figSVG(fig).print_svg(mFile)
-                mFile.seek(0)
-                res["svg"]["m_values"] = mFile.read()
-
-            if np.shape(n0_geo)[1] > 2:
-                fig2 = plt_fig()
-                axis2 = fig2.add_subplot(1, 1, 1)
-                axis2.bar(res["v_labels"], res["v_values"])
-                axis2.tick_params(labelsize=16)
-                axis2.tick_params(axis="x", labelrotation=90)
-                xLim2 = axis2.get_xlim()
-                yLim2 = axis2.get_ylim()
-                if yLim2[1] < 0.2:
-                    axis2.set_ylim(0.0, 0.2)
-                else:
-                    axis2.set_ylim(0.0, None)
-                axis2.plot(xLim2, [0.15, 0.15], "k--")
-                fig2.tight_layout()
-                with io.StringIO() as mFile2:
-                    figSVG(fig2).print_svg(mFile2)
-                    mFile2.seek(0)
-                    res["svg"]["v_values"] = mFile2.read()
+        prof.stage("SVG")
+        if saveResultsSVG == "background":
+            res["svg_future"] = genormSvgAsync(res)
+        elif saveResultsSVG:
+            res["svg"] = genormSvg(res)
 
         if err != "":
             res["error"] = err
@@ -12524,6 +15501,7 @@ class Experiment:
         inclAnnotation=False,
         selReferences=[],
         saveResultsCSV=False,
+        profile=None,
     ):
         """Calulates relative expression and returns a json with additional
         data.
@@ -12536,12 +15514,51 @@ class Experiment:
             inclAnnotation: If true, all annotations are included in csv output
             selReferences: The list of reference genes to correct for.
             saveResultsCSV: Save the results as tsv file.
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
 
         Returns:
             A dictionary with the resulting data, presence and format depending on input.
             run: A list of the run ids
             target: A dictionary with the results per target
             plate: A dictionary with the results per plate
+            profile: A list with the measurements of each stage.
+        """
+
+        prof = StageProfiler("relative", profile, self["id"])
+        try:
+            res = self._relative(
+                prof,
+                overlapType=overlapType,
+                selAnnotation=selAnnotation,
+                statsParametric=statsParametric,
+                inclAnnotation=inclAnnotation,
+                selReferences=selReferences,
+                saveResultsCSV=saveResultsCSV,
+            )
+        finally:
+            profRes = prof.finish()
+        if profile:
+            res["profile"] = profRes
+        return res
+
+    def _relative(
+        self,
+        prof,
+        overlapType="samples",
+        selAnnotation="",
+        statsParametric=False,
+        inclAnnotation=False,
+        selReferences=[],
+        saveResultsCSV=False,
+    ):
+        """Does the work of relative(), see there for the other arguments.
+
+        Args:
+            self: The class self parameter.
+            prof: The StageProfiler measuring the stages.
+
+        Returns:
+            The dictionary returned by relative() without the profile.
         """
 
         res = {}
@@ -12556,6 +15573,7 @@ class Experiment:
             if selAnnotation == "":
                 raise RdmlError("Error: Selection of annotation required.")
 
+        prof.stage("parse")
         res["tec_data"] = {}
         res["ref_data"] = {}
         res["rel_data"] = {}
@@ -12564,7 +15582,7 @@ class Experiment:
 
         n0data = self.getExperimentData()
         pRoot = self._node.getparent()
-        transSamTar = _sampleTypeToDics(pRoot)
+        transSamTar = _metadataToDics(pRoot)["sampleType"]
 
         # Find the sample annotoation
         samples = _get_all_children(pRoot, "sample")
@@ -12625,156 +15643,135 @@ class Experiment:
                 tarType[tarId] = _get_first_child_text(target, "type")
 
         # Mean the technical replicates
-        for sample in n0data["N0"]:
-            res["tec_data"][sample] = {}
-            for target in n0data["N0"][sample]:
-                if transSamTar[sample][target] in [
-                    "ntc",
-                    "nac",
-                    "ntp",
-                    "nrt",
-                    "opt",
-                ]:
-                    continue
-                res["tec_data"][sample][target] = {}
-                res["tec_data"][sample][target]["sample_type"] = ""
-                res["tec_data"][sample][target]["error"] = ""
-                res["tec_data"][sample][target]["note"] = ""
-                if sample in transSamTar:
-                    if target in transSamTar[sample]:
-                        res["tec_data"][sample][target][
-                            "sample_type"
-                        ] = transSamTar[sample][target]
-                res["tec_data"][sample][target]["target_type"] = ""
-                if target in tarType:
-                    res["tec_data"][sample][target]["target_type"] = tarType[
-                        target
-                    ]
-                res["tec_data"][sample][target]["n_tec_rep"] = len(
-                    n0data["N0"][sample][target]
-                )
-                res["tec_data"][sample][target]["raw_vals"] = n0data["N0"][
-                    sample
-                ][target]
-                if len(n0data["N0"][sample][target]) == 0:
-                    res["tec_data"][sample][target]["error"] += "No N0 values;"
-                    res["tec_data"][sample][target]["N0_mean"] = -1.0
-                    res["tec_data"][sample][target]["N0_sd"] = -1.0
-                    res["tec_data"][sample][target]["N0_cv"] = -1.0
-                else:
-                    res["tec_data"][sample][target]["N0_mean"] = float(
-                        np.mean(n0data["N0"][sample][target])
-                    )
-                    if len(n0data["N0"][sample][target]) == 1:
-                        res["tec_data"][sample][target]["N0_sd"] = 0.0
-                        res["tec_data"][sample][target]["N0_cv"] = 0.0
-                    else:
-                        res["tec_data"][sample][target]["N0_sd"] = float(
-                            np.std(n0data["N0"][sample][target], ddof=1)
-                        )
-                        calcCV = (
-                            res["tec_data"][sample][target]["N0_sd"]
-                            / res["tec_data"][sample][target]["N0_mean"]
-                        )
-                        res["tec_data"][sample][target]["N0_cv"] = calcCV
-                        if calcCV > 0.3:
-                            res["tec_data"][sample][target][
-                                "note"
-                            ] += "Tec. Rep. CV > 0.3;"
-
-        # Geomean the reference genes
-        for sample in n0data["N0"]:
-            keepSample = False
-            for target in selReferences:
-                if transSamTar[sample][target] not in [
-                    "ntc",
-                    "nac",
-                    "ntp",
-                    "nrt",
-                    "opt",
-                ]:
-                    keepSample = True
-            if not keepSample:
-                continue
-            res["ref_data"][sample] = {}
-            res["ref_data"][sample]["N0_sum"] = 0.0
-            res["ref_data"][sample]["N0_num"] = 0
-            res["ref_data"][sample]["N0_gem"] = -1.0
-            res["ref_data"][sample]["ref_missing"] = False
-            res["ref_data"][sample]["raw_vals"] = []
-            for target in selReferences:
-                if sample not in res["tec_data"]:
-                    continue
-                if target not in res["tec_data"][sample]:
-                    res["ref_data"][sample]["ref_missing"] = True
-                    continue
-                if res["tec_data"][sample][target]["n_tec_rep"] == 0:
-                    res["ref_data"][sample]["ref_missing"] = True
-                    continue
-                res["ref_data"][sample]["raw_vals"].append(
-                    res["tec_data"][sample][target]["N0_mean"]
-                )
-                res["ref_data"][sample]["N0_sum"] += math.log(
-                    res["tec_data"][sample][target]["N0_mean"]
-                )
-                res["ref_data"][sample]["N0_num"] += 1
-            if res["ref_data"][sample]["N0_num"] > 0:
-                geoMean = math.exp(
-                    res["ref_data"][sample]["N0_sum"]
-                    / res["ref_data"][sample]["N0_num"]
-                )
-                res["ref_data"][sample]["N0_gem"] = geoMean
+        prof.stage("replicates")
+        tecKeys, tecGroups, tecVals = _exp_longTable(n0data["N0"], transSamTar)
+        tecCount, tecMean, tecSd = _exp_groupedMeanSd(
+            tecVals, tecGroups, len(tecKeys)
+        )
+        tecStart = np.concatenate(([0], np.cumsum(tecCount)))
+        tecPos = {}
+        for pos in range(0, len(tecKeys)):
+            tecPos[tecKeys[pos]] = pos
 
-        # Calculate relative gene expression
+        # Geomean the reference genes
+        prof.stage("reference")
+        refSamples = []
+        refMissing = []
+        refStart = [0]
+        refGroups = []
+        refIndex = []
         for sample in n0data["N0"]:
-            res["rel_data"][sample] = {}
-            for target in n0data["N0"][sample]:
-                if sample not in transSamTar:
-                    continue
-                if target not in transSamTar[sample]:
-                    continue
-                if transSamTar[sample][target] in [
+            keepSample = False
+            for target in selReferences:
+                if transSamTar[sample][target] not in [
                     "ntc",
                     "nac",
                     "ntp",
                     "nrt",
                     "opt",
                 ]:
+                    keepSample = True
+            if not keepSample:
+                continue
+            missing = False
+            for target in selReferences:
+                pos = tecPos.get((sample, target), -1)
+                if pos < 0 or tecCount[pos] == 0:
+                    missing = True
                     continue
-                if sample not in res["tec_data"]:
-                    continue
-                if target not in res["tec_data"][sample]:
-                    continue
-                if "target_type" not in res["tec_data"][sample][target]:
-                    continue
-                if res["tec_data"][sample][target]["target_type"] == "ref":
-                    continue
-                res["rel_data"][sample][target] = {}
-                res["rel_data"][sample][target]["rel_expression"] = -1.0
-                res["rel_data"][sample][target]["ref_missing"] = res[
-                    "ref_data"
-                ][sample]["ref_missing"]
-                if not res["rel_data"][sample][target]["ref_missing"]:
-                    if sample not in res["ref_data"]:
-                        continue
-                    relEx = -1.0
-                    if res["tec_data"][sample][target]["N0_mean"] > 0.0:
-                        if res["ref_data"][sample]["N0_gem"] > 0.0:
-                            relEx = (
-                                res["tec_data"][sample][target]["N0_mean"]
-                                / res["ref_data"][sample]["N0_gem"]
-                            )
-                    res["rel_data"][sample][target]["rel_expression"] = relEx
-
-        for sample in res["rel_data"]:
-            for target in res["rel_data"][sample]:
-                res["rel_data"][sample][target]["raw_vals"] = []
-                if res["rel_data"][sample][target]["rel_expression"] > 0.0:
-                    for indivVal in n0data["N0"][sample][target]:
-                        res["rel_data"][sample][target]["raw_vals"].append(
-                            (indivVal / res["ref_data"][sample]["N0_gem"])
-                        )
+                refGroups.append(pos)
+                refIndex.append(len(refSamples))
+            refSamples.append(sample)
+            refMissing.append(missing)
+            refStart.append(len(refGroups))
+        refGroups = np.array(refGroups, dtype=np.int64)
+        refIndex = np.array(refIndex, dtype=np.int64)
+        refLogs = [math.log(val) for val in tecMean[refGroups].tolist()]
+        refSum = np.bincount(
+            refIndex, weights=refLogs, minlength=len(refSamples)
+        )
+        refNum = np.bincount(refIndex, minlength=len(refSamples))
+        refGem = np.full(len(refSamples), -1.0)
+        for pos in range(0, len(refSamples)):
+            if refNum[pos] > 0:
+                refGem[pos] = math.exp(refSum[pos] / refNum[pos])
+        refPos = {}
+        for pos in range(0, len(refSamples)):
+            refPos[refSamples[pos]] = pos
 
+        # Calculate relative gene expression
+        prof.stage("expression")
+        relGem = np.ones(len(tecKeys), dtype=np.float64)
+        relValid = np.zeros(len(tecKeys), dtype=bool)
+        relKeep = np.zeros(len(tecKeys), dtype=bool)
+        for pos in range(0, len(tecKeys)):
+            sample, target = tecKeys[pos]
+            if target in tarType and tarType[target] == "ref":
+                continue
+            relKeep[pos] = True
+            rPos = refPos[sample]
+            if not refMissing[rPos] and refGem[rPos] > 0.0:
+                relGem[pos] = refGem[rPos]
+                relValid[pos] = True
+        relUse = relValid & (tecCount > 0) & (tecMean > 0.0)
+        relEx = np.full(len(tecKeys), -1.0)
+        relEx[relUse] = tecMean[relUse] / relGem[relUse]
+        relRaw = tecVals / relGem[tecGroups]
+
+        # Materialise the result dictionaries
+        for sample in n0data["N0"]:
+            res["tec_data"][sample] = {}
+            res["rel_data"][sample] = {}
+        for pos in range(0, len(tecKeys)):
+            sample, target = tecKeys[pos]
+            tecRes = {}
+            tecRes["sample_type"] = transSamTar[sample][target]
+            tecRes["error"] = ""
+            tecRes["note"] = ""
+            tecRes["target_type"] = ""
+            if target in tarType:
+                tecRes["target_type"] = tarType[target]
+            tecRes["n_tec_rep"] = int(tecCount[pos])
+            tecRes["raw_vals"] = n0data["N0"][sample][target]
+            if tecCount[pos] == 0:
+                tecRes["error"] += "No N0 values;"
+                tecRes["N0_mean"] = -1.0
+                tecRes["N0_sd"] = -1.0
+                tecRes["N0_cv"] = -1.0
+            else:
+                tecRes["N0_mean"] = float(tecMean[pos])
+                tecRes["N0_sd"] = float(tecSd[pos])
+                tecRes["N0_cv"] = 0.0
+                if tecCount[pos] > 1:
+                    tecRes["N0_cv"] = float(tecSd[pos] / tecMean[pos])
+                    if tecRes["N0_cv"] > 0.3:
+                        tecRes["note"] += "Tec. Rep. CV > 0.3;"
+            res["tec_data"][sample][target] = tecRes
+        for pos in range(0, len(refSamples)):
+            refRes = {}
+            refRes["N0_sum"] = float(refSum[pos])
+            refRes["N0_num"] = int(refNum[pos])
+            refRes["N0_gem"] = float(refGem[pos])
+            refRes["ref_missing"] = refMissing[pos]
+            refRes["raw_vals"] = tecMean[
+                refGroups[refStart[pos] : refStart[pos + 1]]
+            ].tolist()
+            res["ref_data"][refSamples[pos]] = refRes
+        for pos in range(0, len(tecKeys)):
+            if not relKeep[pos]:
+                continue
+            sample, target = tecKeys[pos]
+            relRes = {}
+            relRes["rel_expression"] = float(relEx[pos])
+            relRes["ref_missing"] = refMissing[refPos[sample]]
+            relRes["raw_vals"] = []
+            if relUse[pos]:
+                relRes["raw_vals"] = relRaw[
+                    tecStart[pos] : tecStart[pos + 1]
+                ].tolist()
+            res["rel_data"][sample][target] = relRes
+
+        prof.stage("statistics")
         if overlapType == "annotation":
             res["anno_data"] = {}
             res["anno_stats"] = {}
@@ -12808,6 +15805,8 @@ class Experiment:
                                     "rel_expression"
                                 ]
                             )
+            statTarGroups = {}
+            translateGrps = {}
             for target in res["anno_data"]:
                 statTarGroup = []
                 translateGrp = {}
@@ -12832,10 +15831,13 @@ class Experiment:
                             res["anno_data"][target][annoVal]["sem"] = float(
                                 scp.sem(annoCollVals)
                             )
-                res["anno_stats"][target] = runStatistics(
-                    statTarGroup, statsParametric, translateGrp
-                )
+                statTarGroups[target] = statTarGroup
+                translateGrps[target] = translateGrp
+            res["anno_stats"] = runStatisticsBatch(
+                statTarGroups, statsParametric, translateGrps
+            )
 
+        prof.stage("CSV")
         if saveResultsCSV:
             res["tsv"]["technical_data"] = "Sample\tSample Type\t"
             if inclAnnotation:
@@ -13533,6 +16535,26 @@ class Run:
         data["react"] = _get_number_of_children(self._node, "react")
         return data
 
+    def plate_format(self):
+        """Returns the plate format of the run. Runs with the same number of
+        rows and columns share one PlateFormat object.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            The PlateFormat object. Function may raise RdmlError if required.
+        """
+
+        rows = self["pcrFormat_rows"]
+        columns = self["pcrFormat_columns"]
+        if rows is None or columns is None:
+            raise RdmlError("Run requires the pcrFormat rows and columns.")
+        formatKey = (int(rows), int(columns))
+        if formatKey not in _plateFormats:
+            _plateFormats[formatKey] = PlateFormat(rows, columns)
+        return _plateFormats[formatKey]
+
     def export_table(self, dMode):
         """Returns a tab seperated table file with the react fluorescence data
         in RDES format.
@@ -13545,25 +16567,15 @@ class Run:
             A string with the data.
         """
 
-        tarTypeLookup = {}
-        tarDyeLookup = {}
         data = ""
 
         # Get the information for the lookup dictionaries
         pExp = self._node.getparent()
         pRoot = pExp.getparent()
-        transSamTar = _sampleTypeToDics(pRoot)
-        targets = _get_all_children(pRoot, "target")
-        for target in targets:
-            if target.attrib["id"] != "":
-                tarId = target.attrib["id"]
-                forType = _get_first_child_text(target, "type")
-                if forType != "":
-                    tarTypeLookup[tarId] = forType
-                forId = _get_first_child(target, "dyeId")
-                if forId is not None:
-                    if forId.attrib["id"] != "":
-                        tarDyeLookup[tarId] = forId.attrib["id"]
+        metaLookups = _metadataToDics(pRoot)
+        transSamTar = metaLookups["sampleType"]
+        tarTypeLookup = metaLookups["targetType"]
+        tarDyeLookup = metaLookups["targetDye"]
 
         # Now create the header line
         data += "Well\tSample\tSample Type\tTarget\tTarget Type\tDye\t"
@@ -13594,22 +16606,13 @@ class Run:
 
         # Now create the data lines
         reacts = _get_all_children(self._node, "react")
+        plateFormat = self.plate_format()
         wellData = []
         for react in reacts:
             reactId = react.get("id")
             pWell = str(reactId)
-            if (
-                int(self["pcrFormat_columns"]) != 1
-                and int(self["pcrFormat_rows"]) != 1
-            ):
-                pIdNumber = (int(reactId) - 1) % int(
-                    self["pcrFormat_columns"]
-                ) + 1
-                pIdLetter = chr(
-                    ord("A")
-                    + int((int(reactId) - 1) / int(self["pcrFormat_columns"]))
-                )
-                pWell = pIdLetter + str(pIdNumber)
+            if plateFormat.columns != 1 and plateFormat.rows != 1:
+                pWell = plateFormat.label(reactId)
             dataSample = pWell + "\t"
             react_sample = "No Sample"
             forId = _get_first_child(react, "sample")
@@ -13674,6 +16677,94 @@ class Run:
             data += hElem[1]
         return data
 
+    def plate_arrays(self):
+        """Returns the plate layout and the fluorescence data of the run as
+        numpy arrays, one row per react data element sorted by react id.
+
+        Args:
+            self: The class self parameter.
+
+        Returns:
+            A dictionary with the numpy arrays:
+            react, well, sample, sample_type, target, target_type, dye, cq, melt_temp: Strings per row
+            cycles, amp: The sorted cycles and the amplification fluorescence, NaN if missing
+            temps, melt: The sorted temperatures and the melting fluorescence, NaN if missing
+            plate: The number of rows and columns of the plate
+        """
+
+        pRoot = self._node.getparent().getparent()
+        metaLookups = _metadataToDics(pRoot)
+        transSamTar = metaLookups["sampleType"]
+        plateFormat = self.plate_format()
+        cols = {}
+        for key in [
+            "react",
+            "well",
+            "sample",
+            "sample_type",
+            "target",
+            "target_type",
+            "dye",
+            "cq",
+            "melt_temp",
+        ]:
+            cols[key] = []
+        dataNodes = []
+        reacts = _get_all_children(self._node, "react")
+        for react in sorted(reacts, key=lambda elem: int(elem.get("id"))):
+            reactId = react.get("id")
+            pWell = str(reactId)
+            if plateFormat.columns != 1 and plateFormat.rows != 1:
+                pWell = plateFormat.label(reactId)
+            sample = ""
+            forId = _get_first_child(react, "sample")
+            if forId is not None:
+                sample = forId.attrib["id"]
+            for react_data in _get_all_children(react, "data"):
+                target = ""
+                forId = _get_first_child(react_data, "tar")
+                if forId is not None:
+                    target = forId.attrib["id"]
+                sampleType = ""
+                if sample in transSamTar and target in transSamTar[sample]:
+                    sampleType = transSamTar[sample][target]
+                cols["react"].append(reactId)
+                cols["well"].append(pWell)
+                cols["sample"].append(sample)
+                cols["sample_type"].append(sampleType)
+                cols["target"].append(target)
+                cols["target_type"].append(
+                    metaLookups["targetType"].get(target, "")
+                )
+                cols["dye"].append(metaLookups["targetDye"].get(target, ""))
+                cols["cq"].append(_get_first_child_text(react_data, "cq"))
+                cols["melt_temp"].append(
+                    _get_first_child_text(react_data, "meltTemp")
+                )
+                dataNodes.append(react_data)
+
+        ret = {}
+        for key in cols:
+            ret[key] = np.array(cols[key], dtype=str)
+        for pointTag, xTag, xKey, fluorKey in [
+            ["adp", "cyc", "cycles", "amp"],
+            ["mdp", "tmp", "temps", "melt"],
+        ]:
+            pointRow, pointX, pointFluor = _read_data_points(
+                dataNodes, pointTag, xTag
+            )
+            ret[xKey] = np.unique(pointX)
+            ret[fluorKey] = np.full(
+                (len(dataNodes), len(ret[xKey])), np.nan, dtype=np.float64
+            )
+            ret[fluorKey][
+                pointRow, np.searchsorted(ret[xKey], pointX)
+            ] = pointFluor
+        ret["plate"] = np.array(
+            [plateFormat.rows, plateFormat.columns], dtype=np.int64
+        )
+        return ret
+
     def import_table(self, rootEl, filename, dMode):
         """Imports data from a tab seperated table file with react fluorescence
         data.
@@ -13748,6 +16839,7 @@ class Run:
                     dyeLookup[forId.attrib["id"]] = 1
 
         # Process the lines
+        plateFormat = self.plate_format()
         for tabLine in tabLines[1:]:
             sLin = tabLine.split("\t")
             if (
@@ -13829,10 +16921,8 @@ class Run:
 
             # Get the position number if required
             wellPos = sLin[0]
-            if re.search(r"\D\d+", sLin[0]):
-                old_letter = ord(re.sub(r"\d", "", sLin[0]).upper()) - ord("A")
-                old_nr = int(re.sub(r"\D", "", sLin[0]))
-                newId = old_nr + old_letter * int(self["pcrFormat_columns"])
+            newId = plateFormat.react_id(sLin[0])
+            if newId is not None:
                 wellPos = str(newId)
             if re.search(r"\D\d+\D\d+", sLin[0]):
                 old_left = re.sub(r"\D\d+$", "", sLin[0])
@@ -14068,6 +17158,7 @@ class Run:
         headerLookup = {}
         fileLookup = {}
         fileNameSuggLookup = {}
+        plateFormat = self.plate_format()
 
         samples = _get_all_children(rootEl._node, "sample")
         for sample in samples:
@@ -14396,14 +17487,8 @@ class Run:
 
                     # Get the position number if required
                     wellPosStore = wellPos
-                    if re.search(r"\D\d+", wellPos):
-                        old_letter = ord(
-                            re.sub(r"\d", "", wellPos.upper())
-                        ) - ord("A")
-                        old_nr = int(re.sub(r"\D", "", wellPos))
-                        newId = old_nr + old_letter * int(
-                            self["pcrFormat_columns"]
-                        )
+                    newId = plateFormat.react_id(wellPos)
+                    if newId is not None:
                         wellPos = str(newId)
 
                     exp = _get_all_children(self._node, "react")
@@ -14672,10 +17757,8 @@ class Run:
             dataCh3 = None
 
             wellPos = well
-            if re.search(r"\D\d+", well):
-                old_letter = ord(re.sub(r"\d", "", well).upper()) - ord("A")
-                old_nr = int(re.sub(r"\D", "", well))
-                newId = old_nr + old_letter * int(self["pcrFormat_columns"])
+            newId = plateFormat.react_id(well)
+            if newId is not None:
                 wellPos = str(newId)
 
             exp = _get_all_children(self._node, "react")
@@ -15539,30 +18622,16 @@ class Run:
         tabLines = []
 
         # Fill the lookup dics
-        tarTypeLookup = {}
-        tarDyeLookup = {}
-
-        transSamTar = _sampleTypeToDics(rootEl._node)
-        targets = _get_all_children(rootEl._node, "target")
-        for target in targets:
-            if target.attrib["id"] != "":
-                tarId = target.attrib["id"]
-                forType = _get_first_child_text(target, "type")
-                if forType != "":
-                    tarTypeLookup[tarId] = forType
-                forId = _get_first_child(target, "dyeId")
-                if forId is not None and forId.attrib["id"] != "":
-                    tarDyeLookup[tarId] = forId.attrib["id"]
+        metaLookups = _metadataToDics(rootEl._node)
+        transSamTar = metaLookups["sampleType"]
+        tarTypeLookup = metaLookups["targetType"]
+        tarDyeLookup = metaLookups["targetDye"]
 
+        plateFormat = self.plate_format()
         reacts = _get_all_children(self._node, "react")
         for react in reacts:
             pPos = react.attrib["id"]
-            posId = int(react.attrib["id"])
-            pIdNumber = posId % int(self["pcrFormat_columns"])
-            pIdLetter = chr(
-                ord("A") + int(posId / int(self["pcrFormat_columns"]))
-            )
-            pWell = pIdLetter + str(pIdNumber)
+            pWell = plateFormat.label(pPos)
             pSample = ""
             pFileName = ""
             forId = _get_first_child(react, "sample")
@@ -15630,10 +18699,8 @@ class Run:
 
         # Get the position number if required
         wellPos = str(reactPos)
-        if re.search(r"\D\d+", wellPos):
-            old_letter = ord(re.sub(r"\d", "", wellPos.upper())) - ord("A")
-            old_nr = int(re.sub(r"\D", "", wellPos))
-            newId = old_nr + old_letter * int(self["pcrFormat_columns"])
+        newId = self.plate_format().react_id(wellPos)
+        if newId is not None:
             wellPos = str(newId)
 
         exp = _get_all_children(self._node, "react")
@@ -15677,8 +18744,69 @@ class Run:
             A json of the data.
         """
 
+        summary = {}
         all_data = {}
-        data = []
+        all_data["reacts"] = list(self._iter_reactjson(curves, summary))
+        all_data.update(summary)
+        return all_data
+
+    def reactjson_chunks(self, curves=True, floatDigits=None):
+        """Encodes the react data of getreactjson piece by piece, only one
+        react is kept in memory at a time.
+
+        Args:
+            self: The class self parameter.
+            curves: Include amplification and melting curves
+            floatDigits: The number of significant digits of the curve values and floats, None for full precision
+
+        Returns:
+            Yields the json strings, all strings together are the json.
+        """
+
+        summary = {}
+        yield '{"reacts": ['
+        first = True
+        for react_json in self._iter_reactjson(curves, summary, floatDigits):
+            if not first:
+                yield ", "
+            first = False
+            yield "".join(_json_chunks(react_json, floatDigits))
+        yield "]"
+        for key in summary:
+            yield ", " + json.dumps(key) + ": "
+            yield from _json_chunks(summary[key], floatDigits)
+        yield "}"
+
+    def write_reactjson(self, fileObj, curves=True, floatDigits=None):
+        """Writes the json of getreactjson to a file-like object without
+        building it in memory.
+
+        Args:
+            self: The class self parameter.
+            fileObj: The file-like object with a write function for strings.
+            curves: Include amplification and melting curves
+            floatDigits: The number of significant digits of the curve values and floats, None for full precision
+
+        Returns:
+            No return value.
+        """
+
+        for chunk in self.reactjson_chunks(curves, floatDigits):
+            fileObj.write(chunk)
+
+    def _iter_reactjson(self, curves, summary, floatDigits=None):
+        """Creates the json of one react after the other.
+
+        Args:
+            self: The class self parameter.
+            curves: Include amplification and melting curves
+            summary: A dictionary which gets the curve ranges and counts after the last react
+            floatDigits: The number of significant digits of the curve values, None to keep them
+
+        Returns:
+            Yields a json of each react.
+        """
+
         reacts = _get_all_children(self._node, "react")
 
         adp_cyc_max = 0.0
@@ -15829,9 +18957,11 @@ class Run:
                         adp_fluor_min = min(adp_fluor_min, float(fluor))
                         adp_fluor_max = max(adp_fluor_max, float(fluor))
                         in_adp = [
-                            cyc,
-                            fluor,
-                            _get_first_child_text(adp, "tmp"),
+                            _round_number_text(cyc, floatDigits),
+                            _round_number_text(fluor, floatDigits),
+                            _round_number_text(
+                                _get_first_child_text(adp, "tmp"), floatDigits
+                            ),
                         ]
                         adps_json.append(in_adp)
                     in_react["adps"] = adps_json
@@ -15844,7 +18974,10 @@ class Run:
                         mdp_tmp_max = max(mdp_tmp_max, float(tmp))
                         mdp_fluor_min = min(mdp_fluor_min, float(fluor))
                         mdp_fluor_max = max(mdp_fluor_max, float(fluor))
-                        in_mdp = [tmp, fluor]
+                        in_mdp = [
+                            _round_number_text(tmp, floatDigits),
+                            _round_number_text(fluor, floatDigits),
+                        ]
                         mdps_json.append(in_mdp)
                     in_react["mdps"] = mdps_json
                 react_datas_json.append(in_react)
@@ -15888,19 +19021,17 @@ class Run:
                     partit_datas_json.append(in_partit)
                 in_partitions["datas"] = partit_datas_json
                 react_json["partitions"] = in_partitions
-            data.append(react_json)
-        all_data["reacts"] = data
-        all_data["adp_cyc_max"] = adp_cyc_max
-        all_data["anyCalcCorrections"] = anyCorrections
-        all_data["adp_fluor_min"] = adp_fluor_min
-        all_data["adp_fluor_max"] = adp_fluor_max
-        all_data["mdp_tmp_min"] = mdp_tmp_min
-        all_data["mdp_tmp_max"] = mdp_tmp_max
-        all_data["mdp_fluor_min"] = mdp_fluor_min
-        all_data["mdp_fluor_max"] = mdp_fluor_max
-        all_data["max_data_len"] = max_data
-        all_data["max_partition_data_len"] = max_partition_data
-        return all_data
+            yield react_json
+        summary["adp_cyc_max"] = adp_cyc_max
+        summary["anyCalcCorrections"] = anyCorrections
+        summary["adp_fluor_min"] = adp_fluor_min
+        summary["adp_fluor_max"] = adp_fluor_max
+        summary["mdp_tmp_min"] = mdp_tmp_min
+        summary["mdp_tmp_max"] = mdp_tmp_max
+        summary["mdp_fluor_min"] = mdp_fluor_min
+        summary["mdp_fluor_max"] = mdp_fluor_max
+        summary["max_data_len"] = max_data
+        summary["max_partition_data_len"] = max_partition_data
 
     def removeReact(self, vReact):
         """Removes the reaction from the RDML data.
@@ -15913,10 +19044,14 @@ class Run:
             Nothing, updates RDML data.
         """
 
+        react = _get_child_by_id(self._node, "react", str(vReact))
+        if react is not None:
+            _id_registry_remove(self._node, react)
+            return
         reacts = _get_all_children(self._node, "react")
         for react in reacts:
             if int(react.get("id")) == int(vReact):
-                self._node.remove(react)
+                _id_registry_remove(self._node, react)
                 break
         return
 
@@ -15931,7 +19066,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.removeReact(well)
         return
@@ -15980,7 +19115,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.removeClasReactTar(well, vTar)
         return
@@ -16031,7 +19166,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.removeDigiReactTar(well, vTar)
         return
@@ -16088,7 +19223,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.setClasExcl(well, vTar, vExcl, vAppend)
         return
@@ -16153,7 +19288,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.setDigiExcl(well, vTar, vExcl, vAppend)
         return
@@ -16215,7 +19350,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.setClasNote(well, vTar, vNote, vAppend)
         return
@@ -16280,7 +19415,7 @@ class Run:
             Nothing, updates RDML data.
         """
 
-        wells = _wellRangeToList(vWells, self["pcrFormat_columns"])
+        wells = self.plate_format().well_range(vWells)
         for well in wells:
             self.setDigiNote(well, vTar, vNote, vAppend)
         return
@@ -16329,6 +19464,7 @@ class Run:
             verbose=False,
         )
         if "baselineCorrectedData" in res:
+            dataIndex = _reactjson_index(allData["reacts"])
             bas_cyc_max = len(res["baselineCorrectedData"][0]) - 5
             bas_fluor_min = 99999999
             bas_fluor_max = 0.0
@@ -16342,15 +19478,12 @@ class Run:
                         bas_fluor_max = max(bas_fluor_max, float(fluor))
                         in_bas = [cyc, fluor, ""]
                         bass_json.append(in_bas)
-                # Fixme do not loop over all, use sorted data and clever moving
-                for react in allData["reacts"]:
-                    if react["id"] == res["baselineCorrectedData"][row][0]:
-                        for data in react["datas"]:
-                            if (
-                                data["tar"]
-                                == res["baselineCorrectedData"][row][3]
-                            ):
-                                data["bass"] = list(bass_json)
+                dataKey = (
+                    res["baselineCorrectedData"][row][0],
+                    res["baselineCorrectedData"][row][3],
+                )
+                for data in dataIndex.get(dataKey, []):
+                    data["bass"] = list(bass_json)
             allData["bas_cyc_max"] = bas_cyc_max
             allData["bas_fluor_min"] = bas_fluor_min
             allData["bas_fluor_max"] = bas_fluor_max
@@ -16391,8 +19524,12 @@ class Run:
         saveBaslineCorr=False,
         saveResultsList=False,
         saveResultsCSV=False,
+        saveResultsTable=False,
         timeRun=False,
         verbose=False,
+        workDtype="float64",
+        workDir=None,
+        profile=None,
     ):
         """Performs LinRegPCR on the run. Modifies the cq values and returns a
         json with additional data.
@@ -16411,8 +19548,13 @@ class Run:
             saveBaslineCorr: If true, no baseline corrected values are given in the returned data
             saveResultsList: If true, return a 2d array object.
             saveResultsCSV: If true, return a csv string.
+            saveResultsTable: If true, return a ResultsTable object.
             timeRun: If true, print runtime for baseline and total.
             verbose: If true, comment every performed step.
+            workDtype: "float64" or "float32" for the fluorescence working arrays.
+                On 96 well test plates float32 kept all flags and shifted Cq by less than 1e-4 cycles.
+            workDir: If set, memory map the working arrays to temporary files in this directory.
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
 
         Returns:
             A dictionary with the resulting data, presence and format depending on input.
@@ -16420,22 +19562,86 @@ class Run:
             baselineCorrectedData: A 2d array with the baseline corrected raw fluorescence values
             resultsList: A 2d array object.
             resultsCSV: A csv string.
+            resultsTable: A ResultsTable object with typed columns.
+            profile: A list with the measurements of each stage.
+        """
+
+        prof = StageProfiler("linRegPCR", profile, self["id"])
+        try:
+            finalData = self._linRegPCR(
+                prof,
+                pcrEfficiencyExl=pcrEfficiencyExl,
+                updateTargetEfficiency=updateTargetEfficiency,
+                updateRDML=updateRDML,
+                excludeNoPlateau=excludeNoPlateau,
+                excludeEfficiency=excludeEfficiency,
+                excludeInstableBaseline=excludeInstableBaseline,
+                commaConv=commaConv,
+                ignoreExclusion=ignoreExclusion,
+                saveRaw=saveRaw,
+                saveBaslineCorr=saveBaslineCorr,
+                saveResultsList=saveResultsList,
+                saveResultsCSV=saveResultsCSV,
+                saveResultsTable=saveResultsTable,
+                timeRun=timeRun,
+                verbose=verbose,
+                workDtype=workDtype,
+                workDir=workDir,
+            )
+        finally:
+            profRes = prof.finish()
+        if profile:
+            finalData["profile"] = profRes
+        return finalData
+
+    def _linRegPCR(
+        self,
+        prof,
+        pcrEfficiencyExl=0.05,
+        updateTargetEfficiency=False,
+        updateRDML=False,
+        excludeNoPlateau=True,
+        excludeEfficiency="outlier",
+        excludeInstableBaseline=True,
+        commaConv=False,
+        ignoreExclusion=False,
+        saveRaw=False,
+        saveBaslineCorr=False,
+        saveResultsList=False,
+        saveResultsCSV=False,
+        saveResultsTable=False,
+        timeRun=False,
+        verbose=False,
+        workDtype="float64",
+        workDir=None,
+    ):
+        """Does the work of linRegPCR(), see there for the other arguments.
+
+        Args:
+            self: The class self parameter.
+            prof: The StageProfiler measuring the stages.
+
+        Returns:
+            The dictionary returned by linRegPCR() without the profile.
         """
 
         expParent = self._node.getparent()
         rootPar = expParent.getparent()
         dataVersion = rootPar.get("version")
-        transSamTar = _sampleTypeToDics(rootPar)
+        metaLookups = _metadataToDics(rootPar)
+        transSamTar = metaLookups["sampleType"]
 
         if dataVersion == "1.0":
             raise RdmlError("LinRegPCR requires RDML version > 1.0.")
 
+        prof.stage("parse")
+
         ##############################
         # Collect the data in arrays #
         ##############################
 
-        # res is a 2 dimensional array accessed only by
-        # variables, so columns might be added here
+        # resTable holds one typed column per header entry accessed only by
+        # the rar_ variables, so columns might be added here
         header = [
             [
                 "id",  # 0
@@ -16565,7 +19771,76 @@ class Run:
         rar_tooLowCqN0 = 60
         rar_isUsedInWoL = 61
 
-        res = []
+        # The column formats also define the column types of the results table
+        resFormats = ["text"] * len(header[0])
+        for rCol in [
+            rar_amplification,
+            rar_baseline_error,
+            rar_instable_baseline,
+            rar_plateau,
+            rar_noisy_sample,
+            rar_effOutlier_Skip_Mean,
+            rar_effOutlier_Skip_Plat_Mean,
+            rar_effOutlier_Skip_Out,
+            rar_effOutlier_Skip_Plat_Out,
+            rar_shortLogLinPhase,
+            rar_CqIsShifting,
+            rar_tooLowCqEff,
+            rar_tooLowCqN0,
+            rar_isUsedInWoL,
+        ]:
+            resFormats[rCol] = "yesno"
+        for rCol in [
+            rar_baseline,
+            rar_lower_limit,
+            rar_upper_limit,
+            rar_log_lin_fluorescence,
+            rar_indiv_PCR_eff,
+            rar_R2,
+            rar_meanEff_Skip,
+            rar_stdEff_Skip,
+            rar_meanEff_Skip_Plat,
+            rar_stdEff_Skip_Plat,
+            rar_meanEff_Skip_Mean,
+            rar_stdEff_Skip_Mean,
+            rar_meanEff_Skip_Plat_Mean,
+            rar_stdEff_Skip_Plat_Mean,
+            rar_meanEff_Skip_Out,
+            rar_stdEff_Skip_Out,
+            rar_meanEff_Skip_Plat_Out,
+            rar_stdEff_Skip_Plat_Out,
+        ]:
+            resFormats[rCol] = "%0.6f"
+        for rCol in [
+            rar_Cq_common,
+            rar_Cq_grp,
+            rar_Cq_Skip,
+            rar_Cq_Skip_Plat,
+            rar_Cq_Skip_Mean,
+            rar_Cq_Skip_Plat_Mean,
+            rar_Cq_Skip_Out,
+            rar_Cq_Skip_Plat_Out,
+        ]:
+            resFormats[rCol] = "%0.4f"
+        for rCol in [
+            rar_N0_indiv_eff,
+            rar_meanN0_Skip,
+            rar_meanN0_Skip_Plat,
+            rar_meanN0_Skip_Mean,
+            rar_meanN0_Skip_Plat_Mean,
+            rar_meanN0_Skip_Out,
+            rar_meanN0_Skip_Plat_Out,
+        ]:
+            resFormats[rCol] = "%0.6e"
+        for rCol in [
+            rar_threshold_common,
+            rar_threshold_group,
+            rar_log_lin_cycle,
+        ]:
+            resFormats[rCol] = "num"
+        for rCol in [rar_n_log, rar_stop_log, rar_n_included]:
+            resFormats[rCol] = "%d"
+
         finalData = {}
         adp_cyc_max = 0
         pcrEfficiencyExl = float(pcrEfficiencyExl)
@@ -16574,43 +19849,33 @@ class Run:
 
         reacts = _get_all_children(self._node, "react")
 
-        # First get the max number of cycles and create the numpy array
-        colCount = 0
+        # Read all raw data in one pass and create the numpy array
+        rdmlElemData = []
         for react in reacts:
-            react_datas = _get_all_children(react, "data")
-            for react_data in react_datas:
-                colCount += 1
-                adps = _get_all_children(react_data, "adp")
-                for adp in adps:
-                    cyc = _get_first_child_text(adp, "cyc")
-                    adp_cyc_max = max(adp_cyc_max, float(cyc))
-        adp_cyc_max = math.ceil(adp_cyc_max)
+            rdmlElemData.extend(_get_all_children(react, "data"))
+        pointRow, pointCyc, pointFluor = _read_data_points(
+            rdmlElemData, "adp", "cyc", commaConv
+        )
+        anyRawData = len(pointCyc) > 0
+        if anyRawData:
+            adp_cyc_max = math.ceil(max(0.0, np.max(pointCyc)))
 
         # spFl is the shape for all fluorescence numpy data arrays
-        spFl = (colCount, int(adp_cyc_max))
-        rawFluor = np.zeros(spFl, dtype=np.float64)
-        rawFluor[rawFluor <= 0.00000001] = np.nan
+        spFl = (len(rdmlElemData), int(adp_cyc_max))
+        rawFluor = _lrp_workArray(spFl, np.nan, workDtype, workDir)
+        rawFluor[pointRow, np.ceil(pointCyc).astype(np.int64) - 1] = pointFluor
+        resTable = ResultsTable(header[0], resFormats, spFl[0])
 
-        # Create a matrix with the cycle for each rawFluor value
-        vecCycles = np.tile(
-            np.arange(1, (spFl[1] + 1), dtype=np.int64), (spFl[0], 1)
-        )
+        # The cycle for each rawFluor column, broadcast over the rows
+        vecCycles = np.arange(1, (spFl[1] + 1), dtype=np.int64)
 
         # Initialization of the vecNoAmplification vector
         vecExcludedByUser = np.zeros(spFl[0], dtype=np.bool_)
-        rdmlElemData = []
 
-        # Now process the data for numpy and create results array
-        anyRawData = False
+        # Now create results array
         rowCount = 0
         for react in reacts:
             posId = react.get("id")
-            pIdNumber = (int(posId) - 1) % int(self["pcrFormat_columns"]) + 1
-            pIdLetter = chr(
-                ord("A")
-                + int((int(posId) - 1) / int(self["pcrFormat_columns"]))
-            )
-            pWell = pIdLetter + str(pIdNumber)
             sample = ""
             forId = _get_first_child(react, "sample")
             if forId is not None:
@@ -16634,147 +19899,36 @@ class Run:
                 noteVal = _get_first_child_text(react_data, "note")
                 noteVal = _cleanErrorString(noteVal, "amp")
                 noteVal = re.sub(r"^;|;$", "", noteVal)
-                rdmlElemData.append(react_data)
-                res.append(
-                    [
-                        posId,
-                        pWell,
-                        sample,
-                        "",
-                        "",
-                        target,
-                        "",
-                        excl,
-                        noteVal,
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                    ]
-                )  # Must match header length
-                adps = _get_all_children(react_data, "adp")
-                for adp in adps:
-                    cyc = (
-                        int(
-                            math.ceil(float(_get_first_child_text(adp, "cyc")))
-                        )
-                        - 1
-                    )
-                    fluor = _get_first_child_text(adp, "fluor")
-                    if commaConv:
-                        noDot = fluor.replace(".", "")
-                        fluor = noDot.replace(",", ".")
-                    rawFluor[rowCount, cyc] = float(fluor)
-                    anyRawData = True
+                resTable[rar_id][rowCount] = posId
+                resTable[rar_sample][rowCount] = sample
+                resTable[rar_tar][rowCount] = target
+                resTable[rar_excl][rowCount] = excl
+                resTable[rar_note][rowCount] = noteVal
                 rowCount += 1
         if anyRawData == False:
             raise RdmlError(
                 "LinRegPCR requires raw data. No raw data were found in this run."
             )
+        resTable[rar_well] = self.plate_format().labels(resTable[rar_id])
 
         # Look up sample and target information
-        parExp = self._node.getparent()
-        parRoot = parExp.getparent()
-
-        dicLU_dyes = {}
-        luDyes = _get_all_children(parRoot, "dye")
-        for lu_dye in luDyes:
-            lu_chemistry = _get_first_child_text(lu_dye, "dyeChemistry")
-            if lu_chemistry == "":
-                lu_chemistry = "non-saturating DNA binding dye"
-            if lu_dye.attrib["id"] != "":
-                dicLU_dyes[lu_dye.attrib["id"]] = lu_chemistry
-
-        dicLU_targets = {}
-        luTargets = _get_all_children(parRoot, "target")
-        for lu_target in luTargets:
-            forId = _get_first_child(lu_target, "dyeId")
-            lu_dyeId = ""
-            if forId is not None:
-                if forId.attrib["id"] != "":
-                    lu_dyeId = forId.attrib["id"]
-            if lu_dyeId == "" or lu_dyeId not in dicLU_dyes:
-                dicLU_targets[
-                    lu_target.attrib["id"]
-                ] = "non-saturating DNA binding dye"
-            if lu_target.attrib["id"] != "":
-                dicLU_targets[lu_target.attrib["id"]] = dicLU_dyes[lu_dyeId]
-
-        dicLU_samNucl = {}
-        luSamples = _get_all_children(parRoot, "sample")
-        for lu_sample in luSamples:
-            lu_Nucl = ""
-            forUnit = _get_first_child(lu_sample, "templateQuantity")
-            if forUnit is not None:
-                lu_Nucl = _get_first_child_text(forUnit, "nucleotide")
-            if lu_Nucl == "":
-                lu_Nucl = "cDNA"
-            if lu_sample.attrib["id"] != "":
-                dicLU_samNucl[lu_sample.attrib["id"]] = lu_Nucl
+        dicLU_targets = metaLookups["targetChemistry"]
+        dicLU_samNucl = metaLookups["sampleNucleotide"]
 
         # Update the table with dictionary help
         for oRow in range(0, spFl[0]):
-            if res[oRow][rar_sample] != "":
-                if res[oRow][rar_sample] != "":
-                    if res[oRow][rar_tar] != "":
-                        res[oRow][rar_sample_type] = transSamTar[
-                            res[oRow][rar_sample]
-                        ][res[oRow][rar_tar]]
-                res[oRow][rar_sample_nucleotide] = dicLU_samNucl[
-                    res[oRow][rar_sample]
+            if resTable[rar_sample][oRow] != "":
+                if resTable[rar_sample][oRow] != "":
+                    if resTable[rar_tar][oRow] != "":
+                        resTable[rar_sample_type][oRow] = transSamTar[
+                            resTable[rar_sample][oRow]
+                        ][resTable[rar_tar][oRow]]
+                resTable[rar_sample_nucleotide][oRow] = dicLU_samNucl[
+                    resTable[rar_sample][oRow]
                 ]
-            if res[oRow][rar_tar] != "":
-                res[oRow][rar_tar_chemistry] = dicLU_targets[
-                    res[oRow][rar_tar]
+            if resTable[rar_tar][oRow] != "":
+                resTable[rar_tar_chemistry][oRow] = dicLU_targets[
+                    resTable[rar_tar][oRow]
                 ]
 
         if saveRaw:
@@ -16792,11 +19946,11 @@ class Run:
             for oRow in range(0, spFl[0]):
                 rawTable.append(
                     [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
+                        resTable[rar_id][oRow],
+                        resTable[rar_well][oRow],
+                        resTable[rar_sample][oRow],
+                        resTable[rar_tar][oRow],
+                        resTable[rar_excl][oRow],
                     ]
                 )
                 for oCol in range(0, spFl[1]):
@@ -16810,30 +19964,30 @@ class Run:
         targetsCount = 1
         tarWinLookup = {}
         for oRow in range(0, spFl[0]):
-            if res[oRow][rar_tar] not in tarWinLookup:
-                tarWinLookup[res[oRow][rar_tar]] = targetsCount
+            if resTable[rar_tar][oRow] not in tarWinLookup:
+                tarWinLookup[resTable[rar_tar][oRow]] = targetsCount
                 targetsCount += 1
-            vecTarget[oRow] = tarWinLookup[res[oRow][rar_tar]]
+            vecTarget[oRow] = tarWinLookup[resTable[rar_tar][oRow]]
         upWin = np.zeros(targetsCount, dtype=np.float64)
         lowWin = np.zeros(targetsCount, dtype=np.float64)
         threshold = np.ones(targetsCount, dtype=np.float64)
 
-        # Initialization of the error vectors
+        # Initialization of the error vectors, most are columns of resTable
         vecNoAmplification = np.zeros(spFl[0], dtype=np.bool_)
-        vecBaselineError = np.zeros(spFl[0], dtype=np.bool_)
-        vecInstableBaseline = np.zeros(spFl[0], dtype=np.bool_)
+        vecBaselineError = resTable[rar_baseline_error]
+        vecInstableBaseline = resTable[rar_instable_baseline]
         vecNoPlateau = np.zeros(spFl[0], dtype=np.bool_)
-        vecNoisySample = np.zeros(spFl[0], dtype=np.bool_)
+        vecNoisySample = resTable[rar_noisy_sample]
         vecSkipSample = np.zeros(spFl[0], dtype=np.bool_)
-        vecShortLogLin = np.zeros(spFl[0], dtype=np.bool_)
-        vecCtIsShifting = np.zeros(spFl[0], dtype=np.bool_)
-        vecIsUsedInWoL = np.zeros(spFl[0], dtype=np.bool_)
-        vecEffOutlier_Skip_Mean = np.zeros(spFl[0], dtype=np.bool_)
-        vecEffOutlier_Skip_Plat_Mean = np.zeros(spFl[0], dtype=np.bool_)
-        vecEffOutlier_Skip_Out = np.zeros(spFl[0], dtype=np.bool_)
-        vecEffOutlier_Skip_Plat_Out = np.zeros(spFl[0], dtype=np.bool_)
-        vecTooLowCqEff = np.zeros(spFl[0], dtype=np.bool_)
-        vecTooLowCqN0 = np.zeros(spFl[0], dtype=np.bool_)
+        vecShortLogLin = resTable[rar_shortLogLinPhase]
+        vecCtIsShifting = resTable[rar_CqIsShifting]
+        vecIsUsedInWoL = resTable[rar_isUsedInWoL]
+        vecEffOutlier_Skip_Mean = resTable[rar_effOutlier_Skip_Mean]
+        vecEffOutlier_Skip_Plat_Mean = resTable[rar_effOutlier_Skip_Plat_Mean]
+        vecEffOutlier_Skip_Out = resTable[rar_effOutlier_Skip_Out]
+        vecEffOutlier_Skip_Plat_Out = resTable[rar_effOutlier_Skip_Plat_Out]
+        vecTooLowCqEff = resTable[rar_tooLowCqEff]
+        vecTooLowCqN0 = resTable[rar_tooLowCqN0]
 
         # Start and stop cycles of the log lin phase
         stopCyc = np.zeros(spFl[0], dtype=np.int64)
@@ -16898,7 +20052,7 @@ class Run:
 
         # Basic Variables
         pointsInWoL = 4
-        baseCorFluor = rawFluor.copy()
+        prof.stage("baseline")
 
         ########################
         # Baseline correction  #
@@ -16909,11 +20063,8 @@ class Run:
         # First quality check : Is there enough amplification during the reaction #
         ###########################################################################
 
-        # Slope calculation per react/target - the intercept is never used for now
-        rawMod = rawFluor.copy()
-
         # There should be no negative values in uncorrected raw data
-        absMinFluor = np.nanmin(rawMod)
+        absMinFluor = np.nanmin(rawFluor)
         if absMinFluor < 0.0:
             finalData[
                 "noRawData"
@@ -16921,35 +20072,41 @@ class Run:
             finalData[
                 "noRawData"
             ] += "Baseline corrected data not using a constant factor will result in wrong PCR efficiencies!"
-            vecMinFluor = np.nanmin(rawMod, axis=1)
-            vecMaxFluor = np.nanmax(rawMod, axis=1)
+            vecMinFluor = np.nanmin(rawFluor, axis=1)
+            vecMaxFluor = np.nanmax(rawFluor, axis=1)
             for oRow in range(0, spFl[0]):
                 if vecMinFluor[oRow] < 0.0:
                     negShiftBaseline[oRow] = (
                         vecMaxFluor[oRow] - vecMinFluor[oRow]
                     ) / 100.0 - vecMinFluor[oRow]
-                    for oCol in range(0, spFl[1]):
-                        rawFluor[oRow, oCol] += negShiftBaseline[oRow]
-            baseCorFluor = rawFluor.copy()
-            rawMod = rawFluor.copy()
+                    rawFluor[oRow] += negShiftBaseline[oRow]
+
+        baseCorFluor = _lrp_workArray(spFl, np.nan, workDtype, workDir)
+        baseCorFluor[:] = rawFluor
 
+        # Slope calculation per react/target - the intercept is never used for now
+        rawMod = _lrp_workArray(spFl, np.nan, workDtype, workDir)
+        rawMod[:] = rawFluor
         rawMod[np.isnan(rawMod)] = 0
         rawMod[rawMod <= 0.00000001] = np.nan
-        [slopeAmp, _unused] = _lrp_linReg(vecCycles, np.log10(rawMod))
+        logFluor = _lrp_workArray(spFl, np.nan, workDtype, workDir)
+        np.log10(rawMod, out=logFluor)
+        [slopeAmp, _unused] = _lrp_linReg(vecCycles, logFluor)
 
         # Calculate the minimum of fluorescence values per react/target, store it as background
         # and substract it from the raw fluorescence values
         vecMinFluor = np.nanmin(rawMod, axis=1)
         vecBackground = 0.99 * vecMinFluor
         vecDefBackgrd = vecBackground.copy()
-        minCorFluor = rawMod - vecBackground[:, np.newaxis]
+        # rawMod is not needed anymore, so reuse its storage
+        minCorFluor = rawMod
+        minCorFluor -= vecBackground[:, np.newaxis]
         minCorFluor[np.isnan(minCorFluor)] = 0
         minCorFluor[minCorFluor <= 0.00000001] = np.nan
-
-        minFluCount = np.ones(minCorFluor.shape, dtype=np.int64)
-        minFluCount[np.isnan(minCorFluor)] = 0
-        minFluCountSum = np.sum(minFluCount, axis=1)
-        [minSlopeAmp, _unused] = _lrp_linReg(vecCycles, np.log10(minCorFluor))
+        minFluCountSum = np.sum(~np.isnan(minCorFluor), axis=1)
+        np.log10(minCorFluor, out=logFluor)
+        [minSlopeAmp, _unused] = _lrp_linReg(vecCycles, logFluor)
+        del logFluor
 
         for oRow in range(0, spFl[0]):
             # Check to detect the negative slopes and the PCR reactions that have an
@@ -17048,9 +20205,9 @@ class Run:
                     "React: "
                     + str(oRow)
                     + " Pos: "
-                    + res[oRow][0]
+                    + resTable[rar_id][oRow]
                     + " Well: "
-                    + res[oRow][1]
+                    + resTable[rar_well][oRow]
                 )
             # If there is a "no amplification" error, there is no baseline value calculated and it is automatically the
             # minimum fluorescence value assigned as baseline value for the considered reaction :
@@ -17215,7 +20372,7 @@ class Run:
                 pcrEff[oRow] = np.nan
 
             # Negative controls should not be part of the mean calculations
-            if res[oRow][rar_sample_type] in [
+            if resTable[rar_sample_type][oRow] in [
                 "ntc",
                 "nac",
                 "ntp",
@@ -17228,7 +20385,7 @@ class Run:
         baselineCorrectedData = baseCorFluor
 
         # Check if cq values are stable with a modified baseline
-        checkFluor = np.zeros(spFl, dtype=np.float64)
+        checkFluor = _lrp_workArray(spFl, 0.0, workDtype, workDir)
         [meanPcrEff, _unused] = _lrp_meanPcrEff(
             None, [], pcrEff, vecSkipSample, vecNoPlateau, vecShortLogLin
         )
@@ -17443,11 +20600,11 @@ class Run:
             for oRow in range(0, spFl[0]):
                 rawTable.append(
                     [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
+                        resTable[rar_id][oRow],
+                        resTable[rar_well][oRow],
+                        resTable[rar_sample][oRow],
+                        resTable[rar_tar][oRow],
+                        resTable[rar_excl][oRow],
                     ]
                 )
                 for oCol in range(0, spFl[1]):
@@ -17463,6 +20620,7 @@ class Run:
         ###########################################################
         # Calculation of the Window of Linearity (WOL) per target #
         ###########################################################
+        prof.stage("WoL")
 
         # Set a starting window for all groups
         for tar in range(1, targetsCount):
@@ -17559,6 +20717,8 @@ class Run:
         logThreshold = np.log10(threshold[1:])
         threshold[0] = np.power(10, np.mean(logThreshold))
 
+        prof.stage("Cq")
+
         # Create the warnings for the different chemistries
         # Chem Arr     0     1     2     3     4     5     6     7     8     9    10
         critCqEff = [
@@ -17588,28 +20748,40 @@ class Run:
             9.0,
         ]  # For bias N0 < 0.95
         for oRow in range(0, spFl[0]):
-            if res[oRow][rar_tar_chemistry] in [
+            if resTable[rar_tar_chemistry][oRow] in [
                 "hydrolysis probe",
                 "labelled reverse primer",
                 "DNA-zyme probe",
             ]:
                 critCqOffset = 0.0
-                if res[oRow][
-                    rar_tar_chemistry
-                ] == "labelled reverse primer" and res[oRow][
+                if resTable[rar_tar_chemistry][
+                    oRow
+                ] == "labelled reverse primer" and resTable[
                     rar_sample_nucleotide
+                ][
+                    oRow
                 ] in [
                     "DNA",
                     "genomic DNA",
                 ]:
                     critCqOffset = 1.0
-                if res[oRow][rar_tar_chemistry] == "DNA-zyme probe" and res[
+                if resTable[rar_tar_chemistry][
+                    oRow
+                ] == "DNA-zyme probe" and resTable[rar_sample_nucleotide][
                     oRow
-                ][rar_sample_nucleotide] in ["DNA", "genomic DNA"]:
+                ] in [
+                    "DNA",
+                    "genomic DNA",
+                ]:
                     critCqOffset = 4.0
-                if res[oRow][rar_tar_chemistry] == "DNA-zyme probe" and res[
+                if resTable[rar_tar_chemistry][
                     oRow
-                ][rar_sample_nucleotide] in ["cDNA", "RNA"]:
+                ] == "DNA-zyme probe" and resTable[rar_sample_nucleotide][
+                    oRow
+                ] in [
+                    "cDNA",
+                    "RNA",
+                ]:
                     critCqOffset = 6.0
                 if (
                     not np.isnan(pcrEff[oRow])
@@ -17636,6 +20808,7 @@ class Run:
         pcreff_NoNaN = pcrEff.copy()
         pcreff_NoNaN[np.isnan(pcrEff)] = 0.0
         for tar in range(1, targetsCount):
+            prof.stage("outlier")
             # Calculating all choices takes less time then to recalculate
             pcreff_Skip = pcrEff.copy()
             pcreff_Skip[vecTooLowCqEff] = np.nan
@@ -17729,6 +20902,7 @@ class Run:
                 tempStdEff_Skip_Out = np.nanstd(pcreff_Skip_Out)
                 tempStdEff_Skip_Plat_Out = np.nanstd(pcreff_Skip_Plat_Out)
 
+            prof.stage("Cq")
             for oRow in range(0, spFl[0]):
                 if tar == vecTarget[oRow]:
                     meanEff_Skip[oRow] = tempMeanEff_Skip
@@ -17747,7 +20921,7 @@ class Run:
 
                     # Correction of the different chemistries
                     cqCorrection = 0.0
-                    if res[oRow][rar_tar_chemistry] in [
+                    if resTable[rar_tar_chemistry][oRow] in [
                         "hydrolysis probe",
                         "labelled reverse primer",
                         "DNA-zyme probe",
@@ -17762,7 +20936,10 @@ class Run:
                             vecNoAmplification[oRow] or vecBaselineError[oRow]
                         )
                     ):
-                        if res[oRow][rar_tar_chemistry] == "DNA-zyme probe":
+                        if (
+                            resTable[rar_tar_chemistry][oRow]
+                            == "DNA-zyme probe"
+                        ):
                             cqCorrection = -1.0 + np.log10(
                                 1 / (1 - (1 / pcrEff[oRow]))
                             ) / np.log10(pcrEff[oRow])
@@ -17785,7 +20962,7 @@ class Run:
                             and meanEff_Skip[oRow] > 1.001
                         ):
                             if (
-                                res[oRow][rar_tar_chemistry]
+                                resTable[rar_tar_chemistry][oRow]
                                 == "DNA-zyme probe"
                             ):
                                 cqCorrection = -1.0 + np.log10(
@@ -17803,7 +20980,7 @@ class Run:
                             and meanEff_Skip_Plat[oRow] > 1.001
                         ):
                             if (
-                                res[oRow][rar_tar_chemistry]
+                                resTable[rar_tar_chemistry][oRow]
                                 == "DNA-zyme probe"
                             ):
                                 cqCorrection = -1.0 + np.log10(
@@ -17821,7 +20998,7 @@ class Run:
                             and meanEff_Skip_Mean[oRow] > 1.001
                         ):
                             if (
-                                res[oRow][rar_tar_chemistry]
+                                resTable[rar_tar_chemistry][oRow]
                                 == "DNA-zyme probe"
                             ):
                                 cqCorrection = -1.0 + np.log10(
@@ -17839,7 +21016,7 @@ class Run:
                             and meanEff_Skip_Plat_Mean[oRow] > 1.001
                         ):
                             if (
-                                res[oRow][rar_tar_chemistry]
+                                resTable[rar_tar_chemistry][oRow]
                                 == "DNA-zyme probe"
                             ):
                                 cqCorrection = -1.0 + np.log10(
@@ -17858,7 +21035,7 @@ class Run:
                             and meanEff_Skip_Out[oRow] > 1.001
                         ):
                             if (
-                                res[oRow][rar_tar_chemistry]
+                                resTable[rar_tar_chemistry][oRow]
                                 == "DNA-zyme probe"
                             ):
                                 cqCorrection = -1.0 + np.log10(
@@ -17876,7 +21053,7 @@ class Run:
                             and meanEff_Skip_Plat_Out[oRow] > 1.001
                         ):
                             if (
-                                res[oRow][rar_tar_chemistry]
+                                resTable[rar_tar_chemistry][oRow]
                                 == "DNA-zyme probe"
                             ):
                                 cqCorrection = -1.0 + np.log10(
@@ -17965,80 +21142,56 @@ class Run:
         #########################
         # write out the results #
         #########################
-        for rRow in range(0, len(res)):
-            res[rRow][rar_baseline] = (
-                vecBackground[rRow] - negShiftBaseline[rRow]
-            )
-            res[rRow][rar_lower_limit] = lowWin[vecTarget[rRow]]
-            res[rRow][rar_upper_limit] = upWin[vecTarget[rRow]]
-            res[rRow][rar_threshold_common] = threshold[0]
-            res[rRow][rar_threshold_group] = threshold[vecTarget[rRow]]
-
-            res[rRow][rar_n_log] = stopCyc[rRow] - startCycFix[rRow] + 1
-            res[rRow][rar_stop_log] = stopCyc[rRow]
-            res[rRow][rar_n_included] = nInclu[rRow]
-            res[rRow][rar_log_lin_cycle] = indMeanX[rRow]
-            res[rRow][rar_log_lin_fluorescence] = np.power(10, indMeanY[rRow])
-            res[rRow][rar_indiv_PCR_eff] = pcrEff[rRow]
-            res[rRow][rar_R2] = correl[rRow] * correl[rRow]
-            res[rRow][rar_N0_indiv_eff] = nNulls[rRow]
-            res[rRow][rar_Cq_common] = indivCq[rRow]
-            res[rRow][rar_Cq_grp] = indivCq_Grp[rRow]
-
-            res[rRow][rar_meanEff_Skip] = meanEff_Skip[rRow]
-            res[rRow][rar_stdEff_Skip] = stdEff_Skip[rRow]
-            res[rRow][rar_meanN0_Skip] = meanNnull_Skip[rRow]
-            res[rRow][rar_Cq_Skip] = meanCq_Skip[rRow]
-            res[rRow][rar_meanEff_Skip_Plat] = meanEff_Skip_Plat[rRow]
-            res[rRow][rar_stdEff_Skip_Plat] = stdEff_Skip_Plat[rRow]
-            res[rRow][rar_meanN0_Skip_Plat] = meanNnull_Skip_Plat[rRow]
-            res[rRow][rar_Cq_Skip_Plat] = meanCq_Skip_Plat[rRow]
-            res[rRow][rar_meanEff_Skip_Mean] = meanEff_Skip_Mean[rRow]
-            res[rRow][rar_stdEff_Skip_Mean] = stdEff_Skip_Mean[rRow]
-            res[rRow][rar_meanN0_Skip_Mean] = meanNnull_Skip_Mean[rRow]
-            res[rRow][rar_Cq_Skip_Mean] = meanCq_Skip_Mean[rRow]
-            res[rRow][rar_meanEff_Skip_Plat_Mean] = meanEff_Skip_Plat_Mean[
-                rRow
-            ]
-            res[rRow][rar_stdEff_Skip_Plat_Mean] = stdEff_Skip_Plat_Mean[rRow]
-            res[rRow][rar_meanN0_Skip_Plat_Mean] = meanNnull_Skip_Plat_Mean[
-                rRow
-            ]
-            res[rRow][rar_Cq_Skip_Plat_Mean] = meanCq_Skip_Plat_Mean[rRow]
-            res[rRow][rar_meanEff_Skip_Out] = meanEff_Skip_Out[rRow]
-            res[rRow][rar_stdEff_Skip_Out] = stdEff_Skip_Out[rRow]
-            res[rRow][rar_meanN0_Skip_Out] = meanNnull_Skip_Out[rRow]
-            res[rRow][rar_Cq_Skip_Out] = meanCq_Skip_Out[rRow]
-            res[rRow][rar_meanEff_Skip_Plat_Out] = meanEff_Skip_Plat_Out[rRow]
-            res[rRow][rar_stdEff_Skip_Plat_Out] = stdEff_Skip_Plat_Out[rRow]
-            res[rRow][rar_meanN0_Skip_Plat_Out] = meanNnull_Skip_Plat_Out[rRow]
-            res[rRow][rar_Cq_Skip_Plat_Out] = meanCq_Skip_Plat_Out[rRow]
-
-            res[rRow][rar_amplification] = not vecNoAmplification[rRow]
-            res[rRow][rar_baseline_error] = vecBaselineError[rRow]
-            res[rRow][rar_instable_baseline] = vecInstableBaseline[rRow]
-            res[rRow][rar_plateau] = not vecNoPlateau[rRow]
-            res[rRow][rar_noisy_sample] = vecNoisySample[rRow]
-            res[rRow][rar_effOutlier_Skip_Mean] = vecEffOutlier_Skip_Mean[rRow]
-            res[rRow][
-                rar_effOutlier_Skip_Plat_Mean
-            ] = vecEffOutlier_Skip_Plat_Mean[rRow]
-            res[rRow][rar_effOutlier_Skip_Out] = vecEffOutlier_Skip_Out[rRow]
-            res[rRow][
-                rar_effOutlier_Skip_Plat_Out
-            ] = vecEffOutlier_Skip_Plat_Out[rRow]
-            res[rRow][rar_shortLogLinPhase] = vecShortLogLin[rRow]
-            res[rRow][rar_CqIsShifting] = vecCtIsShifting[rRow]
-            res[rRow][rar_tooLowCqEff] = vecTooLowCqEff[rRow]
-            res[rRow][rar_tooLowCqN0] = vecTooLowCqN0[rRow]
-            res[rRow][rar_isUsedInWoL] = vecIsUsedInWoL[rRow]
+        resTable[rar_baseline] = vecBackground - negShiftBaseline
+        resTable[rar_lower_limit] = lowWin[vecTarget]
+        resTable[rar_upper_limit] = upWin[vecTarget]
+        resTable[rar_threshold_common] = threshold[0]
+        resTable[rar_threshold_group] = threshold[vecTarget]
+        resTable[rar_n_log] = stopCyc - startCycFix + 1
+        resTable[rar_stop_log] = stopCyc
+        resTable[rar_n_included] = nInclu
+        resTable[rar_log_lin_cycle] = indMeanX
+        resTable[rar_log_lin_fluorescence] = np.power(10, indMeanY)
+        resTable[rar_indiv_PCR_eff] = pcrEff
+        resTable[rar_R2] = correl * correl
+        resTable[rar_N0_indiv_eff] = nNulls
+        resTable[rar_Cq_common] = indivCq
+        resTable[rar_Cq_grp] = indivCq_Grp
+        resTable[rar_meanEff_Skip] = meanEff_Skip
+        resTable[rar_stdEff_Skip] = stdEff_Skip
+        resTable[rar_meanN0_Skip] = meanNnull_Skip
+        resTable[rar_Cq_Skip] = meanCq_Skip
+        resTable[rar_meanEff_Skip_Plat] = meanEff_Skip_Plat
+        resTable[rar_stdEff_Skip_Plat] = stdEff_Skip_Plat
+        resTable[rar_meanN0_Skip_Plat] = meanNnull_Skip_Plat
+        resTable[rar_Cq_Skip_Plat] = meanCq_Skip_Plat
+        resTable[rar_meanEff_Skip_Mean] = meanEff_Skip_Mean
+        resTable[rar_stdEff_Skip_Mean] = stdEff_Skip_Mean
+        resTable[rar_meanN0_Skip_Mean] = meanNnull_Skip_Mean
+        resTable[rar_Cq_Skip_Mean] = meanCq_Skip_Mean
+        resTable[rar_meanEff_Skip_Plat_Mean] = meanEff_Skip_Plat_Mean
+        resTable[rar_stdEff_Skip_Plat_Mean] = stdEff_Skip_Plat_Mean
+        resTable[rar_meanN0_Skip_Plat_Mean] = meanNnull_Skip_Plat_Mean
+        resTable[rar_Cq_Skip_Plat_Mean] = meanCq_Skip_Plat_Mean
+        resTable[rar_meanEff_Skip_Out] = meanEff_Skip_Out
+        resTable[rar_stdEff_Skip_Out] = stdEff_Skip_Out
+        resTable[rar_meanN0_Skip_Out] = meanNnull_Skip_Out
+        resTable[rar_Cq_Skip_Out] = meanCq_Skip_Out
+        resTable[rar_meanEff_Skip_Plat_Out] = meanEff_Skip_Plat_Out
+        resTable[rar_stdEff_Skip_Plat_Out] = stdEff_Skip_Plat_Out
+        resTable[rar_meanN0_Skip_Plat_Out] = meanNnull_Skip_Plat_Out
+        resTable[rar_Cq_Skip_Plat_Out] = meanCq_Skip_Plat_Out
+        resTable[rar_amplification] = ~vecNoAmplification
+        resTable[rar_plateau] = ~vecNoPlateau
+        # The flag vectors are table columns, but the WoL helpers return them
+        resTable[rar_isUsedInWoL] = vecIsUsedInWoL
 
         ###################################
         # calculate excl and note strings #
         ###################################
-        for rRow in range(0, len(res)):
-            exclVal = _cleanErrorString(res[rRow][rar_excl], "amp")
-            noteVal = _cleanErrorString(res[rRow][rar_note], "amp")
+        for rRow in range(0, spFl[0]):
+            exclVal = _cleanErrorString(resTable[rar_excl][rRow], "amp")
+            noteVal = _cleanErrorString(resTable[rar_note][rRow], "amp")
 
             cqVal = np.NaN
             meanEffVal = np.NaN
@@ -18046,80 +21199,80 @@ class Run:
             if excludeNoPlateau is False and excludeEfficiency == "include":
                 cqVal = meanCq_Skip[rRow]
                 meanEffVal = meanEff_Skip[rRow]
-                diffMeanEff = res[rRow][rar_effOutlier_Skip_Mean]
+                diffMeanEff = resTable[rar_effOutlier_Skip_Mean][rRow]
             if excludeNoPlateau is True and excludeEfficiency == "include":
                 cqVal = meanCq_Skip_Plat[rRow]
                 meanEffVal = meanEff_Skip_Plat[rRow]
-                diffMeanEff = res[rRow][rar_effOutlier_Skip_Plat_Mean]
+                diffMeanEff = resTable[rar_effOutlier_Skip_Plat_Mean][rRow]
             if excludeNoPlateau is False and excludeEfficiency == "mean":
                 cqVal = meanCq_Skip_Mean[rRow]
                 meanEffVal = meanEff_Skip_Mean[rRow]
-                diffMeanEff = res[rRow][rar_effOutlier_Skip_Mean]
+                diffMeanEff = resTable[rar_effOutlier_Skip_Mean][rRow]
             if excludeNoPlateau is True and excludeEfficiency == "mean":
                 cqVal = meanCq_Skip_Plat_Mean[rRow]
                 meanEffVal = meanEff_Skip_Plat_Mean[rRow]
-                diffMeanEff = res[rRow][rar_effOutlier_Skip_Plat_Mean]
+                diffMeanEff = resTable[rar_effOutlier_Skip_Plat_Mean][rRow]
             if excludeNoPlateau is False and excludeEfficiency == "outlier":
                 cqVal = meanCq_Skip_Out[rRow]
                 meanEffVal = meanEff_Skip_Out[rRow]
-                diffMeanEff = res[rRow][rar_effOutlier_Skip_Out]
+                diffMeanEff = resTable[rar_effOutlier_Skip_Out][rRow]
             if excludeNoPlateau is True and excludeEfficiency == "outlier":
                 cqVal = meanCq_Skip_Plat_Out[rRow]
                 meanEffVal = meanEff_Skip_Plat_Out[rRow]
-                diffMeanEff = res[rRow][rar_effOutlier_Skip_Plat_Out]
+                diffMeanEff = resTable[rar_effOutlier_Skip_Plat_Out][rRow]
 
-            if res[rRow][rar_sample_type] in ["ntc", "nac", "ntp", "nrt"]:
+            if resTable[rar_sample_type][rRow] in ["ntc", "nac", "ntp", "nrt"]:
                 if cqVal > 0.0:
                     exclVal += "amplification in negative control;"
-                    if res[rRow][rar_baseline_error]:
+                    if resTable[rar_baseline_error][rRow]:
                         exclVal += "baseline error;"
                 else:
-                    if res[rRow][rar_amplification]:
+                    if resTable[rar_amplification][rRow]:
                         exclVal += "amplification in negative control;"
-                    if res[rRow][rar_baseline_error]:
+                    if resTable[rar_baseline_error][rRow]:
                         exclVal += "baseline error;"
-                if res[rRow][rar_plateau]:
+                if resTable[rar_plateau][rRow]:
                     noteVal += "plateau in negative control;"
 
-            if res[rRow][rar_sample_type] in ["std", "pos"]:
+            if resTable[rar_sample_type][rRow] in ["std", "pos"]:
                 if not (cqVal > 0.0):
                     exclVal += "no amplification in positive control;"
                 else:
-                    if not res[rRow][rar_amplification]:
+                    if not resTable[rar_amplification][rRow]:
                         exclVal += "no amplification in positive control;"
-                if res[rRow][rar_baseline_error]:
+                if resTable[rar_baseline_error][rRow]:
                     exclVal += "baseline error in positive control;"
-                if res[rRow][rar_instable_baseline]:
+                if resTable[rar_instable_baseline][rRow]:
                     exclVal += "instable baseline in positive control;"
-                if not res[rRow][rar_plateau]:
+                if not resTable[rar_plateau][rRow]:
                     noteVal += "no plateau in positive control;"
-                if res[rRow][rar_noisy_sample]:
+                if resTable[rar_noisy_sample][rRow]:
                     noteVal += "noisy sample in positive control;"
 
                 if -0.0001 < cqVal < 10.0:
                     noteVal += "Cq < 10;N0 unreliable;"
                 if cqVal > 34.0:
                     noteVal += "Cq > 34;N0 unreliable;"
-                if res[rRow][rar_n_log] < 5:
+                if resTable[rar_n_log][rRow] < 5:
                     noteVal += (
                         "only "
-                        + str(res[rRow][rar_n_log])
+                        + str(resTable[rar_n_log][rRow])
                         + " values in log phase;"
                     )
-                if res[rRow][rar_indiv_PCR_eff] < 1.7:
+                if resTable[rar_indiv_PCR_eff][rRow] < 1.7:
                     noteVal += (
                         "indiv PCR eff is "
-                        + "{:.3f}".format(res[rRow][rar_indiv_PCR_eff])
+                        + "{:.3f}".format(resTable[rar_indiv_PCR_eff][rRow])
                         + " < 1.7;"
                     )
                 if diffMeanEff:
-                    if not np.isfinite(res[rRow][rar_indiv_PCR_eff]):
+                    if not np.isfinite(resTable[rar_indiv_PCR_eff][rRow]):
                         noteVal += "no indiv PCR eff can be calculated;"
                     else:
                         if excludeEfficiency == "outlier":
                             noteVal += "PCR efficiency outlier;"
                         diffFromMean = (
-                            res[rRow][rar_indiv_PCR_eff] - meanEffVal
+                            resTable[rar_indiv_PCR_eff][rRow] - meanEffVal
                         )
                         if diffFromMean > 0.0:
                             noteVal += (
@@ -18132,44 +21285,44 @@ class Run:
                             )
                             noteVal += "{:.3f}".format(-1 * diffFromMean) + ";"
 
-            if res[rRow][rar_sample_type] in ["unkn"]:
-                if not res[rRow][rar_amplification]:
+            if resTable[rar_sample_type][rRow] in ["unkn"]:
+                if not resTable[rar_amplification][rRow]:
                     noteVal += "no amplification;"
-                if res[rRow][rar_baseline_error]:
+                if resTable[rar_baseline_error][rRow]:
                     noteVal += "baseline error;"
-                if res[rRow][rar_instable_baseline]:
+                if resTable[rar_instable_baseline][rRow]:
                     noteVal += "instable baseline;"
-                if not res[rRow][rar_plateau]:
+                if not resTable[rar_plateau][rRow]:
                     noteVal += "no plateau;"
-                if res[rRow][rar_noisy_sample]:
+                if resTable[rar_noisy_sample][rRow]:
                     noteVal += "noisy sample;"
 
                 if -0.0001 < cqVal < 10.0:
                     noteVal += "Cq < 10;N0 unreliable;"
                 if cqVal > 34.0:
                     noteVal += "Cq > 34;N0 unreliable;"
-                if cqVal > 35.0 and not res[rRow][rar_plateau]:
+                if cqVal > 35.0 and not resTable[rar_plateau][rRow]:
                     noteVal += "Cq too high;"
-                if res[rRow][rar_n_log] < 5:
+                if resTable[rar_n_log][rRow] < 5:
                     noteVal += (
                         "only "
-                        + str(res[rRow][rar_n_log])
+                        + str(resTable[rar_n_log][rRow])
                         + " values in log phase;"
                     )
-                if res[rRow][rar_indiv_PCR_eff] < 1.7:
+                if resTable[rar_indiv_PCR_eff][rRow] < 1.7:
                     noteVal += (
                         "indiv PCR eff is "
-                        + "{:.3f}".format(res[rRow][rar_indiv_PCR_eff])
+                        + "{:.3f}".format(resTable[rar_indiv_PCR_eff][rRow])
                         + " < 1.7;"
                     )
                 if diffMeanEff:
-                    if not np.isfinite(res[rRow][rar_indiv_PCR_eff]):
+                    if not np.isfinite(resTable[rar_indiv_PCR_eff][rRow]):
                         noteVal += "no indiv PCR eff can be calculated;"
                     else:
                         if excludeEfficiency == "outlier":
                             noteVal += "PCR efficiency outlier;"
                         diffFromMean = (
-                            res[rRow][rar_indiv_PCR_eff] - meanEffVal
+                            resTable[rar_indiv_PCR_eff][rRow] - meanEffVal
                         )
                         if diffFromMean > 0.0:
                             noteVal += (
@@ -18185,172 +21338,102 @@ class Run:
             # Write back
             exclVal = re.sub(r"^;|;$", "", exclVal)
             noteVal = re.sub(r"^;|;$", "", noteVal)
-            res[rRow][rar_excl] = exclVal
-            res[rRow][rar_note] = noteVal
+            resTable[rar_excl][rRow] = exclVal
+            resTable[rar_note][rRow] = noteVal
 
         ##############################
         # write out the rdml results #
         ##############################
+        prof.stage("write-back")
         if updateRDML is True:
             self["backgroundDeterminationMethod"] = "LinRegPCR, constant"
             self[
                 "cqDetectionMethod"
             ] = "automated threshold and baseline settings"
-            dataXMLelements = _getXMLDataType()
-            collectedTargetEff = {}
-            collectedTargetErr = {}
-            for rRow in range(0, len(res)):
-                if rdmlElemData[rRow] is not None:
-                    cqVal = np.NaN
-                    N0Val = np.NaN
-                    meanEffVal = np.NaN
-                    stdEffVal = np.NaN
-                    if (
-                        excludeNoPlateau is False
-                        and excludeEfficiency == "include"
-                    ):
-                        cqVal = meanCq_Skip[rRow]
-                        N0Val = meanNnull_Skip[rRow]
-                        meanEffVal = meanEff_Skip[rRow]
-                        stdEffVal = stdEff_Skip[rRow]
-                    if (
-                        excludeNoPlateau is True
-                        and excludeEfficiency == "include"
-                    ):
-                        cqVal = meanCq_Skip_Plat[rRow]
-                        N0Val = meanNnull_Skip_Plat[rRow]
-                        meanEffVal = meanEff_Skip_Plat[rRow]
-                        stdEffVal = stdEff_Skip_Plat[rRow]
-                    if (
-                        excludeNoPlateau is False
-                        and excludeEfficiency == "mean"
-                    ):
-                        cqVal = meanCq_Skip_Mean[rRow]
-                        N0Val = meanNnull_Skip_Mean[rRow]
-                        meanEffVal = meanEff_Skip_Mean[rRow]
-                        stdEffVal = stdEff_Skip_Mean[rRow]
-                    if (
-                        excludeNoPlateau is True
-                        and excludeEfficiency == "mean"
-                    ):
-                        cqVal = meanCq_Skip_Plat_Mean[rRow]
-                        N0Val = meanNnull_Skip_Plat_Mean[rRow]
-                        meanEffVal = meanEff_Skip_Plat_Mean[rRow]
-                        stdEffVal = stdEff_Skip_Plat_Mean[rRow]
-                    if (
-                        excludeNoPlateau is False
-                        and excludeEfficiency == "outlier"
-                    ):
-                        cqVal = meanCq_Skip_Out[rRow]
-                        N0Val = meanNnull_Skip_Out[rRow]
-                        meanEffVal = meanEff_Skip_Out[rRow]
-                        stdEffVal = stdEff_Skip_Out[rRow]
-                    if (
-                        excludeNoPlateau is True
-                        and excludeEfficiency == "outlier"
-                    ):
-                        cqVal = meanCq_Skip_Plat_Out[rRow]
-                        N0Val = meanNnull_Skip_Plat_Out[rRow]
-                        meanEffVal = meanEff_Skip_Plat_Out[rRow]
-                        stdEffVal = stdEff_Skip_Plat_Out[rRow]
-
-                    if np.isnan(cqVal) or cqVal < 0.0 or cqVal > 1000.0:
-                        goodVal = "-1.0"
-                    else:
-                        goodVal = "{:.3f}".format(cqVal)
-                    _change_subelement(
-                        rdmlElemData[rRow],
-                        "cq",
-                        dataXMLelements,
-                        goodVal,
-                        True,
-                        "string",
-                    )
-                    _change_subelement(
-                        rdmlElemData[rRow],
-                        "excl",
-                        dataXMLelements,
-                        res[rRow][rar_excl],
-                        True,
-                        "string",
-                    )
-                    if dataVersion == "1.3":
-                        if not np.isfinite(N0Val):
-                            goodVal = "-1.0"
-                        else:
-                            goodVal = "{:.2e}".format(N0Val)
-                        _change_subelement(
-                            rdmlElemData[rRow],
-                            "N0",
-                            dataXMLelements,
-                            goodVal,
-                            True,
-                            "string",
-                        )
-                        _change_subelement(
-                            rdmlElemData[rRow],
-                            "ampEffMet",
-                            dataXMLelements,
-                            "LinRegPCR",
-                            True,
-                            "string",
-                        )
-                        if not np.isfinite(meanEffVal):
-                            goodVal = "-1.0"
-                        else:
-                            goodVal = "{:.3f}".format(meanEffVal)
-                        _change_subelement(
-                            rdmlElemData[rRow],
-                            "ampEff",
-                            dataXMLelements,
-                            goodVal,
-                            True,
-                            "string",
-                        )
-                        if updateTargetEfficiency:
-                            collectedTargetEff[res[rRow][rar_tar]] = goodVal
-                        if not np.isfinite(stdEffVal):
-                            goodVal = "-1.0"
-                        else:
-                            goodVal = "{:.3f}".format(stdEffVal)
-                        _change_subelement(
-                            rdmlElemData[rRow],
-                            "ampEffSE",
-                            dataXMLelements,
-                            goodVal,
-                            True,
-                            "string",
-                        )
-                        if updateTargetEfficiency:
-                            collectedTargetErr[res[rRow][rar_tar]] = goodVal
-                        _change_subelement(
-                            rdmlElemData[rRow],
-                            "note",
-                            dataXMLelements,
-                            res[rRow][rar_note],
-                            True,
-                            "string",
-                        )
-                    goodVal = "{:.3f}".format(
-                        vecBackground[rRow] - negShiftBaseline[rRow]
+            if excludeEfficiency == "include":
+                if excludeNoPlateau:
+                    cqVals = meanCq_Skip_Plat
+                    N0Vals = meanNnull_Skip_Plat
+                    meanEffVals = meanEff_Skip_Plat
+                    stdEffVals = stdEff_Skip_Plat
+                else:
+                    cqVals = meanCq_Skip
+                    N0Vals = meanNnull_Skip
+                    meanEffVals = meanEff_Skip
+                    stdEffVals = stdEff_Skip
+            elif excludeEfficiency == "mean":
+                if excludeNoPlateau:
+                    cqVals = meanCq_Skip_Plat_Mean
+                    N0Vals = meanNnull_Skip_Plat_Mean
+                    meanEffVals = meanEff_Skip_Plat_Mean
+                    stdEffVals = stdEff_Skip_Plat_Mean
+                else:
+                    cqVals = meanCq_Skip_Mean
+                    N0Vals = meanNnull_Skip_Mean
+                    meanEffVals = meanEff_Skip_Mean
+                    stdEffVals = stdEff_Skip_Mean
+            else:
+                if excludeNoPlateau:
+                    cqVals = meanCq_Skip_Plat_Out
+                    N0Vals = meanNnull_Skip_Plat_Out
+                    meanEffVals = meanEff_Skip_Plat_Out
+                    stdEffVals = stdEff_Skip_Plat_Out
+                else:
+                    cqVals = meanCq_Skip_Out
+                    N0Vals = meanNnull_Skip_Out
+                    meanEffVals = meanEff_Skip_Out
+                    stdEffVals = stdEff_Skip_Out
+
+            # Format all values column wise and write them in one pass
+            with np.errstate(invalid="ignore"):
+                validCq = (cqVals >= 0.0) & (cqVals <= 1000.0)
+            writeBack = {
+                "cq": [
+                    "{:.3f}".format(val) if valid else "-1.0"
+                    for val, valid in zip(cqVals.tolist(), validCq.tolist())
+                ],
+                "excl": resTable[rar_excl].tolist(),
+                "bgFluor": [
+                    "{:.3f}".format(val)
+                    for val in (vecBackground - negShiftBaseline).tolist()
+                ],
+                "quantFluor": ["{:.3f}".format(threshold[0])] * spFl[0],
+            }
+            if dataVersion == "1.3":
+                effVals = [
+                    "{:.3f}".format(val) if valid else "-1.0"
+                    for val, valid in zip(
+                        meanEffVals.tolist(), np.isfinite(meanEffVals).tolist()
                     )
-                    _change_subelement(
-                        rdmlElemData[rRow],
-                        "bgFluor",
-                        dataXMLelements,
-                        goodVal,
-                        True,
-                        "string",
+                ]
+                effErrVals = [
+                    "{:.3f}".format(val) if valid else "-1.0"
+                    for val, valid in zip(
+                        stdEffVals.tolist(), np.isfinite(stdEffVals).tolist()
                     )
-                    goodVal = "{:.3f}".format(threshold[0])
-                    _change_subelement(
-                        rdmlElemData[rRow],
-                        "quantFluor",
-                        dataXMLelements,
-                        goodVal,
-                        True,
-                        "string",
+                ]
+                writeBack["N0"] = [
+                    "{:.2e}".format(val) if valid else "-1.0"
+                    for val, valid in zip(
+                        N0Vals.tolist(), np.isfinite(N0Vals).tolist()
                     )
+                ]
+                writeBack["ampEffMet"] = ["LinRegPCR"] * spFl[0]
+                writeBack["ampEff"] = effVals
+                writeBack["ampEffSE"] = effErrVals
+                writeBack["note"] = resTable[rar_note].tolist()
+            _change_subelements_bulk(
+                rdmlElemData, _getXMLDataType(), writeBack
+            )
+
+            collectedTargetEff = {}
+            collectedTargetErr = {}
+            if updateTargetEfficiency and dataVersion == "1.3":
+                for rRow in range(0, spFl[0]):
+                    if rdmlElemData[rRow] is not None:
+                        curTar = resTable[rar_tar][rRow]
+                        collectedTargetEff[curTar] = effVals[rRow]
+                        collectedTargetErr[curTar] = effErrVals[rRow]
             if updateTargetEfficiency:
                 tarXMLKeys = [
                     "description",
@@ -18366,12 +21449,11 @@ class Run:
                     "sequences",
                     "commercialAssay",
                 ]
+                eleTars = {}
+                for eleTar in _get_all_children(rootPar, "target"):
+                    eleTars.setdefault(eleTar.attrib["id"], []).append(eleTar)
                 for curTar in collectedTargetEff:
-                    eleTars = _get_all_children(rootPar, "target")
-                    for eleTar in eleTars:
-                        foundId = eleTar.attrib["id"]
-                        if foundId != curTar:
-                            continue
+                    for eleTar in eleTars.get(curTar, []):
                         eleEff = _get_or_create_subelement(
                             eleTar, "amplificationEfficiency", tarXMLKeys
                         )
@@ -18389,89 +21471,14 @@ class Run:
             stop_time = datetime.datetime.now() - start_time
             print("Done All: " + str(stop_time) + "sec")
 
+        prof.stage("CSV")
         if saveResultsCSV:
-            retCSV = ""
-            for rCol in range(0, len(header[0])):
-                retCSV += header[0][rCol] + "\t"
-            retCSV = re.sub(r"\t$", "\n", retCSV)
-
-            for rRow in range(0, len(res)):
-                for rCol in range(0, len(res[rRow])):
-                    if rCol in [
-                        rar_amplification,
-                        rar_baseline_error,
-                        rar_instable_baseline,
-                        rar_plateau,
-                        rar_noisy_sample,
-                        rar_effOutlier_Skip_Mean,
-                        rar_effOutlier_Skip_Plat_Mean,
-                        rar_effOutlier_Skip_Out,
-                        rar_effOutlier_Skip_Plat_Out,
-                        rar_shortLogLinPhase,
-                        rar_CqIsShifting,
-                        rar_tooLowCqEff,
-                        rar_tooLowCqN0,
-                        rar_isUsedInWoL,
-                    ]:
-                        if res[rRow][rCol]:
-                            retCSV += "Yes\t"
-                        else:
-                            retCSV += "No\t"
-                    elif rCol in [
-                        rar_baseline,
-                        rar_lower_limit,
-                        rar_upper_limit,
-                        rar_log_lin_fluorescence,
-                        rar_indiv_PCR_eff,
-                        rar_R2,
-                        rar_meanEff_Skip,
-                        rar_stdEff_Skip,
-                        rar_meanEff_Skip_Plat,
-                        rar_stdEff_Skip_Plat,
-                        rar_meanEff_Skip_Mean,
-                        rar_stdEff_Skip_Mean,
-                        rar_meanEff_Skip_Plat_Mean,
-                        rar_stdEff_Skip_Plat_Mean,
-                        rar_meanEff_Skip_Out,
-                        rar_stdEff_Skip_Out,
-                        rar_meanEff_Skip_Plat_Out,
-                        rar_stdEff_Skip_Plat_Out,
-                    ]:
-                        retCSV += (
-                            "{0:0.6f}".format(float(res[rRow][rCol])) + "\t"
-                        )
-                    elif rCol in [
-                        rar_Cq_common,
-                        rar_Cq_grp,
-                        rar_Cq_Skip,
-                        rar_Cq_Skip_Plat,
-                        rar_Cq_Skip_Mean,
-                        rar_Cq_Skip_Plat_Mean,
-                        rar_Cq_Skip_Out,
-                        rar_Cq_Skip_Plat_Out,
-                    ]:
-                        retCSV += (
-                            "{0:0.4f}".format(float(res[rRow][rCol])) + "\t"
-                        )
-                    elif rCol in [
-                        rar_N0_indiv_eff,
-                        rar_meanN0_Skip,
-                        rar_meanN0_Skip_Plat,
-                        rar_meanN0_Skip_Mean,
-                        rar_meanN0_Skip_Plat_Mean,
-                        rar_meanN0_Skip_Out,
-                        rar_meanN0_Skip_Plat_Out,
-                    ]:
-                        retCSV += (
-                            "{0:0.6e}".format(float(res[rRow][rCol])) + "\t"
-                        )
-                    else:
-                        retCSV += str(res[rRow][rCol]) + "\t"
-                retCSV = re.sub(r"\t$", "\n", retCSV)
-            finalData["resultsCSV"] = retCSV
+            finalData["resultsCSV"] = resTable.to_tsv()
+        if saveResultsTable:
+            finalData["resultsTable"] = resTable
 
         if saveResultsList:
-            finalData["resultsList"] = header + res
+            finalData["resultsList"] = resTable.to_list()
 
         return finalData
 
@@ -18546,6 +21553,7 @@ class Run:
             verbose=False,
         )
         if "derivative" in res:
+            dataIndex = _reactjson_index(allData["reacts"])
             if "smoothed" in res["derivative"]:
                 bas_temp_min = 120.0
                 bas_temp_max = 0.0
@@ -18565,18 +21573,12 @@ class Run:
                             bas_fluor_max = max(bas_fluor_max, float(fluor))
                             in_bas = [tmp, fluor]
                             bass_json.append(in_bas)
-                    # Fixme do not loop over all, use sorted data and clever moving
-                    for react in allData["reacts"]:
-                        if (
-                            react["id"]
-                            == res["derivative"]["smoothed"][row][0]
-                        ):
-                            for data in react["datas"]:
-                                if (
-                                    data["tar"]
-                                    == res["derivative"]["smoothed"][row][3]
-                                ):
-                                    data["smo"] = list(bass_json)
+                    dataKey = (
+                        res["derivative"]["smoothed"][row][0],
+                        res["derivative"]["smoothed"][row][3],
+                    )
+                    for data in dataIndex.get(dataKey, []):
+                        data["smo"] = list(bass_json)
                 allData["smo_temp_min"] = bas_temp_min
                 allData["smo_temp_max"] = bas_temp_max
                 allData["smo_fluor_min"] = bas_fluor_min
@@ -18601,18 +21603,12 @@ class Run:
                             bas_fluor_max = max(bas_fluor_max, float(fluor))
                             in_bas = [tmp, fluor]
                             bass_json.append(in_bas)
-                    # Fixme do not loop over all, use sorted data and clever moving
-                    for react in allData["reacts"]:
-                        if (
-                            react["id"]
-                            == res["derivative"]["normalized"][row][0]
-                        ):
-                            for data in react["datas"]:
-                                if (
-                                    data["tar"]
-                                    == res["derivative"]["normalized"][row][3]
-                                ):
-                                    data["nrm"] = list(bass_json)
+                    dataKey = (
+                        res["derivative"]["normalized"][row][0],
+                        res["derivative"]["normalized"][row][3],
+                    )
+                    for data in dataIndex.get(dataKey, []):
+                        data["nrm"] = list(bass_json)
                 allData["nrm_temp_min"] = bas_temp_min
                 allData["nrm_temp_max"] = bas_temp_max
                 allData["nrm_fluor_min"] = bas_fluor_min
@@ -18637,20 +21633,12 @@ class Run:
                             bas_fluor_max = max(bas_fluor_max, float(fluor))
                             in_bas = [tmp, fluor]
                             bass_json.append(in_bas)
-                    # Fixme do not loop over all, use sorted data and clever moving
-                    for react in allData["reacts"]:
-                        if (
-                            react["id"]
-                            == res["derivative"]["firstDerivative"][row][0]
-                        ):
-                            for data in react["datas"]:
-                                if (
-                                    data["tar"]
-                                    == res["derivative"]["firstDerivative"][
-                                        row
-                                    ][3]
-                                ):
-                                    data["fdm"] = list(bass_json)
+                    dataKey = (
+                        res["derivative"]["firstDerivative"][row][0],
+                        res["derivative"]["firstDerivative"][row][3],
+                    )
+                    for data in dataIndex.get(dataKey, []):
+                        data["fdm"] = list(bass_json)
                 allData["fdm_temp_min"] = bas_temp_min
                 allData["fdm_temp_max"] = bas_temp_max
                 allData["fdm_fluor_min"] = bas_fluor_min
@@ -18698,7 +21686,11 @@ class Run:
         saveDerivative=False,
         saveResultsList=False,
         saveResultsCSV=False,
+        savePeakTable=False,
+        blockSize=None,
+        derivativeCallback=None,
         verbose=False,
+        profile=None,
     ):
         """Performs a melt curve analysis on the run. Modifies the melting
         temperature values and returns a json with additional data.
@@ -18724,7 +21716,12 @@ class Run:
             saveDerivative: If true, derivative values are given in the returned data
             saveResultsList: If true, return a 2d array object.
             saveResultsCSV: If true, return a csv string.
+            savePeakTable: If true, return a ResultsTable with all found peaks.
+            blockSize: The number of reactions analysed at once, None for all reactions.
+            derivativeCallback: Called with the data name and the data rows of each analysed block,
+            the first call for each data name includes the header row.
             verbose: If true, comment every performed step.
+            profile: True, "time", a callable or a logging.Logger to measure the stages, see StageProfiler.
 
         Returns:
             A dictionary with the resulting data, presence and format depending on input.
@@ -18732,16 +21729,92 @@ class Run:
             baselineCorrectedData: A 2d array with the baseline corrected raw fluorescence values
             resultsList: A 2d array object.
             resultsCSV: A csv string.
+            peakTable: A ResultsTable object with one row per peak.
+            profile: A list with the measurements of each stage.
+        """
+
+        prof = StageProfiler("meltCurveAnalysis", profile, self["id"])
+        try:
+            finalData = self._meltCurveAnalysis(
+                prof,
+                normMethod=normMethod,
+                fluorSource=fluorSource,
+                truePeakWidth=truePeakWidth,
+                artifactPeakWidth=artifactPeakWidth,
+                expoLowTemp=expoLowTemp,
+                expoHighTemp=expoHighTemp,
+                bilinLowStartTemp=bilinLowStartTemp,
+                bilinLowStopTemp=bilinLowStopTemp,
+                bilinHighStartTemp=bilinHighStartTemp,
+                bilinHighStopTemp=bilinHighStopTemp,
+                peakLowTemp=peakLowTemp,
+                peakHighTemp=peakHighTemp,
+                peakMaxWidth=peakMaxWidth,
+                peakCutoff=peakCutoff,
+                updateRDML=updateRDML,
+                saveRaw=saveRaw,
+                saveDerivative=saveDerivative,
+                saveResultsList=saveResultsList,
+                saveResultsCSV=saveResultsCSV,
+                savePeakTable=savePeakTable,
+                blockSize=blockSize,
+                derivativeCallback=derivativeCallback,
+                verbose=verbose,
+            )
+        finally:
+            profRes = prof.finish()
+        if profile:
+            finalData["profile"] = profRes
+        return finalData
+
+    def _meltCurveAnalysis(
+        self,
+        prof,
+        normMethod="exponential",
+        fluorSource="normalised",
+        truePeakWidth=1.0,
+        artifactPeakWidth=1.0,
+        expoLowTemp=65.0,
+        expoHighTemp=92.0,
+        bilinLowStartTemp=65.0,
+        bilinLowStopTemp=67.0,
+        bilinHighStartTemp=93.0,
+        bilinHighStopTemp=94.0,
+        peakLowTemp=60.0,
+        peakHighTemp=98.0,
+        peakMaxWidth=5.0,
+        peakCutoff=5.0,
+        updateRDML=False,
+        saveRaw=False,
+        saveDerivative=False,
+        saveResultsList=False,
+        saveResultsCSV=False,
+        savePeakTable=False,
+        blockSize=None,
+        derivativeCallback=None,
+        verbose=False,
+    ):
+        """Does the work of meltCurveAnalysis(), see there for the other arguments.
+
+        Args:
+            self: The class self parameter.
+            prof: The StageProfiler measuring the stages.
+
+        Returns:
+            The dictionary returned by meltCurveAnalysis() without the profile.
         """
 
         expParent = self._node.getparent()
         rootPar = expParent.getparent()
         dataVersion = rootPar.get("version")
-        transSamTar = _sampleTypeToDics(rootPar)
+        metaLookups = _metadataToDics(rootPar)
+        transSamTar = metaLookups["sampleType"]
 
         if dataVersion == "1.0":
             raise RdmlError("MeltCurveAnalysis requires RDML version > 1.0.")
 
+        prof.stage("parse")
+
         ##############################
         # Collect the data in arrays #
         ##############################
@@ -18803,9 +21876,8 @@ class Run:
             react_datas = _get_all_children(react, "data")
             for react_data in react_datas:
                 colCount += 1
-                mdps = _get_all_children(react_data, "mdp")
-                for mdp in mdps:
-                    collAllTemp[_get_first_child_text(mdp, "tmp")] = 1
+                for cTemp in _get_data_point_texts(react_data, "mdp", "tmp"):
+                    collAllTemp[cTemp] = 1
 
         tempListUnsort = list(collAllTemp.keys())
         tempStrList = sorted(tempListUnsort, key=float)
@@ -18817,8 +21889,6 @@ class Run:
 
         # spFl is the shape for all fluorescence numpy data arrays
         spFl = (colCount, len(tempList))
-        rawFluor = np.zeros(spFl, dtype=np.float64)
-        rawFluor[rawFluor < 1] = np.nan
 
         # Initialization of the vecNoAmplification vector
         vecExcludedByUser = np.zeros(spFl[0], dtype=np.bool_)
@@ -18827,14 +21897,10 @@ class Run:
         # Now process the data for numpy and create results array
         anyRawData = False
         rowCount = 0
+        plateFormat = self.plate_format()
         for react in reacts:
             posId = react.get("id")
-            pIdNumber = (int(posId) - 1) % int(self["pcrFormat_columns"]) + 1
-            pIdLetter = chr(
-                ord("A")
-                + int((int(posId) - 1) / int(self["pcrFormat_columns"]))
-            )
-            pWell = pIdLetter + str(pIdNumber)
+            pWell = plateFormat.label(posId)
             sample = ""
             forId = _get_first_child(react, "sample")
             if forId is not None:
@@ -18866,13 +21932,19 @@ class Run:
                         "",
                     ]
                 )  # Must match header length
-                mdps = _get_all_children(react_data, "mdp")
-                for mdp in mdps:
-                    cTemp = _get_first_child_text(mdp, "tmp")
-                    cFluor = _get_first_child_text(mdp, "fluor")
-                    if cTemp != "" and cFluor != "" and cTemp in lookUpTemp:
-                        rawFluor[rowCount, lookUpTemp[cTemp]] = float(cFluor)
-                        anyRawData = True
+                # The raw data are read later in blocks of reactions
+                if not anyRawData:
+                    mdps = _get_all_children(react_data, "mdp")
+                    for mdp in mdps:
+                        cTemp = _get_first_child_text(mdp, "tmp")
+                        cFluor = _get_first_child_text(mdp, "fluor")
+                        if (
+                            cTemp != ""
+                            and cFluor != ""
+                            and cTemp in lookUpTemp
+                        ):
+                            anyRawData = True
+                            break
                 rowCount += 1
         if anyRawData == False:
             raise RdmlError(
@@ -18880,37 +21952,8 @@ class Run:
             )
 
         # Look up sample and target information
-        parExp = self._node.getparent()
-        parRoot = parExp.getparent()
-
-        dicLU_dyes = {}
-        luDyes = _get_all_children(parRoot, "dye")
-        for lu_dye in luDyes:
-            lu_chemistry = _get_first_child_text(lu_dye, "dyeChemistry")
-            if lu_chemistry == "":
-                lu_chemistry = "non-saturating DNA binding dye"
-            if lu_dye.attrib["id"] != "":
-                dicLU_dyes[lu_dye.attrib["id"]] = lu_chemistry
-
-        dicLU_targets = {}
-        dicLU_tarMelt = {}
-        luTargets = _get_all_children(parRoot, "target")
-        for lu_target in luTargets:
-            meltingTemperature = _get_first_child_text(
-                lu_target, "meltingTemperature"
-            )
-            forId = _get_first_child(lu_target, "dyeId")
-            lu_dyeId = ""
-            if forId is not None:
-                if forId.attrib["id"] != "":
-                    lu_dyeId = forId.attrib["id"]
-            if lu_dyeId == "" or lu_dyeId not in dicLU_dyes:
-                dicLU_targets[
-                    lu_target.attrib["id"]
-                ] = "non-saturating DNA binding dye"
-            if lu_target.attrib["id"] != "":
-                dicLU_targets[lu_target.attrib["id"]] = dicLU_dyes[lu_dyeId]
-                dicLU_tarMelt[lu_target.attrib["id"]] = meltingTemperature
+        dicLU_targets = metaLookups["targetChemistry"]
+        dicLU_tarMelt = metaLookups["targetMeltTemp"]
 
         # Update the table with dictionary help
         for oRow in range(0, spFl[0]):
@@ -18940,19 +21983,6 @@ class Run:
             ]
             for oCol in tempStrList:
                 rawData[0].append(oCol)
-            for oRow in range(0, spFl[0]):
-                rawData.append(
-                    [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
-                        res[oRow][rar_exp_melt_temp],
-                    ]
-                )
-                for oCol in range(0, spFl[1]):
-                    rawData[oRow + 1].append(float(rawFluor[oRow, oCol]))
             finalData["rawData"] = rawData
 
         # Count the targets and create the target variables
@@ -18982,71 +22012,26 @@ class Run:
         #########################
         # Get the data in shape #
         #########################
-
-        # There should be no negative values in uncorrected raw data
-        absMinFluor = np.nanmin(rawFluor)
-        if absMinFluor < 0.0:
-            finalData[
-                "noRawData"
-            ] = "Error: Fluorescence data have negative values. Use raw data without baseline correction! "
-            finalData[
-                "noRawData"
-            ] += "Baseline corrected data not using a constant factor will result in wrong melting curves!"
-
-        # Initial smooth of raw data
-        smoothFluor = _mca_smooth(tempList, rawFluor)
-
-        # Exponential normalisation
-        normalMelting = np.zeros(spFl, dtype=np.float64)
-        posLowT = 0
-        while posLowT < spFl[1] - 1 and tempList[posLowT] < expoLowTemp:
-            posLowT += 1
-        posHighT = spFl[1] - 1
-        while posHighT > 0 and tempList[posHighT] > expoHighTemp:
-            posHighT -= 1
-
-        for rRow in range(0, spFl[0]):  # loop rRow for every reaction
-            # calculate FDLow and FDHigh from mc[]
-            FDLow = -1 * (
-                smoothFluor[rRow][posLowT] - smoothFluor[rRow][posLowT - 1]
-            )
-            FDHigh = -1 * (
-                smoothFluor[rRow][posHighT] - smoothFluor[rRow][posHighT - 1]
+        prof.stage("derivative")
+
+        # The reactions are analysed in blocks of blockSize reactions to
+        # limit the memory use, a single block is kept between the passes
+        if blockSize is None or int(blockSize) < 1:
+            blockSize = spFl[0]
+        blockSize = int(blockSize)
+        blockRanges = []
+        for blockStart in range(0, spFl[0], blockSize):
+            blockRanges.append(
+                [blockStart, min(blockStart + blockSize, spFl[0])]
             )
+        keptBlocks = {}
 
-            # Rarely happens, protects the log from negative values
-            if FDLow <= 0.0:
-                FDLow = 0.00001
-            if FDHigh <= 0.0:
-                FDHigh = 0.000001  # not same as FDLow = 0.00001
-
-            # determine Aexp and Cexp
-            Aexp = (np.log(FDHigh) - np.log(FDLow)) / (
-                expoHighTemp - expoLowTemp
-            )
-            Cexp = -1 * FDLow / Aexp
-
-            # apply exponential base trend correction
-            MaxMCCorr = 0.0
-            MinMCCorr = 10000.0
-            for rCol in range(0, spFl[1]):
-                normalMelting[rRow][rCol] = smoothFluor[rRow][
-                    rCol
-                ] - Cexp * np.exp(Aexp * (tempList[rCol] - expoLowTemp))
-                if normalMelting[rRow][rCol] > MaxMCCorr:
-                    MaxMCCorr = normalMelting[rRow][rCol]
-                if normalMelting[rRow][rCol] < MinMCCorr:
-                    MinMCCorr = normalMelting[rRow][rCol]
-
-            for rCol in range(0, spFl[1]):
-                normalMelting[rRow][rCol] = (
-                    normalMelting[rRow][rCol] - MinMCCorr
-                ) / (MaxMCCorr - MinMCCorr)
-
+        # The bilinear normalisation needs the statistics of all reactions
+        # of a target, they are summed up over the blocks in extra passes
+        meltPasses = ["final"]
         if normMethod in ["bilinear", "combined"]:
-            ##################################
-            # Finding the suitable low range #
-            ##################################
+            meltPasses = ["lowRange", "highRange", "final"]
+
             # determine index of low start temperature
             startindex = 0
             while (
@@ -19073,649 +22058,443 @@ class Run:
             while tempList[stophighT] > bilinHighStopTemp and stophighT > 0:
                 stophighT -= 1
 
-            MeanSlope = np.zeros(
-                (targetsCount, 3 * NtempsInRange + 1), dtype=np.float64
-            )
-            SDSlope = np.zeros(
-                (targetsCount, 3 * NtempsInRange + 1), dtype=np.float64
-            )
-            IndexR = -1
-            for k in range(startindex, startindex + 3 * NtempsInRange + 1):
-                startlowT = k - 1
-                stoplowT = startlowT + NtempsInRange
-                IndexR += 1  # counts number of tested T ranges
-                SumSlopes = np.zeros(targetsCount, dtype=np.float64)
-                SumSlopes2 = np.zeros(targetsCount, dtype=np.float64)
-                cntSlopes = np.zeros(targetsCount, dtype=np.int64)
-
-                if normMethod == "combined":
-                    bilinNormal = normalMelting.copy()
-                else:
-                    bilinNormal = smoothFluor.copy()
-
-                [slopelow, interceptlow] = _mca_linReg(
-                    np.tile(tempList, (spFl[0], 1)),
-                    bilinNormal,
-                    startlowT,
-                    stoplowT,
-                )
-                [slopehigh, intercepthigh] = _mca_linReg(
-                    np.tile(tempList, (spFl[0], 1)),
-                    bilinNormal,
-                    starthighT,
-                    stophighT,
-                )
-                LowTline = (
-                    interceptlow[:, np.newaxis]
-                    + slopelow[:, np.newaxis] * tempList
-                )
-                HighTline = (
-                    intercepthigh[:, np.newaxis]
-                    + slopehigh[:, np.newaxis] * tempList
-                )
-                bilinNormal = (bilinNormal - HighTline) / (
-                    LowTline - HighTline
-                )
-                [slopeNMC, interceptNMC] = _mca_linReg(
-                    np.tile(tempList, (spFl[0], 1)),
-                    bilinNormal,
-                    startlowT + NtempsInRange,
-                    startlowT + 2 * NtempsInRange,
-                )
-
-                for j in range(0, spFl[0]):
-                    nonSweep = True
-                    for i in range(0, spFl[1] - 1):
-                        if np.abs(
-                            bilinNormal[j][i] - bilinNormal[j][i + 1]
-                        ) > 0.1 and (
-                            bilinNormal[j][i] > 1.0 > bilinNormal[j][i + 1]
-                            or bilinNormal[j][i] < 1.0 < bilinNormal[j][i + 1]
-                        ):
-                            nonSweep = False
-                    if nonSweep:
-                        curTarNr = tarWinLookup[res[j][rar_tar]]
-                        SumSlopes[curTarNr] += slopeNMC[j]
-                        SumSlopes2[curTarNr] += slopeNMC[j] * slopeNMC[j]
-                        cntSlopes[curTarNr] += 1
-
-                for curTarNr in range(1, targetsCount):
-                    if cntSlopes[curTarNr] > 1:
-                        MeanSlope[curTarNr][IndexR] = (
-                            SumSlopes[curTarNr] / cntSlopes[curTarNr]
-                        )
-                        SDSlope[curTarNr][IndexR] = np.sqrt(
-                            (
-                                SumSlopes2[curTarNr]
-                                - (
-                                    SumSlopes[curTarNr]
-                                    * SumSlopes[curTarNr]
-                                    / cntSlopes[curTarNr]
-                                )
-                            )
-                            / (cntSlopes[curTarNr] - 1)
-                        )
-                    else:
-                        if IndexR == 0:
-                            MeanSlope[curTarNr][IndexR] = 10.0
-                            SDSlope[curTarNr][IndexR] = 0.0
-                        else:
-                            MeanSlope[curTarNr][IndexR] = MeanSlope[curTarNr][
-                                IndexR - 1
-                            ]
-                            SDSlope[curTarNr][IndexR] = SDSlope[curTarNr][
-                                IndexR - 1
-                            ]
-
-            MinSlope = 10.0  # default set to 10.0
-            IndexMin = 0
-
-            for curTarNr in range(1, targetsCount):
-                for k in range(0, IndexR - 1):
-                    if normMethod == "combined":
-                        if SDSlope[curTarNr][k] < MinSlope:
-                            MinSlope = SDSlope[curTarNr][k]
-                            IndexMin = k
-                    else:
-                        CritSlope = (
-                            MeanSlope[curTarNr][k] + 2 * SDSlope[curTarNr][k]
-                        )
-                        if CritSlope < 0.0 and (0.0 - CritSlope) < MinSlope:
-                            MinSlope = 0.0 - CritSlope
-                            IndexMin = k
-                bilinLowStart[curTarNr] = tempList[startindex + IndexMin]
-                bilinLowStop[curTarNr] = tempList[
-                    startindex + IndexMin + NtempsInRange
-                ]
-                LowTm[curTarNr] = bilinLowStop[curTarNr]
-
-            ###################################
-            # Finding the suitable high range #
-            ###################################
-            for curTarNr in range(1, targetsCount):
-                starttemp = bilinLowStart[curTarNr]
-                # determine index of low start temperature
-                startlowT = 0
-                while (
-                    tempList[startlowT] < starttemp
-                    and startlowT < len(tempList) - 1
-                ):
-                    startlowT += 1
-
-                stoptemp = bilinLowStop[curTarNr]
-                # determine index of low stop temperature
-                stoplowT = len(tempList) - 1
-                while tempList[stoplowT] > stoptemp and stoplowT > 0:
-                    stoplowT -= 1
-
-                # determine startindex for range of high temps to test
-                starttemp = 90.0
-                # determine indices of high start and stop temperature
-                startindex = 1
-                while (
-                    tempList[startindex] < starttemp
-                    and startindex < len(tempList) - 1
-                ):
-                    startindex += 1
-
-                stoptemp = 91.0
-                # determine indices of high start and stop temperature
-                stopindex = len(tempList) - 1
-                while tempList[stopindex] > stoptemp and stopindex > 0:
-                    stopindex -= 1
-
-                NtempsInRange = stopindex - startindex + 1
-
-                MeanVal = np.zeros(
-                    (targetsCount, 5 * NtempsInRange + 1), dtype=np.float64
-                )
-                SDVal = np.zeros(
-                    (targetsCount, 5 * NtempsInRange + 1), dtype=np.float64
-                )
-                IndexR = -1
-                for k in range(startindex, startindex + 5 * NtempsInRange + 1):
-                    starthighT = k - 1
-                    stophighT = starthighT + NtempsInRange
-                    IndexR += 1  # counts number of tested T ranges
-
-                    SumVal = 0.0
-                    SumVal2 = 0.0
-                    cntVal = 0
-
-                    if normMethod == "combined":
-                        bilinNormal = normalMelting.copy()
-                    else:
-                        bilinNormal = smoothFluor.copy()
-
-                    [slopelow, interceptlow] = _mca_linReg(
-                        np.tile(tempList, (spFl[0], 1)),
-                        bilinNormal,
-                        startlowT,
-                        stoplowT,
-                    )
-                    [slopehigh, intercepthigh] = _mca_linReg(
-                        np.tile(tempList, (spFl[0], 1)),
-                        bilinNormal,
-                        starthighT,
-                        stophighT,
-                    )
-                    LowTline = (
-                        interceptlow[:, np.newaxis]
-                        + slopelow[:, np.newaxis] * tempList
-                    )
-                    HighTline = (
-                        intercepthigh[:, np.newaxis]
-                        + slopehigh[:, np.newaxis] * tempList
-                    )
-                    bilinNormal = (bilinNormal - HighTline) / (
-                        LowTline - HighTline
-                    )
-                    # [slopeNMC, interceptNMC] = _mca_linReg(np.tile(tempList, (spFl[0], 1)), bilinNormal,
-                    #                                        startlowT + NtempsInRange, startlowT + 2 * NtempsInRange)
-
-                    for j in range(0, spFl[0]):
-                        if curTarNr == tarWinLookup[res[j][rar_tar]]:
-                            nonSweep = True
-                            for i in range(k - 2 * NtempsInRange, k + 1):
-                                if np.abs(
-                                    bilinNormal[j][i] - bilinNormal[j][i + 1]
-                                ) > 0.1 and (
-                                    bilinNormal[j][i]
-                                    > 0.0
-                                    > bilinNormal[j][i + 1]
-                                    or bilinNormal[j][i]
-                                    < 0.0
-                                    < bilinNormal[j][i + 1]
-                                ):
-                                    nonSweep = False
-                            if nonSweep:
-                                sumValIn = 0.0
-                                cntValIn = 0
-                                for i in range(k - NtempsInRange, k + 1):
-                                    sumValIn += bilinNormal[j][i]
-                                    cntValIn += 1
-                                MeanValIn = sumValIn / cntValIn
-                                SumVal += MeanValIn
-                                SumVal2 += MeanValIn * MeanValIn
-                                cntVal += 1
-
-                    MeanVal[curTarNr][IndexR] = SumVal / cntVal
-                    SDVal[curTarNr][IndexR] = np.sqrt(
-                        (SumVal2 - (SumVal * SumVal / cntVal)) / (cntVal - 1)
-                    )
-
-                MaxVal = -10.0  # default set to -10.0
-                IndexMax = 0
+            lowRangeSums = [
+                np.zeros((targetsCount, 3 * NtempsInRange + 1)),
+                np.zeros((targetsCount, 3 * NtempsInRange + 1)),
+                np.zeros((targetsCount, 3 * NtempsInRange + 1)),
+            ]
 
-                # criterion is the same for bi-linear or exponential+bi-linear
-                for k in range(0, IndexR):
-                    CritVal = MeanVal[curTarNr][k] - 2 * SDVal[curTarNr][k]
-                    if CritVal > MaxVal:
-                        MaxVal = CritVal
-                        IndexMax = k
+            # determine startindex for range of high temps to test
+            starttemp = 90.0
+            # determine indices of high start and stop temperature
+            highStartindex = 1
+            while (
+                tempList[highStartindex] < starttemp
+                and highStartindex < len(tempList) - 1
+            ):
+                highStartindex += 1
 
-                bilinHighStart[curTarNr] = tempList[startindex + IndexMax]
-                bilinHighStop[curTarNr] = tempList[
-                    startindex + IndexMax + NtempsInRange
-                ]
-                HighTm[curTarNr] = bilinHighStart[curTarNr]
+            stoptemp = 91.0
+            # determine indices of high start and stop temperature
+            highStopindex = len(tempList) - 1
+            while tempList[highStopindex] > stoptemp and highStopindex > 0:
+                highStopindex -= 1
 
-            #################################
-            # Do the bilinear normalisation #
-            #################################
-            if normMethod == "combined":
-                bilinNormal = normalMelting.copy()
-            else:
-                bilinNormal = smoothFluor.copy()
+            highNtempsInRange = highStopindex - highStartindex + 1
 
-            for curTarNr in range(1, targetsCount):
-                # determine index of low start temperature
-                startlowT = 0
-                while (
-                    tempList[startlowT] < bilinLowStart[curTarNr]
-                    and startlowT < len(tempList) - 1
-                ):
-                    startlowT += 1
-                # determine index of low stop temperature
-                stoplowT = len(tempList) - 1
-                while (
-                    tempList[stoplowT] > bilinLowStop[curTarNr]
-                    and stoplowT > 0
-                ):
-                    stoplowT -= 1
-                # determine indices of high start and stop temperature
-                starthighT = 1
-                while (
-                    tempList[starthighT] < bilinHighStart[curTarNr]
-                    and starthighT < len(tempList) - 1
-                ):
-                    starthighT += 1
-                # determine indices of high start and stop temperature
-                stophighT = len(tempList) - 1
-                while (
-                    tempList[stophighT] > bilinHighStop[curTarNr]
-                    and stophighT > 0
-                ):
-                    stophighT -= 1
+            highRangeSums = [
+                np.zeros((targetsCount, 5 * highNtempsInRange + 1)),
+                np.zeros((targetsCount, 5 * highNtempsInRange + 1)),
+                np.zeros((targetsCount, 5 * highNtempsInRange + 1)),
+            ]
+            lowRangePos = np.zeros((targetsCount, 2), dtype=np.int64)
 
-                [slopelow, interceptlow] = _mca_linReg(
-                    np.tile(tempList, (spFl[0], 1)),
-                    bilinNormal,
-                    startlowT,
-                    stoplowT,
+        # There should be no negative values in uncorrected raw data
+        absMinFluor = np.inf
+        derivativeData = {}
+        peakBlocks = []
+        for meltPass in meltPasses:
+            if meltPass == "highRange":
+                ##################################
+                # Finding the suitable low range #
+                ##################################
+                [SumSlopes, SumSlopes2, cntSlopes] = lowRangeSums
+                MeanSlope = np.zeros(
+                    (targetsCount, 3 * NtempsInRange + 1), dtype=np.float64
                 )
-                [slopehigh, intercepthigh] = _mca_linReg(
-                    np.tile(tempList, (spFl[0], 1)),
-                    bilinNormal,
-                    starthighT,
-                    stophighT,
+                SDSlope = np.zeros(
+                    (targetsCount, 3 * NtempsInRange + 1), dtype=np.float64
                 )
+                for IndexR in range(0, 3 * NtempsInRange + 1):
+                    for curTarNr in range(1, targetsCount):
+                        if cntSlopes[curTarNr][IndexR] > 1:
+                            MeanSlope[curTarNr][IndexR] = (
+                                SumSlopes[curTarNr][IndexR]
+                                / cntSlopes[curTarNr][IndexR]
+                            )
+                            SDSlope[curTarNr][IndexR] = np.sqrt(
+                                (
+                                    SumSlopes2[curTarNr][IndexR]
+                                    - (
+                                        SumSlopes[curTarNr][IndexR]
+                                        * SumSlopes[curTarNr][IndexR]
+                                        / cntSlopes[curTarNr][IndexR]
+                                    )
+                                )
+                                / (cntSlopes[curTarNr][IndexR] - 1)
+                            )
+                        else:
+                            if IndexR == 0:
+                                MeanSlope[curTarNr][IndexR] = 10.0
+                                SDSlope[curTarNr][IndexR] = 0.0
+                            else:
+                                MeanSlope[curTarNr][IndexR] = MeanSlope[
+                                    curTarNr
+                                ][IndexR - 1]
+                                SDSlope[curTarNr][IndexR] = SDSlope[curTarNr][
+                                    IndexR - 1
+                                ]
 
-                LowTline = (
-                    interceptlow[:, np.newaxis]
-                    + slopelow[:, np.newaxis] * tempList
-                )
-                HighTline = (
-                    intercepthigh[:, np.newaxis]
-                    + slopehigh[:, np.newaxis] * tempList
-                )
+                MinSlope = 10.0  # default set to 10.0
+                IndexMin = 0
+
+                for curTarNr in range(1, targetsCount):
+                    for k in range(0, IndexR - 1):
+                        if normMethod == "combined":
+                            if SDSlope[curTarNr][k] < MinSlope:
+                                MinSlope = SDSlope[curTarNr][k]
+                                IndexMin = k
+                        else:
+                            CritSlope = (
+                                MeanSlope[curTarNr][k]
+                                + 2 * SDSlope[curTarNr][k]
+                            )
+                            if (
+                                CritSlope < 0.0
+                                and (0.0 - CritSlope) < MinSlope
+                            ):
+                                MinSlope = 0.0 - CritSlope
+                                IndexMin = k
+                    bilinLowStart[curTarNr] = tempList[startindex + IndexMin]
+                    bilinLowStop[curTarNr] = tempList[
+                        startindex + IndexMin + NtempsInRange
+                    ]
+                    LowTm[curTarNr] = bilinLowStop[curTarNr]
+
+                    # determine index of low start temperature
+                    startlowT = 0
+                    while (
+                        tempList[startlowT] < bilinLowStart[curTarNr]
+                        and startlowT < len(tempList) - 1
+                    ):
+                        startlowT += 1
+                    # determine index of low stop temperature
+                    stoplowT = len(tempList) - 1
+                    while (
+                        tempList[stoplowT] > bilinLowStop[curTarNr]
+                        and stoplowT > 0
+                    ):
+                        stoplowT -= 1
+                    lowRangePos[curTarNr] = [startlowT, stoplowT]
+
+            if meltPass == "final" and normMethod in ["bilinear", "combined"]:
+                ###################################
+                # Finding the suitable high range #
+                ###################################
+                [SumVal, SumVal2, cntVal] = highRangeSums
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    MeanVal = SumVal / cntVal
+                    SDVal = np.sqrt(
+                        (SumVal2 - (SumVal * SumVal / cntVal)) / (cntVal - 1)
+                    )
+                for curTarNr in range(1, targetsCount):
+                    MaxVal = -10.0  # default set to -10.0
+                    IndexMax = 0
+
+                    # criterion is the same for bi-linear or exponential+bi-linear
+                    for k in range(0, 5 * highNtempsInRange):
+                        CritVal = MeanVal[curTarNr][k] - 2 * SDVal[curTarNr][k]
+                        if CritVal > MaxVal:
+                            MaxVal = CritVal
+                            IndexMax = k
+
+                    bilinHighStart[curTarNr] = tempList[
+                        highStartindex + IndexMax
+                    ]
+                    bilinHighStop[curTarNr] = tempList[
+                        highStartindex + IndexMax + highNtempsInRange
+                    ]
+                    HighTm[curTarNr] = bilinHighStart[curTarNr]
 
-                for j in range(0, spFl[0]):
-                    if curTarNr == tarWinLookup[res[j][rar_tar]]:
-                        normalMelting[j] = (bilinNormal[j] - HighTline[j]) / (
-                            LowTline[j] - HighTline[j]
+            for [blockStart, blockStop] in blockRanges:
+                if blockStart in keptBlocks:
+                    [smoothFluor, normalMelting] = keptBlocks[blockStart]
+                else:
+                    rawFluor = _mca_readMeltData(
+                        rdmlElemData[blockStart:blockStop],
+                        lookUpTemp,
+                        spFl[1],
+                    )
+                    if meltPass == meltPasses[0]:
+                        absMinFluor = min(
+                            absMinFluor,
+                            np.fmin.reduce(
+                                rawFluor, axis=None, initial=np.inf
+                            ),
                         )
-                        for i in range(0, spFl[1]):
-                            # avoid sweeps because LowTline and HighTline are about to cross
-                            if i > stophighT:
-                                if (
-                                    abs(
-                                        normalMelting[j][i]
-                                        - normalMelting[j][i - 1]
-                                    )
-                                    > 1.01 * normalMelting[j][i - 1]
-                                ):
-                                    normalMelting[j][i] = normalMelting[j][
-                                        i - 1
+                        if saveRaw:
+                            for oRow in range(blockStart, blockStop):
+                                rawData.append(
+                                    [
+                                        res[oRow][rar_id],
+                                        res[oRow][rar_well],
+                                        res[oRow][rar_sample],
+                                        res[oRow][rar_tar],
+                                        res[oRow][rar_excl],
+                                        res[oRow][rar_exp_melt_temp],
                                     ]
+                                    + rawFluor[oRow - blockStart].tolist()
+                                )
 
-        # FindSweepsButtonClick ???
+                    # Initial smooth of raw data
+                    smoothFluor = _mca_smooth(tempList, rawFluor)
+                    del rawFluor
 
-        # Derivate normalMelting
-        tmp = (tempList + np.roll(tempList, 1)) / 2  # Shift to right
-        rawFirstDerivativeTemp = tmp[1:]
-        tmp = (
-            np.roll(normalMelting, 1, axis=1) - normalMelting
-        )  # Shift to right
-        rawFirstDerivative = tmp[:, 1:]
+                    # Exponential normalisation
+                    normalMelting = _mca_expoNormalise(
+                        tempList, smoothFluor, expoLowTemp, expoHighTemp
+                    )
+                    if len(blockRanges) == 1 and len(meltPasses) > 1:
+                        keptBlocks[blockStart] = [smoothFluor, normalMelting]
 
-        # Delete the first three columns
-        rawFirstDerivativeTemp = rawFirstDerivativeTemp[3:]
-        rawFirstDerivative = rawFirstDerivative[:, 3:]
+                if normMethod == "combined":
+                    bilinBase = normalMelting
+                else:
+                    bilinBase = smoothFluor
+                blockTarget = vecTarget[blockStart:blockStop]
+
+                if meltPass == "lowRange":
+                    blockSums = _mca_bilinLowRangeSums(
+                        tempList,
+                        bilinBase,
+                        blockTarget,
+                        targetsCount,
+                        startindex,
+                        NtempsInRange,
+                        starthighT,
+                        stophighT,
+                    )
+                    for sumPos in range(0, 3):
+                        lowRangeSums[sumPos] += blockSums[sumPos]
+                    continue
 
-        # Smooth of raw data
-        smoothFirstDerivative = _mca_smooth(
-            rawFirstDerivativeTemp, rawFirstDerivative
-        )
+                if meltPass == "highRange":
+                    for curTarNr in range(1, targetsCount):
+                        if not np.any(blockTarget == curTarNr):
+                            continue
+                        blockSums = _mca_bilinHighRangeSums(
+                            tempList,
+                            bilinBase[blockTarget == curTarNr],
+                            lowRangePos[curTarNr][0],
+                            lowRangePos[curTarNr][1],
+                            highStartindex,
+                            highNtempsInRange,
+                        )
+                        for sumPos in range(0, 3):
+                            highRangeSums[sumPos][curTarNr] += blockSums[
+                                sumPos
+                            ]
+                    continue
+
+                #################################
+                # Do the bilinear normalisation #
+                #################################
+                if normMethod in ["bilinear", "combined"]:
+                    normalMelting = _mca_bilinNormalise(
+                        tempList,
+                        bilinBase,
+                        blockTarget,
+                        targetsCount,
+                        bilinLowStart,
+                        bilinLowStop,
+                        bilinHighStart,
+                        bilinHighStop,
+                    )
 
-        # Derivate smoothFirstDerivative
-        rawSecondDerivativeTemp = tempList[4:-2]
-        tmp = smoothFirstDerivative - np.roll(
-            smoothFirstDerivative, 1, axis=1
-        )  # Shift to right
-        rawSecondDerivative = tmp[:, 1:-1]
+                # FindSweepsButtonClick ???
 
-        # Smooth of raw data
-        smoothSecondDerivative = _mca_smooth(
-            rawSecondDerivativeTemp, rawSecondDerivative
-        )
+                [
+                    rawFirstDerivativeTemp,
+                    smoothFirstDerivative,
+                    rawSecondDerivativeTemp,
+                    smoothSecondDerivative,
+                ] = _mca_derivatives(tempList, normalMelting)
+
+                # Save or hand over the derivative data of this block
+                if saveDerivative or derivativeCallback is not None:
+                    for [derivName, derivTemps, derivValues] in [
+                        ["smoothed", tempStrList, smoothFluor],
+                        ["normalized", tempStrList, normalMelting],
+                        [
+                            "firstDerivative",
+                            rawFirstDerivativeTemp,
+                            smoothFirstDerivative,
+                        ],
+                        [
+                            "secondDerivative",
+                            rawSecondDerivativeTemp,
+                            smoothSecondDerivative,
+                        ],
+                    ]:
+                        derivRows = []
+                        if blockStart == 0:
+                            derivRows.append(
+                                [
+                                    header[0][rar_id],
+                                    header[0][rar_well],
+                                    header[0][rar_sample],
+                                    header[0][rar_tar],
+                                    header[0][rar_excl],
+                                    header[0][rar_exp_melt_temp],
+                                ]
+                                + list(derivTemps)
+                            )
+                        for oRow in range(blockStart, blockStop):
+                            derivRows.append(
+                                [
+                                    res[oRow][rar_id],
+                                    res[oRow][rar_well],
+                                    res[oRow][rar_sample],
+                                    res[oRow][rar_tar],
+                                    res[oRow][rar_excl],
+                                    res[oRow][rar_exp_melt_temp],
+                                ]
+                                + derivValues[oRow - blockStart].tolist()
+                            )
+                        if saveDerivative:
+                            if derivName not in derivativeData:
+                                derivativeData[derivName] = []
+                            derivativeData[derivName].extend(derivRows)
+                        if derivativeCallback is not None:
+                            derivativeCallback(derivName, derivRows)
+
+                if saveResultsList or savePeakTable:
+                    if fluorSource == "normalised":
+                        peakFluor = normalMelting
+                    else:
+                        peakFluor = smoothFluor
+                    blockPeaks = _mca_findPeaks(
+                        rawFirstDerivativeTemp,
+                        smoothFirstDerivative,
+                        rawSecondDerivativeTemp,
+                        smoothSecondDerivative,
+                        peakFluor,
+                        peakLowTemp,
+                        peakHighTemp,
+                        peakMaxWidth,
+                    )
+                    blockPeaks["row"] += blockStart
+                    peakBlocks.append(blockPeaks)
+
+        if absMinFluor < 0.0:
+            finalData[
+                "noRawData"
+            ] = "Error: Fluorescence data have negative values. Use raw data without baseline correction! "
+            finalData[
+                "noRawData"
+            ] += "Baseline corrected data not using a constant factor will result in wrong melting curves!"
 
-        # Save derivative data
         if saveDerivative:
-            finalData["derivative"] = {}
+            finalData["derivative"] = derivativeData
 
-            smoothData = [
-                [
-                    header[0][rar_id],
-                    header[0][rar_well],
-                    header[0][rar_sample],
-                    header[0][rar_tar],
-                    header[0][rar_excl],
-                    header[0][rar_exp_melt_temp],
-                ]
-            ]
-            for oCol in tempStrList:
-                smoothData[0].append(oCol)
-            for oRow in range(0, spFl[0]):
-                smoothData.append(
-                    [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
-                        res[oRow][rar_exp_melt_temp],
-                    ]
+        #######################################
+        # Now find peaks and their parameters #
+        #######################################
+        prof.stage("peaks")
+        if saveResultsList or savePeakTable:
+            peaks = {}
+            for peakKey in peakBlocks[0]:
+                peaks[peakKey] = np.concatenate(
+                    [blockPeaks[peakKey] for blockPeaks in peakBlocks]
                 )
-                for oCol in range(0, spFl[1]):
-                    smoothData[oRow + 1].append(float(smoothFluor[oRow, oCol]))
-            finalData["derivative"]["smoothed"] = smoothData
 
-            normData = [
-                [
-                    header[0][rar_id],
-                    header[0][rar_well],
-                    header[0][rar_sample],
-                    header[0][rar_tar],
-                    header[0][rar_excl],
-                    header[0][rar_exp_melt_temp],
-                ]
-            ]
-            for oCol in tempStrList:
-                normData[0].append(oCol)
-            for oRow in range(0, spFl[0]):
-                normData.append(
-                    [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
-                        res[oRow][rar_exp_melt_temp],
-                    ]
+            # Set unwanted peaks below peakCutoff to -10.0
+            sumDeltaH = np.bincount(
+                peaks["row"], weights=peaks["deltaH"], minlength=spFl[0]
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                belowCutoff = (
+                    peakCutoff > peaks["deltaH"] / sumDeltaH[peaks["row"]]
                 )
-                for oCol in range(0, spFl[1]):
-                    normData[oRow + 1].append(float(normalMelting[oRow, oCol]))
-            finalData["derivative"]["normalized"] = normData
+            peakTemps = peaks["temp"].copy()
+            peaks["temp"][belowCutoff] = -10.0
 
-            firstDerData = [
-                [
-                    header[0][rar_id],
-                    header[0][rar_well],
-                    header[0][rar_sample],
-                    header[0][rar_tar],
-                    header[0][rar_excl],
-                    header[0][rar_exp_melt_temp],
-                ]
-            ]
-            for oCol in rawFirstDerivativeTemp:
-                firstDerData[0].append(oCol)
-            for oRow in range(0, spFl[0]):
-                firstDerData.append(
+            if savePeakTable:
+                peakTable = ResultsTable(
                     [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
-                        res[oRow][rar_exp_melt_temp],
-                    ]
-                )
-                for oCol in range(0, smoothFirstDerivative.shape[1]):
-                    firstDerData[oRow + 1].append(
-                        float(smoothFirstDerivative[oRow, oCol])
-                    )
-            finalData["derivative"]["firstDerivative"] = firstDerData
-
-            secondDerData = [
-                [
-                    header[0][rar_id],
-                    header[0][rar_well],
-                    header[0][rar_sample],
-                    header[0][rar_tar],
-                    header[0][rar_excl],
-                    header[0][rar_exp_melt_temp],
-                ]
-            ]
-            for oCol in rawSecondDerivativeTemp:
-                secondDerData[0].append(oCol)
-            for oRow in range(0, spFl[0]):
-                secondDerData.append(
+                        header[0][rar_id],
+                        header[0][rar_well],
+                        header[0][rar_sample],
+                        header[0][rar_tar],
+                        "peak temperature",
+                        "peak width",
+                        "peak height",
+                        "peak delta height",
+                        "peak fluorescence drop",
+                        "peak above cutoff",
+                    ],
                     [
-                        res[oRow][rar_id],
-                        res[oRow][rar_well],
-                        res[oRow][rar_sample],
-                        res[oRow][rar_tar],
-                        res[oRow][rar_excl],
-                        res[oRow][rar_exp_melt_temp],
-                    ]
+                        "text",
+                        "text",
+                        "text",
+                        "text",
+                        "%0.3f",
+                        "%0.3f",
+                        "%0.6f",
+                        "%0.6f",
+                        "%0.6f",
+                        "yesno",
+                    ],
+                    len(peaks["row"]),
                 )
-                for oCol in range(0, smoothSecondDerivative.shape[1]):
-                    secondDerData[oRow + 1].append(
-                        float(smoothSecondDerivative[oRow, oCol])
-                    )
-            finalData["derivative"]["secondDerivative"] = secondDerData
+                for peakCol, resCol in [
+                    (0, rar_id),
+                    (1, rar_well),
+                    (2, rar_sample),
+                    (3, rar_tar),
+                ]:
+                    peakTable[peakCol] = [
+                        res[oRow][resCol] for oRow in peaks["row"].tolist()
+                    ]
+                peakTable[4] = peakTemps
+                peakTable[5] = peaks["width"]
+                peakTable[6] = peaks["height"]
+                peakTable[7] = peaks["deltaH"]
+                peakTable[8] = peaks["fluorDrop"]
+                peakTable[9] = ~belowCutoff
+                finalData["peakTable"] = peakTable
 
-        #######################################
-        # Now find peaks and their parameters #
-        #######################################
         if saveResultsList:
+            # Split the flat peak table into lists per reaction
+            rowBorders = np.searchsorted(
+                peaks["row"], np.arange(0, spFl[0] + 1)
+            )
             peakResTemp = []
             peakResWidth = []
             peakResH = []
-            peakResSumH = []
             peakResDeltaH = []
-            peakResSumDeltaH = []
             peakResFluor = []
-            peakResSumFuor = []
-            truePeakFinPos = [-1] * spFl[0]
-            for pos in range(0, spFl[0]):  # loop rRow for every reaction
-                peakResTemp.append([])
-                peakResWidth.append([])
-                peakResH.append([])
-                peakResSumH.append(0.0)
-                peakResDeltaH.append([])
-                peakResSumDeltaH.append(0.0)
-                peakResFluor.append([])
-                peakResSumFuor.append(0.0)
-                for fdPos in range(1, len(rawFirstDerivativeTemp) - 2):
-                    if (
-                        smoothFirstDerivative[pos][fdPos - 1]
-                        <= smoothFirstDerivative[pos][fdPos]
-                        > smoothFirstDerivative[pos][fdPos + 1]
-                    ):
-                        # found a peak
-                        peakTemp = rawFirstDerivativeTemp[fdPos]
-                        sdPosMax = fdPos - 1
-                        sdValMax = smoothSecondDerivative[pos][sdPosMax]
-                        sdPosMin = fdPos
-                        sdValMin = smoothSecondDerivative[pos][sdPosMin]
-                        while (
-                            sdPosMax > 0
-                            and sdValMax
-                            < smoothSecondDerivative[pos][sdPosMax - 1]
-                        ):
-                            sdPosMax -= 1
-                            sdValMax = smoothSecondDerivative[pos][sdPosMax]
-                        while (
-                            sdPosMin < (len(rawSecondDerivativeTemp) - 2)
-                            and sdValMin
-                            > smoothSecondDerivative[pos][sdPosMin + 1]
-                        ):
-                            sdPosMin += 1
-                            sdValMin = smoothSecondDerivative[pos][sdPosMin]
-
-                        if sdPosMax > 0:  # All peaks have to go up first!
-                            lowPeakTemp = rawSecondDerivativeTemp[sdPosMax]
-
-                            ndLowPeakPos = (
-                                sdPosMax + 4
-                            )  # is the precise same temp
-                            if fluorSource == "normalised":
-                                lowFinFluor = normalMelting[pos][ndLowPeakPos]
-                            else:
-                                lowFinFluor = smoothFluor[pos][ndLowPeakPos]
-
-                            validPeakSD = True
-                            if sdPosMin > (len(rawSecondDerivativeTemp) - 4):
-                                # assume symmetry when down side is missing
-                                peakTempWitdth = 2 * (peakTemp - lowPeakTemp)
-                                ndPeakPos = (
-                                    fdPos + 3
-                                )  # The peak is between +3 and +4
-                                if fluorSource == "normalised":
-                                    medFinFluor = normalMelting[pos][ndPeakPos]
-                                else:
-                                    medFinFluor = smoothFluor[pos][ndPeakPos]
-                                fluorDrop = 2 * (lowFinFluor - medFinFluor)
-
-                                # sdPosMax position is on FD between sdPosMax and sdPosMax + 1
-                                deltaH = (
-                                    smoothFirstDerivative[pos][fdPos]
-                                    - smoothFirstDerivative[pos][sdPosMax]
-                                )
-                                if (
-                                    smoothFirstDerivative[pos][fdPos]
-                                    < smoothFirstDerivative[pos][sdPosMax]
-                                    or smoothFirstDerivative[pos][fdPos] < 0.0
-                                    or smoothFirstDerivative[pos][sdPosMax]
-                                    < 0.0
-                                ):
-                                    validPeakSD = False
-                            else:
-                                highPeakTemp = rawSecondDerivativeTemp[
-                                    sdPosMin
-                                ]
-                                peakTempWitdth = highPeakTemp - lowPeakTemp
-                                ndHighPeakPos = (
-                                    sdPosMin + 4
-                                )  # is the precise same temp
-                                if fluorSource == "normalised":
-                                    highFinFluor = normalMelting[pos][
-                                        ndHighPeakPos
-                                    ]
-                                else:
-                                    highFinFluor = smoothFluor[pos][
-                                        ndHighPeakPos
-                                    ]
-                                fluorDrop = lowFinFluor - highFinFluor
-
-                                # sdPosMax position is on FD between sdPosMax and sdPosMax + 1
-                                if smoothFirstDerivative[pos][sdPosMin] < 0.0:
-                                    deltaH = (
-                                        smoothFirstDerivative[pos][fdPos]
-                                        - smoothFirstDerivative[pos][sdPosMax]
-                                    )
-                                else:
-                                    lowH = (
-                                        smoothFirstDerivative[pos][sdPosMax]
-                                        + smoothFirstDerivative[pos][
-                                            sdPosMin + 1
-                                        ]
-                                    )
-                                    deltaH = (
-                                        smoothFirstDerivative[pos][fdPos]
-                                        - lowH / 2
-                                    )
-                                if (
-                                    smoothFirstDerivative[pos][fdPos]
-                                    < smoothFirstDerivative[pos][sdPosMax]
-                                    or smoothFirstDerivative[pos][fdPos]
-                                    < smoothFirstDerivative[pos][sdPosMin + 1]
-                                    or smoothFirstDerivative[pos][fdPos] < 0.0
-                                    or smoothFirstDerivative[pos][sdPosMax]
-                                    < 0.0
-                                ):
-                                    validPeakSD = False
-
-                            if (
-                                fluorDrop > 0.0
-                                and peakTempWitdth < peakMaxWidth
-                                and peakLowTemp < peakTemp < peakHighTemp
-                                and validPeakSD
-                            ):
-                                peakResTemp[pos].append(peakTemp)
-                                peakResWidth[pos].append(peakTempWitdth)
-                                peakResH[pos].append(
-                                    smoothFirstDerivative[pos][fdPos]
-                                )
-                                peakResSumH[pos] += smoothFirstDerivative[pos][
-                                    fdPos
-                                ]
-                                peakResDeltaH[pos].append(deltaH)
-                                peakResSumDeltaH[pos] += deltaH
-                                peakResFluor[pos].append(fluorDrop)
-                                peakResSumFuor[pos] += fluorDrop
-
-            # Set unwanted peaks below peakCutoff to -10.0
             for oRow in range(0, spFl[0]):
-                for oCol in range(0, len(peakResTemp[oRow])):
-                    if (
-                        peakCutoff
-                        > peakResDeltaH[oRow][oCol] / peakResSumDeltaH[oRow]
-                    ):
-                        peakResTemp[oRow][oCol] = -10.0
+                rowStart = rowBorders[oRow]
+                rowStop = rowBorders[oRow + 1]
+                peakResTemp.append(peaks["temp"][rowStart:rowStop].tolist())
+                peakResWidth.append(peaks["width"][rowStart:rowStop].tolist())
+                peakResH.append(peaks["height"][rowStart:rowStop].tolist())
+                peakResDeltaH.append(
+                    peaks["deltaH"][rowStart:rowStop].tolist()
+                )
+                peakResFluor.append(
+                    peaks["fluorDrop"][rowStart:rowStop].tolist()
+                )
+            truePeakFinPos = [-1] * spFl[0]
 
             # Recalculate the sums
-            for oRow in range(0, spFl[0]):
-                peakResSumH[oRow] = 0.0
-                peakResSumDeltaH[oRow] = 0.0
-                peakResSumFuor[oRow] = 0.0
-                for oCol in range(0, len(peakResTemp[oRow])):
-                    if peakResTemp[oRow][oCol] > 0.0:
-                        peakResSumH[oRow] += peakResH[oRow][oCol]
-                        peakResSumDeltaH[oRow] += peakResDeltaH[oRow][oCol]
-                        peakResSumFuor[oRow] += peakResFluor[oRow][oCol]
+            usedPeaks = peaks["temp"] > 0.0
+            peakResSumH = np.bincount(
+                peaks["row"][usedPeaks],
+                weights=peaks["height"][usedPeaks],
+                minlength=spFl[0],
+            ).tolist()
+            peakResSumDeltaH = np.bincount(
+                peaks["row"][usedPeaks],
+                weights=peaks["deltaH"][usedPeaks],
+                minlength=spFl[0],
+            ).tolist()
+            peakResSumFuor = np.bincount(
+                peaks["row"][usedPeaks],
+                weights=peaks["fluorDrop"][usedPeaks],
+                minlength=spFl[0],
+            ).tolist()
 
             # Find the expected peak
             checkedPeakTemp = [row[:] for row in peakResTemp]
@@ -20238,125 +23017,65 @@ class Run:
             ##############################
             # write out the rdml results #
             ##############################
+            prof.stage("write-back")
             if updateRDML is True:
-                dataXMLelements = _getXMLDataType()
-                for rRow in range(0, len(res)):
-                    if rdmlElemData[rRow] is not None:
-                        _change_subelement(
-                            rdmlElemData[rRow],
-                            "excl",
-                            dataXMLelements,
-                            res[rRow][rar_excl],
-                            True,
-                            "string",
+                # Collect the values column wise and write them in one pass
+                writeBack = {
+                    "excl": [
+                        res[rRow][rar_excl] for rRow in range(0, len(res))
+                    ]
+                }
+                if dataVersion == "1.3":
+                    writeBack["note"] = [
+                        res[rRow][rar_note] for rRow in range(0, len(res))
+                    ]
+                    writeBack["corrF"] = [None] * len(res)
+                    writeBack["corrCq"] = [None] * len(res)
+                    writeBack["meltTemp"] = [None] * len(res)
+                    for rRow in range(0, len(res)):
+                        if rdmlElemData[rRow] is None:
+                            continue
+                        lCol = truePeakFinPos[rRow]
+                        isSaturating = (
+                            res[rRow][rar_tar_chemistry]
+                            == "saturating DNA binding dye"
                         )
-                        if dataVersion == "1.3":
-                            _change_subelement(
-                                rdmlElemData[rRow],
-                                "note",
-                                dataXMLelements,
-                                res[rRow][rar_note],
-                                True,
-                                "string",
+                        if lCol < 0:
+                            if isSaturating:
+                                writeBack["corrF"][rRow] = "0.0"
+                                writeBack["corrCq"][rRow] = "-1.0"
+                            continue
+                        writeBack["meltTemp"][rRow] = "{:.3f}".format(
+                            peakResTemp[rRow][lCol]
+                        )
+                        if not isSaturating:
+                            continue
+                        finalFactor = (
+                            peakResFluor[rRow][lCol] / peakResSumFuor[rRow]
+                        )
+                        writeBack["corrF"][rRow] = "{:.3f}".format(finalFactor)
+                        writeBack["corrCq"][rRow] = "-1.0"
+                        try:
+                            oldCq = float(
+                                _get_first_child_text(rdmlElemData[rRow], "cq")
                             )
-                            lCol = truePeakFinPos[rRow]
-                            if lCol >= 0:
-                                if (
-                                    res[rRow][rar_tar_chemistry]
-                                    == "saturating DNA binding dye"
-                                ):
-                                    finalFactor = (
-                                        peakResFluor[rRow][lCol]
-                                        / peakResSumFuor[rRow]
-                                    )
-                                    goodVal = "{:.3f}".format(finalFactor)
-                                    _change_subelement(
-                                        rdmlElemData[rRow],
-                                        "corrF",
-                                        dataXMLelements,
-                                        goodVal,
-                                        True,
-                                        "string",
-                                    )
-                                    _change_subelement(
-                                        rdmlElemData[rRow],
-                                        "corrCq",
-                                        dataXMLelements,
-                                        "-1.0",
-                                        True,
-                                        "string",
-                                    )
-                                    oldCq = _get_first_child_text(
-                                        rdmlElemData[rRow], "cq"
-                                    )
-                                    if oldCq != "":
-                                        try:
-                                            oldCq = float(oldCq)
-                                        except ValueError:
-                                            pass
-                                        else:
-                                            ampEff = _get_first_child_text(
-                                                rdmlElemData[rRow], "ampEff"
-                                            )
-                                            if ampEff != "":
-                                                try:
-                                                    ampEff = float(ampEff)
-                                                except ValueError:
-                                                    pass
-                                                else:
-                                                    if 0.01 < ampEff < 3.0:
-                                                        finalCq = (
-                                                            oldCq
-                                                            - np.log10(
-                                                                finalFactor
-                                                            )
-                                                            / np.log10(ampEff)
-                                                        )
-                                                        goodVal = (
-                                                            "{:.3f}".format(
-                                                                finalCq
-                                                            )
-                                                        )
-                                                        _change_subelement(
-                                                            rdmlElemData[rRow],
-                                                            "corrCq",
-                                                            dataXMLelements,
-                                                            goodVal,
-                                                            True,
-                                                            "string",
-                                                        )
-                                goodVal = "{:.3f}".format(
-                                    peakResTemp[rRow][lCol]
-                                )
-                                _change_subelement(
-                                    rdmlElemData[rRow],
-                                    "meltTemp",
-                                    dataXMLelements,
-                                    goodVal,
-                                    True,
-                                    "string",
+                            ampEff = float(
+                                _get_first_child_text(
+                                    rdmlElemData[rRow], "ampEff"
                                 )
-                            else:
-                                if (
-                                    res[rRow][rar_tar_chemistry]
-                                    == "saturating DNA binding dye"
-                                ):
-                                    _change_subelement(
-                                        rdmlElemData[rRow],
-                                        "corrF",
-                                        dataXMLelements,
-                                        "0.0",
-                                        True,
-                                        "string",
-                                    )
-                                    _change_subelement(
-                                        rdmlElemData[rRow],
-                                        "corrCq",
-                                        dataXMLelements,
-                                        "-1.0",
-                                        True,
-                                        "string",
-                                    )
+                            )
+                        except ValueError:
+                            continue
+                        if 0.01 < ampEff < 3.0:
+                            finalCq = oldCq - np.log10(finalFactor) / np.log10(
+                                ampEff
+                            )
+                            writeBack["corrCq"][rRow] = "{:.3f}".format(
+                                finalCq
+                            )
+                _change_subelements_bulk(
+                    rdmlElemData, _getXMLDataType(), writeBack
+                )
             finalData["resultsList"] = resTable
         return finalData
 
@@ -20406,12 +23125,25 @@ def main():
         dest="linRegPCR",
         help="run LinRegPCR",
     )
+    parser.add_argument(
+        "-a",
+        "--assemble",
+        metavar="plate.rdml",
+        dest="assemble",
+        nargs="+",
+        help="merge plate files into the output file given with -o",
+    )
     parser.add_argument(
         "-o",
         "--resultfile",
         metavar="data_out.rdml",
         dest="resultfile",
-        help="LinRegPCR: output file of LinRegPCR",
+        help="LinRegPCR & Assemble: output file",
+    )
+    parser.add_argument(
+        "--processes",
+        metavar="4",
+        help="Assemble: number of worker processes",
     )
     parser.add_argument(
         "--pcrEfficiencyExl",
@@ -20531,6 +23263,11 @@ def main():
         metavar="5.0",
         help="mcaPeakCutoff: the percentage below melting peaks are ignored in calculations",
     )
+    parser.add_argument(
+        "--mcaBlockSize",
+        metavar="96",
+        help="mcaBlockSize: the number of reactions analysed at once to limit the memory use",
+    )
     parser.add_argument(
         "--saveDerivative",
         metavar="processed_data",
@@ -20544,6 +23281,16 @@ def main():
     parser.add_argument(
         "--timeRun", action="store_true", help="LinRegPCR: print a timestamp"
     )
+    parser.add_argument(
+        "--workDtype",
+        metavar="float64",
+        help="LinRegPCR: float64 or float32 for the fluorescence working arrays",
+    )
+    parser.add_argument(
+        "--workDir",
+        metavar="/tmp",
+        help="LinRegPCR: memory map the working arrays to files in this directory",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -20609,6 +23356,29 @@ def main():
             print(cli_run["id"])
         sys.exit(0)
 
+    # Merge plate files from commandline
+    if args.assemble:
+        if not args.resultfile:
+            print("Error: An output file must be given with -o.")
+            sys.exit(1)
+        cli_processes = None
+        if args.processes:
+            cli_processes = int(args.processes)
+        cli_assemble = Rdml()
+        try:
+            cli_modList = cli_assemble.assemble_plates(
+                args.assemble,
+                experiment=args.experiment,
+                processes=cli_processes,
+            )
+        except RdmlError as cli_err:
+            print("Error: " + str(cli_err))
+            sys.exit(1)
+        for cli_mod in cli_modList:
+            print(cli_mod)
+        cli_assemble.save(args.resultfile)
+        sys.exit(0)
+
     # Run LinRegPCR from commandline
     if args.linRegPCR:
         cli_linRegPCR = Rdml(args.linRegPCR)
@@ -20665,6 +23435,8 @@ def main():
         cli_saveRawData = False
         cli_saveBaselineData = False
         cli_saveResultData = False
+        cli_workDtype = "float64"
+        cli_workDir = None
 
         if args.pcrEfficiencyExl:
             cli_pcrEfficiencyExl = float(args.pcrEfficiencyExl)
@@ -20692,6 +23464,10 @@ def main():
             cli_saveBaselineData = True
         if args.saveResults:
             cli_saveResultData = True
+        if args.workDtype:
+            cli_workDtype = args.workDtype
+        if args.workDir:
+            cli_workDir = args.workDir
 
         cli_result = cli_run.linRegPCR(
             pcrEfficiencyExl=cli_pcrEfficiencyExl,
@@ -20704,9 +23480,12 @@ def main():
             saveRaw=cli_saveRawData,
             saveBaslineCorr=cli_saveBaselineData,
             saveResultsList=False,
-            saveResultsCSV=cli_saveResultData,
+            saveResultsCSV=False,
+            saveResultsTable=cli_saveResultData,
             timeRun=cli_timeRun,
             verbose=cli_verbose,
+            workDtype=cli_workDtype,
+            workDir=cli_workDir,
         )
 
         if "noRawData" in cli_result:
@@ -20739,7 +23518,7 @@ def main():
                     cli_f.write(cli_ResStr)
         if args.saveResults:
             with open(args.saveResults, "w") as cli_f:
-                cli_f.write(cli_result["resultsCSV"])
+                cli_result["resultsTable"].to_tsv(cli_f)
         sys.exit(0)
 
     # Run meltCurveAnalysis from commandline
@@ -20790,7 +23569,7 @@ def main():
 
         cli_saveRDML = False
         cli_saveRawData = False
-        cli_saveDerivative = False
+        cli_derivativeFiles = None
         cli_saveResultData = False
         cli_mcaNormMethod = "exponential"
         cli_mcaFluorSource = "normalised"
@@ -20806,13 +23585,14 @@ def main():
         cli_mcaPeakHighTemp = 98.0
         cli_mcaPeakMaxWidth = 5.0
         cli_mcaPeakCutoff = 5.0
+        cli_mcaBlockSize = None
 
         if args.resultfile:
             cli_saveRDML = True
         if args.saveRaw:
             cli_saveRawData = True
         if args.saveDerivative:
-            cli_saveDerivative = True
+            cli_derivativeFiles = MeltDerivativeFiles(args.saveDerivative)
         if args.saveResults:
             cli_saveResultData = True
         if args.mcaNormMethod:
@@ -20843,28 +23623,35 @@ def main():
             cli_mcaPeakMaxWidth = float(args.mcaPeakMaxWidth)
         if args.mcaPeakCutoff:
             cli_mcaPeakCutoff = float(args.mcaPeakCutoff)
+        if args.mcaBlockSize:
+            cli_mcaBlockSize = int(args.mcaBlockSize)
 
-        cli_result = cli_run.meltCurveAnalysis(
-            normMethod=cli_mcaNormMethod,
-            fluorSource=cli_mcaFluorSource,
-            truePeakWidth=cli_mcaTruePeakWidth,
-            artifactPeakWidth=cli_mcaArtifactPeakWidth,
-            expoLowTemp=cli_mcaExpoLowTemp,
-            expoHighTemp=cli_mcaExpoHighTemp,
-            bilinLowStartTemp=cli_mcaBilinLowStartTemp,
-            bilinLowStopTemp=cli_mcaBilinLowStopTemp,
-            bilinHighStartTemp=cli_mcaBilinHighStartTemp,
-            bilinHighStopTemp=cli_mcaBilinHighStopTemp,
-            peakLowTemp=cli_mcaPeakLowTemp,
-            peakHighTemp=cli_mcaPeakHighTemp,
-            peakMaxWidth=cli_mcaPeakMaxWidth,
-            peakCutoff=cli_mcaPeakCutoff,
-            updateRDML=cli_saveRDML,
-            saveRaw=cli_saveRawData,
-            saveDerivative=cli_saveDerivative,
-            saveResultsList=True,
-            saveResultsCSV=cli_saveResultData,
-        )
+        try:
+            cli_result = cli_run.meltCurveAnalysis(
+                normMethod=cli_mcaNormMethod,
+                fluorSource=cli_mcaFluorSource,
+                truePeakWidth=cli_mcaTruePeakWidth,
+                artifactPeakWidth=cli_mcaArtifactPeakWidth,
+                expoLowTemp=cli_mcaExpoLowTemp,
+                expoHighTemp=cli_mcaExpoHighTemp,
+                bilinLowStartTemp=cli_mcaBilinLowStartTemp,
+                bilinLowStopTemp=cli_mcaBilinLowStopTemp,
+                bilinHighStartTemp=cli_mcaBilinHighStartTemp,
+                bilinHighStopTemp=cli_mcaBilinHighStopTemp,
+                peakLowTemp=cli_mcaPeakLowTemp,
+                peakHighTemp=cli_mcaPeakHighTemp,
+                peakMaxWidth=cli_mcaPeakMaxWidth,
+                peakCutoff=cli_mcaPeakCutoff,
+                updateRDML=cli_saveRDML,
+                saveRaw=cli_saveRawData,
+                saveResultsList=True,
+                saveResultsCSV=cli_saveResultData,
+                blockSize=cli_mcaBlockSize,
+                derivativeCallback=cli_derivativeFiles,
+            )
+        finally:
+            if cli_derivativeFiles is not None:
+                cli_derivativeFiles.close()
         if args.saveRaw:
             if "rawData" in cli_result:
                 with open(args.saveRaw, "w") as cli_f:
@@ -20880,80 +23667,6 @@ def main():
                         cli_ResStr = re.sub(r"\t$", "\n", cli_ResStr)
                     cli_f.write(cli_ResStr)
 
-        if args.saveDerivative:
-            if "derivative" in cli_result:
-                if "smoothed" in cli_result["derivative"]:
-                    with open(
-                        args.saveDerivative + "_smoothed.tsv", "w"
-                    ) as cli_f:
-                        cli_ResStr = ""
-                        for cli_row in cli_result["derivative"]["smoothed"]:
-                            for cli_col in cli_row:
-                                if type(cli_col) is float:
-                                    cli_ResStr += (
-                                        "{0:0.8f}".format(float(cli_col))
-                                        + "\t"
-                                    )
-                                else:
-                                    cli_ResStr += str(cli_col) + "\t"
-                            cli_ResStr = re.sub(r"\t$", "\n", cli_ResStr)
-                        cli_f.write(cli_ResStr)
-
-                if "normalized" in cli_result["derivative"]:
-                    with open(
-                        args.saveDerivative + "_normalized.tsv", "w"
-                    ) as cli_f:
-                        cli_ResStr = ""
-                        for cli_row in cli_result["derivative"]["normalized"]:
-                            for cli_col in cli_row:
-                                if type(cli_col) is float:
-                                    cli_ResStr += (
-                                        "{0:0.8f}".format(float(cli_col))
-                                        + "\t"
-                                    )
-                                else:
-                                    cli_ResStr += str(cli_col) + "\t"
-                            cli_ResStr = re.sub(r"\t$", "\n", cli_ResStr)
-                        cli_f.write(cli_ResStr)
-
-                if "firstDerivative" in cli_result["derivative"]:
-                    with open(
-                        args.saveDerivative + "_firstDerivative.tsv", "w"
-                    ) as cli_f:
-                        cli_ResStr = ""
-                        for cli_row in cli_result["derivative"][
-                            "firstDerivative"
-                        ]:
-                            for cli_col in cli_row:
-                                if type(cli_col) is float:
-                                    cli_ResStr += (
-                                        "{0:0.8e}".format(float(cli_col))
-                                        + "\t"
-                                    )
-                                else:
-                                    cli_ResStr += str(cli_col) + "\t"
-                            cli_ResStr = re.sub(r"\t$", "\n", cli_ResStr)
-                        cli_f.write(cli_ResStr)
-
-                if "secondDerivative" in cli_result["derivative"]:
-                    with open(
-                        args.saveDerivative + "_secondDerivative.tsv", "w"
-                    ) as cli_f:
-                        cli_ResStr = ""
-                        for cli_row in cli_result["derivative"][
-                            "secondDerivative"
-                        ]:
-                            for cli_col in cli_row:
-                                if type(cli_col) is float:
-                                    cli_ResStr += (
-                                        "{0:0.8e}".format(float(cli_col))
-                                        + "\t"
-                                    )
-                                else:
-                                    cli_ResStr += str(cli_col) + "\t"
-                            cli_ResStr = re.sub(r"\t$", "\n", cli_ResStr)
-                        cli_f.write(cli_ResStr)
-
         if args.saveResults:
             if "resultsList" in cli_result:
                 with open(args.saveResults, "w") as cli_f:
@@ -9,13 +9,11 @@
 import io
 import logging
 import os
-import subprocess
 import sys
-import tempfile
 
 import pandas as pd
 
-from rdmlpython.rdml import Rdml
+from rdmlpython.rdml import Rdml, loadPlateArrays
 
 logging.basicConfig(
     level=logging.INFO,
@@ -41,12 +39,16 @@ def reshape_result(result_table):
     return df_plate
 
 
-def extract_run(input_file):
-    # Run LinRegPCR from commandline
-    cli_linRegPCR = Rdml(input_file)
-    if cli_linRegPCR.version() == "1.0":
-        cli_linRegPCR.migrate_version_1_0_to_1_1()
-    cli_expList = cli_linRegPCR.experiments()
+def load_rdml(input_file):
+    # input_file is a file name, the file content as bytes or a stream
+    rdml = Rdml(input_file)
+    if rdml.version() == "1.0":
+        rdml.migrate_version_1_0_to_1_1()
+    return rdml
+
+
+def select_run(rdml):
+    cli_expList = rdml.experiments()
     if len(cli_expList) < 1:
         logging.error("No experiments found!")
         sys.exit(0)
@@ -68,6 +70,10 @@ def extract_run(input_file):
     return run
 
 
+def extract_run(input_file):
+    return select_run(load_rdml(input_file))
+
+
 def export_amp(run):
     # dMode: amp for amplification data, melt for meltcurve data
     # is str
@@ -105,81 +111,105 @@ def export_cq(run):
         saveRaw=False,
         saveBaslineCorr=False,
         saveResultsList=False,
-        saveResultsCSV=True,
+        saveResultsCSV=False,
+        saveResultsTable=True,
         timeRun=True,
         verbose=False,
     )
     if "noRawData" in cli_result:
         print(cli_result["noRawData"])
-    result_table = reshape_result(
-        pd.read_csv(io.StringIO(cli_result["resultsCSV"]), sep="\t")
-    )
+    result_table = reshape_result(cli_result["resultsTable"].to_dataframe())
 
     return result_table
 
 
-# create 3 files for each input
+def load_tables(input_file):
+    # amp and melt tables of the first run, kept in a .npz sidecar next to
+    # input_file so that re-running on the same file skips the XML
+    logging.info("Loading amplification and meltcurve data...")
+    arrays = loadPlateArrays(input_file)
+    wells = pd.Index(arrays["well"], name="Well")
+    amp_table = pd.DataFrame(
+        arrays["amp"].T, index=arrays["cycles"].astype(int), columns=wells
+    )
+    melt_table = pd.DataFrame(
+        arrays["melt"].T, index=arrays["temps"], columns=wells
+    )
+    return amp_table, melt_table
 
 
-def convert_file(input_file, rdml_file, excel_file):
-    with tempfile.NamedTemporaryFile(
-        mode="w+", suffix=".tsv", delete=True
-    ) as tsv_temp:
-        tsv_file = tsv_temp.name
-        script_path = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            "rdmlpython",
-            "rdml.py",
-        )
-        subprocess.call(
-            [
-                # /home/adminuser/venv/bin/python
-                # "python3",
-                sys.executable,
-                script_path,
-                "-lrp",
-                input_file,
-                "--pcrEfficiencyExl",
-                "0.05",
-                "--excludeNoPlateau",
-                "--excludeEfficiency",
-                "mean",
-                "--timeRun",
-                "-o",
-                rdml_file,
-                "--saveResults",
-                tsv_file,
-            ]
-        )
-        df = pd.read_csv(tsv_file, sep="\t").loc[
-            :, ["well", "Cq (mean eff) - no plateau - stat efficiency"]
-        ]
+# create 3 files for each input
 
-    df_plate = (
-        df.join(df["well"].str.extract(r"(?P<letter>[A-Z])(?P<digit>\d+)"))
-        .assign(digit=lambda x: x.digit.astype(int))
-        .pivot(
-            index="letter",
-            columns="digit",
-            values="Cq (mean eff) - no plateau - stat efficiency",
-        )
+
+def convert_file(input_file, rdml_file, excel_file, rdml=None):
+    # rdml_file and excel_file may be file names or writable streams, rdml
+    # is input_file if it was loaded already
+    if rdml is None:
+        rdml = load_rdml(input_file)
+    run = select_run(rdml)
+    logging.info("Running LinRegPCR...")
+    cli_result = run.linRegPCR(
+        pcrEfficiencyExl=0.05,
+        updateRDML=True,
+        excludeNoPlateau=True,
+        excludeEfficiency="mean",
+        excludeInstableBaseline=True,
+        commaConv=False,
+        ignoreExclusion=False,
+        saveRaw=False,
+        saveBaslineCorr=False,
+        saveResultsList=False,
+        saveResultsCSV=False,
+        saveResultsTable=True,
+        timeRun=True,
+        verbose=False,
     )
+    if "noRawData" in cli_result:
+        print(cli_result["noRawData"])
+    rdml.save(rdml_file)
+    df_plate = reshape_result(cli_result["resultsTable"].to_dataframe())
 
     df_plate.to_excel(excel_file, sheet_name="quant", engine="xlsxwriter")
     return df_plate
 
 
+def merge_files(input_files, rdml_file, experiment=None, processes=None):
+    # all runs of the input files end up in one experiment, ready for
+    # interRunCorr and relative quantification
+    rdml = Rdml()
+    if experiment is None:
+        experiment = "merged"
+        if isinstance(rdml_file, str):
+            experiment = os.path.splitext(os.path.basename(rdml_file))[0]
+    logging.info("Merging %d plate files...", len(input_files))
+    for message in rdml.assemble_plates(
+        input_files, experiment=experiment, processes=processes
+    ):
+        logging.info(message)
+    rdml.save(rdml_file)
+    return rdml
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        sys.exit("Usage: run.py input_file.lc96p")
+        sys.exit(
+            "Usage: run.py input_file.lc96p\n"
+            "       run.py merge output.rdml input_file.lc96p ..."
+        )
+    if sys.argv[1] == "merge":
+        if len(sys.argv) < 4:
+            sys.exit("Usage: run.py merge output.rdml input_file.lc96p ...")
+        merge_files(sys.argv[3:], sys.argv[2])
+        sys.exit(0)
     input_file = sys.argv[1]
-    run = extract_run(input_file)
+    # The file is parsed once, the tables and the conversion share the run
+    rdml = load_rdml(input_file)
+    run = select_run(rdml)
     amp_table = export_amp(run)
     melt_table = export_melt(run)
-    result_table = export_cq(run)
+    rdml_file = input_file.rsplit(".", 1)[0] + ".rdml"
+    excel_file = input_file.rsplit(".", 1)[0] + ".xlsx"
+    result_table = convert_file(input_file, rdml_file, excel_file, rdml)
     print(amp_table)
     print(melt_table)
     print(result_table)
-    rdml_file = input_file.rsplit(".", 1)[0] + ".rdml"
-    excel_file = input_file.rsplit(".", 1)[0] + ".xlsx"
-    convert_file(input_file, rdml_file, excel_file)
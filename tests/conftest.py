@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rdmlpython.rdml import Rdml  # noqa: E402
+
+EXAMPLE_AMP = os.path.join(
+    ROOT, "rdmlpython", "schema", "RDES_v1_0_example_amplification.tsv"
+)
+
+
+def build_example_rdml():
+    # The shipped RDES example plate imported into a fresh 96 well run
+    rdml = Rdml()
+    rdml.new_experiment("exp1")
+    exp = rdml.get_experiment(byid="exp1")
+    exp.new_run("run1")
+    run = exp.get_run(byid="run1")
+    run["pcrFormat_rows"] = "8"
+    run["pcrFormat_columns"] = "12"
+    run["pcrFormat_rowLabel"] = "ABC"
+    run["pcrFormat_columnLabel"] = "123"
+    run.import_table(rdml, EXAMPLE_AMP, "amp")
+    return rdml
+
+
+@pytest.fixture
+def example_rdml():
+    return build_example_rdml()
+
+
+@pytest.fixture
+def example_file(tmp_path):
+    path = str(tmp_path / "example.rdml")
+    build_example_rdml().save(path)
+    return path
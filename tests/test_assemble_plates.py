@@ -0,0 +1,18 @@
+from rdmlpython.rdml import Rdml
+
+
+def test_dropped_elements_are_reported(example_file):
+    merged = Rdml()
+    messages = merged.assemble_plates(
+        [example_file, example_file], experiment="all", processes=1
+    )
+
+    assert len(merged.get_experiment(byid="all").runs()) == 2
+    dropped = [msg for msg in messages if msg.endswith("already used.")]
+    assert 'example: sample "NTC" dropped, the id is already used.' in dropped
+    assert 'example: target "GPR15" dropped, the id is already used.' in (
+        dropped
+    )
+    assert len(dropped) == len(merged.samples()) + len(merged.targets()) + (
+        len(merged.dyes())
+    )
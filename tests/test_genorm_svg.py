@@ -0,0 +1,31 @@
+import threading
+
+from rdmlpython import rdml
+
+
+def test_pending_render_is_shared(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slowRender(labels, values, minTop, cutLine):
+        calls.append(labels)
+        started.set()
+        release.wait(10)
+        return "<svg/>"
+
+    monkeypatch.setattr(rdml, "_gen_renderBarSvg", slowRender)
+    monkeypatch.setattr(rdml, "_genormSvgCache", {})
+    genormRes = {"m_targets": ["T1", "T2"], "m_values": [0.4, 0.3]}
+
+    future = rdml.genormSvgAsync(genormRes)
+    assert started.wait(10)
+    waiter = threading.Thread(target=rdml.genormSvg, args=(genormRes,))
+    waiter.start()
+    release.set()
+    waiter.join(10)
+
+    assert future.result(10) == {"m_values": "<svg/>"}
+    assert rdml.genormSvg(genormRes) == {"m_values": "<svg/>"}
+    assert len(calls) == 1
+    assert rdml._genormSvgPending == {}
@@ -0,0 +1,37 @@
+import os
+
+from lxml import etree as et
+
+from rdmlpython.rdml import Rdml
+
+
+def _xml(rdml):
+    return et.tostring(rdml._node)
+
+
+def test_journal_round_trip_element_change(example_file):
+    rdml = Rdml(example_file)
+    rdml.save(example_file, journal=True)
+    rdml.get_sample(byid=rdml.samples()[0]["id"])["description"] = "changed"
+    rdml.save(example_file, journal=True)
+    assert os.path.isfile(example_file + ".journal")
+    assert _xml(Rdml(example_file)) == _xml(rdml)
+
+
+def test_journal_round_trip_run_attribute(example_file):
+    rdml = Rdml(example_file)
+    rdml.save(example_file, journal=True)
+    run = rdml.experiments()[0].runs()[0]
+    run._node.set("instrument", "changed")
+    rdml.save(example_file, journal=True)
+    assert _xml(Rdml(example_file)) == _xml(rdml)
+
+
+def test_journal_round_trip_migration(example_file):
+    rdml = Rdml(example_file)
+    rdml.save(example_file, journal=True)
+    rdml.migrate_version_1_3_to_1_2()
+    rdml.save(example_file, journal=True)
+    reloaded = Rdml(example_file)
+    assert reloaded.version() == "1.2"
+    assert _xml(reloaded) == _xml(rdml)
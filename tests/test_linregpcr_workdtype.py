@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+
+def run_linregpcr(rdml, **kwargs):
+    run = rdml.get_experiment(byid="exp1").get_run(byid="run1")
+    res = run.linRegPCR(saveResultsList=True, **kwargs)
+    return res["resultsList"]
+
+
+def assert_results_match(base, other, cqTol):
+    header = base[0]
+    assert other[0] == header
+    assert len(other) == len(base)
+    for rowBase, rowOther in zip(base[1:], other[1:]):
+        for col, valBase, valOther in zip(header, rowBase, rowOther):
+            if isinstance(valBase, float) and isinstance(valOther, float):
+                assert math.isnan(valBase) == math.isnan(valOther), col
+                if math.isnan(valBase):
+                    continue
+                if cqTol == 0.0:
+                    assert valBase == valOther, col
+                elif col.startswith("Cq"):
+                    assert abs(valBase - valOther) < cqTol, col
+            else:
+                # Flags, notes and reaction data must not change
+                assert valBase == valOther, col
+
+
+def test_memmap_float64_is_identical(example_rdml, tmp_path):
+    base = run_linregpcr(example_rdml)
+    mapped = run_linregpcr(example_rdml, workDir=str(tmp_path))
+    assert_results_match(base, mapped, 0.0)
+
+
+@pytest.mark.parametrize("useWorkDir", [False, True])
+def test_float32_matches_float64(example_rdml, tmp_path, useWorkDir):
+    workDir = str(tmp_path) if useWorkDir else None
+    base = run_linregpcr(example_rdml)
+    low = run_linregpcr(example_rdml, workDtype="float32", workDir=workDir)
+    assert_results_match(base, low, 1e-3)
@@ -0,0 +1,16 @@
+import pytest
+
+from rdmlpython.rdml import MeltDerivativeFiles
+
+
+def test_files_are_closed_when_the_analysis_raises(tmp_path):
+    baseName = str(tmp_path / "melt")
+    with pytest.raises(RuntimeError):
+        with MeltDerivativeFiles(baseName) as writer:
+            writer("smoothed", [["A1", 0.5]])
+            handle = writer._files["smoothed"]
+            raise RuntimeError("analysis failed")
+
+    assert handle.closed
+    with open(baseName + "_smoothed.tsv") as dataFile:
+        assert dataFile.read() == "A1\t0.50000000\n"
@@ -0,0 +1,56 @@
+import pytest
+
+from rdmlpython.rdml import _metadataToDics
+
+
+def test_lookups_are_cached_and_read_only(example_rdml):
+    lookups = _metadataToDics(example_rdml._node)
+    assert _metadataToDics(example_rdml._node) is lookups
+    with pytest.raises(TypeError):
+        lookups["targetType"]["GPR15"] = "toi"
+    with pytest.raises(TypeError):
+        lookups["sampleType"]["NTC"]["GPR15"] = "ntc"
+
+
+def test_public_lookups_are_copies(example_rdml):
+    copied = example_rdml.metadata_lookups()
+    copied["sampleType"]["1"]["GPR15"] = "changed"
+    assert example_rdml.metadata_lookups()["sampleType"]["1"]["GPR15"] == (
+        "unkn"
+    )
+
+
+def test_lookups_follow_changes(example_rdml):
+    root = example_rdml._node
+    assert _metadataToDics(root)["targetType"]["Exon 1"] == "toi"
+
+    target = example_rdml.get_target(byid="Exon 1")
+    target["type"] = "ref"
+    assert _metadataToDics(root)["targetType"]["Exon 1"] == "ref"
+
+    sample = example_rdml.get_sample(byid="1")
+    sample.edit_type("std", 0)
+    assert _metadataToDics(root)["sampleType"]["1"]["GPR15"] == "std"
+
+    example_rdml.new_dye("EvaGreen")
+    example_rdml.get_dye(byid="EvaGreen")[
+        "dyeChemistry"
+    ] = "saturating DNA binding dye"
+    target["dyeId"] = "EvaGreen"
+    assert _metadataToDics(root)["targetChemistry"]["Exon 1"] == (
+        "saturating DNA binding dye"
+    )
+
+    example_rdml.new_sample("extra")
+    assert "extra" in _metadataToDics(root)["sampleType"]
+    example_rdml.delete_sample(byid="extra")
+    assert "extra" not in _metadataToDics(root)["sampleType"]
+
+
+def test_missing_dye_maps_to_non_saturating(example_rdml):
+    target = example_rdml.get_target(byid="GPR15")
+    target["dyeId"] = "unknown dye"
+    lookups = example_rdml.metadata_lookups()
+    assert lookups["targetChemistry"]["GPR15"] == (
+        "non-saturating DNA binding dye"
+    )
@@ -0,0 +1,25 @@
+import os
+
+import numpy as np
+import pytest
+
+from rdmlpython import rdml
+
+
+def test_sidecar_is_written_and_reused(example_file):
+    first = rdml.loadPlateArrays(example_file)
+    assert os.path.isfile(example_file + ".npz")
+    second = rdml.loadPlateArrays(example_file)
+    assert sorted(first) == sorted(second)
+    np.testing.assert_array_equal(first["amp"], second["amp"])
+
+
+def test_failed_sidecar_write_leaves_no_temp_file(example_file, monkeypatch):
+    def failingSavez(*args, **kwargs):
+        raise ValueError("cannot store")
+
+    monkeypatch.setattr(rdml.np, "savez", failingSavez)
+    with pytest.raises(ValueError):
+        rdml.loadPlateArrays(example_file)
+    folder = os.path.dirname(example_file)
+    assert os.listdir(folder) == [os.path.basename(example_file)]
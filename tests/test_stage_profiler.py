@@ -0,0 +1,43 @@
+import tracemalloc
+
+from rdmlpython.rdml import StageProfiler
+
+
+def test_time_only_profile_does_not_trace():
+    prof = StageProfiler("test", "time")
+    prof.stage("work")
+    assert not tracemalloc.is_tracing()
+    records = prof.finish()
+    assert [rec["stage"] for rec in records] == ["work"]
+    assert records[0]["peakAlloc"] is None
+    assert records[0]["wall"] >= 0.0
+
+
+def test_profiler_stops_its_own_tracing():
+    prof = StageProfiler("test", True)
+    prof.stage("work")
+    data = [0] * 100000
+    del data
+    records = prof.finish()
+    assert records[0]["peakAlloc"] > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_caller_peak_is_kept():
+    tracemalloc.start()
+    try:
+        data = [0] * 200000
+        del data
+        callerPeak = tracemalloc.get_traced_memory()[1]
+
+        prof = StageProfiler("test", True)
+        prof.stage("small")
+        kept = [0] * 1000
+        records = prof.finish()
+
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= callerPeak
+        assert 0 < records[0]["peakAlloc"] < callerPeak
+        del kept
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,58 @@
+import io
+import zipfile
+
+import pytest
+
+from rdmlpython import rdml
+
+
+class UnseekableStream(io.RawIOBase):
+    # zipfile writes data descriptors to streams it cannot seek in
+    def __init__(self):
+        self.data = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, chunk):
+        return self.data.write(chunk)
+
+    def tell(self):
+        raise OSError("not seekable")
+
+
+def build_source():
+    stream = UnseekableStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zout:
+        zout.writestr("keep.txt", b"keep " * 1000)
+        zout.writestr("deleted.txt", b"deleted")
+        zout.writestr("replaced.txt", b"old content")
+        zout.writestr("stored.txt", b"stored", zipfile.ZIP_STORED)
+    return io.BytesIO(stream.data.getvalue())
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_rewrite_keeps_a_valid_zip(monkeypatch, raw):
+    if not raw:
+        monkeypatch.setattr(
+            rdml, "_zipRawCopySupported", lambda zin, zout: False
+        )
+    source = build_source()
+    with zipfile.ZipFile(source) as zin:
+        assert all(info.flag_bits & 0x08 for info in zin.infolist())
+
+    target = io.BytesIO()
+    rdml._rewriteZip(
+        source,
+        target,
+        {"deleted.txt": None, "replaced.txt": b"new content"},
+    )
+
+    with zipfile.ZipFile(target) as zin:
+        assert zin.testzip() is None
+        assert zin.namelist() == ["keep.txt", "replaced.txt", "stored.txt"]
+        assert zin.read("keep.txt") == b"keep " * 1000
+        assert zin.read("replaced.txt") == b"new content"
+        assert zin.read("stored.txt") == b"stored"
+        stored = zin.getinfo("stored.txt")
+        assert stored.compress_type == zipfile.ZIP_STORED